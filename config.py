@@ -12,3 +12,103 @@ if not BOT_TOKEN:
 ADMIN_ID = 2138687434
 
 DB_FILE = "task_bot.db"
+
+# ==================== Database Connection Pool ====================
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+DB_POOL_HEALTHCHECK_INTERVAL = float(os.getenv('DB_POOL_HEALTHCHECK_INTERVAL', '60'))
+
+# ==================== SQLite PRAGMA Profile ====================
+# روی هر اتصال Pool یک بار هنگام باز شدن اعمال می‌شود
+DB_JOURNAL_MODE = os.getenv('DB_JOURNAL_MODE', 'WAL')
+DB_SYNCHRONOUS = os.getenv('DB_SYNCHRONOUS', 'NORMAL')
+DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', '5000'))
+DB_CACHE_SIZE_KB = int(os.getenv('DB_CACHE_SIZE_KB', '16384'))
+DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', str(64 * 1024 * 1024)))
+DB_TEMP_STORE = os.getenv('DB_TEMP_STORE', 'MEMORY')
+
+# فاصله checkpoint دوره‌ای فایل WAL (ثانیه)
+DB_CHECKPOINT_INTERVAL = int(os.getenv('DB_CHECKPOINT_INTERVAL', '300'))
+
+# ==================== Database Executor ====================
+# تعداد threadهای اجرای کوئری برای هندلرهای async (حداکثر به اندازه Pool)
+DB_EXECUTOR_WORKERS = min(int(os.getenv('DB_EXECUTOR_WORKERS', str(DB_POOL_SIZE))), DB_POOL_SIZE)
+
+# ==================== User Cache ====================
+USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '1024'))
+USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', '300'))
+
+# ==================== Pagination ====================
+# تعداد آیتم هر صفحه در لیست‌های inline
+PAGE_SIZE = int(os.getenv('PAGE_SIZE', '10'))
+
+# ==================== Concurrent Updates ====================
+# حداکثر updateهای در حال اجرا به صورت هم‌زمان (updateهای هر کاربر همیشه به ترتیب اجرا می‌شوند)
+UPDATE_MAX_IN_FLIGHT = int(os.getenv('UPDATE_MAX_IN_FLIGHT', '16'))
+# حداکثر updateهای پذیرفته شده (در حال اجرا یا منتظر نوبت کاربر)
+UPDATE_MAX_PENDING = max(int(os.getenv('UPDATE_MAX_PENDING', '256')), UPDATE_MAX_IN_FLIGHT)
+
+# ==================== Outbound Delivery ====================
+# صف ارسال پیام‌ها؛ سقف تلگرام حدود 30 پیام در ثانیه برای کل بات و 1 پیام در ثانیه برای هر chat است
+DELIVERY_WORKERS = int(os.getenv('DELIVERY_WORKERS', '8'))
+DELIVERY_GLOBAL_RATE = float(os.getenv('DELIVERY_GLOBAL_RATE', '25'))
+DELIVERY_GLOBAL_BURST = float(os.getenv('DELIVERY_GLOBAL_BURST', '25'))
+DELIVERY_CHAT_RATE = float(os.getenv('DELIVERY_CHAT_RATE', '1'))
+DELIVERY_CHAT_BURST = float(os.getenv('DELIVERY_CHAT_BURST', '5'))
+DELIVERY_MAX_RETRIES = int(os.getenv('DELIVERY_MAX_RETRIES', '3'))
+
+# ==================== Webhook ====================
+# حالت دریافت updateها: polling یا webhook
+BOT_MODE = os.getenv('BOT_MODE', 'polling')
+WEBHOOK_LISTEN = os.getenv('WEBHOOK_LISTEN', '127.0.0.1')
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8443'))
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/telegram')
+# آدرس عمومی https (پشت reverse proxy)؛ خالی یعنی webhook در تلگرام ثبت نشود (تست محلی)
+WEBHOOK_URL = os.getenv('WEBHOOK_URL', '')
+WEBHOOK_SECRET_TOKEN = os.getenv('WEBHOOK_SECRET_TOKEN', '')
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv('WEBHOOK_MAX_CONNECTIONS', '40'))
+# حداکثر انتظار برای درخواست‌های در حال اجرا هنگام خاموش شدن (ثانیه)
+WEBHOOK_DRAIN_TIMEOUT = float(os.getenv('WEBHOOK_DRAIN_TIMEOUT', '10'))
+
+# ==================== Persistence ====================
+# فاصله تحویل تغییرات user_data و وضعیت مکالمه‌ها از Application به persistence (ثانیه)
+PERSISTENCE_UPDATE_INTERVAL = float(os.getenv('PERSISTENCE_UPDATE_INTERVAL', '1'))
+# نوشتن دسته‌ای: حداکثر تأخیر (میلی‌ثانیه) یا تعداد تغییر قبل از نوشتن
+PERSISTENCE_FLUSH_MS = int(os.getenv('PERSISTENCE_FLUSH_MS', '500'))
+PERSISTENCE_FLUSH_CHANGES = int(os.getenv('PERSISTENCE_FLUSH_CHANGES', '50'))
+
+# ==================== Work Data Buffer ====================
+# نوشتن دسته‌ای دانش/پیشنهاد/نتایج: حداکثر ورودی یا حداکثر تأخیر (ثانیه) قبل از نوشتن
+WORK_BUFFER_MAX_ENTRIES = int(os.getenv('WORK_BUFFER_MAX_ENTRIES', '20'))
+WORK_BUFFER_FLUSH_SECONDS = float(os.getenv('WORK_BUFFER_FLUSH_SECONDS', '5'))
+
+# ==================== Task Templates ====================
+# فاصله بررسی قالب‌های سررسید شده (ثانیه) و حداکثر کار ایجاد شده در هر تراکنش
+TEMPLATE_TICK_SECONDS = int(os.getenv('TEMPLATE_TICK_SECONDS', '60'))
+TEMPLATE_BATCH_SIZE = int(os.getenv('TEMPLATE_BATCH_SIZE', '200'))
+
+# ==================== Watchdog ====================
+# بررسی دوره‌ای تایمرهای باز: بستن تایمرهای فراموش شده و اطلاع عبور از مدت زمان کار
+WATCHDOG_INTERVAL_SECONDS = int(os.getenv('WATCHDOG_INTERVAL_SECONDS', '300'))
+WATCHDOG_MAX_SESSION_MINUTES = int(os.getenv('WATCHDOG_MAX_SESSION_MINUTES', '720'))
+WATCHDOG_BATCH_SIZE = int(os.getenv('WATCHDOG_BATCH_SIZE', '500'))
+
+# ==================== Search ====================
+# تعداد نتایج هر صفحه جستجوی متن کامل (/search)
+SEARCH_PAGE_SIZE = int(os.getenv('SEARCH_PAGE_SIZE', '8'))
+
+# ==================== Deduplication ====================
+# حداقل شباهت (Jaccard) برای تقریباً تکراری، حداکثر نامزدهای LSH و اندازه دسته job حذف تکرار
+DEDUP_SIMILARITY = float(os.getenv('DEDUP_SIMILARITY', '0.8'))
+DEDUP_MAX_CANDIDATES = int(os.getenv('DEDUP_MAX_CANDIDATES', '20'))
+DEDUP_BATCH_SIZE = int(os.getenv('DEDUP_BATCH_SIZE', '500'))
+
+# ==================== Export ====================
+# تعداد ردیف هر fetchmany هنگام ساخت خروجی و حداکثر حجم فایل قابل ارسال در تلگرام
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '1000'))
+EXPORT_MAX_UPLOAD_MB = int(os.getenv('EXPORT_MAX_UPLOAD_MB', '50'))
+
+# ==================== Analytics ====================
+# بازه پیش‌فرض گزارش تحلیل عملکرد (روز) و حداقل امتیاز لازم برای محاسبه روند
+ANALYTICS_WINDOW_DAYS = int(os.getenv('ANALYTICS_WINDOW_DAYS', '90'))
+ANALYTICS_MIN_TREND_POINTS = int(os.getenv('ANALYTICS_MIN_TREND_POINTS', '3'))
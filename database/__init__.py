@@ -4,6 +4,6 @@
 ماژول Database - مدیریت دیتابیس و Models
 """
 
-from .connection import create_connection
+from .connection import create_connection, get_connection, close_pool
 
-__all__ = ['create_connection']
\ No newline at end of file
+__all__ = ['create_connection', 'get_connection', 'close_pool']
\ No newline at end of file
@@ -2,23 +2,230 @@
 
 import sqlite3
 import os
-from config import DB_FILE
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from config import (
+    DB_FILE, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_HEALTHCHECK_INTERVAL,
+    DB_JOURNAL_MODE, DB_SYNCHRONOUS, DB_BUSY_TIMEOUT_MS, DB_CACHE_SIZE_KB,
+    DB_MMAP_SIZE, DB_TEMP_STORE
+)
 
 # مسیر دیتابیس در ریشه پروژه
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), DB_FILE)
 
+# پروفایل PRAGMA که روی هر اتصال تازه اعمال می‌شود
+# (cache_size منفی یعنی اندازه بر حسب KiB)
+CONNECTION_PRAGMAS = (
+    ("busy_timeout", DB_BUSY_TIMEOUT_MS),
+    ("journal_mode", DB_JOURNAL_MODE),
+    ("synchronous", DB_SYNCHRONOUS),
+    ("cache_size", -DB_CACHE_SIZE_KB),
+    ("mmap_size", DB_MMAP_SIZE),
+    ("temp_store", DB_TEMP_STORE),
+)
+
+
+def _apply_pragmas(conn):
+    """
+    اعمال پروفایل PRAGMA روی یک اتصال تازه
+
+    busy_timeout اول تنظیم می‌شود تا تغییر journal_mode در صورت
+    قفل بودن دیتابیس منتظر بماند و بلافاصله خطا ندهد.
+    """
+    for name, value in CONNECTION_PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def _open_connection():
+    """
+    باز کردن یک اتصال خام به دیتابیس
+
+    Returns:
+        sqlite3.Connection
+    """
+    # اتصال بین threadها جابه‌جا می‌شود ولی هر لحظه فقط دست یک thread است
+    conn = sqlite3.connect(DB_PATH, timeout=DB_BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    conn.row_factory = sqlite3.Row  # برای دسترسی آسان‌تر به ستون‌ها
+    try:
+        _apply_pragmas(conn)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
 
 def create_connection():
     """
-    ایجاد و برگرداندن یک اتصال به دیتابیس SQLite
-    
+    ایجاد و برگرداندن یک اتصال مستقل (خارج از Pool) به دیتابیس SQLite
+
+    برای اسکریپت‌های جانبی؛ کد برنامه باید از get_connection استفاده کند.
+
     Returns:
         sqlite3.Connection: اتصال به دیتابیس یا None در صورت خطا
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row  # برای دسترسی آسان‌تر به ستون‌ها
-        return conn
+        return _open_connection()
     except sqlite3.Error as e:
         print(f"❌ خطا در اتصال به دیتابیس: {e}")
         return None
+
+
+class ConnectionPool:
+    """Pool محدود از اتصال‌های ماندگار SQLite با بررسی سلامت"""
+
+    def __init__(self, size: int, timeout: float, healthcheck_interval: float):
+        """
+        Args:
+            size: حداکثر تعداد اتصال‌های باز
+            timeout: حداکثر زمان انتظار برای گرفتن اتصال (ثانیه)
+            healthcheck_interval: اتصال‌هایی که بیش از این مدت بیکار بوده‌اند قبل از تحویل بررسی می‌شوند (ثانیه)
+        """
+        self.size = size
+        self.timeout = timeout
+        self.healthcheck_interval = healthcheck_interval
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        گرفتن یک اتصال از Pool (در صورت نیاز اتصال جدید ساخته می‌شود)
+
+        Returns:
+            sqlite3.Connection یا None در صورت خطا/اتمام زمان انتظار
+        """
+        try:
+            conn, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._create_if_allowed()
+            if conn is not None:
+                return conn
+            try:
+                conn, last_used = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                print("❌ خطا در اتصال به دیتابیس: تمام اتصال‌های Pool مشغول هستند")
+                return None
+
+        if time.monotonic() - last_used > self.healthcheck_interval and not self._is_healthy(conn):
+            self._discard(conn)
+            return self._create_if_allowed()
+        return conn
+
+    def release(self, conn):
+        """بازگرداندن اتصال به Pool (تراکنش نیمه‌کاره rollback می‌شود)"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        self._idle.put_nowait((conn, time.monotonic()))
+
+    def close_all(self):
+        """بستن تمام اتصال‌های بیکار Pool"""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def _create_if_allowed(self):
+        """ساخت اتصال جدید اگر ظرفیت Pool پر نشده باشد"""
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+        try:
+            return _open_connection()
+        except sqlite3.Error as e:
+            with self._lock:
+                self._created -= 1
+            print(f"❌ خطا در اتصال به دیتابیس: {e}")
+            return None
+
+    def _discard(self, conn):
+        """بستن اتصال خراب و آزاد کردن ظرفیت آن"""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    @staticmethod
+    def _is_healthy(conn) -> bool:
+        """بررسی سلامت اتصال با یک کوئری سبک"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+
+_pool = ConnectionPool(DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_HEALTHCHECK_INTERVAL)
+_local = threading.local()
+
+
+@contextmanager
+def get_connection():
+    """
+    قرض گرفتن یک اتصال از Pool برای مدت اجرای بلوک with
+
+    فراخوانی‌های تو در تو در یک thread همان اتصال را دوباره استفاده می‌کنند.
+    در صورت خطا در اتصال، مقدار None برگردانده می‌شود.
+
+    Yields:
+        sqlite3.Connection یا None
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        _local.depth += 1
+        try:
+            yield conn
+        finally:
+            _local.depth -= 1
+        return
+
+    conn = _pool.acquire()
+    if conn is None:
+        yield None
+        return
+
+    _local.conn = conn
+    _local.depth = 1
+    try:
+        yield conn
+    finally:
+        _local.conn = None
+        _local.depth = 0
+        _pool.release(conn)
+
+
+def close_pool():
+    """بستن اتصال‌های Pool هنگام خاموش شدن بات"""
+    _pool.close_all()
+
+
+def checkpoint(mode: str = "PASSIVE"):
+    """
+    انتقال صفحات فایل WAL به فایل اصلی دیتابیس
+
+    Args:
+        mode: PASSIVE (بدون انتظار برای خواننده‌ها)، FULL، RESTART یا TRUNCATE
+
+    Returns:
+        tuple (busy, log_frames, checkpointed_frames) یا None در صورت خطا
+    """
+    with get_connection() as conn:
+        if not conn:
+            return None
+
+        try:
+            row = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+            return tuple(row) if row else None
+        except sqlite3.Error as e:
+            print(f"❌ خطا در checkpoint دیتابیس: {e}")
+            return None
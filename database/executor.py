@@ -0,0 +1,71 @@
+# database/executor.py
+
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from config import DB_EXECUTOR_WORKERS
+
+# Executor اختصاصی کوئری‌ها؛ تعداد workerها از اندازه Pool بیشتر نیست
+# تا هیچ thread ای پشت Pool منتظر اتصال نماند
+_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+
+
+async def run_in_db_thread(func, *args, **kwargs):
+    """
+    اجرای یک تابع sync دیتابیس روی Executor اختصاصی
+
+    Args:
+        func: تابع sync (متد Model یا Service)
+        *args, **kwargs: آرگومان‌های تابع
+
+    Returns:
+        خروجی تابع
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executor():
+    """بستن Executor هنگام خاموش شدن بات"""
+    _executor.shutdown(wait=True)
+
+
+def _make_async(func):
+    """ساخت نسخه awaitable از یک متد sync"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_in_db_thread(func, *args, **kwargs)
+
+    wrapper.__name__ = f"a{func.__name__}"
+    return wrapper
+
+
+def async_methods(cls=None, *, exclude=()):
+    """
+    دکوریتور کلاس: برای هر staticmethod عمومی و sync یک نسخه awaitable
+    با پیشوند a اضافه می‌کند (مثلاً TaskModel.get_by_id → TaskModel.aget_by_id)
+
+    متدهای format_* و نام‌های داخل exclude (توابع خالص بدون دیتابیس) نادیده گرفته می‌شوند.
+    اگر کلاس خودش نسخه a<name> را تعریف کرده باشد، همان حفظ می‌شود.
+
+    Usage:
+        @async_methods
+        class TaskModel: ...
+
+        task = await TaskModel.aget_by_id(task_id)
+    """
+    def decorate(klass):
+        for name, attr in list(vars(klass).items()):
+            if not isinstance(attr, staticmethod):
+                continue
+            func = attr.__func__
+            if (name.startswith('_') or name.startswith('format_') or name in exclude
+                    or inspect.iscoroutinefunction(func) or f"a{name}" in vars(klass)):
+                continue
+            setattr(klass, f"a{name}", staticmethod(_make_async(func)))
+        return klass
+
+    if cls is None:
+        return decorate
+    return decorate(cls)
@@ -1,5 +1,6 @@
 # database/migrations/__init__.py
 
 from database.migrations.schema import setup_database, create_tables, seed_admin
+from database.migrations.runner import run_migrations, get_current_version
 
-__all__ = ['setup_database', 'create_tables', 'seed_admin']
+__all__ = ['setup_database', 'create_tables', 'seed_admin', 'run_migrations', 'get_current_version']
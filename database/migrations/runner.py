@@ -0,0 +1,124 @@
+# database/migrations/runner.py
+
+import importlib
+import pkgutil
+import sys
+from datetime import datetime
+from database.connection import get_connection
+from database.migrations import versions
+
+
+def _ensure_version_table(conn):
+    """ایجاد جدول schema_version در صورت نبود"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT NOT NULL
+        );
+    """)
+    conn.commit()
+
+
+def load_migrations():
+    """
+    بارگذاری اسکریپت‌های مهاجرت به ترتیب نسخه
+
+    Returns:
+        لیست ماژول‌ها مرتب بر اساس VERSION
+    """
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        if not module_info.name.startswith('m'):
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(module)
+
+    migrations.sort(key=lambda m: m.VERSION)
+
+    seen = set()
+    for module in migrations:
+        if module.VERSION in seen:
+            raise ValueError(f"نسخه تکراری در مهاجرت‌ها: {module.VERSION}")
+        seen.add(module.VERSION)
+
+    return migrations
+
+
+def get_applied_versions() -> set:
+    """دریافت نسخه‌های اعمال شده"""
+    with get_connection() as conn:
+        if not conn:
+            return set()
+
+        try:
+            _ensure_version_table(conn)
+            return {row[0] for row in conn.execute("SELECT version FROM schema_version")}
+
+        except Exception as e:
+            print(f"❌ خطا در دریافت نسخه دیتابیس: {e}")
+            return set()
+
+
+def get_current_version() -> int:
+    """دریافت آخرین نسخه اعمال شده (0 اگر هیچ مهاجرتی اعمال نشده)"""
+    return max(get_applied_versions(), default=0)
+
+
+def run_migrations() -> bool:
+    """
+    اعمال مهاجرت‌های اعمال‌نشده به ترتیب نسخه
+
+    هر مهاجرت در یک تراکنش BEGIN IMMEDIATE جداگانه اجرا می‌شود؛ با WAL
+    خواننده‌ها در طول ساخت ایندکس متوقف نمی‌شوند و نویسنده‌های دیگر تا
+    busy_timeout منتظر می‌مانند، پس روی دیتابیس در حال کار هم قابل اجراست.
+
+    Returns:
+        bool: موفق بودن تمام مهاجرت‌ها
+    """
+    with get_connection() as conn:
+        if not conn:
+            return False
+
+        applied = get_applied_versions()
+
+        for migration in load_migrations():
+            if migration.VERSION in applied:
+                continue
+
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                migration.upgrade(conn.cursor())
+                conn.execute("""
+                    INSERT INTO schema_version (version, description, applied_at)
+                    VALUES (?, ?, ?)
+                """, (migration.VERSION, migration.DESCRIPTION,
+                      datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+                conn.commit()
+                print(f"✅ مهاجرت {migration.VERSION} اعمال شد: {migration.DESCRIPTION}")
+
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ خطا در اعمال مهاجرت {migration.VERSION}: {e}")
+                return False
+
+        # به‌روزرسانی آمار planner تا ایندکس‌های جدید انتخاب شوند
+        conn.execute("PRAGMA optimize")
+        return True
+
+
+def print_status():
+    """نمایش وضعیت مهاجرت‌ها"""
+    applied = get_applied_versions()
+    print(f"📦 نسخه فعلی دیتابیس: {max(applied, default=0)}")
+    for migration in load_migrations():
+        mark = "✅" if migration.VERSION in applied else "⏳"
+        print(f"{mark} {migration.VERSION:04d} - {migration.DESCRIPTION}")
+
+
+if __name__ == "__main__":
+    # python -m database.migrations.runner [status]
+    if len(sys.argv) > 1 and sys.argv[1] == "status":
+        print_status()
+    else:
+        sys.exit(0 if run_migrations() else 1)
@@ -0,0 +1,10 @@
+# database/migrations/versions/__init__.py
+
+"""
+اسکریپت‌های مهاجرت نسخه‌دار دیتابیس
+
+هر ماژول با نام mNNNN_<توضیح>.py شامل موارد زیر است:
+    VERSION: شماره نسخه (یکتا و صعودی)
+    DESCRIPTION: توضیح کوتاه
+    upgrade(cursor): اعمال تغییرات (داخل تراکنش runner اجرا می‌شود)
+"""
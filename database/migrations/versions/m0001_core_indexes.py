@@ -0,0 +1,64 @@
+# database/migrations/versions/m0001_core_indexes.py
+
+"""
+ایندکس‌های پایه منطبق با WHERE / ORDER BY کوئری‌های Models
+"""
+
+VERSION = 1
+DESCRIPTION = "ایندکس‌های پایه Tasks، TaskWorkData، TaskActivities و AdminReviews"
+
+INDEXES = [
+    # TaskModel.get_by_employee / get_active_by_employee_page
+    "CREATE INDEX IF NOT EXISTS idx_tasks_assignee_status_created "
+    "ON Tasks (assigned_to_id, status, creation_date)",
+
+    # TaskService.get_tasks_by_employee_and_category / get_employee_categories_with_stats
+    "CREATE INDEX IF NOT EXISTS idx_tasks_assignee_category "
+    "ON Tasks (assigned_to_id, category_id)",
+
+    # TaskModel.get_by_status / get_completed_submitted
+    "CREATE INDEX IF NOT EXISTS idx_tasks_status_created "
+    "ON Tasks (status, creation_date)",
+
+    # TaskModel.get_archived / get_archived_with_latest_score
+    "CREATE INDEX IF NOT EXISTS idx_tasks_finalized_completed "
+    "ON Tasks (is_finalized, completion_date)",
+
+    # TaskWorkDataModel.get_by_task_and_user
+    "CREATE INDEX IF NOT EXISTS idx_work_data_task_user_type "
+    "ON TaskWorkData (task_id, user_id, data_type, timestamp)",
+
+    # TaskWorkDataModel.get_by_task
+    "CREATE INDEX IF NOT EXISTS idx_work_data_task_type "
+    "ON TaskWorkData (task_id, data_type, timestamp)",
+
+    # TaskActivityModel.get_active_task_id / start / stop
+    "CREATE INDEX IF NOT EXISTS idx_activities_user_end "
+    "ON TaskActivities (user_id, end_time)",
+
+    # TaskActivityModel.get_spent_minutes
+    "CREATE INDEX IF NOT EXISTS idx_activities_task_user "
+    "ON TaskActivities (task_id, user_id)",
+
+    # AdminReviewModel.get_by_task / get_latest_score
+    "CREATE INDEX IF NOT EXISTS idx_reviews_task_type_time "
+    "ON AdminReviews (task_id, review_type, timestamp)",
+
+    # TaskScoresModel.get_by_task_and_user / create_or_update
+    "CREATE INDEX IF NOT EXISTS idx_scores_task_user "
+    "ON TaskScores (task_id, user_id)",
+
+    # TaskSectionFileModel.get_by_task
+    "CREATE INDEX IF NOT EXISTS idx_section_files_task_section "
+    "ON TaskSectionFiles (task_id, section_type)",
+
+    # TaskAttachmentModel.get_by_task
+    "CREATE INDEX IF NOT EXISTS idx_attachments_task "
+    "ON TaskAttachments (task_id)",
+]
+
+
+def upgrade(cursor):
+    """ایجاد ایندکس‌ها (IF NOT EXISTS تا روی دیتابیس موجود هم امن باشد)"""
+    for statement in INDEXES:
+        cursor.execute(statement)
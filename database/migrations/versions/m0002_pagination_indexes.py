@@ -0,0 +1,34 @@
+# database/migrations/versions/m0002_pagination_indexes.py
+
+"""
+ایندکس‌های عبارتی منطبق با کلید مرتب‌سازی صفحه‌بندی keyset در TaskModel
+(ترتیب (sort_key, id) مستقیماً از ایندکس خوانده می‌شود؛ rowid ستون آخر ضمنی است)
+"""
+
+VERSION = 2
+DESCRIPTION = "ایندکس‌های صفحه‌بندی keyset لیست کارها"
+
+INDEXES = [
+    # TaskModel.get_by_employee_page
+    "CREATE INDEX IF NOT EXISTS idx_tasks_assignee_created_key "
+    "ON Tasks (assigned_to_id, COALESCE(creation_date, ''))",
+
+    # TaskModel.get_completed_submitted_page
+    "CREATE INDEX IF NOT EXISTS idx_tasks_submitted_completed_key "
+    "ON Tasks (COALESCE(completion_date, '')) "
+    "WHERE status = 'completed' AND is_submitted = 1 AND is_finalized = 0",
+
+    # TaskModel.get_archived_with_latest_score_page (همه کارمندان)
+    "CREATE INDEX IF NOT EXISTS idx_tasks_finalized_completed_key "
+    "ON Tasks (is_finalized, COALESCE(completion_date, ''))",
+
+    # TaskModel.get_archived_with_latest_score_page (یک کارمند)
+    "CREATE INDEX IF NOT EXISTS idx_tasks_assignee_finalized_completed_key "
+    "ON Tasks (assigned_to_id, is_finalized, COALESCE(completion_date, ''))",
+]
+
+
+def upgrade(cursor):
+    """ایجاد ایندکس‌ها"""
+    for statement in INDEXES:
+        cursor.execute(statement)
@@ -0,0 +1,62 @@
+# database/migrations/versions/m0003_daily_employee_stats.py
+
+"""
+جدول تجمیعی DailyEmployeeStats برای گزارش روزانه و پر کردن اولیه آن
+
+پر کردن اولیه عمداً SQL ثابت همین مهاجرت است (نه DailyStatsModel) تا تغییرات بعدی مدل
+رفتار مهاجرت 3 را روی دیتابیس‌های جدید یا قدیمی عوض نکند.
+"""
+
+VERSION = 3
+DESCRIPTION = "جدول تجمیعی آمار روزانه کارمندان"
+
+# هر فعالیت بسته شده در مرزهای نیمه‌شب بریده می‌شود؛ دقیقه‌ها به روز هر بخش و خود فعالیت
+# به روز شروع تعلق می‌گیرد
+BACKFILL_ACTIVITIES_SQL = """
+    WITH RECURSIVE segments (user_id, segment_start, end_time, is_first) AS (
+        SELECT user_id, start_time, end_time, 1
+        FROM TaskActivities
+        WHERE end_time IS NOT NULL
+        UNION ALL
+        SELECT user_id, date(segment_start, '+1 day') || ' 00:00:00', end_time, 0
+        FROM segments
+        WHERE date(segment_start, '+1 day') || ' 00:00:00' < end_time
+    )
+    INSERT INTO DailyEmployeeStats (user_id, stat_date, worked_minutes, activity_count)
+    SELECT user_id, substr(segment_start, 1, 10),
+           SUM(CASE WHEN end_time > segment_start THEN CAST(ROUND((
+               JULIANDAY(MIN(end_time, date(segment_start, '+1 day') || ' 00:00:00'))
+               - JULIANDAY(segment_start)) * 86400) AS INTEGER) / 60 ELSE 0 END),
+           SUM(is_first)
+    FROM segments
+    GROUP BY user_id, substr(segment_start, 1, 10)
+"""
+
+BACKFILL_COMPLETED_SQL = """
+    INSERT INTO DailyEmployeeStats (user_id, stat_date, completed_count)
+    SELECT assigned_to_id, substr(completion_date, 1, 10), COUNT(*)
+    FROM Tasks
+    WHERE status = 'completed' AND assigned_to_id IS NOT NULL AND completion_date IS NOT NULL
+    GROUP BY assigned_to_id, substr(completion_date, 1, 10)
+    ON CONFLICT (user_id, stat_date) DO UPDATE SET
+        completed_count = excluded.completed_count
+"""
+
+
+def upgrade(cursor):
+    """ایجاد جدول و پر کردن آن از روی TaskActivities و Tasks"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS DailyEmployeeStats (
+            user_id INTEGER NOT NULL,
+            stat_date TEXT NOT NULL,
+            completed_count INTEGER NOT NULL DEFAULT 0,
+            worked_minutes INTEGER NOT NULL DEFAULT 0,
+            activity_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, stat_date),
+            FOREIGN KEY (user_id) REFERENCES Users (id)
+        ) WITHOUT ROWID
+    """)
+
+    cursor.execute("DELETE FROM DailyEmployeeStats")
+    cursor.execute(BACKFILL_ACTIVITIES_SQL)
+    cursor.execute(BACKFILL_COMPLETED_SQL)
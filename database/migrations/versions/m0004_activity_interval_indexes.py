@@ -0,0 +1,24 @@
+# database/migrations/versions/m0004_activity_interval_indexes.py
+
+"""
+ایندکس‌های بازه زمانی TaskActivities برای گزارش روزانه و کارهای جاری
+"""
+
+VERSION = 4
+DESCRIPTION = "ایندکس‌های بازه زمانی TaskActivities"
+
+INDEXES = [
+    # TaskActivityModel.get_user_activities_between (شاخه شروع داخل بازه)
+    "CREATE INDEX IF NOT EXISTS idx_activities_user_start "
+    "ON TaskActivities (user_id, start_time)",
+
+    # TaskActivityModel.get_open_activities (فقط تایمرهای باز؛ ایندکس کوچک می‌ماند)
+    "CREATE INDEX IF NOT EXISTS idx_activities_open "
+    "ON TaskActivities (start_time) WHERE end_time IS NULL",
+]
+
+
+def upgrade(cursor):
+    """ایجاد ایندکس‌ها"""
+    for statement in INDEXES:
+        cursor.execute(statement)
@@ -0,0 +1,31 @@
+# database/migrations/versions/m0005_bot_persistence.py
+
+"""
+جدول‌های ذخیره وضعیت ConversationHandler ها و user_data/chat_data/bot_data
+"""
+
+VERSION = 5
+DESCRIPTION = "جدول‌های persistence بات"
+
+
+def upgrade(cursor):
+    """ایجاد جدول‌های BotPersistenceData و BotConversations"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS BotPersistenceData (
+            kind TEXT NOT NULL,
+            data_key TEXT NOT NULL,
+            data BLOB NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (kind, data_key)
+        ) WITHOUT ROWID
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS BotConversations (
+            name TEXT NOT NULL,
+            conversation_key TEXT NOT NULL,
+            state BLOB NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (name, conversation_key)
+        ) WITHOUT ROWID
+    """)
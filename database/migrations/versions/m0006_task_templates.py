@@ -0,0 +1,55 @@
+# database/migrations/versions/m0006_task_templates.py
+
+"""
+قالب‌های کار تکرارشونده (TaskTemplates) و فایل‌های بخش‌های آنها
+"""
+
+VERSION = 6
+DESCRIPTION = "قالب‌های کار تکرارشونده"
+
+
+def upgrade(cursor):
+    """ایجاد جدول‌های TaskTemplates و TaskTemplateFiles"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS TaskTemplates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            results TEXT,
+            duration TEXT,
+            importance INTEGER,
+            priority INTEGER,
+            category_id INTEGER,
+            assigned_to_id INTEGER,
+            assigned_by_id INTEGER,
+            recurrence TEXT NOT NULL,
+            time_of_day TEXT NOT NULL,
+            next_run TEXT NOT NULL,
+            last_run TEXT,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (assigned_to_id) REFERENCES Users (id),
+            FOREIGN KEY (category_id) REFERENCES Categories (id)
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS TaskTemplateFiles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            template_id INTEGER NOT NULL,
+            section_type TEXT NOT NULL,
+            file_id TEXT NOT NULL,
+            file_type TEXT NOT NULL,
+            FOREIGN KEY (template_id) REFERENCES TaskTemplates (id)
+        )
+    """)
+
+    # بارگذاری heap زمان‌بند فقط قالب‌های فعال را می‌خواند
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_templates_active_next_run
+        ON TaskTemplates (next_run) WHERE is_active = 1
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_template_files_template
+        ON TaskTemplateFiles (template_id)
+    """)
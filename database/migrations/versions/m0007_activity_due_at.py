@@ -0,0 +1,39 @@
+# database/migrations/versions/m0007_activity_due_at.py
+
+"""
+ستون due_at در TaskActivities: زمانی که تایمر باز از مدت زمان کار عبور می‌کند
+
+watchdog فقط تایمرهای بازی را می‌خواند که due_at آنها رسیده (ایندکس جزئی) و بعد از
+اطلاع‌رسانی due_at را NULL می‌کند تا ردیف از ایندکس خارج شود.
+"""
+
+VERSION = 7
+DESCRIPTION = "ستون due_at تایمرهای باز برای watchdog"
+
+
+def upgrade(cursor):
+    """افزودن ستون، مقداردهی تایمرهای باز فعلی و ایجاد ایندکس"""
+    cursor.execute("ALTER TABLE TaskActivities ADD COLUMN due_at TEXT")
+
+    # زمان باقی‌مانده = مدت زمان کار - زمان تایمرهای بسته قبلی همان کاربر روی همان کار
+    cursor.execute("""
+        UPDATE TaskActivities
+        SET due_at = (
+            SELECT strftime('%Y-%m-%d %H:%M:%S', TaskActivities.start_time,
+                '+' || MAX(CAST(t.duration AS INTEGER) - COALESCE((
+                    SELECT SUM(CAST((JULIANDAY(p.end_time) - JULIANDAY(p.start_time)) * 24 * 60 AS INTEGER))
+                    FROM TaskActivities p
+                    WHERE p.user_id = TaskActivities.user_id
+                      AND p.task_id = TaskActivities.task_id
+                      AND p.end_time IS NOT NULL
+                ), 0), 0) || ' minutes')
+            FROM Tasks t
+            WHERE t.id = TaskActivities.task_id AND CAST(t.duration AS INTEGER) > 0
+        )
+        WHERE end_time IS NULL
+    """)
+
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_activities_open_due "
+        "ON TaskActivities (due_at) WHERE end_time IS NULL AND due_at IS NOT NULL"
+    )
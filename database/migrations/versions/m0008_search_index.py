@@ -0,0 +1,99 @@
+# database/migrations/versions/m0008_search_index.py
+
+"""
+ایندکس جستجوی متن کامل (FTS5) روی کارها، داده‌های کاری کارمندان و نظرات ادمین
+
+rowid هر سند = id ردیف مبدأ * 4 + کد منبع (0 کار، 1 داده کاری، 2 نظر ادمین)
+تا triggerها سند را با یک جستجوی rowid حذف/جایگزین کنند.
+ترتیب نتایج با bm25 (وزن عنوان 4 برابر متن) به عنوان rank پیش‌فرض جدول تعیین می‌شود.
+"""
+
+VERSION = 8
+DESCRIPTION = "ایندکس جستجوی متن کامل FTS5"
+
+TASK_DOCUMENT = """
+    SELECT {row}.id * 4, {row}.id, 'task', {row}.title,
+           TRIM(COALESCE({row}.description, '') || char(10) || COALESCE({row}.results, ''), char(10))
+"""
+
+WORK_DATA_DOCUMENT = """
+    SELECT {row}.id * 4 + 1, {row}.task_id, {row}.data_type, NULL, {row}.text_content
+"""
+
+REVIEW_DOCUMENT = """
+    SELECT {row}.id * 4 + 2, {row}.task_id, 'review_' || {row}.review_type, NULL, {row}.text_content
+"""
+
+INSERT_DOCUMENT = "INSERT INTO SearchIndex (rowid, task_id, kind, title, body)"
+
+TRIGGERS = [
+    # Tasks
+    f"""CREATE TRIGGER IF NOT EXISTS trg_search_tasks_insert AFTER INSERT ON Tasks BEGIN
+        {INSERT_DOCUMENT} {TASK_DOCUMENT.format(row='new')};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_search_tasks_update
+    AFTER UPDATE OF title, description, results ON Tasks BEGIN
+        DELETE FROM SearchIndex WHERE rowid = old.id * 4;
+        {INSERT_DOCUMENT} {TASK_DOCUMENT.format(row='new')};
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_search_tasks_delete AFTER DELETE ON Tasks BEGIN
+        DELETE FROM SearchIndex WHERE rowid = old.id * 4;
+    END""",
+
+    # TaskWorkData (فقط ورودی‌های متنی)
+    f"""CREATE TRIGGER IF NOT EXISTS trg_search_work_data_insert
+    AFTER INSERT ON TaskWorkData WHEN new.text_content IS NOT NULL BEGIN
+        {INSERT_DOCUMENT} {WORK_DATA_DOCUMENT.format(row='new')};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_search_work_data_update
+    AFTER UPDATE OF text_content, data_type ON TaskWorkData BEGIN
+        DELETE FROM SearchIndex WHERE rowid = old.id * 4 + 1;
+        {INSERT_DOCUMENT} {WORK_DATA_DOCUMENT.format(row='new')} WHERE new.text_content IS NOT NULL;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_search_work_data_delete AFTER DELETE ON TaskWorkData BEGIN
+        DELETE FROM SearchIndex WHERE rowid = old.id * 4 + 1;
+    END""",
+
+    # AdminReviews (فقط نظرهای متنی)
+    f"""CREATE TRIGGER IF NOT EXISTS trg_search_reviews_insert
+    AFTER INSERT ON AdminReviews WHEN new.text_content IS NOT NULL BEGIN
+        {INSERT_DOCUMENT} {REVIEW_DOCUMENT.format(row='new')};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_search_reviews_update
+    AFTER UPDATE OF text_content, review_type ON AdminReviews BEGIN
+        DELETE FROM SearchIndex WHERE rowid = old.id * 4 + 2;
+        {INSERT_DOCUMENT} {REVIEW_DOCUMENT.format(row='new')} WHERE new.text_content IS NOT NULL;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_search_reviews_delete AFTER DELETE ON AdminReviews BEGIN
+        DELETE FROM SearchIndex WHERE rowid = old.id * 4 + 2;
+    END""",
+]
+
+
+def upgrade(cursor):
+    """ایجاد جدول FTS5، پر کردن آن از داده‌های موجود و ایجاد triggerها"""
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS SearchIndex USING fts5(
+            task_id UNINDEXED,
+            kind UNINDEXED,
+            title,
+            body,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+    cursor.execute("INSERT INTO SearchIndex (SearchIndex, rank) VALUES ('rank', 'bm25(0.0, 0.0, 4.0, 1.0)')")
+
+    cursor.execute(f"{INSERT_DOCUMENT} {TASK_DOCUMENT.format(row='Tasks')} FROM Tasks")
+    cursor.execute(
+        f"{INSERT_DOCUMENT} {WORK_DATA_DOCUMENT.format(row='TaskWorkData')} "
+        f"FROM TaskWorkData WHERE text_content IS NOT NULL"
+    )
+    cursor.execute(
+        f"{INSERT_DOCUMENT} {REVIEW_DOCUMENT.format(row='AdminReviews')} "
+        f"FROM AdminReviews WHERE text_content IS NOT NULL"
+    )
+
+    for statement in TRIGGERS:
+        cursor.execute(statement)
+
+    cursor.execute("INSERT INTO SearchIndex (SearchIndex) VALUES ('optimize')")
@@ -0,0 +1,46 @@
+# database/migrations/versions/m0009_work_data_fingerprints.py
+
+"""
+اثر انگشت داده‌های کاری برای تشخیص تکرار
+
+- content_hash: هش متن نرمال‌شده (تکرار دقیق)
+- file_unique_id: شناسه یکتای فایل تلگرام (file_id برای یک فایل ثابت نیست)
+- duplicate_of: آیدی ورودی اصلی اگر این ورودی تکراری/تقریباً تکراری باشد
+- WorkDataLSH: کلیدهای باند MinHash هر ورودی متنی (جستجوی نامزدهای مشابه با ایندکس)
+
+ورودی‌های قدیمی با job حذف تکرار (/dedup_work_data) اثر انگشت می‌گیرند.
+"""
+
+VERSION = 9
+DESCRIPTION = "اثر انگشت و حذف تکرار داده‌های کاری"
+
+
+def upgrade(cursor):
+    """افزودن ستون‌ها، جدول LSH و ایندکس‌ها"""
+    cursor.execute("ALTER TABLE TaskWorkData ADD COLUMN content_hash TEXT")
+    cursor.execute("ALTER TABLE TaskWorkData ADD COLUMN file_unique_id TEXT")
+    cursor.execute("ALTER TABLE TaskWorkData ADD COLUMN duplicate_of INTEGER")
+
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_work_data_hash "
+        "ON TaskWorkData (data_type, content_hash) WHERE content_hash IS NOT NULL"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_work_data_file_unique "
+        "ON TaskWorkData (data_type, file_unique_id) WHERE file_unique_id IS NOT NULL"
+    )
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS WorkDataLSH (
+            band_key INTEGER NOT NULL,
+            data_id INTEGER NOT NULL,
+            PRIMARY KEY (band_key, data_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_data_lsh_data ON WorkDataLSH (data_id)")
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_work_data_lsh_delete AFTER DELETE ON TaskWorkData BEGIN
+            DELETE FROM WorkDataLSH WHERE data_id = old.id;
+        END
+    """)
@@ -12,6 +12,13 @@ from .task_section_file import TaskSectionFileModel
 from .task_work_data import TaskWorkDataModel
 from .task_scores import TaskScoresModel
 from .admin_review import AdminReviewModel
+from .task_activity import TaskActivityModel
+from .daily_stats import DailyStatsModel
+from .bot_persistence import BotPersistenceModel
+from .task_template import TaskTemplateModel
+from .search import SearchModel
+from .export import ExportModel
+from .analytics import AnalyticsModel
 
 __all__ = [
     'UserModel',
@@ -22,4 +29,11 @@ __all__ = [
     'TaskWorkDataModel',
     'TaskScoresModel',
     'AdminReviewModel',
+    'TaskActivityModel',
+    'DailyStatsModel',
+    'BotPersistenceModel',
+    'TaskTemplateModel',
+    'SearchModel',
+    'ExportModel',
+    'AnalyticsModel',
 ]
\ No newline at end of file
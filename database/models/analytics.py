@@ -0,0 +1,95 @@
+# database/models/analytics.py
+
+from database.connection import get_connection
+from database.executor import async_methods
+from typing import Optional, List, Dict, Any
+
+# کارهای بازه: کار تخصیص داده شده‌ای که در بازه ایجاد یا تکمیل شده
+WINDOW_TASKS_SQL = """
+    SELECT id FROM Tasks
+    WHERE assigned_to_id IS NOT NULL
+      AND COALESCE(completion_date, creation_date) >= ?
+"""
+
+
+@async_methods
+class AnalyticsModel:
+    """خواندن ستونی داده‌های تحلیل عملکرد (یک بار برای همه کارمندان)"""
+
+    @staticmethod
+    def _columns(cursor, sql: str, params: tuple = ()) -> Dict[str, List[Any]]:
+        """اجرای کوئری و برگرداندن نتیجه به شکل ستون‌ها {نام ستون: لیست مقادیر}"""
+        cursor.execute(sql, params)
+        names = [column[0] for column in cursor.description]
+        rows = cursor.fetchall()
+        if not rows:
+            return {name: [] for name in names}
+        return {name: list(values) for name, values in zip(names, zip(*rows))}
+
+    @staticmethod
+    def load_columns(since: str) -> Optional[Dict[str, Dict[str, List[Any]]]]:
+        """
+        دریافت همه داده‌های لازم برای تحلیل عملکرد در یک اتصال
+
+        Args:
+            since: ابتدای بازه "YYYY-MM-DD HH:MM:SS"
+
+        Returns:
+            dict با کلیدهای employees, categories, tasks, minutes, self_scores, admin_scores
+            (هر کدام dict ستون‌ها) یا None در صورت خطا
+        """
+        with get_connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+                columns = AnalyticsModel._columns
+
+                return {
+                    'employees': columns(cursor, """
+                        SELECT id, telegram_id, name
+                        FROM Users
+                        WHERE is_employee = 1 AND role = 'employee'
+                        ORDER BY id
+                    """),
+                    'categories': columns(cursor, """
+                        SELECT id, name FROM Categories ORDER BY id
+                    """),
+                    'tasks': columns(cursor, """
+                        SELECT id, assigned_to_id, category_id, duration, status, is_submitted,
+                               COALESCE(completion_date, creation_date) AS finished_at
+                        FROM Tasks
+                        WHERE assigned_to_id IS NOT NULL
+                          AND COALESCE(completion_date, creation_date) >= ?
+                        ORDER BY id
+                    """, (since,)),
+                    # دقیقه‌های واقعی جلسه‌های بسته شده به تفکیک کار و کارمند
+                    'minutes': columns(cursor, f"""
+                        SELECT task_id, user_id,
+                               SUM((JULIANDAY(end_time) - JULIANDAY(start_time)) * 24 * 60) AS minutes
+                        FROM TaskActivities
+                        WHERE end_time IS NOT NULL AND task_id IN ({WINDOW_TASKS_SQL})
+                        GROUP BY task_id, user_id
+                    """, (since,)),
+                    'self_scores': columns(cursor, f"""
+                        SELECT task_id, user_id, self_score
+                        FROM TaskScores
+                        WHERE self_score IS NOT NULL AND task_id IN ({WINDOW_TASKS_SQL})
+                    """, (since,)),
+                    # آخرین امتیاز ادمین هر کار
+                    'admin_scores': columns(cursor, f"""
+                        SELECT task_id, admin_score
+                        FROM AdminReviews
+                        WHERE id IN (
+                            SELECT MAX(id) FROM AdminReviews
+                            WHERE review_type = 'score' AND admin_score IS NOT NULL
+                              AND task_id IN ({WINDOW_TASKS_SQL})
+                            GROUP BY task_id
+                        )
+                    """, (since,)),
+                }
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت داده‌های تحلیل عملکرد: {e}")
+                return None
@@ -0,0 +1,108 @@
+# database/models/bot_persistence.py
+
+from database.connection import get_connection
+from database.executor import async_methods
+from datetime import datetime
+from typing import List, Dict, Tuple
+
+
+@async_methods
+class BotPersistenceModel:
+    """مدل جدول‌های BotPersistenceData و BotConversations (داده‌ها به صورت BLOB سریال شده)"""
+
+    @staticmethod
+    def load_data(kind: str) -> Dict[str, bytes]:
+        """
+        دریافت همه ردیف‌های یک نوع داده
+
+        Args:
+            kind: 'user' | 'chat' | 'bot' | 'callback'
+
+        Returns:
+            dict کلید -> BLOB
+        """
+        with get_connection() as conn:
+            if not conn:
+                return {}
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT data_key, data FROM BotPersistenceData WHERE kind = ?
+                """, (kind,))
+                return {row['data_key']: row['data'] for row in cursor.fetchall()}
+
+            except Exception as e:
+                print(f"❌ خطا در بارگذاری داده‌های persistence: {e}")
+                return {}
+
+    @staticmethod
+    def load_conversations(name: str) -> Dict[str, bytes]:
+        """دریافت وضعیت‌های یک ConversationHandler (کلید -> BLOB)"""
+        with get_connection() as conn:
+            if not conn:
+                return {}
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT conversation_key, state FROM BotConversations WHERE name = ?
+                """, (name,))
+                return {row['conversation_key']: row['state'] for row in cursor.fetchall()}
+
+            except Exception as e:
+                print(f"❌ خطا در بارگذاری وضعیت مکالمه‌ها: {e}")
+                return {}
+
+    @staticmethod
+    def save_batch(data_upserts: List[Tuple[str, str, bytes]], data_deletes: List[Tuple[str, str]],
+                   conversation_upserts: List[Tuple[str, str, bytes]],
+                   conversation_deletes: List[Tuple[str, str]]) -> bool:
+        """
+        نوشتن یک دسته تغییر در یک تراکنش
+
+        Args:
+            data_upserts: لیست (kind, key, data)
+            data_deletes: لیست (kind, key)
+            conversation_upserts: لیست (name, key, state)
+            conversation_deletes: لیست (name, key)
+
+        Returns:
+            bool: موفق بودن عملیات
+        """
+        with get_connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+
+                cursor.executemany("""
+                    INSERT INTO BotPersistenceData (kind, data_key, data, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (kind, data_key) DO UPDATE SET
+                        data = excluded.data, updated_at = excluded.updated_at
+                """, [(kind, key, data, now) for kind, key, data in data_upserts])
+                cursor.executemany("""
+                    DELETE FROM BotPersistenceData WHERE kind = ? AND data_key = ?
+                """, data_deletes)
+
+                cursor.executemany("""
+                    INSERT INTO BotConversations (name, conversation_key, state, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (name, conversation_key) DO UPDATE SET
+                        state = excluded.state, updated_at = excluded.updated_at
+                """, [(name, key, state, now) for name, key, state in conversation_upserts])
+                cursor.executemany("""
+                    DELETE FROM BotConversations WHERE name = ? AND conversation_key = ?
+                """, conversation_deletes)
+
+                conn.commit()
+                return True
+
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ خطا در ذخیره داده‌های persistence: {e}")
+                return False
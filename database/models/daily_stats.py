@@ -0,0 +1,236 @@
+# database/models/daily_stats.py
+
+from database.connection import get_connection
+from database.executor import async_methods
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Tuple
+
+DATE_FORMAT = "%Y-%m-%d"
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# شرط شمارش یک کار در completed_count روز completion_date (مشترک بین به‌روزرسانی افزایشی و rebuild)
+COMPLETED_TASK_SQL = "status = 'completed' AND assigned_to_id IS NOT NULL AND completion_date IS NOT NULL"
+
+
+def iter_day_segments(start_dt: datetime, end_dt: datetime):
+    """
+    برش یک بازه زمانی در مرزهای نیمه‌شب
+
+    Yields:
+        (تاریخ "YYYY-MM-DD", شروع بخش, پایان بخش)
+    """
+    while start_dt < end_dt:
+        next_midnight = datetime.combine(start_dt.date() + timedelta(days=1), datetime.min.time())
+        segment_end = min(end_dt, next_midnight)
+        yield start_dt.strftime(DATE_FORMAT), start_dt, segment_end
+        start_dt = segment_end
+
+
+def split_minutes_by_day(start_time: str, end_time: str) -> Dict[str, int]:
+    """
+    تقسیم بازه یک فعالیت روی روزهای تقویمی (برش در نیمه‌شب)
+
+    Args:
+        start_time: زمان شروع "YYYY-MM-DD HH:MM:SS"
+        end_time: زمان پایان "YYYY-MM-DD HH:MM:SS"
+
+    Returns:
+        dict تاریخ -> دقیقه
+    """
+    return {
+        day: int((segment_end - segment_start).total_seconds() // 60)
+        for day, segment_start, segment_end in iter_day_segments(
+            datetime.strptime(start_time, DATETIME_FORMAT),
+            datetime.strptime(end_time, DATETIME_FORMAT)
+        )
+    }
+
+
+@async_methods
+class DailyStatsModel:
+    """
+    مدل جدول تجمیعی DailyEmployeeStats (آمار روزانه هر کارمند)
+
+    ردیف‌ها به صورت افزایشی هنگام توقف تایمر (TaskActivityModel.stop) و هر تغییر کار که
+    شمارش تکمیل را جابه‌جا می‌کند (تحویل، تغییر وضعیت، ویرایش، حذف) در همان تراکنش به‌روز
+    می‌شوند؛ rebuild همه را از روی TaskActivities و Tasks از نو می‌سازد.
+    """
+
+    @staticmethod
+    def _add(cursor, user_id: int, stat_date: str, completed: int = 0,
+             minutes: int = 0, activities: int = 0):
+        """UPSERT افزایشی یک ردیف (روی cursor تراکنش فراخوان)"""
+        cursor.execute("""
+            INSERT INTO DailyEmployeeStats
+            (user_id, stat_date, completed_count, worked_minutes, activity_count)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, stat_date) DO UPDATE SET
+                completed_count = completed_count + excluded.completed_count,
+                worked_minutes = worked_minutes + excluded.worked_minutes,
+                activity_count = activity_count + excluded.activity_count
+        """, (user_id, stat_date, completed, minutes, activities))
+
+    @staticmethod
+    def _completion_key(cursor, task_id: int) -> Optional[Tuple[int, str]]:
+        """(کارمند, روز) ای که کار در completed_count آن شمرده می‌شود یا None (روی cursor تراکنش فراخوان)"""
+        cursor.execute(f"""
+            SELECT assigned_to_id, completion_date FROM Tasks
+            WHERE id = ? AND {COMPLETED_TASK_SQL}
+        """, (task_id,))
+        row = cursor.fetchone()
+        return (row['assigned_to_id'], row['completion_date'][:10]) if row else None
+
+    @staticmethod
+    def _move_completion(cursor, before: Optional[Tuple[int, str]], after: Optional[Tuple[int, str]]):
+        """
+        اعمال تغییر شمارش تکمیل یک کار
+
+        Args:
+            before: خروجی _completion_key قبل از تغییر کار
+            after: خروجی _completion_key بعد از تغییر کار
+        """
+        if before == after:
+            return
+        if before:
+            DailyStatsModel._add(cursor, before[0], before[1], completed=-1)
+        if after:
+            DailyStatsModel._add(cursor, after[0], after[1], completed=1)
+
+    @staticmethod
+    def _record_activity(cursor, user_id: int, start_time: str, end_time: str):
+        """ثبت یک فعالیت بسته شده؛ دقیقه‌ها بین روزها تقسیم و فعالیت در روز شروع شمرده می‌شود"""
+        minutes_by_day = split_minutes_by_day(start_time, end_time)
+        start_date = start_time[:10]
+        if start_date not in minutes_by_day:
+            minutes_by_day[start_date] = 0
+
+        for stat_date, minutes in minutes_by_day.items():
+            DailyStatsModel._add(cursor, user_id, stat_date, minutes=minutes,
+                                 activities=1 if stat_date == start_date else 0)
+
+    @staticmethod
+    def _rebuild(cursor, from_date: Optional[str] = None) -> int:
+        """
+        بازسازی ردیف‌ها از روی داده‌های خام (روی cursor تراکنش فراخوان)
+
+        Returns:
+            تعداد فعالیت‌های پردازش شده
+        """
+        if from_date:
+            cursor.execute("DELETE FROM DailyEmployeeStats WHERE stat_date >= ?", (from_date,))
+            # فعالیتی که قبل از from_date شروع شده فقط سهم روزهای بعدش را می‌دهد
+            cursor.execute("""
+                SELECT user_id,
+                       CASE WHEN start_time < ? THEN ? ELSE start_time END AS start_time,
+                       start_time < ? AS started_before,
+                       end_time
+                FROM TaskActivities
+                WHERE end_time IS NOT NULL AND end_time >= ?
+            """, (from_date, f"{from_date} 00:00:00", from_date, from_date))
+        else:
+            cursor.execute("DELETE FROM DailyEmployeeStats")
+            cursor.execute("""
+                SELECT user_id, start_time, 0 AS started_before, end_time
+                FROM TaskActivities
+                WHERE end_time IS NOT NULL
+            """)
+
+        activities = cursor.fetchall()
+        for row in activities:
+            if row['started_before']:
+                for stat_date, minutes in split_minutes_by_day(row['start_time'], row['end_time']).items():
+                    DailyStatsModel._add(cursor, row['user_id'], stat_date, minutes=minutes)
+            else:
+                DailyStatsModel._record_activity(cursor, row['user_id'], row['start_time'], row['end_time'])
+
+        cursor.execute(f"""
+            INSERT INTO DailyEmployeeStats (user_id, stat_date, completed_count)
+            SELECT assigned_to_id, substr(completion_date, 1, 10), COUNT(*)
+            FROM Tasks
+            WHERE {COMPLETED_TASK_SQL} AND completion_date >= ?
+            GROUP BY assigned_to_id, substr(completion_date, 1, 10)
+            ON CONFLICT (user_id, stat_date) DO UPDATE SET
+                completed_count = excluded.completed_count
+        """, (from_date or '',))
+
+        return len(activities)
+
+    @staticmethod
+    def rebuild(from_date: Optional[str] = None) -> Optional[int]:
+        """
+        بازسازی کامل جدول تجمیعی (یا از یک تاریخ به بعد) در یک تراکنش
+
+        Args:
+            from_date: تاریخ شروع "YYYY-MM-DD" (None = همه)
+
+        Returns:
+            تعداد فعالیت‌های پردازش شده یا None در صورت خطا
+        """
+        with get_connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                processed = DailyStatsModel._rebuild(conn.cursor(), from_date)
+                conn.commit()
+                return processed
+
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ خطا در بازسازی آمار روزانه: {e}")
+                return None
+
+    @staticmethod
+    def get_for_user(user_id: int, stat_date: str) -> Dict[str, int]:
+        """دریافت آمار یک کارمند در یک روز (صفر در صورت نبود ردیف)"""
+        empty = {'completed_count': 0, 'worked_minutes': 0, 'activity_count': 0}
+        with get_connection() as conn:
+            if not conn:
+                return empty
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT completed_count, worked_minutes, activity_count
+                    FROM DailyEmployeeStats
+                    WHERE user_id = ? AND stat_date = ?
+                """, (user_id, stat_date))
+                row = cursor.fetchone()
+                return dict(row) if row else empty
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت آمار روزانه: {e}")
+                return empty
+
+    @staticmethod
+    def get_employees_overview(stat_date: str) -> List[Dict[str, Any]]:
+        """
+        دریافت لیست کارمندان به همراه آمار یک روز با یک کوئری
+
+        Returns:
+            لیست dict با کلیدهای id, telegram_id, name, completed_count,
+            worked_minutes, activity_count
+        """
+        with get_connection() as conn:
+            if not conn:
+                return []
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT u.id, u.telegram_id, u.name,
+                           COALESCE(s.completed_count, 0) AS completed_count,
+                           COALESCE(s.worked_minutes, 0) AS worked_minutes,
+                           COALESCE(s.activity_count, 0) AS activity_count
+                    FROM Users u
+                    LEFT JOIN DailyEmployeeStats s
+                        ON s.user_id = u.id AND s.stat_date = ?
+                    WHERE u.is_employee = 1 AND u.role = 'employee'
+                    ORDER BY u.name
+                """, (stat_date,))
+                return [dict(row) for row in cursor.fetchall()]
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت آمار روزانه کارمندان: {e}")
+                return []
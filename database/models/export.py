@@ -0,0 +1,125 @@
+# database/models/export.py
+
+from database.connection import get_connection
+from datetime import datetime, timedelta
+from typing import Optional, Iterator, Tuple, Dict, Any
+
+# هر dataset: (کوئری پایه, ستون‌های فیلتر, ترتیب)
+# ترتیب‌ها روی کلید اصلی هستند تا SQLite بدون مرتب‌سازی کل نتیجه، ردیف‌ها را به ترتیب برگرداند
+EXPORT_DATASETS: Dict[str, Tuple[str, Dict[str, str], Optional[str]]] = {
+    'tasks': (
+        """
+        SELECT t.id, t.title, t.status, u.name AS employee_name, c.name AS category_name,
+               t.creation_date, t.completion_date, t.duration, t.importance, t.priority,
+               t.is_submitted, t.is_finalized
+        FROM Tasks t
+        LEFT JOIN Users u ON u.id = t.assigned_to_id
+        LEFT JOIN Categories c ON c.id = t.category_id
+        """,
+        {'employee': 't.assigned_to_id', 'category': 't.category_id', 'date': 't.creation_date'},
+        "t.id"
+    ),
+    'activities': (
+        """
+        SELECT a.id, u.name AS employee_name, a.task_id, t.title AS task_title,
+               c.name AS category_name, a.start_time, a.end_time,
+               CAST((JULIANDAY(a.end_time) - JULIANDAY(a.start_time)) * 24 * 60 AS INTEGER) AS minutes
+        FROM TaskActivities a
+        LEFT JOIN Users u ON u.id = a.user_id
+        LEFT JOIN Tasks t ON t.id = a.task_id
+        LEFT JOIN Categories c ON c.id = t.category_id
+        """,
+        {'employee': 'a.user_id', 'category': 't.category_id', 'date': 'a.start_time'},
+        "a.id"
+    ),
+    'scores': (
+        """
+        SELECT * FROM (
+            SELECT s.task_id, t.title AS task_title, s.user_id AS employee_id, u.name AS employee_name,
+                   t.category_id, c.name AS category_name, 'self' AS source,
+                   s.self_score AS score, s.timestamp
+            FROM TaskScores s
+            LEFT JOIN Tasks t ON t.id = s.task_id
+            LEFT JOIN Users u ON u.id = s.user_id
+            LEFT JOIN Categories c ON c.id = t.category_id
+            UNION ALL
+            SELECT r.task_id, t.title, t.assigned_to_id, u.name,
+                   t.category_id, c.name, 'admin',
+                   r.admin_score, r.timestamp
+            FROM AdminReviews r
+            LEFT JOIN Tasks t ON t.id = r.task_id
+            LEFT JOIN Users u ON u.id = t.assigned_to_id
+            LEFT JOIN Categories c ON c.id = t.category_id
+            WHERE r.review_type = 'score'
+        ) x
+        """,
+        {'employee': 'x.employee_id', 'category': 'x.category_id', 'date': 'x.timestamp'},
+        None
+    ),
+}
+
+
+class ExportModel:
+    """خواندن جریانی (fetchmany) داده‌ها برای خروجی CSV/XLSX"""
+
+    @staticmethod
+    def iter_rows(dataset: str, employee_id: Optional[int] = None, category_id: Optional[int] = None,
+                  from_date: Optional[str] = None, to_date: Optional[str] = None,
+                  batch_size: int = 1000) -> Iterator[Tuple[Any, ...]]:
+        """
+        تولید ردیف‌های یک dataset به صورت جریانی
+
+        اولین مقدار تولید شده نام ستون‌هاست. ردیف‌ها دسته‌های batch_size تایی از cursor خوانده
+        می‌شوند و هیچ‌وقت کل نتیجه در حافظه نیست. اتصال تا پایان پیمایش (یا بسته شدن generator)
+        نگه داشته می‌شود.
+
+        Args:
+            dataset: 'tasks' | 'activities' | 'scores'
+            employee_id: فیلتر کارمند (Users.id)
+            category_id: فیلتر دسته‌بندی
+            from_date: از تاریخ "YYYY-MM-DD" (شامل)
+            to_date: تا تاریخ "YYYY-MM-DD" (شامل)
+            batch_size: تعداد ردیف هر fetchmany
+
+        Raises:
+            KeyError: dataset نامعتبر
+            RuntimeError: اتصال دیتابیس در دسترس نیست
+        """
+        query, filter_columns, order = EXPORT_DATASETS[dataset]
+
+        conditions = []
+        params = []
+        if employee_id is not None:
+            conditions.append(f"{filter_columns['employee']} = ?")
+            params.append(employee_id)
+        if category_id is not None:
+            conditions.append(f"{filter_columns['category']} = ?")
+            params.append(category_id)
+        if from_date:
+            conditions.append(f"{filter_columns['date']} >= ?")
+            params.append(from_date)
+        if to_date:
+            # بازه نیمه‌باز تا ابتدای روز بعد (ستون‌ها "YYYY-MM-DD HH:MM:SS" هستند)
+            conditions.append(f"{filter_columns['date']} < ?")
+            params.append((datetime.strptime(to_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d"))
+
+        sql = query
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if order:
+            sql += f" ORDER BY {order}"
+
+        with get_connection() as conn:
+            if not conn:
+                raise RuntimeError("اتصال دیتابیس در دسترس نیست")
+
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            yield tuple(column[0] for column in cursor.description)
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield tuple(row)
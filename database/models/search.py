@@ -0,0 +1,84 @@
+# database/models/search.py
+
+from database.connection import get_connection
+from database.executor import async_methods
+from typing import Optional, List, Dict, Any
+
+# نشانگرهای شروع/پایان عبارت پیدا شده در snippet (در لایه نمایش به تگ تبدیل می‌شوند)
+HIGHLIGHT_OPEN = "\x02"
+HIGHLIGHT_CLOSE = "\x03"
+SNIPPET_TOKENS = 16
+MAX_QUERY_TERMS = 8
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    تبدیل متن کاربر به عبارت MATCH امن FTS5
+
+    هر کلمه یک phrase جدا (AND ضمنی) می‌شود تا عملگرهای FTS5 داخل متن کاربر اثری نداشته
+    باشند؛ کلمه‌ای که به * ختم شود جستجوی پیشوندی است.
+
+    Returns:
+        عبارت MATCH یا None اگر کلمه‌ای نباشد
+    """
+    terms = []
+    for word in text.split()[:MAX_QUERY_TERMS]:
+        prefix = word.endswith('*')
+        word = word.strip('*').replace('"', '')
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return ' '.join(terms) or None
+
+
+@async_methods(exclude=('build_match_query',))
+class SearchModel:
+    """مدل جستجوی متن کامل روی جدول SearchIndex (FTS5)"""
+
+    @staticmethod
+    def search(match_query: str, limit: int, offset: int = 0) -> Optional[List[Dict[str, Any]]]:
+        """
+        جستجو به ترتیب bm25
+
+        مرتب‌سازی و LIMIT داخل زیرکوئری روی خود جدول FTS5 انجام می‌شود (ORDER BY rank)
+        و snippet فقط برای ردیف‌های همین صفحه با جستجوی rowid محاسبه می‌شود
+        (CROSS JOIN ترتیب join را ثابت نگه می‌دارد).
+
+        Args:
+            match_query: خروجی build_match_query
+            limit: تعداد نتایج
+            offset: تعداد نتایج رد شده
+
+        Returns:
+            لیست dict با کلیدهای task_id, kind, task_title, task_status, employee_name,
+            title_highlight, snippet یا None اگر عبارت نامعتبر باشد یا خطا رخ دهد
+        """
+        with get_connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT s.task_id, s.kind,
+                           highlight(SearchIndex, 2, ?, ?) AS title_highlight,
+                           snippet(SearchIndex, 3, ?, ?, '…', {SNIPPET_TOKENS}) AS snippet,
+                           t.title AS task_title, t.status AS task_status,
+                           u.name AS employee_name
+                    FROM (
+                        SELECT rowid, rank FROM SearchIndex
+                        WHERE SearchIndex MATCH ?
+                        ORDER BY rank
+                        LIMIT ? OFFSET ?
+                    ) page
+                    CROSS JOIN SearchIndex s ON s.rowid = page.rowid
+                    LEFT JOIN Tasks t ON t.id = s.task_id
+                    LEFT JOIN Users u ON u.id = t.assigned_to_id
+                    WHERE SearchIndex MATCH ?
+                    ORDER BY page.rank
+                """, (HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE, HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE,
+                      match_query, limit, offset, match_query))
+                return [dict(row) for row in cursor.fetchall()]
+
+            except Exception as e:
+                print(f"❌ خطا در جستجو: {e}")
+                return None
@@ -1,10 +1,15 @@
 # database/models/task.py
 
-from database.connection import create_connection
+from database.connection import get_connection
+from database.executor import async_methods
+from database.models.daily_stats import DailyStatsModel
+from database.models.task_activity import TaskActivityModel
+from config import PAGE_SIZE
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 
+@async_methods
 class TaskModel:
     """مدل CRUD برای جدول Tasks"""
 
@@ -19,326 +24,585 @@ class TaskModel:
         Returns:
             int: task_id یا None در صورت خطا
         """
-        conn = create_connection()
-        if not conn:
-            return None
-
-        try:
-            cursor = conn.cursor()
-
-            # استخراج فیلدها
-            title = kwargs.get('title')
-            description = kwargs.get('description')
-            assigned_to_id = kwargs.get('assigned_to_id')
-            assigned_by_id = kwargs.get('assigned_by_id')
-            duration = kwargs.get('duration')
-            results = kwargs.get('results')
-            importance = kwargs.get('importance')
-            priority = kwargs.get('priority')
-            category_id = kwargs.get('category_id')
-            status = kwargs.get('status', 'pending')
-            creation_date = kwargs.get('creation_date', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        with get_connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+
+                # استخراج فیلدها
+                title = kwargs.get('title')
+                description = kwargs.get('description')
+                assigned_to_id = kwargs.get('assigned_to_id')
+                assigned_by_id = kwargs.get('assigned_by_id')
+                duration = kwargs.get('duration')
+                results = kwargs.get('results')
+                importance = kwargs.get('importance')
+                priority = kwargs.get('priority')
+                category_id = kwargs.get('category_id')
+                status = kwargs.get('status', 'pending')
+                creation_date = kwargs.get('creation_date', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
+                cursor.execute("""
+                    INSERT INTO Tasks 
+                    (title, description, assigned_to_id, assigned_by_id, duration, results, 
+                     importance, priority, category_id, status, creation_date)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (title, description, assigned_to_id, assigned_by_id, duration, results,
+                      importance, priority, category_id, status, creation_date))
+
+                task_id = cursor.lastrowid
+                conn.commit()
+
+                print(f"✅ کار ایجاد شد - ID: {task_id}, تخصیص به: {assigned_to_id}")
+
+                return task_id
+
+            except Exception as e:
+                print(f"❌ خطا در ایجاد کار: {e}")
+                return None
+
+    @staticmethod
+    def _insert_many(cursor, tasks: List[Dict[str, Any]]) -> Tuple[List[int], int]:
+        """
+        درج کارها و فایل‌های بخش‌هایشان روی cursor تراکنش فراخوان
+
+        Returns:
+            (لیست task_id ها, تعداد فایل‌ها)
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        task_ids = []
+        section_files = []
+        for task in tasks:
             cursor.execute("""
                 INSERT INTO Tasks 
                 (title, description, assigned_to_id, assigned_by_id, duration, results, 
                  importance, priority, category_id, status, creation_date)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (title, description, assigned_to_id, assigned_by_id, duration, results,
-                  importance, priority, category_id, status, creation_date))
-
+            """, (task.get('title'), task.get('description'), task.get('assigned_to_id'),
+                  task.get('assigned_by_id'), task.get('duration'), task.get('results'),
+                  task.get('importance'), task.get('priority'), task.get('category_id'),
+                  task.get('status', 'pending'), task.get('creation_date', now)))
             task_id = cursor.lastrowid
-            conn.commit()
+            task_ids.append(task_id)
 
-            print(f"✅ کار ایجاد شد - ID: {task_id}, تخصیص به: {assigned_to_id}")
+            for section_type in ('description', 'results'):
+                for file_data in task.get(f'{section_type}_files') or []:
+                    section_files.append(
+                        (task_id, section_type, file_data['file_id'], file_data['file_type'])
+                    )
 
-            return task_id
+        cursor.executemany("""
+            INSERT INTO TaskSectionFiles (task_id, section_type, file_id, file_type)
+            VALUES (?, ?, ?, ?)
+        """, section_files)
 
-        except Exception as e:
-            print(f"❌ خطا در ایجاد کار: {e}")
-            return None
-        finally:
-            conn.close()
+        return task_ids, len(section_files)
+
+    @staticmethod
+    def create_many(tasks: List[Dict[str, Any]]) -> Optional[List[int]]:
+        """
+        ایجاد چند کار به همراه فایل‌های بخش‌هایشان در یک تراکنش
+
+        Args:
+            tasks: لیست dict فیلدهای کار (مثل create)؛ کلیدهای اختیاری description_files و
+                   results_files لیست dict با کلیدهای file_id و file_type هستند
+
+        Returns:
+            لیست task_id ها به ترتیب ورودی یا None در صورت خطا (هیچ کاری ثبت نمی‌شود)
+        """
+        if not tasks:
+            return []
+
+        with get_connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                task_ids, files_count = TaskModel._insert_many(cursor, tasks)
+                conn.commit()
+                print(f"✅ {len(task_ids)} کار با {files_count} فایل ایجاد شد")
+                return task_ids
+
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ خطا در ایجاد دسته‌ای کارها: {e}")
+                return None
 
     @staticmethod
     def get_by_id(task_id: int) -> Optional[Dict[str, Any]]:
         """دریافت کار با id"""
-        conn = create_connection()
-        if not conn:
-            return None
+        with get_connection() as conn:
+            if not conn:
+                return None
 
-        try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM Tasks WHERE id = ?", (task_id,))
-            row = cursor.fetchone()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM Tasks WHERE id = ?", (task_id,))
+                row = cursor.fetchone()
 
-            if row:
-                return dict(row)
-            return None
+                if row:
+                    return dict(row)
+                return None
 
-        except Exception as e:
-            print(f"❌ خطا در دریافت کار: {e}")
-            return None
-        finally:
-            conn.close()
+            except Exception as e:
+                print(f"❌ خطا در دریافت کار: {e}")
+                return None
 
     @staticmethod
     def get_with_details(task_id: int) -> Optional[Dict[str, Any]]:
         """دریافت کار با اطلاعات کامل"""
-        conn = create_connection()
-        if not conn:
-            return None
+        with get_connection() as conn:
+            if not conn:
+                return None
 
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT t.*, 
-                       u1.name as assigned_to_name,
-                       u2.name as assigned_by_name,
-                       c.name as category_name
-                FROM Tasks t
-                LEFT JOIN Users u1 ON t.assigned_to_id = u1.id
-                LEFT JOIN Users u2 ON t.assigned_by_id = u2.id
-                LEFT JOIN Categories c ON t.category_id = c.id
-                WHERE t.id = ?
-            """, (task_id,))
-            row = cursor.fetchone()
-
-            if row:
-                return dict(row)
-            return None
-
-        except Exception as e:
-            print(f"❌ خطا در دریافت جزئیات کار: {e}")
-            return None
-        finally:
-            conn.close()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT t.*, 
+                           u1.name as assigned_to_name,
+                           u2.name as assigned_by_name,
+                           c.name as category_name
+                    FROM Tasks t
+                    LEFT JOIN Users u1 ON t.assigned_to_id = u1.id
+                    LEFT JOIN Users u2 ON t.assigned_by_id = u2.id
+                    LEFT JOIN Categories c ON t.category_id = c.id
+                    WHERE t.id = ?
+                """, (task_id,))
+                row = cursor.fetchone()
+
+                if row:
+                    return dict(row)
+                return None
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت جزئیات کار: {e}")
+                return None
 
     @staticmethod
     def get_by_employee(employee_id: int, status: Optional[str] = None) -> List[Dict[str, Any]]:
         """دریافت کارهای یک کارمند"""
-        conn = create_connection()
-        if not conn:
-            return []
+        with get_connection() as conn:
+            if not conn:
+                return []
+
+            try:
+                cursor = conn.cursor()
+
+                if status:
+                    cursor.execute("""
+                        SELECT t.*, c.name as category_name
+                        FROM Tasks t
+                        LEFT JOIN Categories c ON t.category_id = c.id
+                        WHERE t.assigned_to_id = ? AND t.status = ?
+                        ORDER BY t.creation_date DESC
+                    """, (employee_id, status))
+                else:
+                    cursor.execute("""
+                        SELECT t.*, c.name as category_name
+                        FROM Tasks t
+                        LEFT JOIN Categories c ON t.category_id = c.id
+                        WHERE t.assigned_to_id = ?
+                        ORDER BY t.creation_date DESC
+                    """, (employee_id,))
+
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت کارهای کارمند: {e}")
+                return []
 
-        try:
-            cursor = conn.cursor()
+    @staticmethod
+    def get_by_status(status: str) -> List[Dict[str, Any]]:
+        """دریافت کارها با وضعیت خاص"""
+        with get_connection() as conn:
+            if not conn:
+                return []
 
-            if status:
-                cursor.execute("""
-                    SELECT t.*, c.name as category_name
-                    FROM Tasks t
-                    LEFT JOIN Categories c ON t.category_id = c.id
-                    WHERE t.assigned_to_id = ? AND t.status = ?
-                    ORDER BY t.creation_date DESC
-                """, (employee_id, status))
-            else:
+            try:
+                cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT t.*, c.name as category_name
+                    SELECT t.*, u.name as employee_name, c.name as category_name
                     FROM Tasks t
+                    LEFT JOIN Users u ON t.assigned_to_id = u.id
                     LEFT JOIN Categories c ON t.category_id = c.id
-                    WHERE t.assigned_to_id = ?
+                    WHERE t.status = ?
                     ORDER BY t.creation_date DESC
-                """, (employee_id,))
-
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+                """, (status,))
 
-        except Exception as e:
-            print(f"❌ خطا در دریافت کارهای کارمند: {e}")
-            return []
-        finally:
-            conn.close()
-
-    @staticmethod
-    def get_by_status(status: str) -> List[Dict[str, Any]]:
-        """دریافت کارها با وضعیت خاص"""
-        conn = create_connection()
-        if not conn:
-            return []
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
 
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT t.*, u.name as employee_name, c.name as category_name
-                FROM Tasks t
-                LEFT JOIN Users u ON t.assigned_to_id = u.id
-                LEFT JOIN Categories c ON t.category_id = c.id
-                WHERE t.status = ?
-                ORDER BY t.creation_date DESC
-            """, (status,))
-
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-
-        except Exception as e:
-            print(f"❌ خطا در دریافت کارها: {e}")
-            return []
-        finally:
-            conn.close()
+            except Exception as e:
+                print(f"❌ خطا در دریافت کارها: {e}")
+                return []
 
     @staticmethod
     def get_completed_submitted() -> List[Dict[str, Any]]:
         """دریافت کارهای تحویل شده"""
-        conn = create_connection()
-        if not conn:
-            return []
+        with get_connection() as conn:
+            if not conn:
+                return []
 
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT t.*, u.name as employee_name
-                FROM Tasks t
-                LEFT JOIN Users u ON t.assigned_to_id = u.id
-                WHERE t.status = 'completed' AND t.is_submitted = 1 AND t.is_finalized = 0
-                ORDER BY t.completion_date DESC
-            """)
-
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-
-        except Exception as e:
-            print(f"❌ خطا در دریافت کارهای تحویل شده: {e}")
-            return []
-        finally:
-            conn.close()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT t.*, u.name as employee_name
+                    FROM Tasks t
+                    LEFT JOIN Users u ON t.assigned_to_id = u.id
+                    WHERE t.status = 'completed' AND t.is_submitted = 1 AND t.is_finalized = 0
+                    ORDER BY t.completion_date DESC
+                """)
+
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت کارهای تحویل شده: {e}")
+                return []
 
     @staticmethod
     def get_archived() -> List[Dict[str, Any]]:
         """دریافت کارهای آرشیو شده"""
-        conn = create_connection()
-        if not conn:
-            return []
+        with get_connection() as conn:
+            if not conn:
+                return []
 
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT t.*, u.name as employee_name
-                FROM Tasks t
-                LEFT JOIN Users u ON t.assigned_to_id = u.id
-                WHERE t.is_finalized = 1
-                ORDER BY t.completion_date DESC
-            """)
-
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-
-        except Exception as e:
-            print(f"❌ خطا در دریافت کارهای آرشیو: {e}")
-            return []
-        finally:
-            conn.close()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT t.*, u.name as employee_name
+                    FROM Tasks t
+                    LEFT JOIN Users u ON t.assigned_to_id = u.id
+                    WHERE t.is_finalized = 1
+                    ORDER BY t.completion_date DESC
+                """)
+
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت کارهای آرشیو: {e}")
+                return []
+
+    @staticmethod
+    def get_archived_with_latest_score(employee_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        دریافت کارهای آرشیو شده همراه با آخرین امتیاز ادمین در یک کوئری
+
+        Args:
+            employee_id: فقط کارهای این کارمند (اختیاری)
+
+        Returns:
+            لیست کارها با کلیدهای اضافه employee_name و latest_score
+        """
+        with get_connection() as conn:
+            if not conn:
+                return []
+
+            try:
+                cursor = conn.cursor()
+
+                employee_filter = "AND t.assigned_to_id = ?" if employee_id is not None else ""
+                params = (employee_id,) if employee_id is not None else ()
+
+                cursor.execute(f"""
+                    WITH ranked_scores AS (
+                        SELECT task_id, admin_score,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY task_id ORDER BY timestamp DESC, id DESC
+                               ) as rn
+                        FROM AdminReviews
+                        WHERE review_type = 'score' AND admin_score IS NOT NULL
+                    )
+                    SELECT t.*, u.name as employee_name, rs.admin_score as latest_score
+                    FROM Tasks t
+                    LEFT JOIN Users u ON t.assigned_to_id = u.id
+                    LEFT JOIN ranked_scores rs ON rs.task_id = t.id AND rs.rn = 1
+                    WHERE t.is_finalized = 1 {employee_filter}
+                    ORDER BY t.completion_date DESC
+                """, params)
+
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت کارهای آرشیو: {e}")
+                return []
 
     @staticmethod
     def update_status(task_id: int, status: str) -> bool:
         """به‌روزرسانی وضعیت کار"""
-        conn = create_connection()
-        if not conn:
-            return False
-
-        try:
-            cursor = conn.cursor()
-            cursor.execute("UPDATE Tasks SET status = ? WHERE id = ?", (status, task_id))
-            conn.commit()
-            return cursor.rowcount > 0
-
-        except Exception as e:
-            print(f"❌ خطا در به‌روزرسانی وضعیت: {e}")
-            return False
-        finally:
-            conn.close()
+        with get_connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                cursor = conn.cursor()
+                before = DailyStatsModel._completion_key(cursor, task_id)
+                cursor.execute("UPDATE Tasks SET status = ? WHERE id = ?", (status, task_id))
+                updated = cursor.rowcount > 0
+                DailyStatsModel._move_completion(cursor, before, DailyStatsModel._completion_key(cursor, task_id))
+                conn.commit()
+                return updated
+
+            except Exception as e:
+                print(f"❌ خطا در به‌روزرسانی وضعیت: {e}")
+                return False
 
     @staticmethod
     def mark_as_submitted(task_id: int) -> bool:
         """علامت‌گذاری کار به عنوان تحویل شده"""
-        conn = create_connection()
-        if not conn:
-            return False
+        with get_connection() as conn:
+            if not conn:
+                return False
 
-        try:
-            cursor = conn.cursor()
-            completion_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            cursor.execute("""
-                UPDATE Tasks 
-                SET status = 'completed', is_submitted = 1, completion_date = ?
-                WHERE id = ?
-            """, (completion_date, task_id))
-            conn.commit()
-            return cursor.rowcount > 0
-
-        except Exception as e:
-            print(f"❌ خطا در تحویل کار: {e}")
-            return False
-        finally:
-            conn.close()
+            try:
+                cursor = conn.cursor()
+                before = DailyStatsModel._completion_key(cursor, task_id)
+
+                completion_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                cursor.execute("""
+                    UPDATE Tasks 
+                    SET status = 'completed', is_submitted = 1, completion_date = ?
+                    WHERE id = ?
+                """, (completion_date, task_id))
+                if not cursor.rowcount:
+                    return False
+
+                # به‌روزرسانی آمار روزانه (تحویل مجدد از روز قبلی کسر می‌شود)
+                DailyStatsModel._move_completion(cursor, before, DailyStatsModel._completion_key(cursor, task_id))
+
+                conn.commit()
+                return True
+
+            except Exception as e:
+                print(f"❌ خطا در تحویل کار: {e}")
+                return False
 
     @staticmethod
     def mark_as_finalized(task_id: int) -> bool:
         """علامت‌گذاری کار به عنوان خاتمه یافته"""
-        conn = create_connection()
-        if not conn:
-            return False
-
-        try:
-            cursor = conn.cursor()
-            cursor.execute("UPDATE Tasks SET is_finalized = 1 WHERE id = ?", (task_id,))
-            conn.commit()
-            return cursor.rowcount > 0
-
-        except Exception as e:
-            print(f"❌ خطا در خاتمه کار: {e}")
-            return False
-        finally:
-            conn.close()
+        with get_connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("UPDATE Tasks SET is_finalized = 1 WHERE id = ?", (task_id,))
+                conn.commit()
+                return cursor.rowcount > 0
+
+            except Exception as e:
+                print(f"❌ خطا در خاتمه کار: {e}")
+                return False
 
     @staticmethod
     def update(task_id: int, **kwargs) -> bool:
         """به‌روزرسانی فیلدهای کار"""
-        conn = create_connection()
-        if not conn:
-            return False
+        with get_connection() as conn:
+            if not conn:
+                return False
 
-        try:
-            cursor = conn.cursor()
+            try:
+                cursor = conn.cursor()
 
-            fields = []
-            values = []
+                fields = []
+                values = []
 
-            for key, value in kwargs.items():
-                fields.append(f"{key} = ?")
-                values.append(value)
+                for key, value in kwargs.items():
+                    fields.append(f"{key} = ?")
+                    values.append(value)
 
-            if not fields:
-                return False
+                if not fields:
+                    return False
 
-            values.append(task_id)
-            query = f"UPDATE Tasks SET {', '.join(fields)} WHERE id = ?"
+                values.append(task_id)
+                query = f"UPDATE Tasks SET {', '.join(fields)} WHERE id = ?"
 
-            cursor.execute(query, values)
-            conn.commit()
-            return cursor.rowcount > 0
+                before = DailyStatsModel._completion_key(cursor, task_id)
+                cursor.execute(query, values)
+                updated = cursor.rowcount > 0
+                DailyStatsModel._move_completion(cursor, before, DailyStatsModel._completion_key(cursor, task_id))
+                if updated and 'duration' in kwargs:
+                    TaskActivityModel._refresh_due_at(cursor, task_id)
+                conn.commit()
+                return updated
 
-        except Exception as e:
-            print(f"❌ خطا در به‌روزرسانی کار: {e}")
-            return False
-        finally:
-            conn.close()
+            except Exception as e:
+                print(f"❌ خطا در به‌روزرسانی کار: {e}")
+                return False
 
     @staticmethod
     def delete(task_id: int) -> bool:
         """حذف کار"""
-        conn = create_connection()
-        if not conn:
-            return False
-
-        try:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM Tasks WHERE id = ?", (task_id,))
-            conn.commit()
-            return cursor.rowcount > 0
-
-        except Exception as e:
-            print(f"❌ خطا در حذف کار: {e}")
-            return False
-        finally:
-            conn.close()
\ No newline at end of file
+        with get_connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                cursor = conn.cursor()
+                before = DailyStatsModel._completion_key(cursor, task_id)
+                cursor.execute("DELETE FROM Tasks WHERE id = ?", (task_id,))
+                deleted = cursor.rowcount > 0
+                DailyStatsModel._move_completion(cursor, before, None if deleted else before)
+                conn.commit()
+                return deleted
+
+            except Exception as e:
+                print(f"❌ خطا در حذف کار: {e}")
+                return False
+
+    # ==================== Keyset Pagination ====================
+
+    @staticmethod
+    def _fetch_page(cursor, select_sql: str, where_sql: str, params: tuple, sort_expr: str,
+                    page_cursor: Optional[Tuple[str, int]], direction: str, limit: int) -> Dict[str, Any]:
+        """
+        اجرای کوئری صفحه‌بندی keyset (ترتیب نزولی روی sort_expr و t.id)
+
+        Args:
+            cursor: cursor دیتابیس
+            select_sql: بخش SELECT ... FROM ... (باید جدول Tasks با alias t باشد)
+            where_sql: شرط پایه
+            params: پارامترهای شرط پایه
+            sort_expr: عبارت مرتب‌سازی (متنی و بدون NULL)
+            page_cursor: (sort_key, id) آیتم مرز صفحه یا None برای صفحه اول
+            direction: 'n' صفحه بعد از cursor، 'p' صفحه قبل از cursor
+            limit: اندازه صفحه
+
+        Returns:
+            dict با کلیدهای items, has_next, has_prev (هر آیتم کلید sort_key دارد)
+        """
+        base_where, base_params = where_sql, params
+        if page_cursor:
+            op = '<' if direction == 'n' else '>'
+            where_sql += f" AND ({sort_expr}, t.id) {op} (?, ?)"
+            params = params + (page_cursor[0], int(page_cursor[1]))
+
+        order = 'DESC' if direction == 'n' else 'ASC'
+        cursor.execute(f"""
+            {select_sql}
+            WHERE {where_sql}
+            ORDER BY {sort_expr} {order}, t.id {order}
+            LIMIT ?
+        """, params + (limit + 1,))
+
+        items = [dict(row) for row in cursor.fetchall()]
+        if not items and page_cursor:
+            # آیتم‌های صفحه در این فاصله حذف شده‌اند؛ بازگشت به صفحه اول
+            return TaskModel._fetch_page(cursor, select_sql, base_where, base_params,
+                                         sort_expr, None, 'n', limit)
+        has_more = len(items) > limit
+        items = items[:limit]
+
+        if direction == 'p':
+            items.reverse()
+            return {'items': items, 'has_next': True, 'has_prev': has_more}
+        return {'items': items, 'has_next': has_more, 'has_prev': page_cursor is not None}
+
+    @staticmethod
+    def get_active_by_employee_page(employee_id: int, page_cursor: Optional[Tuple[str, int]] = None,
+                                    direction: str = 'n', limit: int = PAGE_SIZE) -> Dict[str, Any]:
+        """صفحه‌ای از کارهای pending و in_progress یک کارمند (مرتب بر اساس status نزولی: pending اول)"""
+        with get_connection() as conn:
+            if not conn:
+                return {'items': [], 'has_next': False, 'has_prev': False}
+
+            try:
+                return TaskModel._fetch_page(
+                    conn.cursor(),
+                    "SELECT t.id, t.title, t.status, t.status as sort_key FROM Tasks t",
+                    "t.assigned_to_id = ? AND t.status IN ('pending', 'in_progress')",
+                    (employee_id,), "t.status", page_cursor, direction, limit
+                )
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت کارهای فعال کارمند: {e}")
+                return {'items': [], 'has_next': False, 'has_prev': False}
+
+    @staticmethod
+    def get_by_employee_page(employee_id: int, page_cursor: Optional[Tuple[str, int]] = None,
+                             direction: str = 'n', limit: int = PAGE_SIZE) -> Dict[str, Any]:
+        """صفحه‌ای از تمام کارهای یک کارمند (جدیدترین اول)"""
+        with get_connection() as conn:
+            if not conn:
+                return {'items': [], 'has_next': False, 'has_prev': False}
+
+            try:
+                return TaskModel._fetch_page(
+                    conn.cursor(),
+                    "SELECT t.id, t.title, COALESCE(t.creation_date, '') as sort_key FROM Tasks t",
+                    "t.assigned_to_id = ?",
+                    (employee_id,), "COALESCE(t.creation_date, '')", page_cursor, direction, limit
+                )
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت کارهای کارمند: {e}")
+                return {'items': [], 'has_next': False, 'has_prev': False}
+
+    @staticmethod
+    def get_completed_submitted_page(page_cursor: Optional[Tuple[str, int]] = None,
+                                     direction: str = 'n', limit: int = PAGE_SIZE) -> Dict[str, Any]:
+        """صفحه‌ای از کارهای تحویل شده (جدیدترین تحویل اول)"""
+        with get_connection() as conn:
+            if not conn:
+                return {'items': [], 'has_next': False, 'has_prev': False}
+
+            try:
+                return TaskModel._fetch_page(
+                    conn.cursor(),
+                    """SELECT t.*, u.name as employee_name, COALESCE(t.completion_date, '') as sort_key
+                       FROM Tasks t
+                       LEFT JOIN Users u ON t.assigned_to_id = u.id""",
+                    "t.status = 'completed' AND t.is_submitted = 1 AND t.is_finalized = 0",
+                    (), "COALESCE(t.completion_date, '')", page_cursor, direction, limit
+                )
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت کارهای تحویل شده: {e}")
+                return {'items': [], 'has_next': False, 'has_prev': False}
+
+    @staticmethod
+    def get_archived_with_latest_score_page(employee_id: Optional[int] = None,
+                                            page_cursor: Optional[Tuple[str, int]] = None,
+                                            direction: str = 'n', limit: int = PAGE_SIZE) -> Dict[str, Any]:
+        """
+        صفحه‌ای از کارهای آرشیو شده همراه با آخرین امتیاز ادمین
+
+        امتیاز با زیرکوئری وابسته (روی ایندکس AdminReviews) فقط برای ردیف‌های
+        همین صفحه محاسبه می‌شود تا هزینه هر صفحه به حجم جدول وابسته نباشد.
+        """
+        with get_connection() as conn:
+            if not conn:
+                return {'items': [], 'has_next': False, 'has_prev': False}
+
+            try:
+                where_sql = "t.is_finalized = 1"
+                params = ()
+                if employee_id is not None:
+                    where_sql += " AND t.assigned_to_id = ?"
+                    params = (employee_id,)
+
+                return TaskModel._fetch_page(
+                    conn.cursor(),
+                    """SELECT t.*, u.name as employee_name,
+                              (SELECT ar.admin_score FROM AdminReviews ar
+                               WHERE ar.task_id = t.id AND ar.review_type = 'score'
+                                     AND ar.admin_score IS NOT NULL
+                               ORDER BY ar.timestamp DESC, ar.id DESC
+                               LIMIT 1) as latest_score,
+                              COALESCE(t.completion_date, '') as sort_key
+                       FROM Tasks t
+                       LEFT JOIN Users u ON t.assigned_to_id = u.id""",
+                    where_sql, params, "COALESCE(t.completion_date, '')", page_cursor, direction, limit
+                )
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت کارهای آرشیو: {e}")
+                return {'items': [], 'has_next': False, 'has_prev': False}
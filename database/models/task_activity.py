@@ -0,0 +1,339 @@
+# database/models/task_activity.py
+
+from database.connection import get_connection
+from database.executor import async_methods
+from database.models.daily_stats import DailyStatsModel
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any
+
+# زمانی که تایمر تازه شروع شده از مدت زمان کار عبور می‌کند
+# (مدت زمان کار منهای زمان تایمرهای بسته قبلی همان کاربر روی همان کار)
+DUE_AT_SQL = """
+    UPDATE TaskActivities
+    SET due_at = (
+        SELECT strftime('%Y-%m-%d %H:%M:%S', ?, '+' || MAX(CAST(t.duration AS INTEGER) - COALESCE((
+            SELECT SUM(CAST((JULIANDAY(p.end_time) - JULIANDAY(p.start_time)) * 24 * 60 AS INTEGER))
+            FROM TaskActivities p
+            WHERE p.user_id = ? AND p.task_id = ? AND p.end_time IS NOT NULL
+        ), 0), 0) || ' minutes')
+        FROM Tasks t
+        WHERE t.id = ? AND CAST(t.duration AS INTEGER) > 0
+    )
+    WHERE id = ?
+"""
+
+
+@async_methods
+class TaskActivityModel:
+    """مدل CRUD برای جدول TaskActivities (تایمر کار)"""
+
+    @staticmethod
+    def get_active_task_id(user_id: int) -> Optional[int]:
+        """دریافت task_id کار فعال (تایمر باز) کاربر"""
+        with get_connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT task_id FROM TaskActivities
+                    WHERE user_id = ? AND end_time IS NULL
+                    LIMIT 1
+                """, (user_id,))
+                result = cursor.fetchone()
+                return result[0] if result else None
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت کار فعال: {e}")
+                return None
+
+    @staticmethod
+    def _refresh_due_at(cursor, task_id: int):
+        """
+        محاسبه دوباره due_at تایمرهای باز یک کار (پس از تغییر مدت زمان کار)
+
+        در همان تراکنش فراخوانی‌کننده اجرا می‌شود؛ تایمری که قبلاً اطلاع‌رسانی شده با مدت زمان
+        جدید دوباره زیر نظر watchdog قرار می‌گیرد.
+        """
+        cursor.execute("""
+            SELECT id, user_id, start_time FROM TaskActivities
+            WHERE task_id = ? AND end_time IS NULL
+        """, (task_id,))
+        for activity_id, user_id, start_time in cursor.fetchall():
+            cursor.execute(DUE_AT_SQL, (start_time, user_id, task_id, task_id, activity_id))
+
+    @staticmethod
+    def start(user_id: int, task_id: int) -> bool:
+        """
+        شروع تایمر کار و تغییر وضعیت کار به in_progress
+
+        Returns:
+            bool: False اگر کاربر از قبل تایمر باز داشته باشد یا خطا رخ دهد
+        """
+        with get_connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT task_id FROM TaskActivities
+                    WHERE user_id = ? AND end_time IS NULL
+                """, (user_id,))
+                if cursor.fetchone():
+                    return False
+
+                start_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                cursor.execute("""
+                    INSERT INTO TaskActivities (user_id, task_id, start_time)
+                    VALUES (?, ?, ?)
+                """, (user_id, task_id, start_time))
+                cursor.execute(DUE_AT_SQL, (start_time, user_id, task_id, task_id, cursor.lastrowid))
+
+                before = DailyStatsModel._completion_key(cursor, task_id)
+                cursor.execute("""
+                    UPDATE Tasks SET status = 'in_progress' WHERE id = ?
+                """, (task_id,))
+                DailyStatsModel._move_completion(cursor, before, None)
+
+                conn.commit()
+                return True
+
+            except Exception as e:
+                print(f"❌ خطا در شروع تایمر: {e}")
+                return False
+
+    @staticmethod
+    def stop(user_id: int) -> bool:
+        """بستن تایمر باز کاربر"""
+        with get_connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT id, start_time FROM TaskActivities
+                    WHERE user_id = ? AND end_time IS NULL
+                """, (user_id,))
+                open_activities = cursor.fetchall()
+                if not open_activities:
+                    return False
+
+                end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                for activity in open_activities:
+                    cursor.execute("""
+                        UPDATE TaskActivities SET end_time = ? WHERE id = ?
+                    """, (end_time, activity['id']))
+                    # به‌روزرسانی آمار روزانه در همان تراکنش
+                    DailyStatsModel._record_activity(cursor, user_id, activity['start_time'], end_time)
+
+                conn.commit()
+                return True
+
+            except Exception as e:
+                print(f"❌ خطا در توقف تایمر: {e}")
+                return False
+
+    @staticmethod
+    def get_spent_minutes(task_id: int, user_id: int) -> int:
+        """مجموع زمان سپری شده کاربر روی یک کار (دقیقه)"""
+        with get_connection() as conn:
+            if not conn:
+                return 0
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT COALESCE(SUM(
+                        CAST((JULIANDAY(COALESCE(end_time, datetime('now'))) - JULIANDAY(start_time)) * 24 * 60 AS INTEGER)
+                    ), 0) as total_minutes
+                    FROM TaskActivities
+                    WHERE task_id = ? AND user_id = ?
+                """, (task_id, user_id))
+                return cursor.fetchone()[0]
+
+            except Exception as e:
+                print(f"❌ خطا در محاسبه زمان سپری شده: {e}")
+                return 0
+
+    @staticmethod
+    def get_user_activities_between(user_id: int, range_start: str, range_end: str) -> List[Dict[str, Any]]:
+        """
+        دریافت فعالیت‌های کاربر که با بازه [range_start, range_end) هم‌پوشانی دارند
+
+        دو شاخه جدا تا هر کدام یک بازه روی ایندکس باشد (بدون DATE()):
+        فعالیت‌هایی که داخل بازه شروع شده‌اند (user_id, start_time) و
+        فعالیت‌هایی که قبل از بازه شروع شده و هنوز باز یا بعد از شروع بازه تمام شده‌اند (user_id, end_time).
+        «+start_time» در شاخه دوم جلوی انتخاب ایندکس start_time را می‌گیرد تا کل تاریخچه قبل از بازه پیمایش نشود.
+
+        Args:
+            user_id: آیدی کاربر
+            range_start: "YYYY-MM-DD HH:MM:SS"
+            range_end: "YYYY-MM-DD HH:MM:SS"
+
+        Returns:
+            لیست dict با کلیدهای id, task_id, start_time, end_time, task_title, task_duration
+        """
+        with get_connection() as conn:
+            if not conn:
+                return []
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT a.id, a.task_id, a.start_time, a.end_time,
+                           t.title AS task_title, t.duration AS task_duration
+                    FROM (
+                        SELECT id, task_id, start_time, end_time
+                        FROM TaskActivities
+                        WHERE user_id = ? AND start_time >= ? AND start_time < ?
+                        UNION ALL
+                        SELECT id, task_id, start_time, end_time
+                        FROM TaskActivities
+                        WHERE user_id = ? AND end_time IS NULL AND +start_time < ?
+                        UNION ALL
+                        SELECT id, task_id, start_time, end_time
+                        FROM TaskActivities
+                        WHERE user_id = ? AND end_time > ? AND +start_time < ?
+                    ) a
+                    LEFT JOIN Tasks t ON t.id = a.task_id
+                    ORDER BY a.start_time
+                """, (user_id, range_start, range_end,
+                      user_id, range_start,
+                      user_id, range_start, range_start))
+                return [dict(row) for row in cursor.fetchall()]
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت فعالیت‌های کاربر: {e}")
+                return []
+
+    @staticmethod
+    def get_open_activities() -> List[Dict[str, Any]]:
+        """
+        دریافت تمام تایمرهای باز به همراه نام کارمند و کار
+
+        Returns:
+            لیست dict با کلیدهای user_id, employee_name, task_id, task_title,
+            start_time, task_duration
+        """
+        with get_connection() as conn:
+            if not conn:
+                return []
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT a.user_id, u.name AS employee_name, a.task_id,
+                           t.title AS task_title, a.start_time, t.duration AS task_duration
+                    FROM TaskActivities a
+                    JOIN Users u ON u.id = a.user_id
+                    LEFT JOIN Tasks t ON t.id = a.task_id
+                    WHERE a.end_time IS NULL
+                    ORDER BY a.start_time
+                """)
+                return [dict(row) for row in cursor.fetchall()]
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت تایمرهای باز: {e}")
+                return []
+
+    @staticmethod
+    def close_expired(now: str, max_minutes: int, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        بستن تایمرهایی که بیش از max_minutes باز مانده‌اند (فراموش شده)
+
+        پایان تایمر start_time + max_minutes ثبت می‌شود تا زمان فراموش شده در مجموع
+        زمان کار حساب نشود. حداکثر limit تایمر (قدیمی‌ترین‌ها) در یک تراکنش بسته می‌شوند
+        و پیمایش روی ایندکس جزئی idx_activities_open انجام می‌شود.
+
+        Args:
+            now: زمان فعلی "YYYY-MM-DD HH:MM:SS"
+            max_minutes: حداکثر طول مجاز یک تایمر (دقیقه)
+            limit: حداکثر تعداد تایمر در هر اجرا
+
+        Returns:
+            لیست dict با کلیدهای id, user_id, telegram_id, employee_name, task_id,
+            task_title, start_time, end_time یا None در صورت خطا
+        """
+        cutoff = (datetime.strptime(now, "%Y-%m-%d %H:%M:%S") - timedelta(minutes=max_minutes)).strftime("%Y-%m-%d %H:%M:%S")
+
+        with get_connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute("""
+                    SELECT a.id, a.user_id, u.telegram_id, u.name AS employee_name,
+                           a.task_id, t.title AS task_title, a.start_time,
+                           strftime('%Y-%m-%d %H:%M:%S', a.start_time, ?) AS end_time
+                    FROM TaskActivities a
+                    LEFT JOIN Users u ON u.id = a.user_id
+                    LEFT JOIN Tasks t ON t.id = a.task_id
+                    WHERE a.end_time IS NULL AND a.start_time <= ?
+                    ORDER BY a.start_time
+                    LIMIT ?
+                """, (f"+{max_minutes} minutes", cutoff, limit))
+                expired = [dict(row) for row in cursor.fetchall()]
+
+                cursor.executemany("""
+                    UPDATE TaskActivities SET end_time = ?, due_at = NULL WHERE id = ?
+                """, [(activity['end_time'], activity['id']) for activity in expired])
+                for activity in expired:
+                    DailyStatsModel._record_activity(
+                        cursor, activity['user_id'], activity['start_time'], activity['end_time']
+                    )
+
+                conn.commit()
+                return expired
+
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ خطا در بستن تایمرهای فراموش شده: {e}")
+                return None
+
+    @staticmethod
+    def claim_overdue(now: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        برداشتن تایمرهای بازی که از مدت زمان کار عبور کرده‌اند (هر تایمر فقط یک بار)
+
+        due_at برداشته شده‌ها NULL می‌شود تا از ایندکس جزئی idx_activities_open_due خارج شوند؛
+        هزینه هر اجرا به تعداد تایمرهای سررسید شده بستگی دارد نه به تعداد تایمرهای باز.
+
+        Returns:
+            لیست dict با کلیدهای id, user_id, telegram_id, employee_name, task_id,
+            task_title, task_duration, start_time یا None در صورت خطا
+        """
+        with get_connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute("""
+                    SELECT a.id, a.user_id, u.telegram_id, u.name AS employee_name,
+                           a.task_id, t.title AS task_title, t.duration AS task_duration, a.start_time
+                    FROM TaskActivities a
+                    LEFT JOIN Users u ON u.id = a.user_id
+                    LEFT JOIN Tasks t ON t.id = a.task_id
+                    WHERE a.end_time IS NULL AND a.due_at IS NOT NULL AND a.due_at <= ?
+                    ORDER BY a.due_at
+                    LIMIT ?
+                """, (now, limit))
+                overdue = [dict(row) for row in cursor.fetchall()]
+
+                cursor.executemany("""
+                    UPDATE TaskActivities SET due_at = NULL WHERE id = ?
+                """, [(activity['id'],) for activity in overdue])
+
+                conn.commit()
+                return overdue
+
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ خطا در دریافت تایمرهای سررسید شده: {e}")
+                return None
@@ -0,0 +1,205 @@
+# database/models/task_template.py
+
+from database.connection import get_connection
+from database.executor import async_methods
+from database.models.task import TaskModel
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+
+TEMPLATE_FIELDS = (
+    'title', 'description', 'results', 'duration', 'importance', 'priority',
+    'category_id', 'assigned_to_id', 'assigned_by_id'
+)
+
+
+@async_methods
+class TaskTemplateModel:
+    """مدل جدول‌های TaskTemplates و TaskTemplateFiles (قالب‌های کار تکرارشونده)"""
+
+    @staticmethod
+    def create_from_task(task_id: int, recurrence: str, time_of_day: str, next_run: str) -> Optional[int]:
+        """
+        ساخت قالب از روی یک کار موجود (فیلدها و فایل‌های بخش‌ها کپی می‌شوند)
+
+        Args:
+            task_id: آیدی کار مبنا
+            recurrence: قاعده تکرار (daily, weekly:N, monthly:N, interval:N)
+            time_of_day: ساعت ایجاد "HH:MM"
+            next_run: اولین زمان ایجاد "YYYY-MM-DD HH:MM:SS"
+
+        Returns:
+            template_id یا None اگر کار وجود نداشته باشد یا خطا رخ دهد
+        """
+        with get_connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                fields = ', '.join(TEMPLATE_FIELDS)
+                cursor.execute(f"""
+                    INSERT INTO TaskTemplates
+                    ({fields}, recurrence, time_of_day, next_run, created_at)
+                    SELECT {fields}, ?, ?, ?, ?
+                    FROM Tasks WHERE id = ?
+                """, (recurrence, time_of_day, next_run,
+                      datetime.now().strftime("%Y-%m-%d %H:%M:%S"), task_id))
+
+                if not cursor.rowcount:
+                    conn.rollback()
+                    return None
+
+                template_id = cursor.lastrowid
+                cursor.execute("""
+                    INSERT INTO TaskTemplateFiles (template_id, section_type, file_id, file_type)
+                    SELECT ?, section_type, file_id, file_type
+                    FROM TaskSectionFiles WHERE task_id = ?
+                    ORDER BY id
+                """, (template_id, task_id))
+
+                conn.commit()
+                return template_id
+
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ خطا در ایجاد قالب کار: {e}")
+                return None
+
+    @staticmethod
+    def get_active_schedule() -> List[Dict[str, Any]]:
+        """
+        دریافت زمان‌بندی قالب‌های فعال (برای ساخت heap)
+
+        Returns:
+            لیست dict با کلیدهای id, recurrence, time_of_day, next_run
+        """
+        with get_connection() as conn:
+            if not conn:
+                return []
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT id, recurrence, time_of_day, next_run
+                    FROM TaskTemplates
+                    WHERE is_active = 1
+                """)
+                return [dict(row) for row in cursor.fetchall()]
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت زمان‌بندی قالب‌ها: {e}")
+                return []
+
+    @staticmethod
+    def get_all() -> List[Dict[str, Any]]:
+        """دریافت قالب‌های فعال با نام کارمند (برای نمایش)"""
+        with get_connection() as conn:
+            if not conn:
+                return []
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT t.id, t.title, t.recurrence, t.time_of_day, t.next_run, t.last_run,
+                           u.name AS employee_name
+                    FROM TaskTemplates t
+                    LEFT JOIN Users u ON u.id = t.assigned_to_id
+                    WHERE t.is_active = 1
+                    ORDER BY t.next_run
+                """)
+                return [dict(row) for row in cursor.fetchall()]
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت قالب‌ها: {e}")
+                return []
+
+    @staticmethod
+    def deactivate(template_id: int) -> bool:
+        """غیرفعال کردن قالب"""
+        with get_connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE TaskTemplates SET is_active = 0 WHERE id = ? AND is_active = 1
+                """, (template_id,))
+                conn.commit()
+                return cursor.rowcount > 0
+
+            except Exception as e:
+                print(f"❌ خطا در غیرفعال کردن قالب: {e}")
+                return False
+
+    @staticmethod
+    def materialize(due: List[Dict[str, Any]]) -> Optional[List[Tuple[int, int]]]:
+        """
+        ایجاد کار از روی قالب‌های سررسید شده و جلو بردن next_run در یک تراکنش
+
+        قالبی که در این فاصله غیرفعال شده یا next_run آن با run_at نمی‌خواند نادیده گرفته
+        می‌شود (جلوگیری از ایجاد تکراری).
+
+        Args:
+            due: لیست dict با کلیدهای id, run_at (next_run فعلی) و next_run (مقدار جدید)
+
+        Returns:
+            لیست (template_id, task_id) یا None در صورت خطا
+        """
+        if not due:
+            return []
+
+        with get_connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+
+                ids = [item['id'] for item in due]
+                placeholders = ', '.join('?' * len(ids))
+                cursor.execute(f"""
+                    SELECT id, next_run, {', '.join(TEMPLATE_FIELDS)}
+                    FROM TaskTemplates
+                    WHERE id IN ({placeholders}) AND is_active = 1
+                """, ids)
+                templates = {row['id']: dict(row) for row in cursor.fetchall()}
+
+                cursor.execute(f"""
+                    SELECT template_id, section_type, file_id, file_type
+                    FROM TaskTemplateFiles
+                    WHERE template_id IN ({placeholders})
+                    ORDER BY id
+                """, ids)
+                files: Dict[int, List[Dict[str, Any]]] = {}
+                for row in cursor.fetchall():
+                    files.setdefault(row['template_id'], []).append(dict(row))
+
+                fired = []
+                tasks = []
+                for item in due:
+                    template = templates.get(item['id'])
+                    if not template or template['next_run'] != item['run_at']:
+                        continue
+
+                    task = {field: template[field] for field in TEMPLATE_FIELDS}
+                    template_files = files.get(item['id'], [])
+                    task['description_files'] = [f for f in template_files if f['section_type'] == 'description']
+                    task['results_files'] = [f for f in template_files if f['section_type'] == 'results']
+                    tasks.append(task)
+                    fired.append(item)
+
+                task_ids, _ = TaskModel._insert_many(cursor, tasks)
+                cursor.executemany("""
+                    UPDATE TaskTemplates SET last_run = ?, next_run = ? WHERE id = ?
+                """, [(item['run_at'], item['next_run'], item['id']) for item in fired])
+
+                conn.commit()
+                return [(item['id'], task_id) for item, task_id in zip(fired, task_ids)]
+
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ خطا در ایجاد کار از قالب‌ها: {e}")
+                return None
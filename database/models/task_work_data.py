@@ -1,121 +1,431 @@
 # database/models/task_work_data.py
 
-from database.connection import create_connection
+from database.connection import get_connection
+from database.executor import async_methods
+from utils.text_fingerprint import content_hash, shingles, jaccard, lsh_band_keys
+from config import DEDUP_SIMILARITY, DEDUP_MAX_CANDIDATES, DEDUP_BATCH_SIZE
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
+# انواع داده‌ای که برای تکرار بررسی می‌شوند (نتایج مخصوص هر کار است)
+DEDUP_DATA_TYPES = ('knowledge', 'suggestion')
 
+
+@async_methods
 class TaskWorkDataModel:
     """مدل CRUD برای جدول TaskWorkData (دانش، پیشنهاد، نتایج کارمند)"""
     
+    @staticmethod
+    def _insert(cursor, entry: Dict[str, Any]) -> int:
+        """
+        درج یک رکورد همراه با content_hash و کلیدهای LSH (داخل تراکنش فراخواننده)
+
+        Returns:
+            data_id
+        """
+        text_content = entry.get('text_content')
+        fingerprinted = entry['data_type'] in DEDUP_DATA_TYPES
+        text_hash = content_hash(text_content) if fingerprinted else None
+
+        cursor.execute("""
+            INSERT INTO TaskWorkData
+            (task_id, user_id, data_type, text_content, file_id, file_type, timestamp,
+             content_hash, file_unique_id, duplicate_of)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (entry['task_id'], entry['user_id'], entry['data_type'], text_content,
+              entry.get('file_id'), entry.get('file_type'), entry['timestamp'],
+              text_hash, entry.get('file_unique_id'), entry.get('duplicate_of')))
+        data_id = cursor.lastrowid
+
+        if fingerprinted and text_content:
+            TaskWorkDataModel._insert_band_keys(cursor, data_id, entry['data_type'], text_content)
+        return data_id
+
+    @staticmethod
+    def _insert_band_keys(cursor, data_id: int, data_type: str, text_content: str):
+        """ثبت کلیدهای باند LSH یک رکورد متنی"""
+        cursor.executemany("""
+            INSERT OR IGNORE INTO WorkDataLSH (band_key, data_id) VALUES (?, ?)
+        """, [(band_key, data_id) for band_key in lsh_band_keys(shingles(text_content), data_type)])
+
     @staticmethod
     def create(task_id: int, user_id: int, data_type: str,
                text_content: Optional[str] = None, file_id: Optional[str] = None,
-               file_type: Optional[str] = None) -> Optional[int]:
+               file_type: Optional[str] = None, file_unique_id: Optional[str] = None,
+               duplicate_of: Optional[int] = None) -> Optional[int]:
         """ایجاد رکورد دانش/پیشنهاد/نتایج"""
-        conn = create_connection()
-        if not conn:
-            return None
+        with get_connection() as conn:
+            if not conn:
+                return None
             
-        try:
-            cursor = conn.cursor()
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            try:
+                cursor = conn.cursor()
+                data_id = TaskWorkDataModel._insert(cursor, {
+                    'task_id': task_id,
+                    'user_id': user_id,
+                    'data_type': data_type,
+                    'text_content': text_content,
+                    'file_id': file_id,
+                    'file_type': file_type,
+                    'file_unique_id': file_unique_id,
+                    'duplicate_of': duplicate_of,
+                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                })
+                conn.commit()
+                return data_id
             
-            cursor.execute("""
-                INSERT INTO TaskWorkData 
-                (task_id, user_id, data_type, text_content, file_id, file_type, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (task_id, user_id, data_type, text_content, file_id, file_type, timestamp))
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ خطا در ایجاد داده کاری: {e}")
+                return None
+    
+    @staticmethod
+    def create_many(entries: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        ایجاد چند رکورد در یک تراکنش
+        
+        Args:
+            entries: لیست dict با کلیدهای task_id, user_id, data_type, text_content,
+                     file_id, file_type, timestamp و اختیاری file_unique_id, duplicate_of
             
-            data_id = cursor.lastrowid
-            conn.commit()
-            return data_id
+        Returns:
+            تعداد رکوردهای ثبت شده یا None در صورت خطا (هیچ رکوردی ثبت نمی‌شود)
+        """
+        if not entries:
+            return 0
+        
+        with get_connection() as conn:
+            if not conn:
+                return None
             
-        except Exception as e:
-            print(f"❌ خطا در ایجاد داده کاری: {e}")
-            return None
-        finally:
-            conn.close()
+            try:
+                cursor = conn.cursor()
+                for entry in entries:
+                    TaskWorkDataModel._insert(cursor, entry)
+                conn.commit()
+                return len(entries)
+            
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ خطا در ایجاد دسته‌ای داده‌های کاری: {e}")
+                return None
     
+    @staticmethod
+    def _find_match(cursor, data_type: str, text_content: Optional[str] = None,
+                    file_unique_id: Optional[str] = None, text_hash: Optional[str] = None,
+                    before_id: Optional[int] = None) -> Optional[tuple]:
+        """
+        پیدا کردن ورودی اصلی تکراری/مشابه با جستجوی ایندکس (بدون پیمایش جدول)
+
+        ترتیب: شناسه یکتای فایل، content_hash، سپس نامزدهای LSH که با Jaccard دقیق بررسی می‌شوند.
+
+        Args:
+            before_id: فقط رکوردهای قدیمی‌تر از این آیدی (برای job حذف تکرار)
+
+        Returns:
+            (آیدی ورودی اصلی, شباهت) یا None
+        """
+        bound = " AND id < ?" if before_id else ""
+        bound_args = (before_id,) if before_id else ()
+
+        if file_unique_id:
+            cursor.execute(f"""
+                SELECT id, duplicate_of FROM TaskWorkData
+                WHERE data_type = ? AND file_unique_id = ?{bound}
+                ORDER BY id LIMIT 1
+            """, (data_type, file_unique_id) + bound_args)
+            row = cursor.fetchone()
+            return (row['duplicate_of'] or row['id'], 1.0) if row else None
+
+        if not text_content:
+            return None
+
+        text_hash = text_hash or content_hash(text_content)
+        if text_hash:
+            cursor.execute(f"""
+                SELECT id, duplicate_of FROM TaskWorkData
+                WHERE data_type = ? AND content_hash = ?{bound}
+                ORDER BY id LIMIT 1
+            """, (data_type, text_hash) + bound_args)
+            row = cursor.fetchone()
+            if row:
+                return row['duplicate_of'] or row['id'], 1.0
+
+        shingle_set = shingles(text_content)
+        band_keys = lsh_band_keys(shingle_set, data_type)
+        if not band_keys:
+            return None
+
+        placeholders = ', '.join('?' * len(band_keys))
+        cursor.execute(f"""
+            SELECT l.data_id, COUNT(*) AS shared_bands, w.text_content, w.duplicate_of
+            FROM WorkDataLSH l
+            JOIN TaskWorkData w ON w.id = l.data_id
+            WHERE l.band_key IN ({placeholders}){" AND l.data_id < ?" if before_id else ""}
+            GROUP BY l.data_id
+            ORDER BY shared_bands DESC, l.data_id
+            LIMIT ?
+        """, tuple(band_keys) + bound_args + (DEDUP_MAX_CANDIDATES,))
+
+        best = None
+        for row in cursor.fetchall():
+            similarity = jaccard(shingle_set, shingles(row['text_content'] or ''))
+            if similarity >= DEDUP_SIMILARITY and (best is None or similarity > best[1]):
+                best = (row['duplicate_of'] or row['data_id'], similarity)
+        return best
+
+    @staticmethod
+    def find_duplicate(data_type: str, text_content: Optional[str] = None,
+                       file_unique_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        پیدا کردن ورودی ثبت شده قبلی که با این ورودی یکسان یا بسیار مشابه است
+
+        Args:
+            data_type: نوع داده (فقط DEDUP_DATA_TYPES بررسی می‌شوند)
+            text_content: متن
+            file_unique_id: شناسه یکتای فایل تلگرام
+
+        Returns:
+            dict با کلیدهای id, task_id, task_title, similarity یا None
+        """
+        if data_type not in DEDUP_DATA_TYPES:
+            return None
+
+        with get_connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+                match = TaskWorkDataModel._find_match(cursor, data_type, text_content, file_unique_id)
+                if not match:
+                    return None
+
+                cursor.execute("""
+                    SELECT w.id, w.task_id, t.title AS task_title
+                    FROM TaskWorkData w
+                    LEFT JOIN Tasks t ON t.id = w.task_id
+                    WHERE w.id = ?
+                """, (match[0],))
+                row = cursor.fetchone()
+                return {**dict(row), 'similarity': match[1]} if row else None
+
+            except Exception as e:
+                print(f"❌ خطا در بررسی تکراری بودن داده کاری: {e}")
+                return None
+
+    @staticmethod
+    def deduplicate(purge: bool = False) -> Optional[Dict[str, int]]:
+        """
+        job حذف تکرار روی داده‌های موجود (دسته‌های DEDUP_BATCH_SIZE تایی، commit بعد از هر دسته)
+
+        1. اثر انگشت رکوردهای متنی قدیمی که content_hash ندارند
+        2. علامت‌گذاری duplicate_of برای رکوردهایی که نسخه قدیمی‌تر یکسان یا مشابه دارند
+        3. (purge) حذف تکرارهای دقیق همان کارمند در همان کار (ارسال دوباره یک پیام)
+
+        Returns:
+            dict با کلیدهای fingerprinted, exact, near, purged یا None در صورت خطا
+        """
+        stats = {'fingerprinted': 0, 'exact': 0, 'near': 0, 'purged': 0}
+        type_placeholders = ', '.join('?' * len(DEDUP_DATA_TYPES))
+
+        with get_connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.cursor()
+
+                last_id = 0
+                while True:
+                    cursor.execute(f"""
+                        SELECT id, data_type, text_content FROM TaskWorkData
+                        WHERE id > ? AND content_hash IS NULL AND text_content IS NOT NULL
+                          AND data_type IN ({type_placeholders})
+                        ORDER BY id LIMIT ?
+                    """, (last_id, *DEDUP_DATA_TYPES, DEDUP_BATCH_SIZE))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+
+                    for row in rows:
+                        text_hash = content_hash(row['text_content'])
+                        if not text_hash:
+                            continue
+                        cursor.execute("""
+                            UPDATE TaskWorkData SET content_hash = ? WHERE id = ?
+                        """, (text_hash, row['id']))
+                        TaskWorkDataModel._insert_band_keys(cursor, row['id'], row['data_type'], row['text_content'])
+                        stats['fingerprinted'] += 1
+                    conn.commit()
+                    last_id = rows[-1]['id']
+
+                last_id = 0
+                while True:
+                    cursor.execute(f"""
+                        SELECT id, data_type, text_content, content_hash, file_unique_id FROM TaskWorkData
+                        WHERE id > ? AND duplicate_of IS NULL AND data_type IN ({type_placeholders})
+                          AND (content_hash IS NOT NULL OR file_unique_id IS NOT NULL)
+                        ORDER BY id LIMIT ?
+                    """, (last_id, *DEDUP_DATA_TYPES, DEDUP_BATCH_SIZE))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+
+                    for row in rows:
+                        match = TaskWorkDataModel._find_match(
+                            cursor, row['data_type'], row['text_content'], row['file_unique_id'],
+                            row['content_hash'], before_id=row['id']
+                        )
+                        if not match:
+                            continue
+                        cursor.execute("""
+                            UPDATE TaskWorkData SET duplicate_of = ? WHERE id = ?
+                        """, (match[0], row['id']))
+                        stats['exact' if match[1] >= 1.0 else 'near'] += 1
+                    conn.commit()
+                    last_id = rows[-1]['id']
+
+                if purge:
+                    cursor.execute("""
+                        DELETE FROM TaskWorkData WHERE id IN (
+                            SELECT d.id FROM TaskWorkData d
+                            JOIN TaskWorkData c ON c.id = d.duplicate_of
+                            WHERE d.task_id = c.task_id AND d.user_id = c.user_id
+                              AND d.data_type = c.data_type
+                              AND (d.content_hash = c.content_hash OR d.file_unique_id = c.file_unique_id)
+                        )
+                    """)
+                    stats['purged'] = cursor.rowcount
+                    conn.commit()
+
+                return stats
+
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ خطا در حذف تکرار داده‌های کاری: {e}")
+                return None
+
     @staticmethod
     def get_by_task(task_id: int, data_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """دریافت داده‌های کاری یک task"""
-        conn = create_connection()
-        if not conn:
-            return []
+        with get_connection() as conn:
+            if not conn:
+                return []
             
-        try:
-            cursor = conn.cursor()
+            try:
+                cursor = conn.cursor()
             
-            if data_type:
-                cursor.execute("""
-                    SELECT * FROM TaskWorkData 
-                    WHERE task_id = ? AND data_type = ?
-                    ORDER BY timestamp ASC
-                """, (task_id, data_type))
-            else:
-                cursor.execute("""
-                    SELECT * FROM TaskWorkData 
-                    WHERE task_id = ?
-                    ORDER BY timestamp ASC
-                """, (task_id,))
-            
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-            
-        except Exception as e:
-            print(f"❌ خطا در دریافت داده‌های کاری: {e}")
-            return []
-        finally:
-            conn.close()
+                if data_type:
+                    cursor.execute("""
+                        SELECT * FROM TaskWorkData 
+                        WHERE task_id = ? AND data_type = ?
+                        ORDER BY timestamp ASC
+                    """, (task_id, data_type))
+                else:
+                    cursor.execute("""
+                        SELECT * FROM TaskWorkData 
+                        WHERE task_id = ?
+                        ORDER BY timestamp ASC
+                    """, (task_id,))
+            
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+            
+            except Exception as e:
+                print(f"❌ خطا در دریافت داده‌های کاری: {e}")
+                return []
     
     @staticmethod
     def get_by_task_and_user(task_id: int, user_id: int, data_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """دریافت داده‌های کاری یک کارمند در یک task"""
-        conn = create_connection()
-        if not conn:
-            return []
+        with get_connection() as conn:
+            if not conn:
+                return []
             
-        try:
-            cursor = conn.cursor()
+            try:
+                cursor = conn.cursor()
             
-            if data_type:
-                cursor.execute("""
-                    SELECT * FROM TaskWorkData 
-                    WHERE task_id = ? AND user_id = ? AND data_type = ?
-                    ORDER BY timestamp ASC
-                """, (task_id, user_id, data_type))
-            else:
+                if data_type:
+                    cursor.execute("""
+                        SELECT * FROM TaskWorkData 
+                        WHERE task_id = ? AND user_id = ? AND data_type = ?
+                        ORDER BY timestamp ASC
+                    """, (task_id, user_id, data_type))
+                else:
+                    cursor.execute("""
+                        SELECT * FROM TaskWorkData 
+                        WHERE task_id = ? AND user_id = ?
+                        ORDER BY timestamp ASC
+                    """, (task_id, user_id))
+            
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+            
+            except Exception as e:
+                print(f"❌ خطا در دریافت داده‌های کاری: {e}")
+                return []
+    
+    @staticmethod
+    def get_panel_summary(task_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        خلاصه پنل کار در یک کوئری: عنوان و مدت کار، تعداد داده‌های ثبت شده
+        به تفکیک نوع، زمان سپری شده (دقیقه) و وجود امتیاز خود
+
+        Returns:
+            dict یا None اگر کار وجود نداشته باشد
+        """
+        with get_connection() as conn:
+            if not conn:
+                return None
+            
+            try:
+                cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT * FROM TaskWorkData 
-                    WHERE task_id = ? AND user_id = ?
-                    ORDER BY timestamp ASC
-                """, (task_id, user_id))
-            
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-            
-        except Exception as e:
-            print(f"❌ خطا در دریافت داده‌های کاری: {e}")
-            return []
-        finally:
-            conn.close()
+                    SELECT t.title, t.duration,
+                           COALESCE(w.knowledge_count, 0) as knowledge_count,
+                           COALESCE(w.suggestion_count, 0) as suggestion_count,
+                           COALESCE(w.results_count, 0) as results_count,
+                           (SELECT COALESCE(SUM(
+                                CAST((JULIANDAY(COALESCE(a.end_time, datetime('now'))) - JULIANDAY(a.start_time)) * 24 * 60 AS INTEGER)
+                            ), 0)
+                            FROM TaskActivities a
+                            WHERE a.task_id = t.id AND a.user_id = ?) as spent_minutes,
+                           EXISTS (SELECT 1 FROM TaskScores s
+                                   WHERE s.task_id = t.id AND s.user_id = ?) as has_self_score
+                    FROM Tasks t
+                    LEFT JOIN (
+                        SELECT SUM(data_type = 'knowledge') as knowledge_count,
+                               SUM(data_type = 'suggestion') as suggestion_count,
+                               SUM(data_type = 'results') as results_count
+                        FROM TaskWorkData
+                        WHERE task_id = ? AND user_id = ?
+                    ) w ON 1 = 1
+                    WHERE t.id = ?
+                """, (user_id, user_id, task_id, user_id, task_id))
+            
+                row = cursor.fetchone()
+                if row:
+                    return dict(row)
+                return None
+            
+            except Exception as e:
+                print(f"❌ خطا در دریافت خلاصه پنل کار: {e}")
+                return None
     
     @staticmethod
     def delete_by_task(task_id: int) -> bool:
         """حذف تمام داده‌های کاری یک task"""
-        conn = create_connection()
-        if not conn:
-            return False
-            
-        try:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM TaskWorkData WHERE task_id = ?", (task_id,))
-            conn.commit()
-            return True
-            
-        except Exception as e:
-            print(f"❌ خطا در حذف داده‌های کاری: {e}")
-            return False
-        finally:
-            conn.close()
+        with get_connection() as conn:
+            if not conn:
+                return False
+            
+            try:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM TaskWorkData WHERE task_id = ?", (task_id,))
+                conn.commit()
+                return True
+            
+            except Exception as e:
+                print(f"❌ خطا در حذف داده‌های کاری: {e}")
+                return False
@@ -13,7 +13,7 @@ async def show_categories_menu(update: Update, context: ContextTypes.DEFAULT_TYP
     query = update.callback_query
     await query.answer()
 
-    categories = CategoryModel.get_all()
+    categories = await CategoryModel.aget_all()
 
     keyboard = []
     for cat in categories:
@@ -47,13 +47,13 @@ async def save_new_category(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return GET_CATEGORY_NAME
 
     # بررسی وجود دسته‌بندی
-    existing = CategoryModel.get_by_name(category_name)
+    existing = await CategoryModel.aget_by_name(category_name)
     if existing:
         await update.message.reply_text("❌ این دسته‌بندی قبلاً وجود دارد.")
         return GET_CATEGORY_NAME
 
     # ایجاد دسته‌بندی جدید
-    category_id = CategoryModel.create(category_name)
+    category_id = await CategoryModel.acreate(category_name)
 
     if category_id:
         await update.message.reply_text(f"✅ دسته‌بندی '{category_name}' با موفقیت ایجاد شد.")
@@ -66,7 +66,7 @@ async def save_new_category(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def show_categories_menu_direct(update, context):
     """نمایش مستقیم منوی دسته‌بندی‌ها"""
-    categories = CategoryModel.get_all()
+    categories = await CategoryModel.aget_all()
 
     keyboard = []
     for cat in categories:
@@ -101,5 +101,7 @@ category_conv_handler = ConversationHandler(
     per_message=False,
     per_chat=True,
     per_user=True,
-    allow_reentry=True
+    allow_reentry=True,
+    name="category_conv_handler",
+    persistent=True
 )
\ No newline at end of file
@@ -2,8 +2,8 @@
 
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
+from config import ADMIN_ID
 from services.user_service import UserService
-from services.task_service import TaskService
 from services.file_service import FileService
 from services.work_service import WorkService
 from services.review_service import ReviewService
@@ -15,8 +15,11 @@ async def show_daily_report_menu(update: Update, context: ContextTypes.DEFAULT_T
     query = update.callback_query
     await query.answer()
 
-    # Rule 3: get_all_employees() -> UserService.get_all_employees() (No change)
-    employees = UserService.get_all_employees()
+    # تاریخ امروز
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    # کارمندان به همراه آمار امروز از جدول تجمیعی (یک کوئری)
+    employees = await WorkService.aget_daily_overview(today)
 
     if not employees:
         await query.edit_message_text(
@@ -28,28 +31,11 @@ async def show_daily_report_menu(update: Update, context: ContextTypes.DEFAULT_T
         return
 
     keyboard = []
-
-    # تاریخ امروز
-    today = datetime.now().strftime("%Y-%m-%d")
-
-    try:
-        # Note: employees is likely a list of tuples (emp_id, telegram_id, name)
-        for emp_id, telegram_id, name in employees:
-            try:
-                # Refactored: Use TaskService (Rule 4: SELECT COUNT(*) FROM Tasks -> TaskService مناسب)
-                daily_completed = TaskService.count_daily_completed_tasks(emp_id, today)
-
-                button_text = f"👤 {name} ({daily_completed} کار)"
-                keyboard.append([
-                    InlineKeyboardButton(button_text, callback_data=f"daily_report_{telegram_id}")
-                ])
-
-            except Exception as e:
-                print(f"❌ خطا در دریافت گزارش {name}: {e}")
-                continue
-
-    except Exception as e:
-        print(f"❌ خطای کلی در دریافت گزارش: {e}")
+    for employee in employees:
+        button_text = f"👤 {employee['name']} ({employee['completed_count']} کار)"
+        keyboard.append([
+            InlineKeyboardButton(button_text, callback_data=f"daily_report_{employee['telegram_id']}")
+        ])
 
     # دکمه کارهای جاری
     keyboard.append([
@@ -73,12 +59,12 @@ async def show_employee_daily_report(update: Update, context: ContextTypes.DEFAU
     query = update.callback_query
     await query.answer()
 
-    telegram_id = int(query.data.split('_')[2])
+    telegram_id = context.route_args['telegram_id']
     today = datetime.now().strftime("%Y-%m-%d")
 
     try:
         # Refactored: Use UserService (Rule 4: SELECT * FROM Users -> UserService.get_user_info())
-        employee_data = UserService.get_user_info(telegram_id)
+        employee_data = await UserService.aget_user_info(telegram_id)
 
         if not employee_data:
             await query.edit_message_text("❌ کارمند یافت نشد!")
@@ -88,11 +74,12 @@ async def show_employee_daily_report(update: Update, context: ContextTypes.DEFAU
         employee_name = employee_data.get('name')
         user_id = employee_data.get('id')
 
-        # Refactored: Use WorkService (Rule 4)
-        activities = WorkService.get_user_daily_activities(user_id, today)
+        # فعالیت‌های امروز (جلسه‌های عبوری از نیمه‌شب به بخش امروز بریده می‌شوند)
+        activities = await WorkService.aget_user_daily_activities(user_id, today)
 
-        # Refactored: Use TaskService (Rule 4: SELECT COUNT(*) FROM Tasks -> TaskService مناسب)
-        completed_count = TaskService.count_daily_completed_tasks(user_id, today)
+        # آمار تجمیعی امروز (تعداد تحویل و دقیقه‌های فعالیت‌های بسته شده)
+        daily_stats = await WorkService.aget_daily_stats(user_id, today)
+        completed_count = daily_stats['completed_count']
 
     except Exception as e:
         print(f"❌ خطا در دریافت گزارش: {e}")
@@ -122,40 +109,30 @@ async def show_employee_daily_report(update: Update, context: ContextTypes.DEFAU
         f"⏱ **جدول زمانی کار:**\n"
         f"{'─' * 35}\n"
     )
-    total_minutes = 0
-    for start_time, end_time, task_title, task_duration in activities:
-        try:
-            # تبدیل به datetime
-            start_dt = datetime.strptime(start_time, "%Y-%m-%d %H:%M:%S")
-            if end_time:
-                end_dt = datetime.strptime(end_time, "%Y-%m-%d %H:%M:%S")
-                duration = end_dt - start_dt
-                minutes = int(duration.total_seconds() / 60)
-                total_minutes += minutes
-                # ✅ محاسبه زمان کار تمام شده
-                text += (
-                    f"✅ {task_title}\n"
-                    f"🕐 شروع: {start_dt.strftime('%H:%M')} | پایان: {end_dt.strftime('%H:%M')}\n"
-                    f"⏱ مدت: {minutes} دقیقه\n"
-                    f"{'─' * 35}\n"
-                )
-            else:
-                # 🔄 کار در حال انجام
-                now = datetime.now()
-                elapsed = now - start_dt
-                elapsed_minutes = int(elapsed.total_seconds() / 60)
-                elapsed_hours = elapsed_minutes // 60
-                elapsed_mins = elapsed_minutes % 60
-                total_minutes += elapsed_minutes  # اضافه کردن به کل زمان امروز
-                text += (
-                    f"🔄 {task_title} (در حال انجام)\n"
-                    f"🕐 شروع: {start_dt.strftime('%H:%M')}\n"
-                    f"⏱ مدت تا کنون: {elapsed_hours}:{elapsed_mins:02d} ({elapsed_minutes} دقیقه)\n"
-                    f"{'─' * 35}\n"
-                )
-        except Exception as e:
-            print(f"خطا در محاسبه زمان: {e}")
-            text += f"⚠️ خطا در محاسبه زمان برای کار {task_title}\n"
+    # جمع کل: دقیقه‌های بسته شده از جدول تجمیعی + بخش امروزِ تایمر باز
+    total_minutes = daily_stats['worked_minutes']
+    for activity in activities:
+        task_title = activity['task_title']
+        start_dt = activity['segment_start']
+        minutes = activity['minutes']
+
+        if not activity['is_open']:
+            # ✅ کار تمام شده
+            text += (
+                f"✅ {task_title}\n"
+                f"🕐 شروع: {start_dt.strftime('%H:%M')} | پایان: {activity['segment_end'].strftime('%H:%M')}\n"
+                f"⏱ مدت: {minutes} دقیقه\n"
+                f"{'─' * 35}\n"
+            )
+        else:
+            # 🔄 کار در حال انجام
+            total_minutes += minutes
+            text += (
+                f"🔄 {task_title} (در حال انجام)\n"
+                f"🕐 شروع: {start_dt.strftime('%H:%M')}\n"
+                f"⏱ مدت تا کنون: {minutes // 60}:{minutes % 60:02d} ({minutes} دقیقه)\n"
+                f"{'─' * 35}\n"
+            )
 
     # جمع بندی
     total_hours = total_minutes // 60
@@ -176,8 +153,7 @@ async def show_current_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE)
     await query.answer()
 
     try:
-        # Refactored: Use WorkService (Rule 4)
-        current_tasks = WorkService.get_current_in_progress_tasks()
+        current_tasks = await WorkService.aget_current_in_progress_tasks()
 
     except Exception as e:
         print(f"❌ خطا در دریافت اطلاعات: {e}")
@@ -202,7 +178,11 @@ async def show_current_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE)
         f"📅 {datetime.now().strftime('%Y/%m/%d - %H:%M')}\n\n"
     )
 
-    for employee_name, task_title, start_time, task_duration in current_tasks:
+    for current_task in current_tasks:
+        employee_name = current_task['employee_name']
+        task_title = current_task['task_title']
+        start_time = current_task['start_time']
+        task_duration = current_task['task_duration']
         try:
             # محاسبه مدت زمان کار
             start_dt = datetime.strptime(start_time, "%Y-%m-%d %H:%M:%S")
@@ -233,4 +213,33 @@ async def show_current_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE)
         text,
         reply_markup=InlineKeyboardMarkup(keyboard),
         parse_mode='Markdown'
-    )
\ No newline at end of file
+    )
+
+
+async def backfill_daily_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    دستور /backfill_daily_stats [YYYY-MM-DD] - بازسازی جدول تجمیعی آمار روزانه
+    (بدون تاریخ: کل جدول)
+    """
+    if update.effective_user.id != ADMIN_ID:
+        await update.message.reply_text("❌ شما دسترسی به این بخش را ندارید.")
+        return
+
+    from_date = context.args[0] if context.args else None
+    if from_date:
+        try:
+            datetime.strptime(from_date, "%Y-%m-%d")
+        except ValueError:
+            await update.message.reply_text("❌ فرمت تاریخ باید YYYY-MM-DD باشد.")
+            return
+
+    processed = await WorkService.arebuild_daily_stats(from_date)
+    if processed is None:
+        await update.message.reply_text("❌ خطا در بازسازی آمار روزانه!")
+        return
+
+    await update.message.reply_text(
+        f"✅ آمار روزانه بازسازی شد.\n"
+        f"📅 از تاریخ: {from_date or 'ابتدا'}\n"
+        f"⏱ فعالیت‌های پردازش شده: {processed}"
+    )
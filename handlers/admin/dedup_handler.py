@@ -0,0 +1,36 @@
+# handlers/admin/dedup_handler.py
+
+from telegram import Update
+from telegram.ext import ContextTypes
+from config import ADMIN_ID
+from services.work_service import WorkService
+
+
+async def dedup_work_data(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    دستور /dedup_work_data [purge] - علامت‌گذاری دانش/پیشنهادهای تکراری موجود
+    (با purge تکرارهای دقیق همان کارمند در همان کار حذف می‌شوند)
+    """
+    if update.effective_user.id != ADMIN_ID:
+        await update.message.reply_text("❌ شما دسترسی به این بخش را ندارید.")
+        return
+
+    purge = bool(context.args) and context.args[0].lower() == 'purge'
+    await update.message.reply_text("⏳ در حال بررسی تکرار داده‌های کاری...")
+
+    stats = await WorkService.adeduplicate_work_data(purge)
+    if stats is None:
+        await update.message.reply_text("❌ خطا در بررسی تکرار داده‌ها!")
+        return
+
+    text = (
+        "✅ بررسی تکرار انجام شد.\n\n"
+        f"🔖 اثر انگشت ورودی‌های قدیمی: {stats['fingerprinted']}\n"
+        f"♻️ تکرار دقیق: {stats['exact']}\n"
+        f"🔍 تقریباً تکراری: {stats['near']}\n"
+    )
+    if purge:
+        text += f"🗑 حذف شده: {stats['purged']}\n"
+    else:
+        text += "\nبرای حذف تکرارهای دقیق یک کارمند در همان کار: /dedup_work_data purge"
+    await update.message.reply_text(text)
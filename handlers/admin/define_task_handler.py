@@ -10,6 +10,7 @@ from services.task_service import TaskService
 from services.user_service import UserService
 from services.file_service import FileService
 from utils.keyboards import get_back_to_menu_keyboard
+from utils.callback_router import route_handler
 from config import ADMIN_ID
 
 # States
@@ -296,7 +297,7 @@ async def get_priority(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     context.user_data['priority'] = int(priority)
 
-    categories = TaskService.get_categories()
+    categories = await TaskService.aget_categories()
 
     if not categories:
         await update.message.reply_text("❌ دسته‌بندی موجود نیست. لطفاً ابتدا دسته‌بندی ایجاد کنید.")
@@ -323,7 +324,7 @@ async def skip_priority(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    categories = TaskService.get_categories()
+    categories = await TaskService.aget_categories()
 
     if not categories:
         await query.edit_message_text("❌ دسته‌بندی موجود نیست.")
@@ -349,10 +350,10 @@ async def get_category(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    category_id = int(query.data.split('_')[1])
+    category_id = context.route_args['category_id']
     context.user_data['category_id'] = category_id
 
-    employees = UserService.get_all_employees()
+    employees = await UserService.aget_all_employees()
 
     if not employees:
         await query.edit_message_text("❌ هیچ کارمندی موجود نیست.")
@@ -377,7 +378,7 @@ async def skip_category(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    employees = UserService.get_all_employees()
+    employees = await UserService.aget_all_employees()
 
     if not employees:
         await query.edit_message_text("❌ هیچ کارمندی موجود نیست.")
@@ -402,7 +403,7 @@ async def assign_employee(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    employee_id = int(query.data.split('_')[1])
+    employee_id = context.route_args['employee_id']
 
     # ایجاد کار
     task_data = {
@@ -414,36 +415,20 @@ async def assign_employee(update: Update, context: ContextTypes.DEFAULT_TYPE):
         'priority': context.user_data.get('priority'),
         'category_id': context.user_data.get('category_id'),
         'assigned_to_id': employee_id,
-        'assigned_by_id': ADMIN_ID
+        'assigned_by_id': ADMIN_ID,
+        'description_files': context.user_data.get('description_files', []),
+        'results_files': context.user_data.get('results_files', [])
     }
 
-    task_id = TaskService.create_task(task_data)
+    # کار و فایل‌های توضیحات/نتایج در یک تراکنش ذخیره می‌شوند
+    task_ids = await TaskService.acreate_tasks_bulk([task_data])
+    task_id = task_ids[0] if task_ids else None
 
     if task_id:
-        # ✅ ذخیره فایل‌های توضیحات
-        for file_data in context.user_data.get('description_files', []):
-            result = FileService.add_section_file(
-                task_id,
-                'description',
-                file_data['file_id'],
-                file_data['file_type']
-            )
-            print(f"✅ فایل توضیحات ذخیره شد: {result}")
-
-        # ✅ ذخیره فایل‌های نتایج
-        for file_data in context.user_data.get('results_files', []):
-            result = FileService.add_section_file(
-                task_id,
-                'results',
-                file_data['file_id'],
-                file_data['file_type']
-            )
-            print(f"✅ فایل نتایج ذخیره شد: {result}")
-
         await query.edit_message_text(
             f"✅ **کار با موفقیت ایجاد شد!**\n\n"
             f"📋 عنوان: {task_data['title']}\n"
-            f"👤 تخصیص به: {UserService.get_user_by_id(employee_id).get('name')}",
+            f"👤 تخصیص به: {(await UserService.aget_user_by_id(employee_id)).get('name')}",
             reply_markup=get_back_to_menu_keyboard(),
             parse_mode='Markdown'
         )
@@ -506,11 +491,11 @@ task_creation_conv_handler = ConversationHandler(
             CallbackQueryHandler(skip_priority, pattern='^skip_priority$')
         ],
         CATEGORY: [
-            CallbackQueryHandler(get_category, pattern='^cat_'),
+            route_handler("cat_{category_id:int}", get_category),
             CallbackQueryHandler(skip_category, pattern='^skip_category$')
         ],
         ASSIGN_EMPLOYEE: [
-            CallbackQueryHandler(assign_employee, pattern='^emp_')
+            route_handler("emp_{employee_id:int}", assign_employee)
         ]
     },
     fallbacks=[
@@ -520,5 +505,7 @@ task_creation_conv_handler = ConversationHandler(
     per_message=False,
     per_chat=True,
     per_user=True,
-    allow_reentry=True
+    allow_reentry=True,
+    name="task_creation_conv_handler",
+    persistent=True
 )
\ No newline at end of file
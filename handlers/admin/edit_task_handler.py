@@ -9,6 +9,8 @@ from services.task_service import TaskService
 from services.file_service import FileService
 from services.work_service import WorkService
 from services.review_service import ReviewService
+from utils.keyboards import parse_page_cursor, get_pagination_row
+from utils.callback_router import route_handler
 import datetime
 
 # وضعیت‌های مکالمه
@@ -56,27 +58,26 @@ async def select_user_for_editing(update: Update, context: ContextTypes.DEFAULT_
     query = update.callback_query
     await query.answer()
 
-    user_telegram_id = int(query.data.split('_')[2])
+    user_telegram_id = context.route_args['telegram_id']
     context.user_data['selected_user_telegram_id'] = user_telegram_id
 
-    # دریافت کارهای این کاربر
-    conn = create_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT id FROM Users WHERE telegram_id = ?", (user_telegram_id,))
-    user_db_id = cursor.fetchone()[0]
-
-    cursor.execute("SELECT id, title FROM Tasks WHERE assigned_to_id = ?", (user_db_id,))
-    tasks = cursor.fetchall()
-    conn.close()
+    # دریافت کارهای این کاربر (صفحه‌بندی شده)
+    user = await UserService.aget_user_info(user_telegram_id)
+    direction, page_cursor = parse_page_cursor(context.route_args.get('cursor'))
+    page = await TaskService.aget_employee_tasks_page(user['id'], page_cursor, direction) if user else {'items': []}
+    tasks = page['items']
 
     if not tasks:
         await query.edit_message_text("این کاربر هیچ کاری ندارد.")
         return ConversationHandler.END
 
     keyboard = []
-    for task_id, title in tasks:
-        keyboard.append([InlineKeyboardButton(title, callback_data=f"edit_task_{task_id}")])
+    for task in tasks:
+        keyboard.append([InlineKeyboardButton(task['title'], callback_data=f"edit_task_{task['id']}")])
+
+    pagination_row = get_pagination_row(f"edit_user_{user_telegram_id}", page)
+    if pagination_row:
+        keyboard.append(pagination_row)
 
     keyboard.append([InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_main_menu")])
     reply_markup = InlineKeyboardMarkup(keyboard)
@@ -90,7 +91,7 @@ async def select_task_for_editing(update: Update, context: ContextTypes.DEFAULT_
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['edit_task_id'] = task_id
 
     # نمایش گزینه‌های قابل ویرایش
@@ -117,7 +118,7 @@ async def edit_title_field(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['edit_task_id'] = task_id
     context.user_data['edit_field'] = 'title'
 
@@ -130,7 +131,7 @@ async def edit_duration_field(update: Update, context: ContextTypes.DEFAULT_TYPE
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['edit_task_id'] = task_id
     context.user_data['edit_field'] = 'duration'
 
@@ -143,7 +144,7 @@ async def edit_results_field(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['edit_task_id'] = task_id
     context.user_data['edit_field'] = 'results'
 
@@ -156,7 +157,7 @@ async def edit_description_field(update: Update, context: ContextTypes.DEFAULT_T
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['edit_task_id'] = task_id
     context.user_data['edit_field'] = 'description'
 
@@ -169,7 +170,7 @@ async def edit_importance_field(update: Update, context: ContextTypes.DEFAULT_TY
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['edit_task_id'] = task_id
     context.user_data['edit_field'] = 'importance'
 
@@ -182,7 +183,7 @@ async def edit_priority_field(update: Update, context: ContextTypes.DEFAULT_TYPE
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['edit_task_id'] = task_id
     context.user_data['edit_field'] = 'priority'
 
@@ -195,7 +196,7 @@ async def edit_files_field(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['edit_task_id'] = task_id
     context.user_data['edit_field'] = 'files'
     tasks_being_edited[query.from_user.id] = {"attachments": []}
@@ -211,7 +212,7 @@ async def edit_assignee_field(update: Update, context: ContextTypes.DEFAULT_TYPE
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['edit_task_id'] = task_id
     context.user_data['edit_field'] = 'assignee'
 
@@ -233,23 +234,19 @@ async def edit_category_field(update: Update, context: ContextTypes.DEFAULT_TYPE
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['edit_task_id'] = task_id
     context.user_data['edit_field'] = 'category'
 
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, name FROM Categories ORDER BY name")
-    categories = cursor.fetchall()
-    conn.close()
+    categories = await TaskService.aget_categories()
 
     if not categories:
         await query.edit_message_text("هیچ دسته‌بندی تعریف نشده.")
         return ConversationHandler.END
 
     keyboard = []
-    for cat_id, cat_name in categories:
-        keyboard.append([InlineKeyboardButton(cat_name, callback_data=f"set_cat_{cat_id}")])
+    for category in categories:
+        keyboard.append([InlineKeyboardButton(category['name'], callback_data=f"set_cat_{category['id']}")])
 
     reply_markup = InlineKeyboardMarkup(keyboard)
     await query.edit_message_text("دسته‌بندی جدید را انتخاب کنید:", reply_markup=reply_markup)
@@ -262,11 +259,7 @@ async def process_title_edit(update: Update, context: ContextTypes.DEFAULT_TYPE)
     new_title = update.message.text
     task_id = context.user_data['edit_task_id']
 
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE Tasks SET title = ? WHERE id = ?", (new_title, task_id))
-    conn.commit()
-    conn.close()
+    await TaskService.aupdate_task(task_id, title=new_title)
 
     await update.message.reply_text("عنوان با موفقیت به‌روزرسانی شد.")
     await update.message.reply_text("منوی اصلی:", reply_markup=get_main_menu_keyboard())
@@ -282,11 +275,7 @@ async def process_duration_edit(update: Update, context: ContextTypes.DEFAULT_TY
 
         task_id = context.user_data['edit_task_id']
 
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE Tasks SET duration = ? WHERE id = ?", (str(new_duration), task_id))
-        conn.commit()
-        conn.close()
+        await TaskService.aupdate_task(task_id, duration=str(new_duration))
 
         await update.message.reply_text("مدت زمان با موفقیت به‌روزرسانی شد.")
         await update.message.reply_text("منوی اصلی:", reply_markup=get_main_menu_keyboard())
@@ -302,11 +291,7 @@ async def process_results_edit(update: Update, context: ContextTypes.DEFAULT_TYP
     new_results = update.message.text
     task_id = context.user_data['edit_task_id']
 
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE Tasks SET results = ? WHERE id = ?", (new_results, task_id))
-    conn.commit()
-    conn.close()
+    await TaskService.aupdate_task(task_id, results=new_results)
 
     await update.message.reply_text("نتایج مورد انتظار با موفقیت به‌روزرسانی شد.")
     await update.message.reply_text("منوی اصلی:", reply_markup=get_main_menu_keyboard())
@@ -318,11 +303,7 @@ async def process_description_edit(update: Update, context: ContextTypes.DEFAULT
     new_description = update.message.text
     task_id = context.user_data['edit_task_id']
 
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE Tasks SET description = ? WHERE id = ?", (new_description, task_id))
-    conn.commit()
-    conn.close()
+    await TaskService.aupdate_task(task_id, description=new_description)
 
     await update.message.reply_text("توضیحات با موفقیت به‌روزرسانی شد.")
     await update.message.reply_text("منوی اصلی:", reply_markup=get_main_menu_keyboard())
@@ -338,11 +319,7 @@ async def process_importance_edit(update: Update, context: ContextTypes.DEFAULT_
 
         task_id = context.user_data['edit_task_id']
 
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE Tasks SET importance = ? WHERE id = ?", (new_importance, task_id))
-        conn.commit()
-        conn.close()
+        await TaskService.aupdate_task(task_id, importance=new_importance)
 
         await update.message.reply_text("درجه اهمیت با موفقیت به‌روزرسانی شد.")
         await update.message.reply_text("منوی اصلی:", reply_markup=get_main_menu_keyboard())
@@ -362,11 +339,7 @@ async def process_priority_edit(update: Update, context: ContextTypes.DEFAULT_TY
 
         task_id = context.user_data['edit_task_id']
 
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE Tasks SET priority = ? WHERE id = ?", (new_priority, task_id))
-        conn.commit()
-        conn.close()
+        await TaskService.aupdate_task(task_id, priority=new_priority)
 
         await update.message.reply_text("اولویت با موفقیت به‌روزرسانی شد.")
         await update.message.reply_text("منوی اصلی:", reply_markup=get_main_menu_keyboard())
@@ -404,19 +377,8 @@ async def end_files_edit(update: Update, context: ContextTypes.DEFAULT_TYPE):
     task_id = context.user_data['edit_task_id']
     attachments = tasks_being_edited.pop(update.effective_user.id)["attachments"]
 
-    conn = create_connection()
-    cursor = conn.cursor()
-
-    # حذف فایل‌های قدیمی
-    cursor.execute("DELETE FROM TaskAttachments WHERE task_id = ?", (task_id,))
-
-    # اضافه کردن فایل‌های جدید
-    for file_id, file_type in attachments:
-        cursor.execute("INSERT INTO TaskAttachments (task_id, file_id, file_type) VALUES (?, ?, ?)",
-                       (task_id, file_id, file_type))
-
-    conn.commit()
-    conn.close()
+    # جایگزینی فایل‌های قدیمی با فایل‌های جدید
+    await FileService.areplace_task_attachments(task_id, attachments)
 
     await update.message.reply_text("فایل‌ها با موفقیت به‌روزرسانی شد.")
     await update.message.reply_text("منوی اصلی:", reply_markup=get_main_menu_keyboard())
@@ -428,22 +390,15 @@ async def save_assignee_edit(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     await query.answer()
 
-    assignee_telegram_id = query.data.split('_')[2]
+    assignee_telegram_id = context.route_args['telegram_id']
     task_id = context.user_data['edit_task_id']
 
     assigned_to_db_id = None
     if assignee_telegram_id != "None":
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM Users WHERE telegram_id = ?", (int(assignee_telegram_id),))
-        assigned_to_db_id = cursor.fetchone()[0]
-        conn.close()
-
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE Tasks SET assigned_to_id = ? WHERE id = ?", (assigned_to_db_id, task_id))
-    conn.commit()
-    conn.close()
+        assignee = await UserService.aget_user_info(int(assignee_telegram_id))
+        assigned_to_db_id = assignee['id']
+
+    await TaskService.aupdate_task(task_id, assigned_to_id=assigned_to_db_id)
 
     await query.edit_message_text("انجام‌دهنده با موفقیت به‌روزرسانی شد.")
     await context.bot.send_message(chat_id=query.from_user.id, text="منوی اصلی:", reply_markup=get_main_menu_keyboard())
@@ -455,14 +410,10 @@ async def save_category_edit(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     await query.answer()
 
-    category_id = int(query.data.split('_')[2])
+    category_id = context.route_args['category_id']
     task_id = context.user_data['edit_task_id']
 
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE Tasks SET category_id = ? WHERE id = ?", (category_id, task_id))
-    conn.commit()
-    conn.close()
+    await TaskService.aupdate_task(task_id, category_id=category_id)
 
     await query.edit_message_text("دسته‌بندی با موفقیت به‌روزرسانی شد.")
     await context.bot.send_message(chat_id=query.from_user.id, text="منوی اصلی:", reply_markup=get_main_menu_keyboard())
@@ -484,11 +435,14 @@ edit_conv_handler = ConversationHandler(
     entry_points=[CallbackQueryHandler(start_task_editing, pattern='^edit_task$')],
     states={
         EDIT_SELECT_USER: [
-            CallbackQueryHandler(select_user_for_editing, pattern='^edit_user_'),
+            route_handler("edit_user_{telegram_id:int}", select_user_for_editing),
+            route_handler("edit_user_{telegram_id:int}_pg_{cursor}", select_user_for_editing),
             CommandHandler("cancel", cancel_edit_task)
         ],
         EDIT_SELECT_TASK: [
-            CallbackQueryHandler(select_task_for_editing, pattern='^edit_task_'),
+            route_handler("edit_task_{task_id:int}", select_task_for_editing),
+            route_handler("edit_user_{telegram_id:int}", select_user_for_editing),
+            route_handler("edit_user_{telegram_id:int}_pg_{cursor}", select_user_for_editing),
             CommandHandler("cancel", cancel_edit_task)
         ],
         EDIT_GET_TITLE: [
@@ -521,25 +475,27 @@ edit_conv_handler = ConversationHandler(
             CommandHandler("cancel", cancel_edit_task)
         ],
         EDIT_SELECT_ASSIGNEE: [
-            CallbackQueryHandler(save_assignee_edit, pattern='^assign_edit_'),
+            route_handler("assign_edit_{telegram_id}", save_assignee_edit),
             CommandHandler("cancel", cancel_edit_task)
         ],
         EDIT_SELECT_CATEGORY: [
-            CallbackQueryHandler(save_category_edit, pattern='^set_cat_'),
+            route_handler("set_cat_{category_id:int}", save_category_edit),
             CommandHandler("cancel", cancel_edit_task)
         ]
     },
     fallbacks=[
-        CallbackQueryHandler(edit_title_field, pattern='^edit_title_'),
-        CallbackQueryHandler(edit_duration_field, pattern='^edit_duration_'),
-        CallbackQueryHandler(edit_results_field, pattern='^edit_results_'),
-        CallbackQueryHandler(edit_description_field, pattern='^edit_description_'),
-        CallbackQueryHandler(edit_importance_field, pattern='^edit_importance_'),
-        CallbackQueryHandler(edit_priority_field, pattern='^edit_priority_'),
-        CallbackQueryHandler(edit_files_field, pattern='^edit_files_'),
-        CallbackQueryHandler(edit_assignee_field, pattern='^edit_assignee_'),
-        CallbackQueryHandler(edit_category_field, pattern='^edit_category_'),
+        route_handler("edit_title_{task_id:int}", edit_title_field),
+        route_handler("edit_duration_{task_id:int}", edit_duration_field),
+        route_handler("edit_results_{task_id:int}", edit_results_field),
+        route_handler("edit_description_{task_id:int}", edit_description_field),
+        route_handler("edit_importance_{task_id:int}", edit_importance_field),
+        route_handler("edit_priority_{task_id:int}", edit_priority_field),
+        route_handler("edit_files_{task_id:int}", edit_files_field),
+        route_handler("edit_assignee_{task_id:int}", edit_assignee_field),
+        route_handler("edit_category_{task_id:int}", edit_category_field),
         CommandHandler("cancel", cancel_edit_task)
     ],
-    per_message=False
+    per_message=False,
+    name="edit_conv_handler",
+    persistent=True
 )
\ No newline at end of file
@@ -0,0 +1,58 @@
+# handlers/admin/export_handler.py
+
+import os
+from pathlib import Path
+from telegram import Update
+from telegram.ext import ContextTypes
+from config import ADMIN_ID, EXPORT_MAX_UPLOAD_MB
+from services.export_service import ExportService
+from services.delivery_service import DeliveryService
+
+EXPORT_USAGE = (
+    "📤 خروجی گرفتن از داده‌ها\n\n"
+    "/export <tasks|activities|scores> [csv|xlsx] [employee=..] [category=..] [from=YYYY-MM-DD] [to=YYYY-MM-DD]\n\n"
+    "employee: آیدی تلگرام یا نام کارمند، category: آیدی یا نام دسته‌بندی "
+    "(در نام‌ها به جای فاصله _ بگذارید).\n"
+    "مثال: /export activities xlsx employee=علی_احمدی from=2026-01-01 to=2026-01-31"
+)
+
+
+async def export_data(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """دستور /export - ساخت و ارسال فایل CSV/XLSX (فقط ادمین)"""
+    if update.effective_user.id != ADMIN_ID:
+        await update.message.reply_text("❌ شما دسترسی به این بخش را ندارید.")
+        return
+
+    try:
+        options = await ExportService.aparse_options(context.args)
+    except ValueError as e:
+        await update.message.reply_text(f"❌ {e}\n\n{EXPORT_USAGE}")
+        return
+
+    await update.message.reply_text("⏳ در حال ساخت فایل خروجی...")
+
+    result = await ExportService.aexport(**options)
+    if not result:
+        await update.message.reply_text("❌ خطا در ساخت فایل خروجی!")
+        return
+
+    try:
+        if result['size'] > EXPORT_MAX_UPLOAD_MB * 1024 * 1024:
+            await update.message.reply_text(
+                f"❌ حجم فایل ({result['size'] // (1024 * 1024)} مگابایت) بیش از حد مجاز ارسال است؛ "
+                f"بازه تاریخ یا فیلترها را محدودتر کنید."
+            )
+            return
+
+        # Path به جای file object تا در صورت تلاش دوباره صف ارسال، فایل از ابتدا خوانده شود
+        await DeliveryService.send(
+            context.bot, update.effective_chat.id, 'send_document',
+            document=Path(result['path']),
+            filename=result['filename'],
+            caption=f"📤 {result['filename']}\n📊 {result['rows']} ردیف"
+        )
+    except Exception as e:
+        print(f"❌ خطا در ارسال فایل خروجی: {e}")
+        await update.message.reply_text("❌ خطا در ارسال فایل خروجی!")
+    finally:
+        os.remove(result['path'])
@@ -0,0 +1,59 @@
+# handlers/admin/import_tasks_handler.py
+
+from telegram import Update
+from telegram.ext import ContextTypes
+from config import ADMIN_ID
+from services.import_service import ImportService, IMPORT_MAX_BYTES
+
+IMPORT_USAGE = (
+    "📥 **ورود دسته‌ای کارها**\n\n"
+    "یک فایل .csv یا .json با کپشن /import_tasks ارسال کنید "
+    "(یا روی فایل ارسال شده با /import_tasks پاسخ دهید).\n\n"
+    "ستون‌ها: title (اجباری), description, results, duration, importance, priority, "
+    "category, assignee, description_files, results_files"
+)
+MAX_REPORTED_ERRORS = 20
+
+
+async def import_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    دستور /import_tasks - ورود دسته‌ای کارها از فایل CSV/JSON
+    (فایل با کپشن /import_tasks یا پاسخ به پیام فایل)
+    """
+    if update.effective_user.id != ADMIN_ID:
+        await update.message.reply_text("❌ شما دسترسی به این بخش را ندارید.")
+        return
+
+    message = update.message
+    document = message.document or (message.reply_to_message.document if message.reply_to_message else None)
+    if not document:
+        await message.reply_text(IMPORT_USAGE, parse_mode='Markdown')
+        return
+
+    if document.file_size and document.file_size > IMPORT_MAX_BYTES:
+        await message.reply_text(f"❌ حجم فایل بیش از {IMPORT_MAX_BYTES // (1024 * 1024)} مگابایت است.")
+        return
+
+    try:
+        telegram_file = await context.bot.get_file(document.file_id)
+        content = bytes(await telegram_file.download_as_bytearray())
+    except Exception as e:
+        print(f"❌ خطا در دریافت فایل ورود کارها: {e}")
+        await message.reply_text("❌ خطا در دریافت فایل!")
+        return
+
+    result = await ImportService.aimport_tasks(content, document.file_name or '', ADMIN_ID)
+
+    if result['errors']:
+        errors = result['errors']
+        text = "❌ هیچ کاری ثبت نشد:\n\n" + "\n".join(f"• {error}" for error in errors[:MAX_REPORTED_ERRORS])
+        if len(errors) > MAX_REPORTED_ERRORS:
+            text += f"\n\n... و {len(errors) - MAX_REPORTED_ERRORS} خطای دیگر"
+        await message.reply_text(text)
+        return
+
+    task_ids = result['task_ids']
+    await message.reply_text(
+        f"✅ {len(task_ids)} کار با موفقیت ثبت شد.\n"
+        f"🆔 شناسه‌ها: {task_ids[0]} تا {task_ids[-1]}"
+    )
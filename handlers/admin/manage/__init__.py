@@ -4,7 +4,7 @@
 Task Management Handlers - مدیریت کارها
 """
 
-from .manage_menu_handler import show_manage_tasks_menu
+from .manage_menu_handler import show_manage_tasks_menu, manage_placeholder
 from .manage_by_employee_handler import (
     manage_by_employee,
     show_employee_tasks_by_category,
@@ -19,6 +19,7 @@ from .manage_task_detail_handler import (
 
 __all__ = [
     'show_manage_tasks_menu',
+    'manage_placeholder',
     'manage_by_employee',
     'show_employee_tasks_by_category',
     'show_tasks_by_employee_category',
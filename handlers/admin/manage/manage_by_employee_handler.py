@@ -5,6 +5,7 @@ from telegram.ext import ContextTypes
 from database.models.user import UserModel
 from services.user_service import UserService
 from services.task_service import TaskService
+from utils.callback_codec import encode_callback
 
 
 async def manage_by_employee(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -12,7 +13,7 @@ async def manage_by_employee(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     await query.answer()
 
-    employees = UserService.get_all_employees()
+    employees = await UserService.aget_all_employees()
 
     if not employees:
         await query.edit_message_text(
@@ -30,7 +31,7 @@ async def manage_by_employee(update: Update, context: ContextTypes.DEFAULT_TYPE)
         name = employee.get('name')
 
         # دریافت آمار از TaskService
-        stats = TaskService.get_employee_task_statistics(emp_id)
+        stats = await TaskService.aget_employee_task_statistics(emp_id)
         total = stats.get('total', 0)
         archived = stats.get('archived', 0)
 
@@ -52,10 +53,10 @@ async def show_employee_tasks_by_category(update: Update, context: ContextTypes.
     query = update.callback_query
     await query.answer()
 
-    employee_id = int(query.data.split('_')[2])
+    employee_id = context.route_args['employee_id']
 
     # دریافت نام کارمند
-    employee = UserModel.get_by_id(employee_id)
+    employee = await UserModel.aget_by_id(employee_id)
     if not employee:
         await query.edit_message_text("❌ کارمند یافت نشد!")
         return
@@ -63,7 +64,7 @@ async def show_employee_tasks_by_category(update: Update, context: ContextTypes.
     employee_name = employee.get('name')
 
     # دریافت دسته‌بندی‌ها از TaskService
-    categories = TaskService.get_employee_categories_with_stats(employee_id)
+    categories = await TaskService.aget_employee_categories_with_stats(employee_id)
 
     if not categories:
         await query.edit_message_text(
@@ -83,7 +84,7 @@ async def show_employee_tasks_by_category(update: Update, context: ContextTypes.
         finished = category.get('finished', 0) or 0
 
         button_text = f"📂 {cat_name} ({finished}/{total})"
-        keyboard.append([InlineKeyboardButton(button_text, callback_data=f"emp_cat_{employee_id}_{cat_id}")])
+        keyboard.append([InlineKeyboardButton(button_text, callback_data=encode_callback("ec", employee_id, cat_id))])
 
     keyboard.append([InlineKeyboardButton("🔙 بازگشت", callback_data="manage_by_employee")])
 
@@ -100,12 +101,11 @@ async def show_tasks_by_employee_category(update: Update, context: ContextTypes.
     query = update.callback_query
     await query.answer()
 
-    parts = query.data.split('_')
-    employee_id = int(parts[2])
-    category_id = int(parts[3])
+    employee_id = context.route_args['employee_id']
+    category_id = context.route_args['category_id']
 
     # دریافت نام کارمند
-    employee = UserModel.get_by_id(employee_id)
+    employee = await UserModel.aget_by_id(employee_id)
     if not employee:
         await query.edit_message_text("❌ کارمند یافت نشد!")
         return
@@ -114,11 +114,11 @@ async def show_tasks_by_employee_category(update: Update, context: ContextTypes.
 
     # دریافت نام دسته‌بندی
     from database.models.category import CategoryModel
-    category = CategoryModel.get_by_id(category_id)
+    category = await CategoryModel.aget_by_id(category_id)
     category_name = category.get('name') if category else 'نامشخص'
 
     # دریافت کارها از TaskService
-    tasks = TaskService.get_tasks_by_employee_and_category(employee_id, category_id)
+    tasks = await TaskService.aget_tasks_by_employee_and_category(employee_id, category_id)
 
     if not tasks:
         await query.edit_message_text(
@@ -5,6 +5,7 @@ from telegram.ext import ContextTypes
 from services.task_service import TaskService
 from services.user_service import UserService
 from services.file_service import FileService
+from utils.callback_codec import encode_callback
 
 
 async def view_task_details_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -12,11 +13,11 @@ async def view_task_details_admin(update: Update, context: ContextTypes.DEFAULT_
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     admin_telegram_id = query.from_user.id
 
     # دریافت اطلاعات کامل کار
-    task = TaskService.get_task(task_id, with_details=True)
+    task = await TaskService.aget_task(task_id, with_details=True)
     if not task:
         await query.edit_message_text("❌ کار یافت نشد!")
         return
@@ -48,11 +49,11 @@ async def view_task_details_admin(update: Update, context: ContextTypes.DEFAULT_
 
     if current_status != 'in_progress':
         status_buttons.append(
-            InlineKeyboardButton("🔄 در حال انجام", callback_data=f"status_in_progress_{task_id}")
+            InlineKeyboardButton("🔄 در حال انجام", callback_data=encode_callback("ts", "in_progress", task_id))
         )
     if current_status != 'on_hold':
         status_buttons.append(
-            InlineKeyboardButton("⏸ متوقف", callback_data=f"status_on_hold_{task_id}")
+            InlineKeyboardButton("⏸ متوقف", callback_data=encode_callback("ts", "on_hold", task_id))
         )
 
     if status_buttons:
@@ -94,19 +95,13 @@ async def view_task_details_admin(update: Update, context: ContextTypes.DEFAULT_
         )
 
     # ارسال فایل‌های توضیحات
-    description_files = FileService.get_section_files(task_id, 'description')
+    description_files = await FileService.aget_section_files(task_id, 'description')
     if description_files:
         await context.bot.send_message(
             chat_id=admin_telegram_id,
             text="📎 **فایل‌های توضیحات:**"
         )
-        for file_data in description_files:
-            await FileService.send_file_to_user(
-                context.bot,
-                admin_telegram_id,
-                file_data['file_id'],
-                file_data['file_type']
-            )
+        await FileService.send_files_grouped(context.bot, admin_telegram_id, description_files)
 
     if task.get('results'):
         await context.bot.send_message(
@@ -116,19 +111,13 @@ async def view_task_details_admin(update: Update, context: ContextTypes.DEFAULT_
         )
 
     # ارسال فایل‌های نتایج
-    results_files = FileService.get_section_files(task_id, 'results')
+    results_files = await FileService.aget_section_files(task_id, 'results')
     if results_files:
         await context.bot.send_message(
             chat_id=admin_telegram_id,
             text="📎 **فایل‌های نتایج:**"
         )
-        for file_data in results_files:
-            await FileService.send_file_to_user(
-                context.bot,
-                admin_telegram_id,
-                file_data['file_id'],
-                file_data['file_type']
-            )
+        await FileService.send_files_grouped(context.bot, admin_telegram_id, results_files)
 
 
 async def assign_task_to_employee(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -136,16 +125,16 @@ async def assign_task_to_employee(update: Update, context: ContextTypes.DEFAULT_
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
 
     # دریافت اطلاعات کار
-    task = TaskService.get_task(task_id, with_details=True)
+    task = await TaskService.aget_task(task_id, with_details=True)
     if not task:
         await query.edit_message_text("❌ کار یافت نشد!")
         return
 
     # دریافت لیست کارمندان
-    employees = UserService.get_all_employees()
+    employees = await UserService.aget_all_employees()
 
     if not employees:
         await query.edit_message_text(
@@ -166,7 +155,7 @@ async def assign_task_to_employee(update: Update, context: ContextTypes.DEFAULT_
             continue
 
         keyboard.append([
-            InlineKeyboardButton(f"👤 {name}", callback_data=f"assign_to_{task_id}_{emp_id}")
+            InlineKeyboardButton(f"👤 {name}", callback_data=encode_callback("at", task_id, emp_id))
         ])
 
     keyboard.append([
@@ -189,20 +178,19 @@ async def confirm_assign_task(update: Update, context: ContextTypes.DEFAULT_TYPE
     query = update.callback_query
     await query.answer()
 
-    parts = query.data.split('_')
-    task_id = int(parts[2])
-    employee_id = int(parts[3])
+    task_id = context.route_args['task_id']
+    employee_id = context.route_args['employee_id']
 
     # دریافت اطلاعات
-    task = TaskService.get_task(task_id)
-    employee = UserService.get_user_by_id(employee_id)
+    task = await TaskService.aget_task(task_id)
+    employee = await UserService.aget_user_by_id(employee_id)
 
     if not task or not employee:
         await query.edit_message_text("❌ خطا در تخصیص!")
         return
 
     # تخصیص کار
-    success = TaskService.assign_task_to_employee(task_id, employee_id)
+    success = await TaskService.aassign_task_to_employee(task_id, employee_id)
 
     if success:
         await query.edit_message_text(
@@ -237,18 +225,17 @@ async def change_task_status(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     await query.answer()
 
-    parts = query.data.split('_')
-    new_status = parts[1]
-    task_id = int(parts[2])
+    new_status = context.route_args['status']
+    task_id = context.route_args['task_id']
 
     # دریافت اطلاعات کار
-    task = TaskService.get_task(task_id, with_details=True)
+    task = await TaskService.aget_task(task_id, with_details=True)
     if not task:
         await query.edit_message_text("❌ کار یافت نشد!")
         return
 
     # تغییر وضعیت
-    success = TaskService.update_task_status(task_id, new_status)
+    success = await TaskService.aupdate_task_status(task_id, new_status)
 
     if success:
         from utils.formatters import format_task_status
@@ -259,7 +246,7 @@ async def change_task_status(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
 
         # بازگشت به جزئیات کار
-        context.user_data['callback_query_data'] = f"view_task_{task_id}"
+        context.route_args = {'task_id': task_id}
         await view_task_details_admin(update, context)
 
     else:
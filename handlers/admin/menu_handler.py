@@ -23,7 +23,7 @@ async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
     else:
         # منوی کارمند
-        user = UserService.get_user_info(user_id)
+        user = await UserService.aget_user_info(user_id)
         if user and user.get('is_employee') == 1:  # ✅ اصلاح شد
             await query.edit_message_text(
                 "🏠 **منوی اصلی**",
@@ -0,0 +1,45 @@
+# handlers/admin/performance_report_handler.py
+
+from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
+from telegram.ext import ContextTypes
+from config import ADMIN_ID, ANALYTICS_WINDOW_DAYS
+from services.analytics_service import AnalyticsService
+
+REPORT_WINDOWS = (30, 90, 365)
+
+
+def _build_report_keyboard(days: int) -> InlineKeyboardMarkup:
+    """دکمه‌های انتخاب بازه گزارش و بازگشت"""
+    window_row = [
+        InlineKeyboardButton(f"{'✅ ' if window == days else ''}{window} روز",
+                             callback_data=f"performance_report_{window}")
+        for window in REPORT_WINDOWS
+    ]
+    return InlineKeyboardMarkup([
+        window_row,
+        [InlineKeyboardButton("🔙 بازگشت به منو", callback_data="back_to_main_menu")]
+    ])
+
+
+async def show_performance_report(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """گزارش تحلیل عملکرد کارمندان (بازه پیش‌فرض یا performance_report_{days})"""
+    query = update.callback_query
+    await query.answer()
+
+    if query.from_user.id != ADMIN_ID:
+        return
+
+    days = context.route_args.get('days', ANALYTICS_WINDOW_DAYS)
+    report = await AnalyticsService.acompute_metrics(days)
+    if report is None:
+        await query.edit_message_text(
+            "❌ خطا در محاسبه گزارش عملکرد!",
+            reply_markup=_build_report_keyboard(days)
+        )
+        return
+
+    await query.edit_message_text(
+        AnalyticsService.format_report(report),
+        reply_markup=_build_report_keyboard(days),
+        parse_mode='HTML'
+    )
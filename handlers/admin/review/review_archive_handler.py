@@ -4,7 +4,9 @@ from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
 from services.task_service import TaskService
 from services.review_service import ReviewService
-from services.file_service import FileService
+from services.delivery_service import DeliveryService, INTERACTIVE
+from services.file_service import CAPTION_LIMIT
+from utils.keyboards import parse_page_callback, get_pagination_row
 
 
 async def show_archived_tasks_for_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -12,8 +14,10 @@ async def show_archived_tasks_for_admin(update: Update, context: ContextTypes.DE
     query = update.callback_query
     await query.answer()
 
-    # دریافت کارهای آرشیو شده
-    archived_tasks = TaskService.get_archived_tasks()
+    # دریافت کارهای آرشیو شده همراه با آخرین امتیاز ادمین (صفحه‌بندی شده)
+    direction, page_cursor = parse_page_callback(query.data)
+    page = await TaskService.aget_archived_tasks_with_scores_page(None, page_cursor, direction)
+    archived_tasks = page['items']
 
     if not archived_tasks:
         keyboard = [[InlineKeyboardButton("🔙 بازگشت به منو", callback_data="back_to_main_menu")]]
@@ -31,8 +35,7 @@ async def show_archived_tasks_for_admin(update: Update, context: ContextTypes.DE
         title = task.get('title')
         employee_name = task.get('employee_name', 'نامشخص')
 
-        # دریافت امتیاز ادمین
-        admin_score = ReviewService.get_latest_score(task_id)
+        admin_score = task.get('latest_score')
         score_text = f"({admin_score}/10)" if admin_score else ""
 
         button_text = f"🗄 {title} - {employee_name} {score_text}"
@@ -40,11 +43,15 @@ async def show_archived_tasks_for_admin(update: Update, context: ContextTypes.DE
             InlineKeyboardButton(button_text, callback_data=f"view_archived_{task_id}")
         ])
 
+    pagination_row = get_pagination_row("archived_tasks", page)
+    if pagination_row:
+        keyboard.append(pagination_row)
+
     keyboard.append([InlineKeyboardButton("🔙 بازگشت به منو", callback_data="back_to_main_menu")])
 
     await query.edit_message_text(
-        f"🗄 **کارهای آرشیو شده** ({len(archived_tasks)} کار)\n\n"
-        f"لطفاً کار مورد نظر را انتخاب کنید:",
+        "🗄 **کارهای آرشیو شده**\n\n"
+        "لطفاً کار مورد نظر را انتخاب کنید:",
         reply_markup=InlineKeyboardMarkup(keyboard),
         parse_mode='Markdown'
     )
@@ -55,16 +62,16 @@ async def view_archived_task_for_admin(update: Update, context: ContextTypes.DEF
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
 
     # دریافت اطلاعات کار
-    task = TaskService.get_task(task_id, with_details=True)
+    task = await TaskService.aget_task(task_id, with_details=True)
     if not task:
         await query.edit_message_text("❌ کار یافت نشد!")
         return
 
     # دریافت خلاصه نظرات
-    review_summary = ReviewService.get_review_summary(task_id)
+    review_summary = await ReviewService.aget_review_summary(task_id)
 
     message_text = (
         f"🗄 **کار آرشیو شده**\n\n"
@@ -99,11 +106,11 @@ async def show_admin_review_for_archived(update: Update, context: ContextTypes.D
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[3])
+    task_id = context.route_args['task_id']
     admin_telegram_id = query.from_user.id
 
     # دریافت تمام نظرات
-    all_reviews = ReviewService.get_all_reviews(task_id)
+    all_reviews = await ReviewService.aget_all_reviews(task_id)
 
     await query.edit_message_text(
         "💭 **نظرات مدیر**\n\n"
@@ -111,7 +118,8 @@ async def show_admin_review_for_archived(update: Update, context: ContextTypes.D
         parse_mode='Markdown'
     )
 
-    # ارسال نظرات
+    # ارسال‌ها در صف DeliveryService قرار می‌گیرند (ترتیب chat حفظ و محدودیت نرخ رعایت می‌شود)
+    bot = context.bot
     review_types = {
         'opinion': ('💭 نظر کلی', all_reviews.get('opinion', [])),
         'positive': ('✅ نقاط مثبت', all_reviews.get('positive', [])),
@@ -123,50 +131,46 @@ async def show_admin_review_for_archived(update: Update, context: ContextTypes.D
     has_any_review = False
 
     for review_key, (title, reviews) in review_types.items():
-        if reviews:
-            has_any_review = True
-            await context.bot.send_message(
-                chat_id=admin_telegram_id,
-                text=f"━━━━━━━━━━━━━━━━━\n{title}",
-                parse_mode='Markdown'
+        if not reviews:
+            continue
+
+        has_any_review = True
+        DeliveryService.enqueue_message(
+            bot, admin_telegram_id, f"━━━━━━━━━━━━━━━━━\n{title}", INTERACTIVE, parse_mode='Markdown'
+        )
+
+        if review_key == 'score':
+            # امتیاز فقط عدد است
+            score = reviews[0].get('admin_score')
+            DeliveryService.enqueue_message(
+                bot, admin_telegram_id, f"**امتیاز:** {score}/10", INTERACTIVE, parse_mode='Markdown'
             )
+            continue
+
+        # فایل‌های پشت سر هم آلبوم می‌شوند و متن هر نظر caption فایل آن است
+        files = []
+        for idx, review in enumerate(reviews, 1):
+            text = f"**#{idx}**\n{review['text_content']}" if review.get('text_content') else None
 
-            if review_key == 'score':
-                # امتیاز فقط عدد است
-                score = reviews[0].get('admin_score')
-                await context.bot.send_message(
-                    chat_id=admin_telegram_id,
-                    text=f"**امتیاز:** {score}/10",
-                    parse_mode='Markdown'
-                )
-            else:
-                # سایر نظرات
-                for idx, review in enumerate(reviews, 1):
-                    if review.get('text_content'):
-                        await context.bot.send_message(
-                            chat_id=admin_telegram_id,
-                            text=f"**#{idx}**\n{review['text_content']}",
-                            parse_mode='Markdown'
-                        )
-
-                    if review.get('file_id'):
-                        await FileService.send_file_to_user(
-                            context.bot,
-                            admin_telegram_id,
-                            review['file_id'],
-                            review['file_type']
-                        )
+            if review.get('file_id') and (not text or len(text) <= CAPTION_LIMIT):
+                files.append({'file_id': review['file_id'], 'file_type': review['file_type'], 'caption': text})
+                continue
+
+            # متن بدون فایل (یا بلندتر از caption) پیام جداست؛ آلبوم قبلی اول ارسال می‌شود
+            DeliveryService.enqueue_files(bot, admin_telegram_id, files, INTERACTIVE, parse_mode='Markdown')
+            files = []
+            if text:
+                DeliveryService.enqueue_message(bot, admin_telegram_id, text, INTERACTIVE, parse_mode='Markdown')
+            if review.get('file_id'):
+                files.append({'file_id': review['file_id'], 'file_type': review['file_type']})
+
+        DeliveryService.enqueue_files(bot, admin_telegram_id, files, INTERACTIVE, parse_mode='Markdown')
 
     if not has_any_review:
-        await context.bot.send_message(
-            chat_id=admin_telegram_id,
-            text="ℹ️ هیچ نظری برای این کار ثبت نشده است."
-        )
+        DeliveryService.enqueue_message(bot, admin_telegram_id, "ℹ️ هیچ نظری برای این کار ثبت نشده است.", INTERACTIVE)
 
     # دکمه بازگشت
     keyboard = [[InlineKeyboardButton("🔙 بازگشت", callback_data=f"view_archived_{task_id}")]]
-    await context.bot.send_message(
-        chat_id=admin_telegram_id,
-        text="━━━━━━━━━━━━━━━━━",
-        reply_markup=InlineKeyboardMarkup(keyboard)
-    )
\ No newline at end of file
+    DeliveryService.enqueue_message(
+        bot, admin_telegram_id, "━━━━━━━━━━━━━━━━━", INTERACTIVE, reply_markup=InlineKeyboardMarkup(keyboard)
+    )
@@ -10,17 +10,17 @@ async def finalize_task(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
 
     # بررسی امکان خاتمه
-    can_finalize, message = TaskService.can_admin_finalize(task_id)
+    can_finalize, message = await TaskService.acan_admin_finalize(task_id)
 
     if not can_finalize:
         await query.answer(message, show_alert=True)
         return
 
     # درخواست تأیید
-    task = TaskService.get_task(task_id, with_details=True)
+    task = await TaskService.aget_task(task_id, with_details=True)
 
     keyboard = [
         [
@@ -45,20 +45,20 @@ async def confirm_finalize_task(update: Update, context: ContextTypes.DEFAULT_TY
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
 
     # بررسی مجدد امکان خاتمه
-    can_finalize, message = TaskService.can_admin_finalize(task_id)
+    can_finalize, message = await TaskService.acan_admin_finalize(task_id)
 
     if not can_finalize:
         await query.edit_message_text(f"❌ {message}")
         return
 
     # خاتمه کار
-    success = TaskService.finalize_task(task_id)
+    success = await TaskService.afinalize_task(task_id)
 
     if success:
-        task = TaskService.get_task(task_id, with_details=True)
+        task = await TaskService.aget_task(task_id, with_details=True)
 
         await query.edit_message_text(
             f"✅ **کار با موفقیت خاتمه یافت!**\n\n"
@@ -73,7 +73,7 @@ async def confirm_finalize_task(update: Update, context: ContextTypes.DEFAULT_TY
             employee_telegram_id = task.get('assigned_to_id')
             if employee_telegram_id:
                 from database.models.user import UserModel
-                user = UserModel.get_by_id(employee_telegram_id)
+                user = await UserModel.aget_by_id(employee_telegram_id)
                 if user:
                     await context.bot.send_message(
                         chat_id=user.get('telegram_id'),
@@ -2,7 +2,7 @@
 
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import (
-    ContextTypes, ConversationHandler, CallbackQueryHandler,
+    ContextTypes, ConversationHandler,
     MessageHandler, filters, CommandHandler
 )
 from config import ADMIN_ID
@@ -16,6 +16,7 @@ from utils.constants import (
     ADMIN_TASK_SCORE
 )
 from utils.validators import validate_score
+from utils.callback_router import route_handler
 
 
 # ==================== نظر کلی ====================
@@ -25,7 +26,7 @@ async def start_opinion_entry(update: Update, context: ContextTypes.DEFAULT_TYPE
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['current_task_id'] = task_id
     context.user_data['review_type'] = 'opinion'
 
@@ -45,7 +46,7 @@ async def start_positive_entry(update: Update, context: ContextTypes.DEFAULT_TYP
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['current_task_id'] = task_id
     context.user_data['review_type'] = 'positive'
 
@@ -65,7 +66,7 @@ async def start_negative_entry(update: Update, context: ContextTypes.DEFAULT_TYP
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['current_task_id'] = task_id
     context.user_data['review_type'] = 'negative'
 
@@ -85,7 +86,7 @@ async def start_suggestion_entry(update: Update, context: ContextTypes.DEFAULT_T
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['current_task_id'] = task_id
     context.user_data['review_type'] = 'suggestion'
 
@@ -109,13 +110,13 @@ async def receive_review_entry(update: Update, context: ContextTypes.DEFAULT_TYP
     if update.message.text and update.message.text != '/done':
         # تشخیص نوع نظر و فراخوانی متد مناسب
         if review_type == 'opinion':
-            ReviewService.add_opinion(task_id, ADMIN_ID, text_content=update.message.text)
+            await ReviewService.aadd_opinion(task_id, ADMIN_ID, text_content=update.message.text)
         elif review_type == 'positive':
-            ReviewService.add_positive_points(task_id, ADMIN_ID, text_content=update.message.text)
+            await ReviewService.aadd_positive_points(task_id, ADMIN_ID, text_content=update.message.text)
         elif review_type == 'negative':
-            ReviewService.add_negative_points(task_id, ADMIN_ID, text_content=update.message.text)
+            await ReviewService.aadd_negative_points(task_id, ADMIN_ID, text_content=update.message.text)
         elif review_type == 'suggestion':
-            ReviewService.add_suggestion(task_id, ADMIN_ID, text_content=update.message.text)
+            await ReviewService.aadd_suggestion(task_id, ADMIN_ID, text_content=update.message.text)
 
         await update.message.reply_text("✅ ثبت شد!\n\nمی‌توانید مطالب بیشتری اضافه کنید یا /done بزنید.")
 
@@ -134,13 +135,13 @@ async def receive_review_entry(update: Update, context: ContextTypes.DEFAULT_TYP
 
     if file_type and file_id:
         if review_type == 'opinion':
-            ReviewService.add_opinion(task_id, ADMIN_ID, file_id=file_id, file_type=file_type)
+            await ReviewService.aadd_opinion(task_id, ADMIN_ID, file_id=file_id, file_type=file_type)
         elif review_type == 'positive':
-            ReviewService.add_positive_points(task_id, ADMIN_ID, file_id=file_id, file_type=file_type)
+            await ReviewService.aadd_positive_points(task_id, ADMIN_ID, file_id=file_id, file_type=file_type)
         elif review_type == 'negative':
-            ReviewService.add_negative_points(task_id, ADMIN_ID, file_id=file_id, file_type=file_type)
+            await ReviewService.aadd_negative_points(task_id, ADMIN_ID, file_id=file_id, file_type=file_type)
         elif review_type == 'suggestion':
-            ReviewService.add_suggestion(task_id, ADMIN_ID, file_id=file_id, file_type=file_type)
+            await ReviewService.aadd_suggestion(task_id, ADMIN_ID, file_id=file_id, file_type=file_type)
 
         await update.message.reply_text("✅ فایل ثبت شد!\n\nمی‌توانید مطالب بیشتری اضافه کنید یا /done بزنید.")
 
@@ -186,11 +187,11 @@ async def start_score_entry(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['current_task_id'] = task_id
 
     # بررسی امتیاز قبلی
-    previous_score = ReviewService.get_latest_score(task_id)
+    previous_score = await ReviewService.aget_latest_score(task_id)
 
     if previous_score:
         message = (
@@ -223,7 +224,7 @@ async def receive_score(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return ADMIN_TASK_SCORE
 
     # ذخیره امتیاز
-    result = ReviewService.add_score(task_id, ADMIN_ID, score_value)
+    result = await ReviewService.aadd_score(task_id, ADMIN_ID, score_value)
 
     if result:
         await update.message.reply_text(f"✅ امتیاز ({score_value}/10) با موفقیت ثبت شد!")
@@ -259,11 +260,11 @@ async def cancel_review_entry(update: Update, context: ContextTypes.DEFAULT_TYPE
 
 completed_tasks_conv_handler = ConversationHandler(
     entry_points=[
-        CallbackQueryHandler(start_opinion_entry, pattern='^admin_opinion_'),
-        CallbackQueryHandler(start_positive_entry, pattern='^admin_positive_'),
-        CallbackQueryHandler(start_negative_entry, pattern='^admin_negative_'),
-        CallbackQueryHandler(start_suggestion_entry, pattern='^admin_suggestion_'),
-        CallbackQueryHandler(start_score_entry, pattern='^admin_score_'),
+        route_handler("admin_opinion_{task_id:int}", start_opinion_entry),
+        route_handler("admin_positive_{task_id:int}", start_positive_entry),
+        route_handler("admin_negative_{task_id:int}", start_negative_entry),
+        route_handler("admin_suggestion_{task_id:int}", start_suggestion_entry),
+        route_handler("admin_score_{task_id:int}", start_score_entry),
     ],
     states={
         ADMIN_REVIEW_OPINION_TEXT: [
@@ -296,5 +297,7 @@ completed_tasks_conv_handler = ConversationHandler(
     per_message=False,
     per_chat=True,
     per_user=True,
-    allow_reentry=True
+    allow_reentry=True,
+    name="completed_tasks_conv_handler",
+    persistent=True
 )
\ No newline at end of file
@@ -3,6 +3,7 @@
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
 from services.task_service import TaskService
+from utils.keyboards import parse_page_callback, get_pagination_row
 
 
 async def show_completed_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -10,8 +11,10 @@ async def show_completed_tasks(update: Update, context: ContextTypes.DEFAULT_TYP
     query = update.callback_query
     await query.answer()
 
-    # دریافت کارهای تحویل شده
-    completed_tasks = TaskService.get_completed_submitted_tasks()
+    # دریافت کارهای تحویل شده (صفحه‌بندی شده)
+    direction, page_cursor = parse_page_callback(query.data)
+    page = await TaskService.aget_completed_submitted_tasks_page(page_cursor, direction)
+    completed_tasks = page['items']
 
     if not completed_tasks:
         keyboard = [[InlineKeyboardButton("🔙 بازگشت به منو", callback_data="back_to_main_menu")]]
@@ -35,11 +38,15 @@ async def show_completed_tasks(update: Update, context: ContextTypes.DEFAULT_TYP
             InlineKeyboardButton(button_text, callback_data=f"review_task_{task_id}")
         ])
 
+    pagination_row = get_pagination_row("completed_tasks", page)
+    if pagination_row:
+        keyboard.append(pagination_row)
+
     keyboard.append([InlineKeyboardButton("🔙 بازگشت به منو", callback_data="back_to_main_menu")])
 
     await query.edit_message_text(
-        f"✅ **کارهای تحویل شده** ({len(completed_tasks)} کار)\n\n"
-        f"لطفاً کار مورد نظر را برای بررسی انتخاب کنید:",
+        "✅ **کارهای تحویل شده**\n\n"
+        "لطفاً کار مورد نظر را برای بررسی انتخاب کنید:",
         reply_markup=InlineKeyboardMarkup(keyboard),
         parse_mode='Markdown'
     )
\ No newline at end of file
@@ -3,7 +3,8 @@
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
 from services.work_service import WorkService
-from services.file_service import FileService
+from services.delivery_service import DeliveryService, INTERACTIVE
+from services.file_service import CAPTION_LIMIT
 
 
 async def show_employee_outputs(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -11,11 +12,11 @@ async def show_employee_outputs(update: Update, context: ContextTypes.DEFAULT_TY
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     admin_telegram_id = query.from_user.id
 
     # دریافت تمام داده‌های کاری
-    all_work_data = WorkService.get_all_work_data(task_id)
+    all_work_data = await WorkService.aget_all_work_data(task_id)
 
     await query.edit_message_text(
         f"📊 **خروجی‌های کارمند**\n\n"
@@ -23,125 +24,62 @@ async def show_employee_outputs(update: Update, context: ContextTypes.DEFAULT_TY
         parse_mode='Markdown'
     )
 
-    # ========== 1. دانش ==========
-    knowledge_data = all_work_data.get('knowledge', [])
-    if knowledge_data:
-        await context.bot.send_message(
-            chat_id=admin_telegram_id,
-            text="━━━━━━━━━━━━━━━━━\n📚 **دانش‌های ثبت شده**",
-            parse_mode='Markdown'
-        )
-
-        for idx, item in enumerate(knowledge_data, 1):
-            if item.get('text_content'):
-                await context.bot.send_message(
-                    chat_id=admin_telegram_id,
-                    text=f"**#{idx}**\n{item['text_content']}",
-                    parse_mode='Markdown'
-                )
+    # ارسال‌ها در صف DeliveryService قرار می‌گیرند (ترتیب chat حفظ و محدودیت نرخ رعایت می‌شود)
+    bot = context.bot
+    sections = [
+        ('knowledge', "📚 **دانش‌های ثبت شده**", "هیچ دانشی ثبت نشده است."),       # 1. دانش
+        ('suggestion', "💡 **پیشنهادات ثبت شده**", "هیچ پیشنهادی ثبت نشده است."),   # 2. پیشنهادات
+        ('results', "📋 **نتایج ثبت شده**", "هیچ نتیجه‌ای ثبت نشده است."),         # 3. نتایج
+    ]
+
+    for data_type, header, empty_text in sections:
+        items = all_work_data.get(data_type, [])
+        if not items:
+            DeliveryService.enqueue_message(
+                bot, admin_telegram_id, f"━━━━━━━━━━━━━━━━━\n{header}\n\n{empty_text}", INTERACTIVE, parse_mode='Markdown'
+            )
+            continue
 
-            if item.get('file_id'):
-                await FileService.send_file_to_user(
-                    context.bot,
-                    admin_telegram_id,
-                    item['file_id'],
-                    item['file_type']
-                )
-    else:
-        await context.bot.send_message(
-            chat_id=admin_telegram_id,
-            text="━━━━━━━━━━━━━━━━━\n📚 **دانش‌های ثبت شده**\n\nهیچ دانشی ثبت نشده است.",
-            parse_mode='Markdown'
+        DeliveryService.enqueue_message(
+            bot, admin_telegram_id, f"━━━━━━━━━━━━━━━━━\n{header}", INTERACTIVE, parse_mode='Markdown'
         )
 
-    # ========== 2. پیشنهادات ==========
-    suggestion_data = all_work_data.get('suggestion', [])
-    if suggestion_data:
-        await context.bot.send_message(
-            chat_id=admin_telegram_id,
-            text="━━━━━━━━━━━━━━━━━\n💡 **پیشنهادات ثبت شده**",
-            parse_mode='Markdown'
-        )
+        # فایل‌های پشت سر هم آلبوم می‌شوند و متن هر آیتم caption فایل آن است
+        files = []
+        for idx, item in enumerate(items, 1):
+            text = f"**#{idx}**\n{item['text_content']}" if item.get('text_content') else None
 
-        for idx, item in enumerate(suggestion_data, 1):
-            if item.get('text_content'):
-                await context.bot.send_message(
-                    chat_id=admin_telegram_id,
-                    text=f"**#{idx}**\n{item['text_content']}",
-                    parse_mode='Markdown'
-                )
+            if item.get('file_id') and (not text or len(text) <= CAPTION_LIMIT):
+                files.append({'file_id': item['file_id'], 'file_type': item['file_type'], 'caption': text})
+                continue
 
+            # متن بدون فایل (یا بلندتر از caption) پیام جداست؛ آلبوم قبلی اول ارسال می‌شود
+            DeliveryService.enqueue_files(bot, admin_telegram_id, files, INTERACTIVE, parse_mode='Markdown')
+            files = []
+            if text:
+                DeliveryService.enqueue_message(bot, admin_telegram_id, text, INTERACTIVE, parse_mode='Markdown')
             if item.get('file_id'):
-                await FileService.send_file_to_user(
-                    context.bot,
-                    admin_telegram_id,
-                    item['file_id'],
-                    item['file_type']
-                )
-    else:
-        await context.bot.send_message(
-            chat_id=admin_telegram_id,
-            text="━━━━━━━━━━━━━━━━━\n💡 **پیشنهادات ثبت شده**\n\nهیچ پیشنهادی ثبت نشده است.",
-            parse_mode='Markdown'
-        )
-
-    # ========== 3. نتایج ==========
-    results_data = all_work_data.get('results', [])
-    if results_data:
-        await context.bot.send_message(
-            chat_id=admin_telegram_id,
-            text="━━━━━━━━━━━━━━━━━\n📋 **نتایج ثبت شده**",
-            parse_mode='Markdown'
-        )
-
-        for idx, item in enumerate(results_data, 1):
-            if item.get('text_content'):
-                await context.bot.send_message(
-                    chat_id=admin_telegram_id,
-                    text=f"**#{idx}**\n{item['text_content']}",
-                    parse_mode='Markdown'
-                )
+                files.append({'file_id': item['file_id'], 'file_type': item['file_type']})
 
-            if item.get('file_id'):
-                await FileService.send_file_to_user(
-                    context.bot,
-                    admin_telegram_id,
-                    item['file_id'],
-                    item['file_type']
-                )
-    else:
-        await context.bot.send_message(
-            chat_id=admin_telegram_id,
-            text="━━━━━━━━━━━━━━━━━\n📋 **نتایج ثبت شده**\n\nهیچ نتیجه‌ای ثبت نشده است.",
-            parse_mode='Markdown'
-        )
+        DeliveryService.enqueue_files(bot, admin_telegram_id, files, INTERACTIVE, parse_mode='Markdown')
 
     # ========== 4. امتیاز خود ==========
     # دریافت اطلاعات کار برای گرفتن user_id
     from services.task_service import TaskService
-    task = TaskService.get_task(task_id, with_details=True)
+    task = await TaskService.aget_task(task_id, with_details=True)
     if task:
         user_id = task.get('assigned_to_id')
-        self_score_data = WorkService.get_self_score(task_id, user_id)
+        self_score_data = await WorkService.aget_self_score(task_id, user_id)
 
         if self_score_data:
             score = self_score_data.get('self_score')
-            await context.bot.send_message(
-                chat_id=admin_telegram_id,
-                text=f"━━━━━━━━━━━━━━━━━\n⭐ **امتیاز خود کارمند:** {score}/10",
-                parse_mode='Markdown'
-            )
+            score_text = f"━━━━━━━━━━━━━━━━━\n⭐ **امتیاز خود کارمند:** {score}/10"
         else:
-            await context.bot.send_message(
-                chat_id=admin_telegram_id,
-                text="━━━━━━━━━━━━━━━━━\n⭐ **امتیاز خود کارمند:** ثبت نشده",
-                parse_mode='Markdown'
-            )
+            score_text = "━━━━━━━━━━━━━━━━━\n⭐ **امتیاز خود کارمند:** ثبت نشده"
+        DeliveryService.enqueue_message(bot, admin_telegram_id, score_text, INTERACTIVE, parse_mode='Markdown')
 
     # دکمه بازگشت
     keyboard = [[InlineKeyboardButton("🔙 بازگشت به پنل بررسی", callback_data=f"review_task_{task_id}")]]
-    await context.bot.send_message(
-        chat_id=admin_telegram_id,
-        text="━━━━━━━━━━━━━━━━━",
-        reply_markup=InlineKeyboardMarkup(keyboard)
-    )
\ No newline at end of file
+    DeliveryService.enqueue_message(
+        bot, admin_telegram_id, "━━━━━━━━━━━━━━━━━", INTERACTIVE, reply_markup=InlineKeyboardMarkup(keyboard)
+    )
@@ -11,16 +11,16 @@ async def show_task_review_panel(update: Update, context: ContextTypes.DEFAULT_T
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
 
     # دریافت اطلاعات کار
-    task = TaskService.get_task(task_id, with_details=True)
+    task = await TaskService.aget_task(task_id, with_details=True)
     if not task:
         await query.edit_message_text("❌ کار یافت نشد!")
         return
 
     # دریافت خلاصه نظرات ادمین
-    review_summary = ReviewService.get_review_summary(task_id)
+    review_summary = await ReviewService.aget_review_summary(task_id)
 
     message_text = (
         f"📋 **پنل بررسی کار**\n\n"
@@ -11,11 +11,11 @@ async def show_task_profile_for_admin(update: Update, context: ContextTypes.DEFA
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     admin_telegram_id = query.from_user.id
 
     # دریافت اطلاعات کامل کار
-    task = TaskService.get_task(task_id, with_details=True)
+    task = await TaskService.aget_task(task_id, with_details=True)
     if not task:
         await query.edit_message_text("❌ کار یافت نشد!")
         return
@@ -37,7 +37,7 @@ async def show_task_profile_for_admin(update: Update, context: ContextTypes.DEFA
 
     # ========== 1. توضیحات ==========
     description = task.get('description')
-    description_files = FileService.get_section_files(task_id, 'description')
+    description_files = await FileService.aget_section_files(task_id, 'description')
 
     if description or description_files:
         await context.bot.send_message(
@@ -50,13 +50,7 @@ async def show_task_profile_for_admin(update: Update, context: ContextTypes.DEFA
             await context.bot.send_message(chat_id=admin_telegram_id, text=description)
 
         if description_files:
-            for file_data in description_files:
-                await FileService.send_file_to_user(
-                    context.bot,
-                    admin_telegram_id,
-                    file_data['file_id'],
-                    file_data['file_type']
-                )
+            await FileService.send_files_grouped(context.bot, admin_telegram_id, description_files)
     else:
         await context.bot.send_message(
             chat_id=admin_telegram_id,
@@ -66,7 +60,7 @@ async def show_task_profile_for_admin(update: Update, context: ContextTypes.DEFA
 
     # ========== 2. نتایج مورد انتظار ==========
     results = task.get('results')
-    results_files = FileService.get_section_files(task_id, 'results')
+    results_files = await FileService.aget_section_files(task_id, 'results')
 
     if results or results_files:
         await context.bot.send_message(
@@ -79,13 +73,7 @@ async def show_task_profile_for_admin(update: Update, context: ContextTypes.DEFA
             await context.bot.send_message(chat_id=admin_telegram_id, text=results)
 
         if results_files:
-            for file_data in results_files:
-                await FileService.send_file_to_user(
-                    context.bot,
-                    admin_telegram_id,
-                    file_data['file_id'],
-                    file_data['file_type']
-                )
+            await FileService.send_files_grouped(context.bot, admin_telegram_id, results_files)
     else:
         await context.bot.send_message(
             chat_id=admin_telegram_id,
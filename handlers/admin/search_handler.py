@@ -0,0 +1,79 @@
+# handlers/admin/search_handler.py
+
+from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
+from telegram.ext import ContextTypes
+from config import ADMIN_ID
+from services.search_service import SearchService
+
+SEARCH_USAGE = (
+    "🔎 جستجو در کارها، دانش، پیشنهادها، نتایج و نظرات ادمین\n\n"
+    "/search <عبارت>\n"
+    "همه کلمه‌ها باید در نتیجه باشند؛ برای جستجوی پیشوندی کلمه را با * تمام کنید (مثال: گزارش*)."
+)
+
+
+def _build_search_keyboard(results) -> InlineKeyboardMarkup:
+    """دکمه مشاهده کارهای نتایج و دکمه‌های صفحه‌بندی"""
+    keyboard = []
+    seen = set()
+    for item in results['items']:
+        task_id = item['task_id']
+        if task_id in seen or not item['task_title']:
+            continue
+        seen.add(task_id)
+        keyboard.append([
+            InlineKeyboardButton(f"📋 #{task_id} {item['task_title']}", callback_data=f"task_profile_{task_id}")
+        ])
+
+    pagination_row = []
+    if results['has_prev']:
+        pagination_row.append(InlineKeyboardButton("◀️ قبلی", callback_data=f"search_pg_{results['page'] - 1}"))
+    if results['has_next']:
+        pagination_row.append(InlineKeyboardButton("بعدی ▶️", callback_data=f"search_pg_{results['page'] + 1}"))
+    if pagination_row:
+        keyboard.append(pagination_row)
+
+    return InlineKeyboardMarkup(keyboard)
+
+
+async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """دستور /search <عبارت> - جستجوی متن کامل (فقط ادمین)"""
+    if update.effective_user.id != ADMIN_ID:
+        await update.message.reply_text("❌ شما دسترسی به این بخش را ندارید.")
+        return
+
+    text = ' '.join(context.args).strip()
+    results = await SearchService.asearch(text) if text else None
+    if results is None:
+        await update.message.reply_text(SEARCH_USAGE)
+        return
+
+    # متن جستجو برای صفحه‌بندی نگه داشته می‌شود (callback_data جای آن را ندارد)
+    context.user_data['search_query'] = text
+
+    await update.message.reply_text(
+        SearchService.format_results(text, results),
+        reply_markup=_build_search_keyboard(results),
+        parse_mode='HTML'
+    )
+
+
+async def show_search_page(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """صفحه‌های بعدی/قبلی نتایج جستجو"""
+    query = update.callback_query
+    await query.answer()
+
+    if query.from_user.id != ADMIN_ID:
+        return
+
+    text = context.user_data.get('search_query')
+    results = await SearchService.asearch(text, context.route_args['page']) if text else None
+    if results is None:
+        await query.edit_message_text("⚠️ جستجو منقضی شده است؛ دوباره /search را بزنید.")
+        return
+
+    await query.edit_message_text(
+        SearchService.format_results(text, results),
+        reply_markup=_build_search_keyboard(results),
+        parse_mode='HTML'
+    )
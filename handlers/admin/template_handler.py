@@ -0,0 +1,85 @@
+# handlers/admin/template_handler.py
+
+from telegram import Update
+from telegram.ext import ContextTypes
+from config import ADMIN_ID
+from services.template_service import TemplateService
+
+TEMPLATE_USAGE = (
+    "🔁 **ساخت قالب تکرارشونده از یک کار**\n\n"
+    "/make\\_template <task\\_id> <قاعده> [HH:MM]\n\n"
+    "قاعده‌ها: daily | weekly:N (0=دوشنبه تا 6=یکشنبه) | monthly:N (1 تا 28) | interval:N (هر N روز)\n"
+    "مثال: /make\\_template 12 weekly:5 09:00"
+)
+DEFAULT_TIME_OF_DAY = "09:00"
+
+
+async def make_template(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """دستور /make_template <task_id> <rule> [HH:MM] - ساخت قالب تکرارشونده از روی یک کار"""
+    if update.effective_user.id != ADMIN_ID:
+        await update.message.reply_text("❌ شما دسترسی به این بخش را ندارید.")
+        return
+
+    if len(context.args) not in (2, 3) or not context.args[0].isdigit():
+        await update.message.reply_text(TEMPLATE_USAGE, parse_mode='Markdown')
+        return
+
+    task_id = int(context.args[0])
+    recurrence = context.args[1].lower()
+    time_of_day = context.args[2] if len(context.args) == 3 else DEFAULT_TIME_OF_DAY
+
+    try:
+        hour, minute = (int(part) for part in time_of_day.split(':'))
+        template = await TemplateService.create_from_task(task_id, recurrence, f"{hour:02d}:{minute:02d}")
+    except ValueError as e:
+        await update.message.reply_text(f"❌ {e}\n\n{TEMPLATE_USAGE}", parse_mode='Markdown')
+        return
+
+    if not template:
+        await update.message.reply_text("❌ کار یافت نشد یا خطا در ساخت قالب!")
+        return
+
+    await update.message.reply_text(
+        f"✅ قالب #{template['id']} ساخته شد.\n"
+        f"🔁 تکرار: {recurrence}\n"
+        f"📅 اولین ایجاد: {template['next_run']}"
+    )
+
+
+async def list_templates(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """دستور /templates - لیست قالب‌های فعال"""
+    if update.effective_user.id != ADMIN_ID:
+        await update.message.reply_text("❌ شما دسترسی به این بخش را ندارید.")
+        return
+
+    templates = await TemplateService.get_templates()
+    if not templates:
+        await update.message.reply_text("📭 هیچ قالب فعالی وجود ندارد.")
+        return
+
+    text = "🔁 قالب‌های فعال:\n\n"
+    for template in templates:
+        text += (
+            f"#{template['id']} {template['title']}\n"
+            f"  👤 {template['employee_name'] or 'بدون تخصیص'} | 🔁 {template['recurrence']} "
+            f"ساعت {template['time_of_day']}\n"
+            f"  ⏭ بعدی: {template['next_run']}\n"
+        )
+    text += "\nبرای حذف: /del_template <id>"
+    await update.message.reply_text(text)
+
+
+async def delete_template(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """دستور /del_template <id> - غیرفعال کردن قالب"""
+    if update.effective_user.id != ADMIN_ID:
+        await update.message.reply_text("❌ شما دسترسی به این بخش را ندارید.")
+        return
+
+    if len(context.args) != 1 or not context.args[0].isdigit():
+        await update.message.reply_text("❌ استفاده: /del_template <id>")
+        return
+
+    if await TemplateService.deactivate(int(context.args[0])):
+        await update.message.reply_text("✅ قالب غیرفعال شد.")
+    else:
+        await update.message.reply_text("❌ قالب فعالی با این شناسه یافت نشد.")
@@ -11,7 +11,7 @@ async def show_user_management_menu(update: Update, context: ContextTypes.DEFAUL
     await query.answer()
 
     # دریافت همه کاربران (غیر از ادمین)
-    users = UserService.get_all_users()
+    users = await UserService.aget_all_users()
 
     if not users:
         keyboard = [[InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_main_menu")]]
@@ -44,8 +44,8 @@ async def show_user_details(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    telegram_id = int(query.data.split('_')[1])
-    user = UserService.get_user_info(telegram_id)
+    telegram_id = context.route_args['telegram_id']
+    user = await UserService.aget_user_info(telegram_id)
 
     if not user:
         await query.edit_message_text("❌ کاربر یافت نشد!")
@@ -80,8 +80,8 @@ async def request_approval_confirmation(update: Update, context: ContextTypes.DE
     query = update.callback_query
     await query.answer()
 
-    telegram_id = int(query.data.split('_')[1])
-    user = UserService.get_user_info(telegram_id)
+    telegram_id = context.route_args['telegram_id']
+    user = await UserService.aget_user_info(telegram_id)
 
     if not user:
         await query.edit_message_text("❌ کاربر یافت نشد!")
@@ -113,15 +113,15 @@ async def confirm_approval(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    telegram_id = int(query.data.split('_')[2])
-    user = UserService.get_user_info(telegram_id)
+    telegram_id = context.route_args['telegram_id']
+    user = await UserService.aget_user_info(telegram_id)
 
     if not user:
         await query.edit_message_text("❌ کاربر یافت نشد!")
         return
 
     # تبدیل به کارمند
-    success = UserService.approve_employee(telegram_id)
+    success = await UserService.aapprove_employee(telegram_id)
 
     if success:
         await query.edit_message_text(
@@ -5,6 +5,8 @@ from services.task_service import TaskService
 from services.file_service import FileService
 from services.work_service import WorkService
 from services.review_service import ReviewService
+from services.delivery_service import DeliveryService, INTERACTIVE
+from utils.keyboards import parse_page_callback, get_pagination_row
 
 
 def get_employee_main_keyboard():
@@ -22,40 +24,37 @@ async def show_archived_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE
 
     user_telegram_id = query.from_user.id
 
-    conn = create_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT id FROM Users WHERE telegram_id = ?", (user_telegram_id,))
-    user_db_id = cursor.fetchone()[0]
-
-    # دریافت کارهای آرشیو شده با امتیاز ادمین
-    cursor.execute("""
-        SELECT t.id, t.title, COALESCE(ar.admin_score, 'بدون امتیاز') as admin_score
-        FROM Tasks t
-        LEFT JOIN AdminReviews ar ON t.id = ar.task_id AND ar.review_type = 'score'
-        WHERE t.assigned_to_id = ? AND t.status = 'archived'
-        ORDER BY t.completion_date DESC
-    """, (user_db_id,))
+    user = await UserService.aget_user_info(user_telegram_id)
+    if not user:
+        await query.edit_message_text("❌ کاربر یافت نشد!")
+        return
 
-    archived_tasks = cursor.fetchall()
-    conn.close()
+    # دریافت کارهای آرشیو شده با امتیاز ادمین (صفحه‌بندی شده)
+    direction, page_cursor = parse_page_callback(query.data)
+    page = await TaskService.aget_archived_tasks_with_scores_page(user['id'], page_cursor, direction)
+    archived_tasks = page['items']
 
     if not archived_tasks:
         await query.edit_message_text("هیچ کار آرشیو شده‌ای وجود ندارد.")
         return
 
     keyboard = []
-    for task_id, title, admin_score in archived_tasks:
-        score_text = f"({admin_score})" if admin_score != 'بدون امتیاز' else ""
+    for task in archived_tasks:
+        task_id, title, admin_score = task['id'], task['title'], task['latest_score']
+        score_text = f"({admin_score})" if admin_score is not None else ""
         keyboard.append([
             InlineKeyboardButton(f"{title} {score_text}", callback_data=f"view_archive_{task_id}")
         ])
 
+    pagination_row = get_pagination_row("archive_tasks", page)
+    if pagination_row:
+        keyboard.append(pagination_row)
+
     keyboard.append([InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_main_menu_employee")])
 
     reply_markup = InlineKeyboardMarkup(keyboard)
     await query.edit_message_text(
-        f"آرشیو کارها ({len(archived_tasks)} کار):",
+        "آرشیو کارها:",
         reply_markup=reply_markup
     )
 
@@ -65,40 +64,27 @@ async def view_archived_task_details(update: Update, context: ContextTypes.DEFAU
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     user_telegram_id = query.from_user.id
 
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-
         # اطلاعات کار
-        cursor.execute("""
-            SELECT t.title, t.description, t.duration, t.results, t.importance, 
-                   t.priority, t.completion_date, c.name as category_name
-            FROM Tasks t
-            LEFT JOIN Categories c ON t.category_id = c.id
-            WHERE t.id = ?
-        """, (task_id,))
-
-        task_info = cursor.fetchone()
-
-        if not task_info:
+        task = await TaskService.aget_task(task_id, with_details=True)
+        if not task:
             await query.edit_message_text("❌ کار یافت نشد!")
-            conn.close()
             return
 
         # نظرات ادمین
-        cursor.execute("""
-            SELECT review_type, text_content, file_id, file_type, admin_score
-            FROM AdminReviews
-            WHERE task_id = ?
-            ORDER BY review_type
-        """, (task_id,))
-        admin_reviews = cursor.fetchall()
+        admin_reviews = await ReviewService.aget_all_reviews(task_id)
 
-        # اطلاعات کار
-        title, description, duration, results, importance, priority, completion_date, category_name = task_info
+        title = task.get('title')
+        description = task.get('description')
+        duration = task.get('duration')
+        results = task.get('results')
+        importance = task.get('importance')
+        priority = task.get('priority')
+        completion_date = task.get('completion_date')
+        category_name = task.get('category_name')
 
         message_text = (
             f"📋 **جزئیات کار آرشیو شده**\n\n"
@@ -117,7 +103,7 @@ async def view_archived_task_details(update: Update, context: ContextTypes.DEFAU
         await query.edit_message_text(message_text, parse_mode='Markdown')
 
         # اگر نظری ثبت نشده باشد، فقط دکمه بازگشت و متن نمایش داده می‌شود و برمی‌گردد
-        if not admin_reviews:
+        if not any(admin_reviews.values()):
             keyboard = [[InlineKeyboardButton("🔙 بازگشت به آرشیو", callback_data="archive_tasks")]]
             await context.bot.send_message(
                 chat_id=user_telegram_id,
@@ -135,70 +121,50 @@ async def view_archived_task_details(update: Update, context: ContextTypes.DEFAU
             'score': '⭐ امتیاز مدیر'
         }
 
-        # گروه‌بندی نظرات بر اساس نوع
+        # گروه‌بندی نظرات بر اساس نوع (به ترتیب زمان ثبت)
         grouped_reviews = {}
-        for review_type, text_content, file_id, file_type, admin_score in admin_reviews:
-            if review_type not in grouped_reviews:
-                grouped_reviews[review_type] = []
-            grouped_reviews[review_type].append({
-                'text': text_content,
-                'file_id': file_id,
-                'file_type': file_type,
-                'score': admin_score
-            })
-
-        # ارسال نظرات به ترتیب
+        for review_type, reviews in admin_reviews.items():
+            if not reviews:
+                continue
+            grouped_reviews[review_type] = [{
+                'text': review['text_content'],
+                'file_id': review['file_id'],
+                'file_type': review['file_type'],
+                'score': review['admin_score']
+            } for review in reversed(reviews)]
+
+        # ارسال نظرات به ترتیب از طریق صف DeliveryService (ترتیب chat حفظ می‌شود)
+        bot = context.bot
         for review_key, review_title in review_types.items():
             if review_key in grouped_reviews:
                 review_data = grouped_reviews[review_key]
 
                 if review_key == 'score':
                     # امتیاز فقط متن است
-                    score = review_data[0].get('score', 'ثبت نشده')
-                    await context.bot.send_message(
-                        chat_id=user_telegram_id,
-                        text=f"**{review_title}**: `{score}/10`",
-                        parse_mode='Markdown'
+                    score = review_data[-1].get('score', 'ثبت نشده')
+                    DeliveryService.enqueue_message(
+                        bot, user_telegram_id, f"**{review_title}**: `{score}/10`", INTERACTIVE, parse_mode='Markdown'
                     )
                     continue
 
-                await context.bot.send_message(
-                    chat_id=user_telegram_id,
-                    text=f"**{review_title}**:",
-                    parse_mode='Markdown'
+                DeliveryService.enqueue_message(
+                    bot, user_telegram_id, f"**{review_title}**:", INTERACTIVE, parse_mode='Markdown'
                 )
 
                 for item in review_data:
                     if item['text']:
-                        await context.bot.send_message(
-                            chat_id=user_telegram_id,
-                            text=item['text']
-                        )
+                        DeliveryService.enqueue_message(bot, user_telegram_id, item['text'], INTERACTIVE)
 
                     if item['file_id']:
-                        try:
-                            file_type = item['file_type']
-                            if file_type == 'photo':
-                                await context.bot.send_photo(chat_id=user_telegram_id, photo=item['file_id'])
-                            elif file_type == 'video':
-                                await context.bot.send_video(chat_id=user_telegram_id, video=item['file_id'])
-                            elif file_type == 'voice':
-                                await context.bot.send_voice(chat_id=user_telegram_id, voice=item['file_id'])
-                            elif file_type == 'document':
-                                await context.bot.send_document(chat_id=user_telegram_id, document=item['file_id'])
-                        except Exception as e:
-                            print(f"خطا در ارسال فایل: {e}")
-                            await context.bot.send_message(
-                                chat_id=user_telegram_id,
-                                text=f"⚠️ خطا در ارسال فایل"
-                            )
+                        DeliveryService.enqueue_file(
+                            bot, user_telegram_id, item['file_id'], item['file_type'], INTERACTIVE,
+                            fallback_text="⚠️ خطا در ارسال فایل"
+                        )
 
         # دکمه بازگشت
         keyboard = [[InlineKeyboardButton("🔙 بازگشت به آرشیو", callback_data="archive_tasks")]]
-        await context.bot.send_message(
-            chat_id=user_telegram_id,
-            text="━━━━━━━━━━━━━━━━━━━━",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+        DeliveryService.enqueue_message(
+            bot, user_telegram_id, "━━━━━━━━━━━━━━━━━━━━", INTERACTIVE, reply_markup=InlineKeyboardMarkup(keyboard)
         )
 
     except Exception as e:
@@ -223,7 +189,4 @@ async def view_archived_task_details(update: Update, context: ContextTypes.DEFAU
                 reply_markup=InlineKeyboardMarkup([[ \
                     InlineKeyboardButton("🔙 بازگشت", callback_data="archive_tasks")
                 ]])
-            )
-    finally:
-        if conn:
-            conn.close()
\ No newline at end of file
+            )
\ No newline at end of file
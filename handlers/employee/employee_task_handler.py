@@ -4,9 +4,12 @@ import datetime
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes, ConversationHandler, CallbackQueryHandler, CommandHandler
 
-from database.connection import create_connection
 from services.user_service import UserService
 from services.task_service import TaskService
+from services.file_service import FileService
+from services.work_service import WorkService
+from services.delivery_service import DeliveryService, INTERACTIVE
+from utils.keyboards import parse_page_callback, get_pagination_row
 
 # --- وضعیت‌های مکالمه ---
 TASK_START_CONFIRMATION, TASK_WORK_VIEW = range(10, 12)
@@ -23,25 +26,6 @@ def get_employee_main_keyboard():
     return InlineKeyboardMarkup(keyboard)
 
 
-def get_active_task_id(user_db_id):
-    """یافتن کار فعال کاربر"""
-    conn = create_connection()
-    if not conn:
-        return None
-
-    try:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT task_id FROM TaskActivities 
-            WHERE user_id = ? AND end_time IS NULL 
-            LIMIT 1
-        """, (user_db_id,))
-        result = cursor.fetchone()
-        return result[0] if result else None
-    finally:
-        conn.close()
-
-
 async def back_to_tasks_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """بازگشت به فهرست کارها"""
     query = update.callback_query
@@ -66,41 +50,28 @@ async def list_employee_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE
 
     user_telegram_id = query.from_user.id
 
-    conn = create_connection()
-    if not conn:
-        await query.edit_message_text("❌ خطا در اتصال به دیتابیس!")
-        return
-
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT id FROM Users WHERE telegram_id = ?", (user_telegram_id,))
-    result = cursor.fetchone()
-    if not result:
-        conn.close()
+    user = await UserService.aget_user_info(user_telegram_id)
+    if not user:
         await query.edit_message_text("❌ کاربر یافت نشد!")
         return
 
-    user_db_id = result[0]
+    user_db_id = user['id']
 
-    # فقط کارهای pending و in_progress
-    cursor.execute("""
-        SELECT id, title, status FROM Tasks 
-        WHERE assigned_to_id = ? AND status IN ('pending', 'in_progress')
-        ORDER BY status DESC
-    """, (user_db_id,))
-    tasks = cursor.fetchall()
-
-    # دریافت کار فعال
-    active_task_id = get_active_task_id(user_db_id)
-
-    conn.close()
+    # فقط کارهای pending و in_progress (صفحه‌بندی شده)
+    direction, page_cursor = parse_page_callback(query.data)
+    page = await TaskService.aget_active_employee_tasks_page(user_db_id, page_cursor, direction)
+    tasks = page['items']
 
     if not tasks:
         await query.edit_message_text("📭 هیچ کار فعالی به شما محول نشده است.")
         return
 
+    # دریافت کار فعال
+    active_task_id = await WorkService.aget_active_task_id(user_db_id)
+
     keyboard = []
-    for task_id, task_title, status in tasks:
+    for task in tasks:
+        task_id, task_title = task['id'], task['title']
         if task_id == active_task_id:
             title_display = f"🟢 {task_title}"
         else:
@@ -112,6 +83,10 @@ async def list_employee_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE
         ]
         keyboard.append(row)
 
+    pagination_row = get_pagination_row("list_tasks", page)
+    if pagination_row:
+        keyboard.append(pagination_row)
+
     keyboard.append([InlineKeyboardButton("🗂 آرشیو کارها", callback_data="archive_tasks")])
     keyboard.append([InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_main_menu_employee")])
 
@@ -124,57 +99,26 @@ async def view_task_details(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[1])
+    task_id = context.route_args['task_id']
     user_telegram_id = query.from_user.id
 
-    conn = create_connection()
-    if not conn:
-        await query.edit_message_text("❌ خطا در اتصال به دیتابیس!")
-        return
-
-    cursor = conn.cursor()
-
     # دریافت اطلاعات کامل کار
-    cursor.execute("""
-        SELECT t.title, t.description, t.duration, t.results, t.importance, 
-               t.priority, t.creation_date, c.name as category_name
-        FROM Tasks t
-        LEFT JOIN Categories c ON t.category_id = c.id
-        WHERE t.id = ?
-    """, (task_id,))
-    task_info = cursor.fetchone()
-
-    if not task_info:
-        conn.close()
+    task = await TaskService.aget_task(task_id, with_details=True)
+    if not task:
         await query.edit_message_text("❌ کار یافت نشد!")
         return
 
-    title, description, duration, results, importance, priority, creation_date, category_name = task_info
-
-    # 🔍 دیباگ: چک کردن فایل‌های بخش توضیحات
-    cursor.execute("""
-        SELECT file_id, file_type FROM TaskSectionFiles 
-        WHERE task_id = ? AND section_type = 'description'
-    """, (task_id,))
-    description_files = cursor.fetchall()
-    print(f"🔍 DEBUG: تعداد فایل‌های توضیحات = {len(description_files)}")
-    print(f"🔍 DEBUG: فایل‌های توضیحات = {description_files}")
-
-    # 🔍 دیباگ: چک کردن فایل‌های بخش نتایج
-    cursor.execute("""
-        SELECT file_id, file_type FROM TaskSectionFiles 
-        WHERE task_id = ? AND section_type = 'results'
-    """, (task_id,))
-    results_files = cursor.fetchall()
-    print(f"🔍 DEBUG: تعداد فایل‌های نتایج = {len(results_files)}")
-    print(f"🔍 DEBUG: فایل‌های نتایج = {results_files}")
-
-    # 🔍 دیباگ: چک کردن تمام فایل‌ها
-    cursor.execute("SELECT * FROM TaskSectionFiles WHERE task_id = ?", (task_id,))
-    all_files = cursor.fetchall()
-    print(f"🔍 DEBUG: تمام فایل‌های task_id={task_id}: {all_files}")
-
-    conn.close()
+    description_files = await FileService.aget_section_files(task_id, 'description')
+    results_files = await FileService.aget_section_files(task_id, 'results')
+
+    title = task.get('title')
+    description = task.get('description')
+    duration = task.get('duration')
+    results = task.get('results')
+    importance = task.get('importance')
+    priority = task.get('priority')
+    creation_date = task.get('creation_date')
+    category_name = task.get('category_name')
 
     # ========== ارسال شناسنامه خلاصه ==========
     summary_text = (
@@ -190,93 +134,59 @@ async def view_task_details(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.edit_message_text(summary_text, parse_mode='Markdown')
 
     # ========== 1. توضیحات ==========
+    # ارسال‌ها در صف DeliveryService قرار می‌گیرند (ترتیب chat حفظ و محدودیت نرخ رعایت می‌شود)
+    bot = context.bot
     if description or description_files:
-        await context.bot.send_message(
-            chat_id=user_telegram_id,
-            text="━━━━━━━━━━━━━━━━━\n📝 **توضیحات کار**",
-            parse_mode='Markdown'
+        DeliveryService.enqueue_message(
+            bot, user_telegram_id, "━━━━━━━━━━━━━━━━━\n📝 **توضیحات کار**", INTERACTIVE, parse_mode='Markdown'
         )
 
         # متن توضیحات
         if description:
-            await context.bot.send_message(
-                chat_id=user_telegram_id,
-                text=description
-            )
+            DeliveryService.enqueue_message(bot, user_telegram_id, description, INTERACTIVE)
 
         # فایل‌های توضیحات
         if description_files:
-            for file_id, file_type in description_files:
-                try:
-                    if file_type == 'photo':
-                        await context.bot.send_photo(chat_id=user_telegram_id, photo=file_id)
-                    elif file_type == 'video':
-                        await context.bot.send_video(chat_id=user_telegram_id, video=file_id)
-                    elif file_type == 'voice':
-                        await context.bot.send_voice(chat_id=user_telegram_id, voice=file_id)
-                    elif file_type == 'document':
-                        await context.bot.send_document(chat_id=user_telegram_id, document=file_id)
-                except Exception as e:
-                    await context.bot.send_message(
-                        chat_id=user_telegram_id,
-                        text=f"⚠️ خطا در ارسال فایل: {str(e)}"
-                    )
+            DeliveryService.enqueue_files(
+                bot, user_telegram_id, description_files, INTERACTIVE, fallback_text="⚠️ خطا در ارسال فایل."
+            )
         else:
             print("⚠️ هیچ فایلی در بخش توضیحات یافت نشد!")
     else:
-        await context.bot.send_message(
-            chat_id=user_telegram_id,
-            text="━━━━━━━━━━━━━━━━━\n📝 **توضیحات کار**\n\nتوضیحاتی ثبت نشده است.",
+        DeliveryService.enqueue_message(
+            bot, user_telegram_id,
+            "━━━━━━━━━━━━━━━━━\n📝 **توضیحات کار**\n\nتوضیحاتی ثبت نشده است.", INTERACTIVE,
             parse_mode='Markdown'
         )
 
     # ========== 2. نتایج مورد انتظار ==========
     if results or results_files:
-        await context.bot.send_message(
-            chat_id=user_telegram_id,
-            text="━━━━━━━━━━━━━━━━━\n📊 **نتایج مورد انتظار**",
-            parse_mode='Markdown'
+        DeliveryService.enqueue_message(
+            bot, user_telegram_id, "━━━━━━━━━━━━━━━━━\n📊 **نتایج مورد انتظار**", INTERACTIVE, parse_mode='Markdown'
         )
 
         # متن نتایج
         if results:
-            await context.bot.send_message(
-                chat_id=user_telegram_id,
-                text=results
-            )
+            DeliveryService.enqueue_message(bot, user_telegram_id, results, INTERACTIVE)
 
         # فایل‌های نتایج
         if results_files:
-            for file_id, file_type in results_files:
-                try:
-                    if file_type == 'photo':
-                        await context.bot.send_photo(chat_id=user_telegram_id, photo=file_id)
-                    elif file_type == 'video':
-                        await context.bot.send_video(chat_id=user_telegram_id, video=file_id)
-                    elif file_type == 'voice':
-                        await context.bot.send_voice(chat_id=user_telegram_id, voice=file_id)
-                    elif file_type == 'document':
-                        await context.bot.send_document(chat_id=user_telegram_id, document=file_id)
-                except Exception as e:
-                    await context.bot.send_message(
-                        chat_id=user_telegram_id,
-                        text=f"⚠️ خطا در ارسال فایل: {str(e)}"
-                    )
+            DeliveryService.enqueue_files(
+                bot, user_telegram_id, results_files, INTERACTIVE, fallback_text="⚠️ خطا در ارسال فایل."
+            )
         else:
             print("⚠️ هیچ فایلی در بخش نتایج یافت نشد!")
     else:
-        await context.bot.send_message(
-            chat_id=user_telegram_id,
-            text="━━━━━━━━━━━━━━━━━\n📊 **نتایج مورد انتظار**\n\nنتایجی ثبت نشده است.",
+        DeliveryService.enqueue_message(
+            bot, user_telegram_id,
+            "━━━━━━━━━━━━━━━━━\n📊 **نتایج مورد انتظار**\n\nنتایجی ثبت نشده است.", INTERACTIVE,
             parse_mode='Markdown'
         )
 
     # ========== دکمه بازگشت ==========
     keyboard = [[InlineKeyboardButton("🔙 بازگشت به کارها", callback_data="list_tasks")]]
-    await context.bot.send_message(
-        chat_id=user_telegram_id,
-        text="━━━━━━━━━━━━━━━━━",
-        reply_markup=InlineKeyboardMarkup(keyboard)
+    DeliveryService.enqueue_message(
+        bot, user_telegram_id, "━━━━━━━━━━━━━━━━━", INTERACTIVE, reply_markup=InlineKeyboardMarkup(keyboard)
     )
 
 
@@ -305,5 +215,7 @@ employee_conv_handler = ConversationHandler(
     per_message=False,
     per_chat=True,
     per_user=True,
-    allow_reentry=True
+    allow_reentry=True,
+    name="employee_conv_handler",
+    persistent=True
 )
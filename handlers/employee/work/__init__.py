@@ -10,7 +10,7 @@ from .work_knowledge_handler import knowledge_conv_handler, start_knowledge_entr
 from .work_suggestion_handler import suggestion_conv_handler, start_suggestion_entry
 from .work_results_handler import results_conv_handler, start_results_entry
 from .work_score_handler import score_conv_handler, start_self_score_entry
-from .work_submit_handler import submit_task, submit_task_callback, confirm_submit_callback
+from .work_submit_handler import submit_task, confirm_submit_task
 
 __all__ = [
     'show_task_work_panel',
@@ -25,6 +25,5 @@ __all__ = [
     'score_conv_handler',
     'start_self_score_entry',
     'submit_task',
-    'submit_task_callback',
-    'confirm_submit_callback',
+    'confirm_submit_task',
 ]
\ No newline at end of file
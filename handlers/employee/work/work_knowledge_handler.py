@@ -2,13 +2,15 @@
 
 from telegram import Update
 from telegram.ext import (
-    ContextTypes, ConversationHandler, CallbackQueryHandler,
+    ContextTypes, ConversationHandler,
     MessageHandler, filters, CommandHandler
 )
-from database.models.user import UserModel
+from services.user_service import UserService
 from services.work_service import WorkService
+from services.work_data_buffer import WorkDataBuffer
 from services.file_service import FileService
 from utils.constants import WORK_KNOWLEDGE_ENTRY
+from utils.callback_router import route_handler
 
 
 async def start_knowledge_entry(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -16,7 +18,7 @@ async def start_knowledge_entry(update: Update, context: ContextTypes.DEFAULT_TY
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[1])
+    task_id = context.route_args['task_id']
     context.user_data['current_task_id'] = task_id
     context.user_data['knowledge_entries'] = []
 
@@ -35,7 +37,7 @@ async def receive_knowledge_entry(update: Update, context: ContextTypes.DEFAULT_
     user_telegram_id = update.effective_user.id
 
     # دریافت user_id
-    user = UserModel.get_by_telegram_id(user_telegram_id)
+    user = await UserService.aget_user_info(user_telegram_id)
     if not user:
         await update.message.reply_text("❌ کاربر یافت نشد!")
         return ConversationHandler.END
@@ -44,17 +46,33 @@ async def receive_knowledge_entry(update: Update, context: ContextTypes.DEFAULT_
 
     # ذخیره متن
     if update.message.text and update.message.text != '/done':
-        WorkService.add_knowledge(task_id, user_id, text_content=update.message.text)
-        await update.message.reply_text("✅ دانش ثبت شد!\n\nمی‌توانید دانش بیشتری اضافه کنید یا /done بزنید.")
+        # ثبت همراه با علامت تکراری بودن (ورودی رد نمی‌شود، فقط به کارمند اطلاع داده می‌شود)
+        duplicate = await WorkDataBuffer.find_duplicate('knowledge', text_content=update.message.text)
+        await WorkDataBuffer.add(
+            task_id, user_id, 'knowledge', text_content=update.message.text,
+            duplicate_of=duplicate['id'] if duplicate else None
+        )
+        await update.message.reply_text(
+            "✅ دانش ثبت شد!\n\nمی‌توانید دانش بیشتری اضافه کنید یا /done بزنید."
+            + WorkService.format_duplicate_notice(duplicate)
+        )
         return WORK_KNOWLEDGE_ENTRY
 
     # ذخیره فایل
     file_type = FileService.get_file_type_from_message(update.message)
     file_id = FileService.get_file_id_from_message(update.message)
+    file_unique_id = FileService.get_file_unique_id_from_message(update.message)
 
     if file_type and file_id:
-        WorkService.add_knowledge(task_id, user_id, file_id=file_id, file_type=file_type)
-        await update.message.reply_text("✅ فایل دانش ثبت شد!\n\nمی‌توانید دانش بیشتری اضافه کنید یا /done بزنید.")
+        duplicate = await WorkDataBuffer.find_duplicate('knowledge', file_unique_id=file_unique_id)
+        await WorkDataBuffer.add(
+            task_id, user_id, 'knowledge', file_id=file_id, file_type=file_type,
+            file_unique_id=file_unique_id, duplicate_of=duplicate['id'] if duplicate else None
+        )
+        await update.message.reply_text(
+            "✅ فایل دانش ثبت شد!\n\nمی‌توانید دانش بیشتری اضافه کنید یا /done بزنید."
+            + WorkService.format_duplicate_notice(duplicate)
+        )
         return WORK_KNOWLEDGE_ENTRY
 
     await update.message.reply_text("❌ لطفاً متن یا فایل ارسال کنید.")
@@ -65,6 +83,12 @@ async def finish_knowledge_entry(update: Update, context: ContextTypes.DEFAULT_T
     """اتمام ثبت دانش"""
     task_id = context.user_data.get('current_task_id')
 
+    # نوشتن ورودی‌های بافر شده قبل از تأیید نهایی
+    user = await UserService.aget_user_info(update.effective_user.id)
+    if user and await WorkDataBuffer.flush(task_id, user['id'], 'knowledge') is None:
+        await update.message.reply_text("❌ خطا در ذخیره دانش‌ها! لطفاً دوباره /done بزنید.")
+        return WORK_KNOWLEDGE_ENTRY
+
     await update.message.reply_text("✅ ثبت دانش کامل شد!")
 
     # بازگشت به پنل کار
@@ -83,6 +107,10 @@ async def finish_knowledge_entry(update: Update, context: ContextTypes.DEFAULT_T
 
 async def cancel_knowledge_entry(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """لغو ثبت دانش"""
+    # ورودی‌هایی که تأیید «ثبت شد» گرفته‌اند با لغو هم ذخیره می‌شوند
+    user = await UserService.aget_user_info(update.effective_user.id)
+    if user:
+        await WorkDataBuffer.flush(context.user_data.get('current_task_id'), user['id'], 'knowledge')
     context.user_data.clear()
     await update.message.reply_text("❌ ثبت دانش لغو شد.")
     return ConversationHandler.END
@@ -90,7 +118,7 @@ async def cancel_knowledge_entry(update: Update, context: ContextTypes.DEFAULT_T
 
 knowledge_conv_handler = ConversationHandler(
     entry_points=[
-        CallbackQueryHandler(start_knowledge_entry, pattern='^knowledge_')
+        route_handler("knowledge_{task_id:int}", start_knowledge_entry)
     ],
     states={
         WORK_KNOWLEDGE_ENTRY: [
@@ -105,5 +133,7 @@ knowledge_conv_handler = ConversationHandler(
     per_message=False,
     per_chat=True,
     per_user=True,
-    allow_reentry=True
+    allow_reentry=True,
+    name="knowledge_conv_handler",
+    persistent=True
 )
\ No newline at end of file
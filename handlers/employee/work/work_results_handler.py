@@ -2,13 +2,14 @@
 
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import (
-    ContextTypes, ConversationHandler, CallbackQueryHandler,
+    ContextTypes, ConversationHandler,
     MessageHandler, filters, CommandHandler
 )
-from database.models.user import UserModel
-from services.work_service import WorkService
+from services.user_service import UserService
+from services.work_data_buffer import WorkDataBuffer
 from services.file_service import FileService
 from utils.constants import WORK_RESULTS_ENTRY
+from utils.callback_router import route_handler
 
 
 async def start_results_entry(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -16,7 +17,7 @@ async def start_results_entry(update: Update, context: ContextTypes.DEFAULT_TYPE
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[1])
+    task_id = context.route_args['task_id']
     context.user_data['current_task_id'] = task_id
 
     await query.edit_message_text(
@@ -34,7 +35,7 @@ async def receive_results_entry(update: Update, context: ContextTypes.DEFAULT_TY
     user_telegram_id = update.effective_user.id
 
     # دریافت user_id
-    user = UserModel.get_by_telegram_id(user_telegram_id)
+    user = await UserService.aget_user_info(user_telegram_id)
     if not user:
         await update.message.reply_text("❌ کاربر یافت نشد!")
         return ConversationHandler.END
@@ -43,7 +44,7 @@ async def receive_results_entry(update: Update, context: ContextTypes.DEFAULT_TY
 
     # ذخیره متن
     if update.message.text and update.message.text != '/done':
-        WorkService.add_results(task_id, user_id, text_content=update.message.text)
+        await WorkDataBuffer.add(task_id, user_id, 'results', text_content=update.message.text)
         await update.message.reply_text("✅ نتیجه ثبت شد!\n\nمی‌توانید نتایج بیشتری اضافه کنید یا /done بزنید.")
         return WORK_RESULTS_ENTRY
 
@@ -52,7 +53,10 @@ async def receive_results_entry(update: Update, context: ContextTypes.DEFAULT_TY
     file_id = FileService.get_file_id_from_message(update.message)
 
     if file_type and file_id:
-        WorkService.add_results(task_id, user_id, file_id=file_id, file_type=file_type)
+        await WorkDataBuffer.add(
+            task_id, user_id, 'results', file_id=file_id, file_type=file_type,
+            file_unique_id=FileService.get_file_unique_id_from_message(update.message)
+        )
         await update.message.reply_text("✅ فایل نتیجه ثبت شد!\n\nمی‌توانید نتایج بیشتری اضافه کنید یا /done بزنید.")
         return WORK_RESULTS_ENTRY
 
@@ -64,6 +68,12 @@ async def finish_results_entry(update: Update, context: ContextTypes.DEFAULT_TYP
     """اتمام ثبت نتایج"""
     task_id = context.user_data.get('current_task_id')
 
+    # نوشتن ورودی‌های بافر شده قبل از تأیید نهایی
+    user = await UserService.aget_user_info(update.effective_user.id)
+    if user and await WorkDataBuffer.flush(task_id, user['id'], 'results') is None:
+        await update.message.reply_text("❌ خطا در ذخیره نتایج! لطفاً دوباره /done بزنید.")
+        return WORK_RESULTS_ENTRY
+
     await update.message.reply_text("✅ ثبت نتایج کامل شد!")
 
     keyboard = [[InlineKeyboardButton("🔙 بازگشت به پنل کار", callback_data=f"work_panel_{task_id}")]]
@@ -78,6 +88,10 @@ async def finish_results_entry(update: Update, context: ContextTypes.DEFAULT_TYP
 
 async def cancel_results_entry(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """لغو ثبت نتایج"""
+    # ورودی‌هایی که تأیید «ثبت شد» گرفته‌اند با لغو هم ذخیره می‌شوند
+    user = await UserService.aget_user_info(update.effective_user.id)
+    if user:
+        await WorkDataBuffer.flush(context.user_data.get('current_task_id'), user['id'], 'results')
     context.user_data.clear()
     await update.message.reply_text("❌ ثبت نتایج لغو شد.")
     return ConversationHandler.END
@@ -85,7 +99,7 @@ async def cancel_results_entry(update: Update, context: ContextTypes.DEFAULT_TYP
 
 results_conv_handler = ConversationHandler(
     entry_points=[
-        CallbackQueryHandler(start_results_entry, pattern='^results_')
+        route_handler("results_{task_id:int}", start_results_entry)
     ],
     states={
         WORK_RESULTS_ENTRY: [
@@ -100,5 +114,7 @@ results_conv_handler = ConversationHandler(
     per_message=False,
     per_chat=True,
     per_user=True,
-    allow_reentry=True
+    allow_reentry=True,
+    name="results_conv_handler",
+    persistent=True
 )
\ No newline at end of file
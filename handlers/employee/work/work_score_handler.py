@@ -2,13 +2,14 @@
 
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import (
-    ContextTypes, ConversationHandler, CallbackQueryHandler,
+    ContextTypes, ConversationHandler,
     MessageHandler, filters, CommandHandler
 )
-from database.models.user import UserModel
+from services.user_service import UserService
 from services.work_service import WorkService
 from utils.constants import WORK_SELF_SCORE_ENTRY
 from utils.validators import validate_score
+from utils.callback_router import route_handler
 
 
 async def start_self_score_entry(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -16,16 +17,16 @@ async def start_self_score_entry(update: Update, context: ContextTypes.DEFAULT_T
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     context.user_data['current_task_id'] = task_id
 
     # بررسی امتیاز قبلی
     user_telegram_id = query.from_user.id
-    user = UserModel.get_by_telegram_id(user_telegram_id)
+    user = await UserService.aget_user_info(user_telegram_id)
 
     if user:
         user_id = user.get('id')
-        previous_score = WorkService.get_self_score(task_id, user_id)
+        previous_score = await WorkService.aget_self_score(task_id, user_id)
 
         if previous_score:
             score_value = previous_score.get('self_score')
@@ -66,7 +67,7 @@ async def receive_self_score(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return WORK_SELF_SCORE_ENTRY
 
     # دریافت user_id
-    user = UserModel.get_by_telegram_id(user_telegram_id)
+    user = await UserService.aget_user_info(user_telegram_id)
     if not user:
         await update.message.reply_text("❌ کاربر یافت نشد!")
         return ConversationHandler.END
@@ -74,7 +75,7 @@ async def receive_self_score(update: Update, context: ContextTypes.DEFAULT_TYPE)
     user_id = user.get('id')
 
     # ذخیره امتیاز
-    result = WorkService.set_self_score(task_id, user_id, score_value)
+    result = await WorkService.aset_self_score(task_id, user_id, score_value)
 
     if result:
         await update.message.reply_text(f"✅ امتیاز شما ({score_value}/10) با موفقیت ثبت شد!")
@@ -106,7 +107,7 @@ async def cancel_self_score_entry(update: Update, context: ContextTypes.DEFAULT_
 
 score_conv_handler = ConversationHandler(
     entry_points=[
-        CallbackQueryHandler(start_self_score_entry, pattern='^self_score_')
+        route_handler("self_score_{task_id:int}", start_self_score_entry)
     ],
     states={
         WORK_SELF_SCORE_ENTRY: [
@@ -119,5 +120,7 @@ score_conv_handler = ConversationHandler(
     per_message=False,
     per_chat=True,
     per_user=True,
-    allow_reentry=True
+    allow_reentry=True,
+    name="score_conv_handler",
+    persistent=True
 )
\ No newline at end of file
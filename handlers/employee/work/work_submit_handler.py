@@ -1,8 +1,8 @@
 # handlers/employee/work/work_submit_handler.py
 
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
-from telegram.ext import ContextTypes, CallbackQueryHandler
-from database.models.user import UserModel
+from telegram.ext import ContextTypes
+from services.user_service import UserService
 from services.task_service import TaskService
 from services.work_service import WorkService
 
@@ -12,11 +12,11 @@ async def submit_task(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[1])
+    task_id = context.route_args['task_id']
     user_telegram_id = query.from_user.id
 
     # بررسی امکان تحویل
-    can_submit, message = TaskService.can_employee_submit(task_id, user_telegram_id)
+    can_submit, message = await TaskService.acan_employee_submit(task_id, user_telegram_id)
 
     if not can_submit:
         await query.answer(message, show_alert=True)
@@ -44,22 +44,22 @@ async def confirm_submit_task(update: Update, context: ContextTypes.DEFAULT_TYPE
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[2])
+    task_id = context.route_args['task_id']
     user_telegram_id = query.from_user.id
 
     # بررسی مجدد امکان تحویل
-    can_submit, message = TaskService.can_employee_submit(task_id, user_telegram_id)
+    can_submit, message = await TaskService.acan_employee_submit(task_id, user_telegram_id)
 
     if not can_submit:
         await query.edit_message_text(f"❌ {message}")
         return
 
     # تحویل کار
-    success = TaskService.submit_task(task_id)
+    success = await TaskService.asubmit_task(task_id)
 
     if success:
         # دریافت اطلاعات کار
-        task = TaskService.get_task(task_id, with_details=True)
+        task = await TaskService.aget_task(task_id, with_details=True)
 
         await query.edit_message_text(
             f"✅ **کار با موفقیت تحویل داده شد!**\n\n"
@@ -70,7 +70,7 @@ async def confirm_submit_task(update: Update, context: ContextTypes.DEFAULT_TYPE
 
         # اطلاع‌رسانی به ادمین
         try:
-            user = UserModel.get_by_telegram_id(user_telegram_id)
+            user = await UserService.aget_user_info(user_telegram_id)
             employee_name = user.get('name') if user else 'کارمند'
 
             admin_id = context.bot_data.get('admin_id')
@@ -93,8 +93,3 @@ async def confirm_submit_task(update: Update, context: ContextTypes.DEFAULT_TYPE
             "❌ خطا در تحویل کار!\n\n"
             "لطفاً دوباره تلاش کنید."
         )
-
-
-# Callback Query Handlers برای استفاده در main.py
-submit_task_callback = CallbackQueryHandler(submit_task, pattern='^submit_')
-confirm_submit_callback = CallbackQueryHandler(confirm_submit_task, pattern='^confirm_submit_')
\ No newline at end of file
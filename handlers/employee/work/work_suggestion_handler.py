@@ -2,13 +2,15 @@
 
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import (
-    ContextTypes, ConversationHandler, CallbackQueryHandler,
+    ContextTypes, ConversationHandler,
     MessageHandler, filters, CommandHandler
 )
-from database.models.user import UserModel
+from services.user_service import UserService
 from services.work_service import WorkService
+from services.work_data_buffer import WorkDataBuffer
 from services.file_service import FileService
 from utils.constants import WORK_SUGGESTION_ENTRY
+from utils.callback_router import route_handler
 
 
 async def start_suggestion_entry(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -16,7 +18,7 @@ async def start_suggestion_entry(update: Update, context: ContextTypes.DEFAULT_T
     query = update.callback_query
     await query.answer()
 
-    task_id = int(query.data.split('_')[1])
+    task_id = context.route_args['task_id']
     context.user_data['current_task_id'] = task_id
 
     await query.edit_message_text(
@@ -34,7 +36,7 @@ async def receive_suggestion_entry(update: Update, context: ContextTypes.DEFAULT
     user_telegram_id = update.effective_user.id
 
     # دریافت user_id
-    user = UserModel.get_by_telegram_id(user_telegram_id)
+    user = await UserService.aget_user_info(user_telegram_id)
     if not user:
         await update.message.reply_text("❌ کاربر یافت نشد!")
         return ConversationHandler.END
@@ -43,17 +45,33 @@ async def receive_suggestion_entry(update: Update, context: ContextTypes.DEFAULT
 
     # ذخیره متن
     if update.message.text and update.message.text != '/done':
-        WorkService.add_suggestion(task_id, user_id, text_content=update.message.text)
-        await update.message.reply_text("✅ پیشنهاد ثبت شد!\n\nمی‌توانید پیشنهاد بیشتری اضافه کنید یا /done بزنید.")
+        # ثبت همراه با علامت تکراری بودن (ورودی رد نمی‌شود، فقط به کارمند اطلاع داده می‌شود)
+        duplicate = await WorkDataBuffer.find_duplicate('suggestion', text_content=update.message.text)
+        await WorkDataBuffer.add(
+            task_id, user_id, 'suggestion', text_content=update.message.text,
+            duplicate_of=duplicate['id'] if duplicate else None
+        )
+        await update.message.reply_text(
+            "✅ پیشنهاد ثبت شد!\n\nمی‌توانید پیشنهاد بیشتری اضافه کنید یا /done بزنید."
+            + WorkService.format_duplicate_notice(duplicate)
+        )
         return WORK_SUGGESTION_ENTRY
 
     # ذخیره فایل
     file_type = FileService.get_file_type_from_message(update.message)
     file_id = FileService.get_file_id_from_message(update.message)
+    file_unique_id = FileService.get_file_unique_id_from_message(update.message)
 
     if file_type and file_id:
-        WorkService.add_suggestion(task_id, user_id, file_id=file_id, file_type=file_type)
-        await update.message.reply_text("✅ فایل پیشنهاد ثبت شد!\n\nمی‌توانید پیشنهاد بیشتری اضافه کنید یا /done بزنید.")
+        duplicate = await WorkDataBuffer.find_duplicate('suggestion', file_unique_id=file_unique_id)
+        await WorkDataBuffer.add(
+            task_id, user_id, 'suggestion', file_id=file_id, file_type=file_type,
+            file_unique_id=file_unique_id, duplicate_of=duplicate['id'] if duplicate else None
+        )
+        await update.message.reply_text(
+            "✅ فایل پیشنهاد ثبت شد!\n\nمی‌توانید پیشنهاد بیشتری اضافه کنید یا /done بزنید."
+            + WorkService.format_duplicate_notice(duplicate)
+        )
         return WORK_SUGGESTION_ENTRY
 
     await update.message.reply_text("❌ لطفاً متن یا فایل ارسال کنید.")
@@ -64,6 +82,12 @@ async def finish_suggestion_entry(update: Update, context: ContextTypes.DEFAULT_
     """اتمام ثبت پیشنهاد"""
     task_id = context.user_data.get('current_task_id')
 
+    # نوشتن ورودی‌های بافر شده قبل از تأیید نهایی
+    user = await UserService.aget_user_info(update.effective_user.id)
+    if user and await WorkDataBuffer.flush(task_id, user['id'], 'suggestion') is None:
+        await update.message.reply_text("❌ خطا در ذخیره پیشنهادها! لطفاً دوباره /done بزنید.")
+        return WORK_SUGGESTION_ENTRY
+
     await update.message.reply_text("✅ ثبت پیشنهاد کامل شد!")
 
     keyboard = [[InlineKeyboardButton("🔙 بازگشت به پنل کار", callback_data=f"work_panel_{task_id}")]]
@@ -78,6 +102,10 @@ async def finish_suggestion_entry(update: Update, context: ContextTypes.DEFAULT_
 
 async def cancel_suggestion_entry(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """لغو ثبت پیشنهاد"""
+    # ورودی‌هایی که تأیید «ثبت شد» گرفته‌اند با لغو هم ذخیره می‌شوند
+    user = await UserService.aget_user_info(update.effective_user.id)
+    if user:
+        await WorkDataBuffer.flush(context.user_data.get('current_task_id'), user['id'], 'suggestion')
     context.user_data.clear()
     await update.message.reply_text("❌ ثبت پیشنهاد لغو شد.")
     return ConversationHandler.END
@@ -85,7 +113,7 @@ async def cancel_suggestion_entry(update: Update, context: ContextTypes.DEFAULT_
 
 suggestion_conv_handler = ConversationHandler(
     entry_points=[
-        CallbackQueryHandler(start_suggestion_entry, pattern='^suggestion_')
+        route_handler("suggestion_{task_id:int}", start_suggestion_entry)
     ],
     states={
         WORK_SUGGESTION_ENTRY: [
@@ -100,5 +128,7 @@ suggestion_conv_handler = ConversationHandler(
     per_message=False,
     per_chat=True,
     per_user=True,
-    allow_reentry=True
+    allow_reentry=True,
+    name="suggestion_conv_handler",
+    persistent=True
 )
\ No newline at end of file
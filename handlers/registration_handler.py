@@ -43,7 +43,7 @@ async def check_and_start_registration(update: Update, context: ContextTypes.DEF
     user_id = update.effective_user.id
 
     # چک ادمین
-    if UserService.is_admin(user_id):
+    if await UserService.ais_admin(user_id):
         await update.message.reply_text(
             "👋 خوش آمدید، مدیر عزیز!",
             reply_markup=get_admin_reply_keyboard()  # ✅ کیبورد ثابت
@@ -55,7 +55,7 @@ async def check_and_start_registration(update: Update, context: ContextTypes.DEF
         return ConversationHandler.END
 
     # بررسی وجود کاربر
-    user = UserService.get_user_info(user_id)
+    user = await UserService.aget_user_info(user_id)
 
     if user:
         # کارمند تأیید شده
@@ -146,7 +146,7 @@ async def get_phone(update: Update, context: ContextTypes.DEFAULT_TYPE):
     phone_number = contact.phone_number
     telegram_id = update.effective_user.id
 
-    success = UserService.register_user(telegram_id, first_name, last_name, phone_number)
+    success = await UserService.aregister_user(telegram_id, first_name, last_name, phone_number)
 
     if success:
         await update.message.reply_text(
@@ -199,5 +199,7 @@ registration_conv_handler = ConversationHandler(
     per_message=False,
     per_chat=True,
     per_user=True,
-    allow_reentry=True
+    allow_reentry=True,
+    name="registration_conv_handler",
+    persistent=True
 )
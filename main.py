@@ -1,29 +1,46 @@
 # main.py
 import os
+import asyncio
 import logging
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
 from telegram.ext import (
-    Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters, ContextTypes
+    Application, CommandHandler, MessageHandler, filters, ContextTypes
 )
 
 
 
 # ایمپورت تنظیمات
 try:
-    from config import BOT_TOKEN, ADMIN_ID
+    from config import (
+        BOT_TOKEN, ADMIN_ID, DB_CHECKPOINT_INTERVAL, UPDATE_MAX_IN_FLIGHT, UPDATE_MAX_PENDING,
+        BOT_MODE, WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_PATH, WEBHOOK_URL, WEBHOOK_SECRET_TOKEN,
+        WEBHOOK_MAX_CONNECTIONS, WEBHOOK_DRAIN_TIMEOUT,
+        PERSISTENCE_UPDATE_INTERVAL, PERSISTENCE_FLUSH_MS, PERSISTENCE_FLUSH_CHANGES, TEMPLATE_TICK_SECONDS,
+        WATCHDOG_INTERVAL_SECONDS
+    )
 except ImportError:
     logging.error("خطا: فایل config.py پیدا نشد یا متغیرهای مورد نیاز در آن تعریف نشده‌اند.")
     exit()
 
 # ایمپورت راه‌اندازی دیتابیس
 from database.migrations.schema import setup_database
+from database.connection import checkpoint, close_pool
+from database.executor import run_in_db_thread, shutdown_executor
 
 # ایمپورت سرویس‌ها
 from services.user_service import UserService
+from services.delivery_service import DeliveryService
+from services.work_data_buffer import WorkDataBuffer
+from services.template_service import TemplateService
+from services.watchdog_service import WatchdogService
 
 # ایمپورت utils
 from utils.constants import GET_FULL_NAME, GET_PHONE
 from utils.keyboards import get_main_menu_keyboard, get_employee_main_keyboard
+from utils.callback_router import CallbackRouter
+from utils.update_processor import PerUserUpdateProcessor
+from utils.webhook_server import serve_webhook
+from utils.sqlite_persistence import SQLitePersistence
 
 # تنظیمات لاگ
 logging.basicConfig(
@@ -53,10 +70,17 @@ from handlers.admin.user_management_handler import (
 )
 from handlers.admin.menu_handler import show_main_menu
 from handlers.admin.daily_report_handler import (
-    show_daily_report_menu, show_employee_daily_report, show_current_tasks
+    show_daily_report_menu, show_employee_daily_report, show_current_tasks, backfill_daily_stats
 )
+from handlers.admin.import_tasks_handler import import_tasks
+from handlers.admin.template_handler import make_template, list_templates, delete_template
+from handlers.admin.search_handler import search_command, show_search_page
+from handlers.admin.dedup_handler import dedup_work_data
+from handlers.admin.export_handler import export_data
+from handlers.admin.performance_report_handler import show_performance_report
 from handlers.admin.manage import (
     show_manage_tasks_menu,
+    manage_placeholder,
     manage_by_employee,
     show_employee_tasks_by_category,
     show_tasks_by_employee_category,
@@ -75,12 +99,13 @@ from handlers.employee.employee_task_handler import (
 from handlers.employee.work import (
     show_task_work_panel,
     start_work_timer,
+    end_work_timer,
     knowledge_conv_handler,
     suggestion_conv_handler,
     results_conv_handler,
     score_conv_handler,
-    submit_task_callback,
-    confirm_submit_callback
+    submit_task,
+    confirm_submit_task
 )
 
 # ایمپورت هندلر ثبت‌نام
@@ -124,7 +149,7 @@ async def handle_start_for_existing_users(update: Update, context: ContextTypes.
         return
 
     # چک کارمند تأیید شده
-    user = UserService.get_user_info(user_id)
+    user = await UserService.aget_user_info(user_id)
     if user:
         is_employee = user.get('is_employee')
         role = user.get('role')
@@ -154,7 +179,7 @@ async def handle_main_menu_button(update: Update, context: ContextTypes.DEFAULT_
         return
 
     # چک کارمند
-    user = UserService.get_user_info(user_id)
+    user = await UserService.aget_user_info(user_id)
     if user and user.get('is_employee') == 1:
         await update.message.reply_text(
             "📋 منوی کاری شما:",
@@ -182,6 +207,125 @@ async def back_to_main_menu_from_admin(update: Update, context: ContextTypes.DEF
     )
 
 
+async def wal_checkpoint_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """checkpoint دوره‌ای فایل WAL تا حجم آن بی‌رویه بزرگ نشود (روی thread دیتابیس، نه event loop)"""
+    result = await run_in_db_thread(checkpoint)
+    if result and result[0]:
+        logging.info("checkpoint ناقص ماند؛ خواننده‌ها هنوز فعال هستند")
+
+
+async def template_scheduler_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """ایجاد کارهای قالب‌های تکرارشونده‌ای که زمانشان رسیده"""
+    created = await TemplateService.run_due()
+    if created:
+        logging.info(f"{len(created)} کار از روی قالب‌های تکرارشونده ایجاد شد")
+
+
+async def work_watchdog_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """بستن تایمرهای فراموش شده و اطلاع عبور از زمان کار"""
+    await WatchdogService.run(context.bot)
+
+
+async def on_stop(application: Application) -> None:
+    """نوشتن بافر داده‌های کاری و ارسال پیام‌های باقی‌مانده صف قبل از بسته شدن Bot"""
+    await WorkDataBuffer.flush_all()
+    await DeliveryService.shutdown()
+
+
+async def on_shutdown(application: Application) -> None:
+    """checkpoint نهایی و بستن اتصال‌های Pool هنگام خاموش شدن"""
+    shutdown_executor()
+    checkpoint("TRUNCATE")
+    close_pool()
+
+
+def build_callback_router() -> CallbackRouter:
+    """جدول مسیرهای callback_data (ترتیب ثبت اهمیتی ندارد؛ تکرار خطا می‌دهد)"""
+    router = CallbackRouter()
+
+    # --- منو و ناوبری ---
+    router.add("show_menu", show_main_menu)
+    router.add("back_to_main_menu", back_to_main_menu_from_admin)
+    router.add("back_to_main_menu_employee", back_to_main_menu_employee)
+
+    # --- گزارش روزانه ---
+    router.add("daily_report", show_daily_report_menu)
+    router.add("daily_report_{telegram_id:int}", show_employee_daily_report)
+    router.add("current_tasks", show_current_tasks)
+    router.add("performance_report", show_performance_report)
+    router.add("performance_report_{days:int}", show_performance_report)
+
+    # --- مدیریت کارها ---
+    router.add("manage_tasks", show_manage_tasks_menu)
+    router.add("manage_by_employee", manage_by_employee)
+    router.add("emp_tasks_{employee_id:int}", show_employee_tasks_by_category)
+    router.add_packed("ec", show_tasks_by_employee_category, "employee_id", "category_id")
+
+    # بخش‌های در حال توسعه
+    router.add("manage_by_category", manage_placeholder)
+    router.add("manage_by_status", manage_placeholder)
+    router.add("manage_by_importance", manage_placeholder)
+    router.add("manage_by_priority", manage_placeholder)
+    router.add("manage_by_score", manage_placeholder)
+
+    # جزئیات و تخصیص کار
+    router.add("view_task_{task_id:int}", view_task_details_admin)
+    router.add("assign_task_{task_id:int}", assign_task_to_employee)
+    router.add("reassign_task_{task_id:int}", assign_task_to_employee)
+    router.add_packed("at", confirm_assign_task, "task_id", "employee_id")
+    router.add_packed("ts", change_task_status, "status", "task_id")
+
+    # --- دسته‌بندی‌ها ---
+    router.add("categories", show_categories_menu)
+
+    # --- کارهای تحویل شده و خاتمه‌یافته ---
+    router.add("completed_tasks", show_completed_tasks)
+    router.add("completed_tasks_pg_{cursor}", show_completed_tasks)
+    router.add("review_task_{task_id:int}", show_task_review_panel)
+    router.add("task_profile_{task_id:int}", show_task_profile_for_admin)
+    router.add("employee_outputs_{task_id:int}", show_employee_outputs)
+    router.add("finalize_task_{task_id:int}", finalize_task)
+    router.add("confirm_finalize_{task_id:int}", confirm_finalize_task)
+    router.add("archived_tasks", show_archived_tasks_for_admin)
+    router.add("archived_tasks_pg_{cursor}", show_archived_tasks_for_admin)
+    router.add("view_archived_{task_id:int}", view_archived_task_for_admin)
+    router.add("admin_review_archived_{task_id:int}", show_admin_review_for_archived)
+    router.add("search_pg_{page:int}", show_search_page)
+
+    # --- مدیریت کاربران ---
+    router.add("user_management", show_user_management_menu)
+    router.add("user_{telegram_id:int}", show_user_details)
+    router.add("approve_{telegram_id:int}", request_approval_confirmation)
+    router.add("confirm_approve_{telegram_id:int}", confirm_approval)
+
+    # --- هندلرهای نیروها ---
+    router.add("list_tasks", list_employee_tasks)
+    router.add("list_tasks_pg_{cursor}", list_employee_tasks)
+    router.add("details_{task_id:int}", view_task_details)
+    router.add("back_to_tasks_list", back_to_tasks_list)
+
+    # --- هندلرهای کار ---
+    router.add("work_panel_{task_id:int}", show_task_work_panel)
+    router.add("start_work_{task_id:int}", start_work_timer)
+    router.add("end_work_{task_id:int}", end_work_timer)
+    router.add("submit_{task_id:int}", submit_task)
+    router.add("confirm_submit_{task_id:int}", confirm_submit_task)
+
+    router.add("archive_tasks", show_archived_tasks)
+    router.add("archive_tasks_pg_{cursor}", show_archived_tasks)
+    router.add("view_archive_{task_id:int}", view_archived_task_details)
+
+    return router
+
+
+async def show_route_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """دستور /route_stats - آمار زمان پردازش مسیرهای callback (فقط ادمین)"""
+    if update.effective_user.id != ADMIN_ID:
+        return
+
+    await update.message.reply_text(context.bot_data['callback_router'].format_stats())
+
+
 def main() -> None:
     """تابع اصلی برای اجرای بات"""
     # 🧪 تست اتوماتیک دیپلوی گیت
@@ -198,7 +342,39 @@ def main() -> None:
     # راه‌اندازی دیتابیس جدید
     setup_database()
 
-    application = Application.builder().token(BOT_TOKEN).build()
+    # updateهای کاربران مختلف موازی، updateهای هر کاربر به ترتیب
+    update_processor = PerUserUpdateProcessor(UPDATE_MAX_IN_FLIGHT, UPDATE_MAX_PENDING)
+    # وضعیت مکالمه‌ها و user_data بعد از restart حفظ می‌شود
+    persistence = SQLitePersistence(PERSISTENCE_UPDATE_INTERVAL, PERSISTENCE_FLUSH_MS, PERSISTENCE_FLUSH_CHANGES)
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .concurrent_updates(update_processor)
+        .persistence(persistence)
+        .post_stop(on_stop)
+        .post_shutdown(on_shutdown)
+        .build()
+    )
+
+    # ========== کارهای زمان‌بندی‌شده ==========
+    application.job_queue.run_repeating(
+        wal_checkpoint_job,
+        interval=DB_CHECKPOINT_INTERVAL,
+        first=DB_CHECKPOINT_INTERVAL,
+        name="wal_checkpoint"
+    )
+    application.job_queue.run_repeating(
+        template_scheduler_job,
+        interval=TEMPLATE_TICK_SECONDS,
+        first=5,
+        name="task_templates"
+    )
+    application.job_queue.run_repeating(
+        work_watchdog_job,
+        interval=WATCHDOG_INTERVAL_SECONDS,
+        first=WATCHDOG_INTERVAL_SECONDS,
+        name="work_watchdog"
+    )
 
     # ========== ConversationHandler ها ==========
     # ابتدا ConversationHandler برای ثبت‌نام (برای کاربران جدید)
@@ -216,107 +392,54 @@ def main() -> None:
     application.add_handler(results_conv_handler)
     application.add_handler(score_conv_handler)
 
-    application.add_handler(submit_task_callback)
-    application.add_handler(confirm_submit_callback)
     application.add_handler(completed_tasks_conv_handler)
 
     # ========== CommandHandler ==========
     # هندلر start برای ادمین و کارمندان موجود
     application.add_handler(CommandHandler("start", handle_start_for_existing_users))
+    application.add_handler(CommandHandler("backfill_daily_stats", backfill_daily_stats))
+    application.add_handler(CommandHandler("import_tasks", import_tasks))
+    application.add_handler(CommandHandler("make_template", make_template))
+    application.add_handler(CommandHandler("templates", list_templates))
+    application.add_handler(CommandHandler("del_template", delete_template))
+    application.add_handler(CommandHandler("search", search_command))
+    application.add_handler(CommandHandler("dedup_work_data", dedup_work_data))
+    application.add_handler(CommandHandler("export", export_data))
+    application.add_handler(MessageHandler(
+        filters.Document.ALL & filters.CaptionRegex(r"^/import_tasks"), import_tasks
+    ))
 
     # ========== MessageHandler برای دکمه منوی اصلی ثابت ==========
     application.add_handler(MessageHandler(filters.Regex("^🏠 منوی اصلی$"), handle_main_menu_button))
 
-    # ========== CallbackQueryHandler ها ==========
-
-    # --- منو و ناوبری ---
-    application.add_handler(CallbackQueryHandler(show_main_menu, pattern='^show_menu$'))
-    application.add_handler(CallbackQueryHandler(back_to_main_menu_from_admin, pattern='^back_to_main_menu$'))
-    application.add_handler(CallbackQueryHandler(back_to_main_menu_employee, pattern='^back_to_main_menu_employee$'))
-
-    # --- گزارش روزانه ---
-    application.add_handler(CallbackQueryHandler(show_daily_report_menu, pattern='^daily_report$'))
-    application.add_handler(CallbackQueryHandler(show_employee_daily_report, pattern='^daily_report_'))
-    application.add_handler(CallbackQueryHandler(show_current_tasks, pattern='^current_tasks$'))
-
-    # --- مدیریت کارها (سیستم جدید) ---
-    application.add_handler(CallbackQueryHandler(show_manage_tasks_new, pattern='^manage_tasks$'))
-    application.add_handler(CallbackQueryHandler(manage_by_employee, pattern='^manage_by_employee$'))
-    application.add_handler(CallbackQueryHandler(show_employee_tasks_by_category, pattern='^emp_tasks_'))
-    application.add_handler(CallbackQueryHandler(show_tasks_by_employee_category, pattern='^emp_cat_'))
-
-    # --- مدیریت کارها ---
-    application.add_handler(CallbackQueryHandler(show_manage_tasks_menu, pattern='^manage_tasks$'))
-    application.add_handler(CallbackQueryHandler(manage_by_employee, pattern='^manage_by_employee$'))
-    application.add_handler(CallbackQueryHandler(show_employee_tasks_by_category, pattern='^emp_tasks_'))
-    application.add_handler(CallbackQueryHandler(show_tasks_by_employee_category, pattern='^emp_cat_'))
-
-    # بخش‌های در حال توسعه - حذف شد
-    # application.add_handler(CallbackQueryHandler(manage_placeholder, pattern='^manage_by_category$'))
-    # application.add_handler(CallbackQueryHandler(manage_placeholder, pattern='^manage_by_importance$'))
-    # application.add_handler(CallbackQueryHandler(manage_placeholder, pattern='^manage_by_priority$'))
-    # application.add_handler(CallbackQueryHandler(manage_placeholder, pattern='^manage_by_score$'))
-
-    # جزئیات و تخصیص کار
-    application.add_handler(CallbackQueryHandler(view_task_details_admin, pattern='^view_task_'))
-    application.add_handler(CallbackQueryHandler(assign_task_to_employee, pattern='^assign_task_'))
-    application.add_handler(CallbackQueryHandler(assign_task_to_employee, pattern='^reassign_task_'))
-    application.add_handler(CallbackQueryHandler(confirm_assign_task, pattern='^assign_to_'))
-    application.add_handler(CallbackQueryHandler(change_task_status, pattern='^status_'))
-
-    # بخش‌های در حال توسعه
-    application.add_handler(CallbackQueryHandler(manage_placeholder, pattern='^manage_by_category$'))
-    application.add_handler(CallbackQueryHandler(manage_placeholder, pattern='^manage_by_importance$'))
-    application.add_handler(CallbackQueryHandler(manage_placeholder, pattern='^manage_by_priority$'))
-    application.add_handler(CallbackQueryHandler(manage_placeholder, pattern='^manage_by_score$'))
-
-    # --- مدیریت کارها (سیستم قدیم - برای سازگاری) ---
-    application.add_handler(CallbackQueryHandler(list_all_tasks, pattern='^list_all_tasks$'))
-    application.add_handler(CallbackQueryHandler(list_pending_tasks, pattern='^list_pending_tasks$'))
-    application.add_handler(CallbackQueryHandler(list_in_progress_tasks, pattern='^list_in_progress_tasks$'))
-    application.add_handler(CallbackQueryHandler(list_completed_tasks_manage, pattern='^list_completed_tasks_manage$'))
-
-    # --- جزئیات و تخصیص کار ---
-    application.add_handler(CallbackQueryHandler(view_task_details_admin, pattern='^view_task_'))
-    application.add_handler(CallbackQueryHandler(assign_task_to_employee, pattern='^assign_task_'))
-    application.add_handler(CallbackQueryHandler(assign_task_to_employee, pattern='^reassign_task_'))
-    application.add_handler(CallbackQueryHandler(change_task_status, pattern='^status_'))
-
-    # --- دسته‌بندی‌ها ---
-    application.add_handler(CallbackQueryHandler(show_categories_menu, pattern='^categories$'))
-
-    # --- کارهای تحویل شده و خاتمه‌یافته ---
-    application.add_handler(CallbackQueryHandler(show_completed_tasks, pattern='^completed_tasks$'))
-    application.add_handler(CallbackQueryHandler(show_task_review_panel, pattern='^review_task_'))
-    application.add_handler(CallbackQueryHandler(show_task_profile_for_admin, pattern='^task_profile_'))
-    application.add_handler(CallbackQueryHandler(show_employee_outputs, pattern='^employee_outputs_'))
-    application.add_handler(CallbackQueryHandler(finalize_task, pattern='^finalize_task_'))
-    application.add_handler(CallbackQueryHandler(confirm_finalize_task, pattern='^confirm_finalize_'))
-    application.add_handler(CallbackQueryHandler(show_archived_tasks_for_admin, pattern='^archived_tasks$'))
-    application.add_handler(CallbackQueryHandler(view_archived_task_for_admin, pattern='^view_archived_'))
-    application.add_handler(CallbackQueryHandler(show_admin_review_for_archived, pattern='^admin_review_archived_'))
-
-    # --- مدیریت کاربران ---
-    application.add_handler(CallbackQueryHandler(show_user_management_menu, pattern='^user_management$'))
-    application.add_handler(CallbackQueryHandler(show_user_details, pattern='^user_'))
-    application.add_handler(CallbackQueryHandler(request_approval_confirmation, pattern='^approve_'))
-    application.add_handler(CallbackQueryHandler(confirm_approval, pattern='^confirm_approve_'))
-
-    # --- هندلرهای نیروها ---
-    application.add_handler(CallbackQueryHandler(list_employee_tasks, pattern='^list_tasks$'))
-    application.add_handler(CallbackQueryHandler(view_task_details, pattern='^details_'))
-    application.add_handler(CallbackQueryHandler(back_to_tasks_list, pattern='^back_to_tasks_list$'))
-
-    # ✅ هندلرهای کار (جدید)
-    application.add_handler(CallbackQueryHandler(show_task_work_panel, pattern='^work_panel_'))
-    application.add_handler(CallbackQueryHandler(start_work_timer, pattern='^start_work_'))
-
-    application.add_handler(CallbackQueryHandler(show_archived_tasks, pattern='^archive_tasks$'))
-    application.add_handler(CallbackQueryHandler(view_archived_task_details, pattern='^view_archive_'))
+    # ========== مسیریابی callback ها ==========
+    # یک CallbackQueryHandler واحد بعد از ConversationHandler ها (مسیرهای entry_point
+    # آنها ثبت نمی‌شوند؛ ConversationHandler ها زودتر امتحان می‌شوند)
+    callback_router = build_callback_router()
+    callback_router.check_shadowing(application.handlers.get(0, []))
+    application.add_handler(callback_router.build_handler())
+    application.bot_data['callback_router'] = callback_router
+    application.add_handler(CommandHandler("route_stats", show_route_stats))
 
     # اجرای بات
-    print("✅ بات با موفقیت راه‌اندازی شد!")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    if BOT_MODE == 'webhook':
+        if not WEBHOOK_SECRET_TOKEN:
+            logging.error("خطا: در حالت webhook باید WEBHOOK_SECRET_TOKEN تنظیم شود.")
+            return
+        print(f"✅ بات در حالت webhook روی {WEBHOOK_LISTEN}:{WEBHOOK_PORT}{WEBHOOK_PATH} راه‌اندازی شد!")
+        asyncio.run(serve_webhook(
+            application,
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            path=WEBHOOK_PATH,
+            secret_token=WEBHOOK_SECRET_TOKEN,
+            webhook_url=WEBHOOK_URL,
+            max_connections=WEBHOOK_MAX_CONNECTIONS,
+            drain_timeout=WEBHOOK_DRAIN_TIMEOUT
+        ))
+    else:
+        print("✅ بات با موفقیت راه‌اندازی شد!")
+        application.run_polling(allowed_updates=Update.ALL_TYPES)
 
 
 if __name__ == "__main__":
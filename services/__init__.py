@@ -9,6 +9,14 @@ from .task_service import TaskService
 from .file_service import FileService
 from .work_service import WorkService
 from .review_service import ReviewService
+from .delivery_service import DeliveryService
+from .work_data_buffer import WorkDataBuffer
+from .import_service import ImportService
+from .template_service import TemplateService
+from .watchdog_service import WatchdogService
+from .search_service import SearchService
+from .export_service import ExportService
+from .analytics_service import AnalyticsService
 
 __all__ = [
     'UserService',
@@ -16,4 +24,12 @@ __all__ = [
     'FileService',
     'WorkService',
     'ReviewService',
+    'DeliveryService',
+    'WorkDataBuffer',
+    'ImportService',
+    'TemplateService',
+    'WatchdogService',
+    'SearchService',
+    'ExportService',
+    'AnalyticsService',
 ]
\ No newline at end of file
@@ -0,0 +1,276 @@
+# services/analytics_service.py
+
+"""
+تحلیل عملکرد کارمندان
+
+داده‌های بازه با چند کوئری ستونی (AnalyticsModel.load_columns) یک بار خوانده و به آرایه‌های NumPy
+تبدیل می‌شوند؛ سپس همه کارمندان در یک گذر برداری محاسبه می‌شوند: آیدی‌ها با searchsorted روی آیدی‌های
+مرتب به اندیس تبدیل و تجمیع‌ها با bincount (با وزن) انجام می‌شوند، بدون حلقه پایتون روی کارها.
+
+شاخص‌ها:
+    calibration_gap     میانگین (امتیاز خود کارمند - آخرین امتیاز ادمین)؛ مثبت یعنی خوش‌بینی
+    on_time_ratio       سهم کارهای تحویلی که زمان واقعی تایمر از مدت زمان تعیین شده بیشتر نشده
+    time_ratio          میانگین زمان واقعی / مدت زمان تعیین شده
+    categories          تعداد کار تحویلی به تفکیک دسته‌بندی و نرخ هفتگی آن
+    trend               شیب رگرسیون خطی امتیاز ادمین نسبت به زمان (تغییر امتیاز در هر 30 روز)
+"""
+
+import html
+import numpy as np
+from datetime import datetime, timedelta
+from database.executor import async_methods
+from database.models.analytics import AnalyticsModel
+from config import ANALYTICS_WINDOW_DAYS, ANALYTICS_MIN_TREND_POINTS
+from typing import Optional, List, Dict, Any, Tuple
+
+COMPLETED_STATUSES = ('completed', 'archived')
+TREND_PERIOD_DAYS = 30
+MAX_REPORT_CHARS = 3900
+MAX_REPORT_CATEGORIES = 3
+UNCATEGORIZED_LABEL = "بدون دسته"
+
+
+def _lookup(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    اندیس values در آرایه مرتب keys
+
+    Returns:
+        (اندیس‌ها, ماسک مقادیر یافت شده)
+    """
+    if not len(keys):
+        return np.zeros(len(values), dtype=np.int64), np.zeros(len(values), dtype=bool)
+    index = np.minimum(np.searchsorted(keys, values), len(keys) - 1)
+    return index, keys[index] == values
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _to_days(values: List[Optional[str]]) -> np.ndarray:
+    """تبدیل تاریخ‌های "YYYY-MM-DD HH:MM:SS" به روز (اعشاری) از epoch؛ تاریخ نامعتبر NaN"""
+    try:
+        stamps = np.array(values, dtype='datetime64[s]')
+    except ValueError:
+        stamps = np.array([_to_stamp(value) for value in values], dtype='datetime64[s]')
+    days = stamps.astype(np.int64) / 86400.0
+    days[np.isnat(stamps)] = np.nan
+    return days
+
+
+def _to_stamp(value: Optional[str]) -> np.datetime64:
+    try:
+        return np.datetime64(value, 's')
+    except (TypeError, ValueError):
+        return np.datetime64('NaT')
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """تقسیم عنصر به عنصر؛ جایی که مخرج صفر است NaN"""
+    result = np.full(len(numerator), np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def _optional(value: float, digits: int = 2) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+@async_methods
+class AnalyticsService:
+    """سرویس تحلیل عملکرد کارمندان - Business Logic"""
+
+    @staticmethod
+    def compute_metrics(days: int = ANALYTICS_WINDOW_DAYS, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """
+        محاسبه شاخص‌های عملکرد همه کارمندان در بازه days روز اخیر
+
+        Returns:
+            dict با کلیدهای days, since و employees (لیست dict شاخص‌های هر کارمند، به ترتیب
+            تعداد کار تحویلی) یا None در صورت خطای دیتابیس
+        """
+        now = now or datetime.now()
+        start = now - timedelta(days=days)
+        data = AnalyticsModel.load_columns(start.strftime("%Y-%m-%d %H:%M:%S"))
+        if data is None:
+            return None
+
+        employees = data['employees']
+        employee_ids = np.array(employees['id'], dtype=np.int64)
+        n_employees = len(employee_ids)
+
+        # --- کارها: فقط کارهای کارمندان فعلی ---
+        tasks = data['tasks']
+        task_employee, known = _lookup(employee_ids, np.array(tasks['assigned_to_id'], dtype=np.int64))
+        task_ids = np.array(tasks['id'], dtype=np.int64)[known]
+        task_employee = task_employee[known]
+        assignee_ids = employee_ids[task_employee]
+        duration = np.fromiter((_to_float(value) for value in tasks['duration']), float, len(tasks['duration']))[known]
+        status = np.array(tasks['status'], dtype=object)[known]
+        submitted = np.array(tasks['is_submitted'], dtype=float)[known] == 1
+        finished_days = _to_days(tasks['finished_at'])[known]
+        category_ids = np.array(tasks['category_id'], dtype=float)[known]
+        n_tasks = len(task_ids)
+
+        completed = submitted | np.isin(status, COMPLETED_STATUSES)
+
+        # --- زمان واقعی هر کار (فقط جلسه‌های خود کارمند تخصیص یافته) ---
+        minutes = data['minutes']
+        index, found = _lookup(task_ids, np.array(minutes['task_id'], dtype=np.int64))
+        rows = np.flatnonzero(found)
+        rows = rows[assignee_ids[index[rows]] == np.array(minutes['user_id'], dtype=np.int64)[rows]]
+        actual = np.bincount(
+            index[rows], weights=np.array(minutes['minutes'], dtype=float)[rows], minlength=n_tasks
+        )
+
+        # --- امتیاز خود کارمند و آخرین امتیاز ادمین هر کار ---
+        scores = data['self_scores']
+        index, found = _lookup(task_ids, np.array(scores['task_id'], dtype=np.int64))
+        rows = np.flatnonzero(found)
+        rows = rows[assignee_ids[index[rows]] == np.array(scores['user_id'], dtype=np.int64)[rows]]
+        self_score = np.full(n_tasks, np.nan)
+        self_score[index[rows]] = np.array(scores['self_score'], dtype=float)[rows]
+
+        reviews = data['admin_scores']
+        index, found = _lookup(task_ids, np.array(reviews['task_id'], dtype=np.int64))
+        admin_score = np.full(n_tasks, np.nan)
+        admin_score[index[found]] = np.array(reviews['admin_score'], dtype=float)[found]
+
+        def per_employee(mask: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+            return np.bincount(
+                task_employee[mask], weights=None if weights is None else weights[mask], minlength=n_employees
+            ).astype(float)
+
+        assigned_count = per_employee(np.ones(n_tasks, dtype=bool))
+        completed_count = per_employee(completed)
+        total_minutes = per_employee(np.ones(n_tasks, dtype=bool), actual)
+
+        # --- کالیبراسیون ---
+        scored = ~np.isnan(self_score) & ~np.isnan(admin_score)
+        gap = self_score - admin_score
+        calibration_count = per_employee(scored)
+        calibration_gap = _ratio(per_employee(scored, gap), calibration_count)
+        calibration_abs_gap = _ratio(per_employee(scored, np.abs(gap)), calibration_count)
+
+        # --- تحویل به موقع ---
+        timed = completed & (duration > 0) & (actual > 0)
+        timed_count = per_employee(timed)
+        on_time_ratio = _ratio(per_employee(timed & (actual <= duration)), timed_count)
+        time_ratio = _ratio(per_employee(timed, _ratio(actual, duration)), timed_count)
+
+        # --- کار تحویلی به تفکیک دسته‌بندی (ستون آخر: بدون دسته) ---
+        categories = data['categories']
+        known_category_ids = np.array(categories['id'], dtype=np.int64)
+        n_categories = len(known_category_ids) + 1
+        category_index, found = _lookup(
+            known_category_ids, np.nan_to_num(category_ids, nan=-1).astype(np.int64)
+        )
+        category_index = np.where(found, category_index, n_categories - 1)
+        throughput = np.bincount(
+            task_employee[completed] * n_categories + category_index[completed],
+            minlength=n_employees * n_categories
+        ).reshape(n_employees, n_categories)
+        category_names = list(categories['name']) + [UNCATEGORIZED_LABEL]
+        weeks = max(days / 7.0, 1.0)
+
+        # --- روند امتیاز ادمین: کمترین مربعات با جمع‌های n, Σx, Σy, Σxy, Σx² ---
+        points = ~np.isnan(admin_score) & ~np.isnan(finished_days)
+        x = finished_days - np.datetime64(start, 's').astype(np.int64) / 86400.0
+        n = per_employee(points)
+        sum_x = per_employee(points, x)
+        sum_y = per_employee(points, admin_score)
+        sum_xy = per_employee(points, x * admin_score)
+        sum_xx = per_employee(points, x * x)
+        denominator = n * sum_xx - sum_x * sum_x
+        denominator[n < ANALYTICS_MIN_TREND_POINTS] = 0
+        trend = _ratio(n * sum_xy - sum_x * sum_y, denominator) * TREND_PERIOD_DAYS
+        average_admin_score = _ratio(sum_y, n)
+
+        results = []
+        for i in range(n_employees):
+            top = np.argsort(-throughput[i], kind='stable')[:MAX_REPORT_CATEGORIES]
+            results.append({
+                'id': int(employee_ids[i]),
+                'telegram_id': employees['telegram_id'][i],
+                'name': employees['name'][i],
+                'assigned': int(assigned_count[i]),
+                'completed': int(completed_count[i]),
+                'minutes': int(round(total_minutes[i])),
+                'calibration_gap': _optional(calibration_gap[i]),
+                'calibration_abs_gap': _optional(calibration_abs_gap[i]),
+                'calibration_count': int(calibration_count[i]),
+                'on_time_ratio': _optional(on_time_ratio[i]),
+                'time_ratio': _optional(time_ratio[i]),
+                'on_time_count': int(timed_count[i]),
+                'categories': [
+                    {'name': category_names[c], 'count': int(throughput[i, c]),
+                     'per_week': round(float(throughput[i, c]) / weeks, 2)}
+                    for c in top if throughput[i, c]
+                ],
+                'trend': _optional(trend[i]),
+                'trend_points': int(n[i]),
+                'average_admin_score': _optional(average_admin_score[i]),
+            })
+
+        results.sort(key=lambda item: (-item['completed'], -item['assigned'], item['name'] or ''))
+        return {'days': days, 'since': start.strftime("%Y-%m-%d"), 'employees': results}
+
+    @staticmethod
+    def format_report(report: Dict[str, Any]) -> str:
+        """
+        متن گزارش تحلیل عملکرد (parse_mode='HTML')
+
+        Args:
+            report: خروجی compute_metrics
+        """
+        header = f"📈 <b>تحلیل عملکرد</b> - {report['days']} روز اخیر (از {report['since']})\n\n"
+        if not report['employees']:
+            return header + "❌ هیچ کارمندی یافت نشد!"
+
+        blocks = []
+        length = len(header)
+        for number, employee in enumerate(report['employees']):
+            lines = [
+                f"👤 <b>{html.escape(employee['name'] or '-')}</b>",
+                f"📋 کارها: {employee['completed']} تحویلی از {employee['assigned']} | "
+                f"⏱ {employee['minutes'] // 60} ساعت و {employee['minutes'] % 60} دقیقه",
+            ]
+
+            if employee['on_time_ratio'] is not None:
+                lines.append(
+                    f"🎯 به موقع: {employee['on_time_ratio'] * 100:.0f}% از {employee['on_time_count']} کار"
+                    f" | زمان واقعی/تعیین شده: {employee['time_ratio']:.2f}"
+                )
+
+            if employee['calibration_gap'] is not None:
+                lines.append(
+                    f"⚖️ فاصله خودارزیابی با ادمین: {employee['calibration_gap']:+.2f}"
+                    f" (میانگین قدرمطلق {employee['calibration_abs_gap']:.2f}، {employee['calibration_count']} کار)"
+                )
+
+            if employee['trend'] is not None:
+                arrow = "📈" if employee['trend'] > 0 else "📉" if employee['trend'] < 0 else "➖"
+                lines.append(
+                    f"{arrow} روند امتیاز: {employee['trend']:+.2f} در هر {TREND_PERIOD_DAYS} روز"
+                    f" (میانگین {employee['average_admin_score']:.1f}، {employee['trend_points']} امتیاز)"
+                )
+            elif employee['average_admin_score'] is not None:
+                lines.append(f"⭐️ میانگین امتیاز ادمین: {employee['average_admin_score']:.1f}")
+
+            if employee['categories']:
+                lines.append("📂 " + "، ".join(
+                    f"{html.escape(category['name'])}: {category['count']} ({category['per_week']:g}/هفته)"
+                    for category in employee['categories']
+                ))
+
+            block = "\n".join(lines)
+            if length + len(block) > MAX_REPORT_CHARS:
+                blocks.append(f"... و {len(report['employees']) - number} کارمند دیگر")
+                break
+            blocks.append(block)
+            length += len(block) + 2
+
+        return header + "\n\n".join(blocks)
@@ -0,0 +1,385 @@
+# services/delivery_service.py
+
+"""
+صف ارسال پیام‌های خروجی با رعایت محدودیت نرخ تلگرام
+
+- سطل توکن سراسری (کل بات) و سطل توکن جدا برای هر chat
+- رعایت خودکار RetryAfter (خطای 429) و ارسال مجدد
+- دو اولویت: INTERACTIVE (پاسخ‌های کاربر) قبل از BULK (ارسال‌های انبوه)
+- ارسال هم‌زمان به chatهای مختلف؛ ترتیب پیام‌های هر chat (در یک اولویت) حفظ می‌شود
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Optional, List, Dict, Any
+from telegram import Bot
+from telegram.error import RetryAfter
+from services.file_service import FileService
+from config import (
+    DELIVERY_WORKERS, DELIVERY_GLOBAL_RATE, DELIVERY_GLOBAL_BURST,
+    DELIVERY_CHAT_RATE, DELIVERY_CHAT_BURST, DELIVERY_MAX_RETRIES
+)
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BULK = 1
+
+FILE_SEND_METHODS = {
+    'photo': ('send_photo', 'photo'),
+    'video': ('send_video', 'video'),
+    'voice': ('send_voice', 'voice'),
+    'document': ('send_document', 'document'),
+}
+
+
+class TokenBucket:
+    """سطل توکن ساده (rate توکن در ثانیه، حداکثر burst توکن)"""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated_at', 'blocked_until')
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def delay(self) -> float:
+        """ثانیه تا در دسترس بودن یک توکن (0 یعنی همین حالا)"""
+        now = time.monotonic()
+        self._refill(now)
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def consume(self):
+        """برداشتن یک توکن (پس از delay() == 0)"""
+        self._refill(time.monotonic())
+        self.tokens -= 1
+
+    def block(self, seconds: float):
+        """توقف سطل تا seconds ثانیه (RetryAfter)"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = min(self.tokens, 0)
+
+    async def acquire(self):
+        """انتظار تا آزاد شدن یک توکن و برداشتن آن"""
+        while True:
+            wait = self.delay()
+            if wait <= 0:
+                self.consume()
+                return
+            await asyncio.sleep(wait)
+
+
+class _Job:
+    """یک فراخوانی متد Bot در صف"""
+
+    __slots__ = ('bot', 'method', 'kwargs', 'future', 'retries', 'fallback_text')
+
+    def __init__(self, bot: Bot, method: str, kwargs: Dict[str, Any], future: asyncio.Future,
+                 fallback_text: Optional[str] = None):
+        self.bot = bot
+        self.method = method
+        self.kwargs = kwargs
+        self.future = future
+        self.retries = 0
+        self.fallback_text = fallback_text
+
+
+class _ChatLane:
+    """صف اختصاصی یک chat؛ در هر لحظه حداکثر یک worker آن را سرویس می‌دهد"""
+
+    __slots__ = ('chat_id', 'jobs', 'bucket', 'serving', 'token', 'scheduled_priority')
+
+    def __init__(self, chat_id: int):
+        self.chat_id = chat_id
+        self.jobs: List[tuple] = []                # heap: (priority, seq, sub, job)
+        self.bucket = TokenBucket(DELIVERY_CHAT_RATE, DELIVERY_CHAT_BURST)
+        self.serving = False
+        self.token = 0                             # نسخه آخرین زمان‌بندی؛ ورودی‌های قدیمی صف نادیده گرفته می‌شوند
+        self.scheduled_priority: Optional[int] = None
+
+
+class _Dispatcher:
+    """صف اولویت‌دار chatها و workerهای ارسال"""
+
+    def __init__(self):
+        self._lanes: Dict[int, _ChatLane] = {}
+        self._ready: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._global_bucket = TokenBucket(DELIVERY_GLOBAL_RATE, DELIVERY_GLOBAL_BURST)
+        self._seq = itertools.count()
+        self._idle: Optional[asyncio.Event] = None
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+
+    def _ensure_started(self):
+        """راه‌اندازی lazy روی event loop جاری"""
+        if self._workers:
+            return
+        self._ready = asyncio.PriorityQueue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"delivery-{index}")
+            for index in range(DELIVERY_WORKERS)
+        ]
+
+    def _schedule(self, lane: _ChatLane):
+        """قرار دادن chat در صف آماده با اولویت بهترین کار آن"""
+        if lane.serving or not lane.jobs:
+            return
+        priority = lane.jobs[0][0]
+        if lane.scheduled_priority is not None and lane.scheduled_priority <= priority:
+            return
+        lane.token += 1
+        lane.scheduled_priority = priority
+        self._ready.put_nowait((priority, next(self._seq), lane.chat_id, lane.token))
+
+    def _schedule_later(self, lane: _ChatLane, delay: float):
+        """زمان‌بندی مجدد chat پس از delay ثانیه (بدون اشغال worker)"""
+        lane.token += 1
+        lane.scheduled_priority = -1   # تا پایان انتظار زمان‌بندی دیگری انجام نشود
+        token = lane.token
+
+        def wake():
+            if lane.token == token:
+                lane.scheduled_priority = None
+                self._schedule(lane)
+
+        asyncio.get_running_loop().call_later(delay, wake)
+
+    def submit(self, bot: Bot, chat_id: int, method: str, priority: int,
+               fallback_text: Optional[str] = None, **kwargs) -> asyncio.Future:
+        """افزودن یک ارسال به صف chat"""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_log_failure)
+
+        lane = self._lanes.get(chat_id)
+        if lane is None:
+            lane = self._lanes[chat_id] = _ChatLane(chat_id)
+
+        job = _Job(bot, method, dict(kwargs, chat_id=chat_id), future, fallback_text)
+        heapq.heappush(lane.jobs, (priority, next(self._seq), 0, job))
+        self._idle.clear()
+        self._schedule(lane)
+        return future
+
+    async def _worker(self):
+        """برداشتن chat آماده، ارسال یک پیام و زمان‌بندی مجدد آن"""
+        while True:
+            priority, _, chat_id, token = await self._ready.get()
+            lane = self._lanes.get(chat_id)
+            if lane is None or lane.token != token or lane.serving or not lane.jobs:
+                continue
+            lane.scheduled_priority = None
+
+            # سطل chat خالی است: chat را بعداً برگردان و سراغ chat دیگری برو
+            wait = lane.bucket.delay()
+            if wait > 0:
+                self._schedule_later(lane, wait)
+                continue
+
+            lane.serving = True
+            entry = heapq.heappop(lane.jobs)
+            try:
+                lane.bucket.consume()
+                await self._global_bucket.acquire()
+                await self._send(lane, entry)
+            finally:
+                lane.serving = False
+                self._after_send(lane)
+
+    async def _send(self, lane: _ChatLane, entry: tuple):
+        """اجرای یک ارسال با رعایت RetryAfter"""
+        job = entry[3]
+        try:
+            result = await getattr(job.bot, job.method)(**job.kwargs)
+            self.sent += 1
+            if not job.future.done():
+                job.future.set_result(result)
+
+        except RetryAfter as e:
+            retry_after = e.retry_after
+            seconds = retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else float(retry_after)
+            # 429 تلگرام به ازای کل ربات هم اعمال می‌شود؛ بقیه chatها هم باید صبر کنند
+            lane.bucket.block(seconds)
+            self._global_bucket.block(seconds)
+            job.retries += 1
+            if job.retries <= DELIVERY_MAX_RETRIES:
+                self.retried += 1
+                heapq.heappush(lane.jobs, entry)
+            else:
+                self._fail(lane, entry, e)
+
+        except Exception as e:
+            self._fail(lane, entry, e)
+
+    def _fail(self, lane: _ChatLane, entry: tuple, error: Exception):
+        """ثبت خطا و در صورت وجود، ارسال پیام جایگزین در همان جایگاه ترتیب"""
+        job = entry[3]
+        self.failed += 1
+        if not job.future.done():
+            job.future.set_exception(error)
+        if job.fallback_text:
+            fallback_future = asyncio.get_running_loop().create_future()
+            fallback_future.add_done_callback(_log_failure)
+            fallback = _Job(job.bot, 'send_message', {'chat_id': lane.chat_id, 'text': job.fallback_text},
+                            fallback_future)
+            heapq.heappush(lane.jobs, (entry[0], entry[1], 1, fallback))
+
+    def _after_send(self, lane: _ChatLane):
+        """زمان‌بندی کار بعدی chat یا آزادسازی lane"""
+        if lane.jobs:
+            wait = lane.bucket.delay()
+            if wait > 0:
+                self._schedule_later(lane, wait)
+            else:
+                self._schedule(lane)
+            return
+
+        del self._lanes[lane.chat_id]
+        if not self._lanes:
+            self._idle.set()
+
+    async def drain(self, timeout: float):
+        """انتظار برای خالی شدن صف‌ها (حداکثر timeout ثانیه)"""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("صف ارسال در زمان خاموش شدن کامل خالی نشد")
+
+    async def stop(self):
+        """توقف workerها"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def get_stats(self) -> Dict[str, int]:
+        """آمار صف ارسال"""
+        return {
+            'pending': sum(len(lane.jobs) for lane in self._lanes.values()),
+            'chats': len(self._lanes),
+            'sent': self.sent,
+            'failed': self.failed,
+            'retried': self.retried
+        }
+
+
+def _log_failure(future: asyncio.Future):
+    """ثبت خطای ارسال‌هایی که کسی منتظر نتیجه‌شان نیست"""
+    if not future.cancelled() and future.exception():
+        logger.warning(f"❌ خطا در ارسال پیام: {future.exception()}")
+
+
+_dispatcher = _Dispatcher()
+
+
+class DeliveryService:
+    """سرویس ارسال پیام‌های خروجی از طریق صف محدودکننده نرخ"""
+
+    @staticmethod
+    def enqueue(bot: Bot, chat_id: int, method: str, priority: int = BULK,
+                fallback_text: Optional[str] = None, **kwargs) -> asyncio.Future:
+        """
+        افزودن یک فراخوانی متد Bot به صف (بدون انتظار)
+
+        Args:
+            bot: نمونه Bot
+            chat_id: آیدی چت
+            method: نام متد Bot (مثلاً 'send_message')
+            priority: INTERACTIVE یا BULK
+            fallback_text: متنی که در صورت شکست نهایی به جای این پیام ارسال شود
+            **kwargs: آرگومان‌های متد
+
+        Returns:
+            Future نتیجه (Message)
+        """
+        return _dispatcher.submit(bot, chat_id, method, priority, fallback_text, **kwargs)
+
+    @staticmethod
+    def enqueue_message(bot: Bot, chat_id: int, text: str, priority: int = BULK, **kwargs) -> asyncio.Future:
+        """افزودن یک send_message به صف"""
+        return DeliveryService.enqueue(bot, chat_id, 'send_message', priority, text=text, **kwargs)
+
+    @staticmethod
+    def enqueue_file(bot: Bot, chat_id: int, file_id: str, file_type: str, priority: int = BULK,
+                     caption: Optional[str] = None, fallback_text: Optional[str] = None,
+                     **kwargs) -> Optional[asyncio.Future]:
+        """
+        افزودن ارسال یک فایل به صف بر اساس نوع آن
+
+        Returns:
+            Future یا None اگر نوع فایل پشتیبانی نشود
+        """
+        send_method = FILE_SEND_METHODS.get(file_type)
+        if not send_method:
+            return None
+        method, argument = send_method
+        return DeliveryService.enqueue(bot, chat_id, method, priority, fallback_text,
+                                       caption=caption, **{argument: file_id}, **kwargs)
+
+    @staticmethod
+    def enqueue_files(bot: Bot, chat_id: int, files: List[Dict[str, Any]], priority: int = BULK,
+                      parse_mode: Optional[str] = None,
+                      fallback_text: Optional[str] = None) -> List[asyncio.Future]:
+        """
+        افزودن فایل‌ها به صف به صورت آلبوم (هر 10 فایل سازگار یک send_media_group)
+
+        Args:
+            files: لیست dict با کلیدهای file_id, file_type و caption (اختیاری)
+            parse_mode: حالت قالب‌بندی captionها
+            fallback_text: متن جایگزین در صورت شکست ارسال یک دسته
+
+        Returns:
+            لیست Futureها (یکی برای هر دسته)
+        """
+        futures = []
+        for batch in FileService.plan_media_batches(files):
+            if len(batch) == 1:
+                file_data = batch[0]
+                caption = file_data.get('caption')
+                future = DeliveryService.enqueue_file(
+                    bot, chat_id, file_data['file_id'], file_data['file_type'], priority,
+                    caption=caption, fallback_text=fallback_text,
+                    **({'parse_mode': parse_mode} if caption and parse_mode else {})
+                )
+            else:
+                future = DeliveryService.enqueue(
+                    bot, chat_id, 'send_media_group', priority, fallback_text,
+                    media=[FileService.build_input_media(file_data, parse_mode) for file_data in batch]
+                )
+            if future is not None:
+                futures.append(future)
+        return futures
+
+    @staticmethod
+    async def send(bot: Bot, chat_id: int, method: str, priority: int = INTERACTIVE, **kwargs):
+        """ارسال از طریق صف و انتظار برای نتیجه"""
+        return await DeliveryService.enqueue(bot, chat_id, method, priority, **kwargs)
+
+    @staticmethod
+    async def shutdown(timeout: float = 10.0):
+        """ارسال باقی‌مانده صف (تا timeout) و توقف workerها"""
+        await _dispatcher.drain(timeout)
+        await _dispatcher.stop()
+
+    @staticmethod
+    def get_stats() -> Dict[str, int]:
+        """آمار صف ارسال (pending, chats, sent, failed, retried)"""
+        return _dispatcher.get_stats()
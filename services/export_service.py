@@ -0,0 +1,175 @@
+# services/export_service.py
+
+"""
+خروجی CSV/XLSX کارها، فعالیت‌ها (تایمرها) و امتیازها
+
+ردیف‌ها از cursor با fetchmany خوانده و مستقیم در فایل موقت روی دیسک نوشته می‌شوند
+(CSV با csv.writer، XLSX با Workbook در حالت write_only)، پس مصرف حافظه به اندازه جدول بستگی ندارد.
+فراخواننده بعد از ارسال فایل باید آن را حذف کند.
+"""
+
+import csv
+import os
+import tempfile
+from datetime import datetime
+from database.executor import async_methods
+from database.models.export import ExportModel, EXPORT_DATASETS
+from database.models.category import CategoryModel
+from database.models.user import UserModel
+from config import EXPORT_BATCH_SIZE
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+
+EXPORT_FORMATS = ('csv', 'xlsx')
+XLSX_MAX_ROWS = 1048576
+
+
+@async_methods
+class ExportService:
+    """سرویس ساخت خروجی جریانی - Business Logic"""
+
+    @staticmethod
+    def parse_options(args: List[str]) -> Dict[str, Any]:
+        """
+        تبدیل آرگومان‌های دستور /export به گزینه‌های export
+
+        قالب: <tasks|activities|scores> [csv|xlsx] [employee=..] [category=..] [from=YYYY-MM-DD] [to=YYYY-MM-DD]
+        employee آیدی، آیدی تلگرام یا نام کارمند و category آیدی یا نام دسته‌بندی است.
+
+        Raises:
+            ValueError: آرگومان نامعتبر
+
+        Returns:
+            dict با کلیدهای dataset, file_format, employee_id, category_id, from_date, to_date
+        """
+        if not args or args[0] not in EXPORT_DATASETS:
+            raise ValueError(f"نوع خروجی باید یکی از {', '.join(EXPORT_DATASETS)} باشد")
+
+        options = {
+            'dataset': args[0], 'file_format': 'csv', 'employee_id': None,
+            'category_id': None, 'from_date': None, 'to_date': None
+        }
+
+        for arg in args[1:]:
+            if arg in EXPORT_FORMATS:
+                options['file_format'] = arg
+                continue
+
+            key, separator, value = arg.partition('=')
+            value = value.replace('_', ' ').strip()
+            if not separator or not value:
+                raise ValueError(f"آرگومان نامعتبر: {arg}")
+
+            if key == 'employee':
+                employees = UserModel.get_all_employees()
+                matches = [
+                    employee['id'] for employee in employees
+                    if value in (str(employee['id']), str(employee['telegram_id']), (employee['name'] or '').strip())
+                ]
+                if not matches:
+                    raise ValueError(f"کارمند «{value}» یافت نشد")
+                options['employee_id'] = matches[0]
+            elif key == 'category':
+                matches = [
+                    category['id'] for category in CategoryModel.get_all()
+                    if value in (str(category['id']), category['name'].strip())
+                ]
+                if not matches:
+                    raise ValueError(f"دسته‌بندی «{value}» یافت نشد")
+                options['category_id'] = matches[0]
+            elif key in ('from', 'to'):
+                try:
+                    datetime.strptime(value, "%Y-%m-%d")
+                except ValueError:
+                    raise ValueError(f"تاریخ باید به شکل YYYY-MM-DD باشد: {value}")
+                options[f'{key}_date'] = value
+            else:
+                raise ValueError(f"فیلتر ناشناخته: {key}")
+
+        if options['from_date'] and options['to_date'] and options['from_date'] > options['to_date']:
+            raise ValueError("تاریخ شروع بعد از تاریخ پایان است")
+        return options
+
+    @staticmethod
+    def _write_csv(path: str, header: Tuple[str, ...], rows: Iterator[Tuple[Any, ...]]) -> int:
+        """نوشتن جریانی CSV (utf-8-sig تا Excel متن فارسی را درست باز کند)"""
+        count = 0
+        with open(path, 'w', newline='', encoding='utf-8-sig') as output:
+            writer = csv.writer(output)
+            writer.writerow(header)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    @staticmethod
+    def _write_xlsx(path: str, sheet_title: str, header: Tuple[str, ...], rows: Iterator[Tuple[Any, ...]]) -> int:
+        """
+        نوشتن جریانی XLSX با Workbook(write_only=True)
+
+        با رسیدن به سقف ردیف‌های یک sheet در Excel، sheet جدید با همان سرستون‌ها ساخته می‌شود.
+        """
+        from openpyxl import Workbook
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+        workbook = Workbook(write_only=True)
+        sheet = None
+        sheet_count = 0
+        sheet_rows = XLSX_MAX_ROWS
+        count = 0
+        for row in rows:
+            if sheet_rows >= XLSX_MAX_ROWS:
+                sheet_count += 1
+                sheet = workbook.create_sheet(sheet_title if sheet_count == 1 else f"{sheet_title}_{sheet_count}")
+                sheet.append(header)
+                sheet_rows = 1
+            sheet.append([
+                ILLEGAL_CHARACTERS_RE.sub('', value) if isinstance(value, str) else value
+                for value in row
+            ])
+            sheet_rows += 1
+            count += 1
+
+        if sheet is None:
+            workbook.create_sheet(sheet_title).append(header)
+        workbook.save(path)
+        return count
+
+    @staticmethod
+    def export(dataset: str, file_format: str = 'csv', employee_id: Optional[int] = None,
+               category_id: Optional[int] = None, from_date: Optional[str] = None,
+               to_date: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        ساخت فایل خروجی در پوشه موقت
+
+        Returns:
+            dict با کلیدهای path, filename, rows, size یا None در صورت خطا
+        """
+        if dataset not in EXPORT_DATASETS or file_format not in EXPORT_FORMATS:
+            return None
+
+        descriptor, path = tempfile.mkstemp(prefix=f"export_{dataset}_", suffix=f".{file_format}")
+        os.close(descriptor)
+
+        rows = ExportModel.iter_rows(dataset, employee_id, category_id, from_date, to_date, EXPORT_BATCH_SIZE)
+        try:
+            header = next(rows)
+            if file_format == 'xlsx':
+                count = ExportService._write_xlsx(path, dataset, header, rows)
+            else:
+                count = ExportService._write_csv(path, header, rows)
+
+            return {
+                'path': path,
+                'filename': f"{dataset}_{datetime.now().strftime('%Y%m%d_%H%M')}.{file_format}",
+                'rows': count,
+                'size': os.path.getsize(path)
+            }
+
+        except Exception as e:
+            os.remove(path)
+            print(f"❌ خطا در ساخت خروجی {dataset}: {e}")
+            return None
+
+        finally:
+            # بستن generator تا اتصال دیتابیس فوراً به Pool برگردد
+            rows.close()
@@ -2,10 +2,23 @@
 
 from database.models.task_attachment import TaskAttachmentModel
 from database.models.task_section_file import TaskSectionFileModel
-from telegram import Bot
+from database.executor import async_methods
+from telegram import Bot, InputMediaPhoto, InputMediaVideo, InputMediaDocument
 from typing import Optional, List, Dict, Any
 
+# محدودیت‌های تلگرام برای آلبوم (send_media_group)
+MEDIA_GROUP_LIMIT = 10
+CAPTION_LIMIT = 1024
 
+# نوع‌هایی که در یک آلبوم کنار هم قرار می‌گیرند (عکس و ویدیو با هم، سند فقط با سند؛ voice آلبوم ندارد)
+MEDIA_GROUP_KINDS = {'photo': 'visual', 'video': 'visual', 'document': 'document'}
+INPUT_MEDIA_TYPES = {'photo': InputMediaPhoto, 'video': InputMediaVideo, 'document': InputMediaDocument}
+
+
+@async_methods(exclude=(
+    'get_file_type_from_message', 'get_file_id_from_message', 'get_file_unique_id_from_message',
+    'plan_media_batches', 'build_input_media'
+))
 class FileService:
     """سرویس مدیریت فایل‌ها - Business Logic"""
     
@@ -69,7 +82,7 @@ class FileService:
     
     @staticmethod
     async def send_file_to_user(bot: Bot, chat_id: int, file_id: str, file_type: str, 
-                                 caption: Optional[str] = None) -> bool:
+                                 caption: Optional[str] = None, parse_mode: Optional[str] = None) -> bool:
         """
         ارسال فایل به کاربر
         
@@ -79,19 +92,21 @@ class FileService:
             file_id: آیدی فایل تلگرام
             file_type: نوع فایل
             caption: متن توضیحات (اختیاری)
+            parse_mode: حالت قالب‌بندی caption (اختیاری)
             
         Returns:
             bool: موفق بودن ارسال
         """
+        parse_mode = parse_mode if caption else None
         try:
             if file_type == 'photo':
-                await bot.send_photo(chat_id=chat_id, photo=file_id, caption=caption)
+                await bot.send_photo(chat_id=chat_id, photo=file_id, caption=caption, parse_mode=parse_mode)
             elif file_type == 'video':
-                await bot.send_video(chat_id=chat_id, video=file_id, caption=caption)
+                await bot.send_video(chat_id=chat_id, video=file_id, caption=caption, parse_mode=parse_mode)
             elif file_type == 'voice':
-                await bot.send_voice(chat_id=chat_id, voice=file_id, caption=caption)
+                await bot.send_voice(chat_id=chat_id, voice=file_id, caption=caption, parse_mode=parse_mode)
             elif file_type == 'document':
-                await bot.send_document(chat_id=chat_id, document=file_id, caption=caption)
+                await bot.send_document(chat_id=chat_id, document=file_id, caption=caption, parse_mode=parse_mode)
             else:
                 return False
             return True
@@ -100,31 +115,102 @@ class FileService:
             return False
     
     @staticmethod
-    async def send_task_files_to_user(bot: Bot, chat_id: int, task_id: int) -> bool:
+    def plan_media_batches(files: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
         """
-        ارسال تمام فایل‌های یک کار به کاربر (شامل attachments و section files)
+        گروه‌بندی فایل‌های پشت سر هم در آلبوم‌های حداکثر 10 تایی (ترتیب حفظ می‌شود)
+        
+        Args:
+            files: لیست dict با کلیدهای file_id, file_type و caption (اختیاری)
+            
+        Returns:
+            لیست دسته‌ها؛ دسته تک‌عضوی یعنی ارسال عادی
+        """
+        batches = []
+        current = []
+        current_kind = None
+        
+        for file_data in files:
+            kind = MEDIA_GROUP_KINDS.get(file_data['file_type'])
+            if current and (kind is None or kind != current_kind or len(current) >= MEDIA_GROUP_LIMIT):
+                batches.append(current)
+                current = []
+            
+            if kind is None:
+                batches.append([file_data])
+                current_kind = None
+            else:
+                current.append(file_data)
+                current_kind = kind
+        
+        if current:
+            batches.append(current)
+        
+        return batches
+    
+    @staticmethod
+    def build_input_media(file_data: Dict[str, Any], parse_mode: Optional[str] = None):
+        """ساخت InputMedia یک فایل برای send_media_group"""
+        return INPUT_MEDIA_TYPES[file_data['file_type']](
+            media=file_data['file_id'],
+            caption=file_data.get('caption'),
+            parse_mode=parse_mode if file_data.get('caption') else None
+        )
+    
+    @staticmethod
+    async def send_files_grouped(bot: Bot, chat_id: int, files: List[Dict[str, Any]],
+                                 parse_mode: Optional[str] = None) -> bool:
+        """
+        ارسال فایل‌ها به صورت آلبوم (یک فراخوانی send_media_group برای هر 10 فایل سازگار)
         
         Args:
             bot: نمونه Bot
             chat_id: آیدی چت
-            task_id: آیدی کار
+            files: لیست dict با کلیدهای file_id, file_type و caption (اختیاری)
+            parse_mode: حالت قالب‌بندی captionها
             
         Returns:
-            bool: موفق بودن ارسال
+            bool: موفق بودن ارسال همه فایل‌ها
         """
         success = True
         
-        # ارسال فایل‌های ضمیمه
-        attachments = FileService.get_task_attachments(task_id)
-        for attachment in attachments:
-            result = await FileService.send_file_to_user(
-                bot, chat_id, attachment['file_id'], attachment['file_type']
-            )
-            if not result:
+        for batch in FileService.plan_media_batches(files):
+            if len(batch) == 1:
+                file_data = batch[0]
+                if not await FileService.send_file_to_user(
+                    bot, chat_id, file_data['file_id'], file_data['file_type'],
+                    file_data.get('caption'), parse_mode
+                ):
+                    success = False
+                continue
+            
+            try:
+                await bot.send_media_group(
+                    chat_id=chat_id,
+                    media=[FileService.build_input_media(file_data, parse_mode) for file_data in batch]
+                )
+            except Exception as e:
+                print(f"❌ خطا در ارسال آلبوم: {e}")
                 success = False
         
         return success
     
+    @staticmethod
+    async def send_task_files_to_user(bot: Bot, chat_id: int, task_id: int) -> bool:
+        """
+        ارسال تمام فایل‌های یک کار به کاربر (شامل attachments و section files)
+        
+        Args:
+            bot: نمونه Bot
+            chat_id: آیدی چت
+            task_id: آیدی کار
+            
+        Returns:
+            bool: موفق بودن ارسال
+        """
+        # ارسال فایل‌های ضمیمه (آلبوم‌های حداکثر 10 تایی)
+        attachments = await FileService.aget_task_attachments(task_id)
+        return await FileService.send_files_grouped(bot, chat_id, attachments)
+    
     @staticmethod
     async def send_section_files_with_labels(bot: Bot, chat_id: int, task_id: int) -> bool:
         """
@@ -141,26 +227,18 @@ class FileService:
         success = True
         
         # فایل‌های نتایج
-        results_files = FileService.get_section_files(task_id, 'results')
+        results_files = await FileService.aget_section_files(task_id, 'results')
         if results_files:
             await bot.send_message(chat_id=chat_id, text="📊 فایل‌های نتایج مورد انتظار:")
-            for file_data in results_files:
-                result = await FileService.send_file_to_user(
-                    bot, chat_id, file_data['file_id'], file_data['file_type']
-                )
-                if not result:
-                    success = False
+            if not await FileService.send_files_grouped(bot, chat_id, results_files):
+                success = False
         
         # فایل‌های توضیحات
-        description_files = FileService.get_section_files(task_id, 'description')
+        description_files = await FileService.aget_section_files(task_id, 'description')
         if description_files:
             await bot.send_message(chat_id=chat_id, text="📝 فایل‌های توضیحات:")
-            for file_data in description_files:
-                result = await FileService.send_file_to_user(
-                    bot, chat_id, file_data['file_id'], file_data['file_type']
-                )
-                if not result:
-                    success = False
+            if not await FileService.send_files_grouped(bot, chat_id, description_files):
+                success = False
         
         return success
     
@@ -187,6 +265,20 @@ class FileService:
         
         return success
     
+    @staticmethod
+    def replace_task_attachments(task_id: int, attachments: List[tuple]) -> bool:
+        """
+        جایگزینی فایل‌های ضمیمه کار با فایل‌های جدید
+        
+        Args:
+            task_id: آیدی کار
+            attachments: لیست (file_id, file_type)
+            
+        Returns:
+            bool: موفق بودن عملیات
+        """
+        return TaskAttachmentModel.replace_for_task(task_id, attachments)
+    
     @staticmethod
     def delete_section_files(task_id: int, section_type: str) -> bool:
         """
@@ -242,3 +334,24 @@ class FileService:
         elif message.document:
             return message.document.file_id
         return None
+
+    @staticmethod
+    def get_file_unique_id_from_message(message) -> Optional[str]:
+        """
+        استخراج file_unique_id از پیام تلگرام (برای یک فایل ثابت است، برخلاف file_id)
+        
+        Args:
+            message: پیام تلگرام
+            
+        Returns:
+            file_unique_id یا None
+        """
+        if message.photo:
+            return message.photo[-1].file_unique_id
+        elif message.video:
+            return message.video.file_unique_id
+        elif message.voice:
+            return message.voice.file_unique_id
+        elif message.document:
+            return message.document.file_unique_id
+        return None
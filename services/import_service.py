@@ -0,0 +1,217 @@
+# services/import_service.py
+
+"""
+ورود دسته‌ای کارها از فایل CSV یا JSON
+
+ستون‌ها / کلیدها:
+    title (اجباری), description, results, duration (دقیقه), importance (1-10), priority (1-10),
+    category (نام دسته‌بندی) یا category_id,
+    assignee (آیدی تلگرام یا نام کارمند) یا assigned_to_id,
+    description_files, results_files
+
+فایل‌ها در JSON لیست {"file_id": ..., "file_type": ...} و در CSV به شکل
+"photo:AgAC...;document:BQAC..." هستند.
+
+اگر حتی یک ردیف نامعتبر باشد هیچ کاری ثبت نمی‌شود و خطاها با شماره ردیف برگردانده می‌شوند؛
+در غیر این صورت همه کارها در یک تراکنش ثبت می‌شوند.
+"""
+
+import csv
+import io
+import json
+from database.executor import async_methods
+from database.models.category import CategoryModel
+from database.models.user import UserModel
+from services.task_service import TaskService
+from typing import Optional, List, Dict, Any, Tuple
+
+IMPORT_MAX_BYTES = 5 * 1024 * 1024
+IMPORT_MAX_TASKS = 2000
+FILE_TYPES = ('photo', 'video', 'voice', 'document')
+
+
+@async_methods(exclude=('parse_document',))
+class ImportService:
+    """سرویس ورود دسته‌ای کارها - Business Logic"""
+
+    @staticmethod
+    def parse_document(content: bytes, filename: str) -> List[Dict[str, Any]]:
+        """
+        تبدیل محتوای فایل به لیست ردیف‌ها
+
+        Args:
+            content: محتوای فایل
+            filename: نام فایل (نوع از پسوند تشخیص داده می‌شود)
+
+        Raises:
+            ValueError: قالب نامعتبر
+
+        Returns:
+            لیست dict ردیف‌ها
+        """
+        text = content.decode('utf-8-sig')
+
+        if filename.lower().endswith('.json'):
+            data = json.loads(text)
+            if isinstance(data, dict):
+                data = data.get('tasks')
+            if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+                raise ValueError("فایل JSON باید لیستی از کارها (یا {\"tasks\": [...]}) باشد")
+            return data
+
+        if filename.lower().endswith('.csv'):
+            reader = csv.DictReader(io.StringIO(text))
+            if not reader.fieldnames or 'title' not in [name.strip() for name in reader.fieldnames]:
+                raise ValueError("فایل CSV باید ستون title داشته باشد")
+            return [
+                {(key or '').strip(): (value.strip() if isinstance(value, str) else value)
+                 for key, value in row.items()}
+                for row in reader
+            ]
+
+        raise ValueError("فقط فایل‌های .csv و .json پشتیبانی می‌شوند")
+
+    @staticmethod
+    def _parse_files(value: Any) -> List[Dict[str, str]]:
+        """تبدیل ستون فایل‌ها به لیست dict (Raises: ValueError)"""
+        if not value:
+            return []
+
+        if isinstance(value, str):
+            items = []
+            for part in value.split(';'):
+                part = part.strip()
+                if not part:
+                    continue
+                file_type, separator, file_id = part.partition(':')
+                items.append({'file_type': file_type.strip(), 'file_id': file_id.strip()} if separator else {})
+            value = items
+
+        if not isinstance(value, list):
+            raise ValueError("فهرست فایل‌ها نامعتبر است")
+
+        files = []
+        for item in value:
+            if not isinstance(item, dict) or not item.get('file_id') or item.get('file_type') not in FILE_TYPES:
+                raise ValueError(f"فایل نامعتبر (نوع باید یکی از {', '.join(FILE_TYPES)} باشد)")
+            files.append({'file_id': str(item['file_id']), 'file_type': item['file_type']})
+        return files
+
+    @staticmethod
+    def _parse_score(value: Any, field: str) -> Optional[int]:
+        """اعتبارسنجی اهمیت/اولویت (1 تا 10) (Raises: ValueError)"""
+        if value in (None, ''):
+            return None
+        score = int(value)
+        if not 1 <= score <= 10:
+            raise ValueError(f"{field} باید بین 1 تا 10 باشد")
+        return score
+
+    @staticmethod
+    def prepare_tasks(rows: List[Dict[str, Any]], assigned_by_id: int) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        اعتبارسنجی ردیف‌ها و تبدیل نام دسته‌بندی/کارمند به آیدی
+
+        Returns:
+            (لیست کارهای آماده ثبت, لیست خطاها)
+        """
+        categories = CategoryModel.get_all()
+        category_ids = {category['id'] for category in categories}
+        category_by_name = {category['name'].strip(): category['id'] for category in categories}
+
+        employees = UserModel.get_all_employees()
+        employee_ids = {employee['id'] for employee in employees}
+        employee_by_telegram = {str(employee['telegram_id']): employee['id'] for employee in employees}
+        employee_by_name = {(employee['name'] or '').strip(): employee['id'] for employee in employees}
+
+        tasks = []
+        errors = []
+        for row_number, row in enumerate(rows, 1):
+            try:
+                title = str(row.get('title') or '').strip()
+                if not title:
+                    raise ValueError("عنوان خالی است")
+
+                duration = row.get('duration')
+                if duration not in (None, ''):
+                    duration = int(duration)
+                    if duration <= 0:
+                        raise ValueError("مدت زمان باید عدد مثبت باشد")
+                else:
+                    duration = None
+
+                category_id = None
+                if row.get('category_id') not in (None, ''):
+                    category_id = int(row['category_id'])
+                    if category_id not in category_ids:
+                        raise ValueError(f"دسته‌بندی {category_id} وجود ندارد")
+                elif row.get('category'):
+                    category_id = category_by_name.get(str(row['category']).strip())
+                    if category_id is None:
+                        raise ValueError(f"دسته‌بندی «{row['category']}» وجود ندارد")
+
+                assigned_to_id = None
+                if row.get('assigned_to_id') not in (None, ''):
+                    assigned_to_id = int(row['assigned_to_id'])
+                    if assigned_to_id not in employee_ids:
+                        raise ValueError(f"کارمند {assigned_to_id} وجود ندارد")
+                elif row.get('assignee'):
+                    assignee = str(row['assignee']).strip()
+                    assigned_to_id = employee_by_telegram.get(assignee) or employee_by_name.get(assignee)
+                    if assigned_to_id is None:
+                        raise ValueError(f"کارمند «{assignee}» یافت نشد")
+
+                tasks.append({
+                    'title': title,
+                    'description': row.get('description') or None,
+                    'results': row.get('results') or None,
+                    'duration': duration,
+                    'importance': ImportService._parse_score(row.get('importance'), 'اهمیت'),
+                    'priority': ImportService._parse_score(row.get('priority'), 'اولویت'),
+                    'category_id': category_id,
+                    'assigned_to_id': assigned_to_id,
+                    'assigned_by_id': assigned_by_id,
+                    'description_files': ImportService._parse_files(row.get('description_files')),
+                    'results_files': ImportService._parse_files(row.get('results_files'))
+                })
+
+            except (ValueError, TypeError) as e:
+                errors.append(f"ردیف {row_number}: {e}")
+
+        return tasks, errors
+
+    @staticmethod
+    def import_tasks(content: bytes, filename: str, assigned_by_id: int) -> Dict[str, Any]:
+        """
+        ورود کارها از محتوای فایل (همه یا هیچ)
+
+        Args:
+            content: محتوای فایل
+            filename: نام فایل
+            assigned_by_id: تخصیص‌دهنده
+
+        Returns:
+            dict با کلیدهای task_ids (لیست) و errors (لیست)
+        """
+        if len(content) > IMPORT_MAX_BYTES:
+            return {'task_ids': [], 'errors': [f"حجم فایل بیش از {IMPORT_MAX_BYTES // (1024 * 1024)} مگابایت است"]}
+
+        try:
+            rows = ImportService.parse_document(content, filename)
+        except (ValueError, UnicodeDecodeError, csv.Error) as e:
+            return {'task_ids': [], 'errors': [f"خطا در خواندن فایل: {e}"]}
+
+        if not rows:
+            return {'task_ids': [], 'errors': ["فایل هیچ کاری ندارد"]}
+        if len(rows) > IMPORT_MAX_TASKS:
+            return {'task_ids': [], 'errors': [f"حداکثر {IMPORT_MAX_TASKS} کار در هر فایل مجاز است"]}
+
+        tasks, errors = ImportService.prepare_tasks(rows, assigned_by_id)
+        if errors:
+            return {'task_ids': [], 'errors': errors}
+
+        task_ids = TaskService.create_tasks_bulk(tasks)
+        if task_ids is None:
+            return {'task_ids': [], 'errors': ["خطا در ثبت کارها در دیتابیس"]}
+
+        return {'task_ids': task_ids, 'errors': []}
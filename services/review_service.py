@@ -1,9 +1,11 @@
 # services/review_service.py
 
 from database.models.admin_review import AdminReviewModel
+from database.executor import async_methods
 from typing import Optional, List, Dict, Any
 
 
+@async_methods
 class ReviewService:
     """سرویس مدیریت نظرات ادمین - Business Logic"""
     
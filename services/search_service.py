@@ -0,0 +1,85 @@
+# services/search_service.py
+
+import html
+from database.executor import async_methods
+from database.models.search import SearchModel, build_match_query, HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE
+from config import SEARCH_PAGE_SIZE
+from typing import Optional, Dict, Any
+
+KIND_LABELS = {
+    'task': '📋 کار',
+    'knowledge': '📚 دانش',
+    'suggestion': '💡 پیشنهاد',
+    'results': '📊 نتایج',
+}
+REVIEW_KIND_LABEL = '👨‍💼 نظر ادمین'
+
+
+@async_methods
+class SearchService:
+    """سرویس جستجوی متن کامل در کارها، داده‌های کاری و نظرات ادمین - Business Logic"""
+
+    @staticmethod
+    def search(text: str, page: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        جستجو و صفحه‌بندی نتایج
+
+        Args:
+            text: متن جستجو (کلمه‌ای که به * ختم شود پیشوندی جستجو می‌شود)
+            page: شماره صفحه (از 0)
+
+        Returns:
+            dict با کلیدهای items, page, has_prev, has_next یا None اگر متن جستجو خالی باشد
+        """
+        match_query = build_match_query(text)
+        if not match_query:
+            return None
+
+        page = max(page, 0)
+        items = SearchModel.search(match_query, SEARCH_PAGE_SIZE + 1, page * SEARCH_PAGE_SIZE) or []
+        return {
+            'items': items[:SEARCH_PAGE_SIZE],
+            'page': page,
+            'has_prev': page > 0,
+            'has_next': len(items) > SEARCH_PAGE_SIZE
+        }
+
+    @staticmethod
+    def _highlight(text: Optional[str]) -> str:
+        """escape متن برای HTML و تبدیل نشانگرهای snippet به <b>"""
+        return (
+            html.escape(text or '')
+            .replace(HIGHLIGHT_OPEN, '<b>')
+            .replace(HIGHLIGHT_CLOSE, '</b>')
+        )
+
+    @staticmethod
+    def format_results(text: str, results: Dict[str, Any]) -> str:
+        """
+        متن نتایج جستجو (parse_mode='HTML')
+
+        Args:
+            text: متن جستجو
+            results: خروجی search
+        """
+        header = f"🔎 نتایج جستجو برای «{html.escape(text)}» - صفحه {results['page'] + 1}\n\n"
+        if not results['items']:
+            return header + "📭 نتیجه‌ای یافت نشد."
+
+        lines = []
+        for number, item in enumerate(results['items'], results['page'] * SEARCH_PAGE_SIZE + 1):
+            kind = item['kind'] or ''
+            label = REVIEW_KIND_LABEL if kind.startswith('review_') else KIND_LABELS.get(kind, kind)
+            title = (
+                SearchService._highlight(item['title_highlight'])
+                if kind == 'task' else html.escape(item['task_title'] or '')
+            )
+            employee = f" - {html.escape(item['employee_name'])}" if item['employee_name'] else ""
+
+            entry = f"{number}. {label} | کار #{item['task_id']}: {title}{employee}"
+            snippet = SearchService._highlight(item['snippet']).strip()
+            if snippet:
+                entry += f"\n<i>{snippet}</i>"
+            lines.append(entry)
+
+        return header + "\n\n".join(lines)
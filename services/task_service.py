@@ -1,10 +1,14 @@
 # services/task_service.py
 
+from database.connection import get_connection
 from database.models.task import TaskModel
 from database.models.category import CategoryModel
-from typing import Optional, List, Dict, Any
+from database.models.daily_stats import DailyStatsModel
+from database.executor import async_methods
+from typing import Optional, List, Dict, Any, Tuple
 
 
+@async_methods
 class TaskService:
     """سرویس مدیریت کارها - Business Logic"""
 
@@ -21,6 +25,19 @@ class TaskService:
         """
         return TaskModel.create(**task_data)
 
+    @staticmethod
+    def create_tasks_bulk(tasks: List[Dict[str, Any]]) -> Optional[List[int]]:
+        """
+        ایجاد چند کار و فایل‌های بخش‌هایشان در یک تراکنش
+
+        Args:
+            tasks: لیست دیکشنری اطلاعات کار (با description_files و results_files اختیاری)
+
+        Returns:
+            لیست task_id ها یا None (در صورت خطا هیچ کاری ثبت نمی‌شود)
+        """
+        return TaskModel.create_many(tasks)
+
     @staticmethod
     def get_categories() -> List[Dict[str, Any]]:
         """
@@ -61,6 +78,70 @@ class TaskService:
         """
         return TaskModel.get_by_employee(employee_id, status)
 
+    @staticmethod
+    def get_active_employee_tasks_page(employee_id: int, page_cursor: Optional[Tuple[str, int]] = None,
+                                       direction: str = 'n') -> Dict[str, Any]:
+        """
+        دریافت یک صفحه از کارهای در جریان کارمند
+
+        Args:
+            employee_id: آیدی کارمند
+            page_cursor: cursor صفحه (از utils.keyboards.parse_page_callback)
+            direction: 'n' یا 'p'
+
+        Returns:
+            dict با کلیدهای items, has_next, has_prev
+        """
+        return TaskModel.get_active_by_employee_page(employee_id, page_cursor, direction)
+
+    @staticmethod
+    def get_employee_tasks_page(employee_id: int, page_cursor: Optional[Tuple[str, int]] = None,
+                                direction: str = 'n') -> Dict[str, Any]:
+        """
+        دریافت یک صفحه از تمام کارهای کارمند
+
+        Args:
+            employee_id: آیدی کارمند
+            page_cursor: cursor صفحه
+            direction: 'n' یا 'p'
+
+        Returns:
+            dict با کلیدهای items, has_next, has_prev
+        """
+        return TaskModel.get_by_employee_page(employee_id, page_cursor, direction)
+
+    @staticmethod
+    def get_completed_submitted_tasks_page(page_cursor: Optional[Tuple[str, int]] = None,
+                                           direction: str = 'n') -> Dict[str, Any]:
+        """
+        دریافت یک صفحه از کارهای تحویل شده
+
+        Args:
+            page_cursor: cursor صفحه
+            direction: 'n' یا 'p'
+
+        Returns:
+            dict با کلیدهای items, has_next, has_prev
+        """
+        return TaskModel.get_completed_submitted_page(page_cursor, direction)
+
+    @staticmethod
+    def get_archived_tasks_with_scores_page(employee_id: Optional[int] = None,
+                                            page_cursor: Optional[Tuple[str, int]] = None,
+                                            direction: str = 'n') -> Dict[str, Any]:
+        """
+        دریافت یک صفحه از کارهای آرشیو شده همراه با آخرین امتیاز ادمین
+
+        Args:
+            employee_id: آیدی کارمند (اختیاری)
+            page_cursor: cursor صفحه
+            direction: 'n' یا 'p'
+
+        Returns:
+            dict با کلیدهای items, has_next, has_prev
+        """
+        return TaskModel.get_archived_with_latest_score_page(employee_id, page_cursor, direction)
+
     @staticmethod
     def get_tasks_by_status(status: str) -> List[Dict[str, Any]]:
         """
@@ -94,6 +175,19 @@ class TaskService:
         """
         return TaskModel.get_archived()
 
+    @staticmethod
+    def get_archived_tasks_with_scores(employee_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        دریافت کارهای آرشیو شده همراه با آخرین امتیاز ادمین
+
+        Args:
+            employee_id: آیدی کارمند (اختیاری؛ بدون آن همه کارها)
+
+        Returns:
+            لیست کارها با کلیدهای employee_name و latest_score
+        """
+        return TaskModel.get_archived_with_latest_score(employee_id)
+
     @staticmethod
     def update_task_status(task_id: int, status: str) -> bool:
         """
@@ -262,7 +356,7 @@ class TaskService:
         Returns:
             tuple: (می‌تواند تحویل دهد, پیام)
         """
-        from database.models.user import UserModel
+        from services.user_service import UserService
         from services.work_service import WorkService
 
         task = TaskModel.get_by_id(task_id)
@@ -271,7 +365,7 @@ class TaskService:
             return False, "کار یافت نشد!"
 
         # تبدیل telegram_id به user.id
-        user = UserModel.get_by_telegram_id(telegram_id)
+        user = UserService.get_user_info(telegram_id)
         if not user:
             return False, "کاربر یافت نشد!"
 
@@ -382,53 +476,51 @@ class TaskService:
         Returns:
             dict: {'total': ..., 'pending': ..., 'in_progress': ..., 'completed': ..., 'archived': ...}
         """
-        conn = create_connection()
-        if not conn:
-            return {}
-
-        try:
-            cursor = conn.cursor()
-
-            # تعداد کل کارهای غیر آرشیو
-            cursor.execute("""
-                SELECT COUNT(*) FROM Tasks 
-                WHERE assigned_to_id = ? AND status != 'archived'
-            """, (employee_id,))
-            total = cursor.fetchone()[0]
-
-            # تعداد کارهای آرشیو
-            cursor.execute("""
-                SELECT COUNT(*) FROM Tasks 
-                WHERE assigned_to_id = ? AND status = 'archived'
-            """, (employee_id,))
-            archived = cursor.fetchone()[0]
-
-            # تعداد به تفکیک وضعیت
-            cursor.execute("""
-                SELECT status, COUNT(*) 
-                FROM Tasks 
-                WHERE assigned_to_id = ? 
-                GROUP BY status
-            """, (employee_id,))
-
-            status_counts = {}
-            for status, count in cursor.fetchall():
-                status_counts[status] = count
-
-            return {
-                'total': total,
-                'archived': archived,
-                'pending': status_counts.get('pending', 0),
-                'in_progress': status_counts.get('in_progress', 0),
-                'completed': status_counts.get('completed', 0),
-                'on_hold': status_counts.get('on_hold', 0)
-            }
-
-        except Exception as e:
-            print(f"❌ خطا در دریافت آمار: {e}")
-            return {}
-        finally:
-            conn.close()
+        with get_connection() as conn:
+            if not conn:
+                return {}
+
+            try:
+                cursor = conn.cursor()
+
+                # تعداد کل کارهای غیر آرشیو
+                cursor.execute("""
+                    SELECT COUNT(*) FROM Tasks 
+                    WHERE assigned_to_id = ? AND status != 'archived'
+                """, (employee_id,))
+                total = cursor.fetchone()[0]
+
+                # تعداد کارهای آرشیو
+                cursor.execute("""
+                    SELECT COUNT(*) FROM Tasks 
+                    WHERE assigned_to_id = ? AND status = 'archived'
+                """, (employee_id,))
+                archived = cursor.fetchone()[0]
+
+                # تعداد به تفکیک وضعیت
+                cursor.execute("""
+                    SELECT status, COUNT(*) 
+                    FROM Tasks 
+                    WHERE assigned_to_id = ? 
+                    GROUP BY status
+                """, (employee_id,))
+
+                status_counts = {}
+                for status, count in cursor.fetchall():
+                    status_counts[status] = count
+
+                return {
+                    'total': total,
+                    'archived': archived,
+                    'pending': status_counts.get('pending', 0),
+                    'in_progress': status_counts.get('in_progress', 0),
+                    'completed': status_counts.get('completed', 0),
+                    'on_hold': status_counts.get('on_hold', 0)
+                }
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت آمار: {e}")
+                return {}
 
     @staticmethod
     def get_employee_categories_with_stats(employee_id: int) -> List[Dict[str, Any]]:
@@ -441,31 +533,29 @@ class TaskService:
         Returns:
             لیست دسته‌بندی‌ها با آمار
         """
-        conn = create_connection()
-        if not conn:
-            return []
-
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT c.id, c.name, 
-                       COUNT(t.id) as total,
-                       SUM(CASE WHEN t.status = 'archived' THEN 1 ELSE 0 END) as finished
-                FROM Categories c
-                JOIN Tasks t ON t.category_id = c.id
-                WHERE t.assigned_to_id = ?
-                GROUP BY c.id, c.name
-                ORDER BY c.name
-            """, (employee_id,))
-
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-
-        except Exception as e:
-            print(f"❌ خطا در دریافت دسته‌بندی‌ها: {e}")
-            return []
-        finally:
-            conn.close()
+        with get_connection() as conn:
+            if not conn:
+                return []
+
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT c.id, c.name, 
+                           COUNT(t.id) as total,
+                           SUM(CASE WHEN t.status = 'archived' THEN 1 ELSE 0 END) as finished
+                    FROM Categories c
+                    JOIN Tasks t ON t.category_id = c.id
+                    WHERE t.assigned_to_id = ?
+                    GROUP BY c.id, c.name
+                    ORDER BY c.name
+                """, (employee_id,))
+
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
+
+            except Exception as e:
+                print(f"❌ خطا در دریافت دسته‌بندی‌ها: {e}")
+                return []
 
     @staticmethod
     def get_tasks_by_employee_and_category(employee_id: int, category_id: int) -> List[Dict[str, Any]]:
@@ -479,32 +569,30 @@ class TaskService:
         Returns:
             لیست کارها
         """
-        conn = create_connection()
-        if not conn:
-            return []
+        with get_connection() as conn:
+            if not conn:
+                return []
 
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT t.* 
-                FROM Tasks t
-                WHERE t.assigned_to_id = ? AND t.category_id = ?
-                ORDER BY t.creation_date DESC
-            """, (employee_id, category_id))
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT t.* 
+                    FROM Tasks t
+                    WHERE t.assigned_to_id = ? AND t.category_id = ?
+                    ORDER BY t.creation_date DESC
+                """, (employee_id, category_id))
 
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+                rows = cursor.fetchall()
+                return [dict(row) for row in rows]
 
-        except Exception as e:
-            print(f"❌ خطا در دریافت کارها: {e}")
-            return []
-        finally:
-            conn.close()
+            except Exception as e:
+                print(f"❌ خطا در دریافت کارها: {e}")
+                return []
 
     @staticmethod
     def count_daily_completed_tasks(employee_id: int, date: str) -> int:
         """
-        شمارش کارهای تحویل شده در یک روز خاص
+        شمارش کارهای تحویل شده در یک روز خاص (از جدول تجمیعی DailyEmployeeStats)
 
         Args:
             employee_id: آیدی کارمند (user.id)
@@ -513,23 +601,4 @@ class TaskService:
         Returns:
             تعداد کارها
         """
-        conn = create_connection()
-        if not conn:
-            return 0
-
-        try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) FROM Tasks
-                WHERE assigned_to_id = ? 
-                AND status = 'completed'
-                AND DATE(completion_date) = ?
-            """, (employee_id, date))
-
-            return cursor.fetchone()[0]
-
-        except Exception as e:
-            print(f"❌ خطا در شمارش کارها: {e}")
-            return 0
-        finally:
-            conn.close()
\ No newline at end of file
+        return DailyStatsModel.get_for_user(employee_id, date)['completed_count']
@@ -0,0 +1,253 @@
+# services/template_service.py
+
+"""
+قالب‌های کار تکرارشونده و زمان‌بند آنها
+
+قواعد تکرار:
+    daily          هر روز
+    weekly:N       هر هفته، روز N (0=دوشنبه ... 6=یکشنبه، مثل datetime.weekday)
+    monthly:N      هر ماه، روز N (1 تا 28)
+    interval:N     هر N روز
+
+زمان‌بند زمان اجرای بعدی قالب‌های فعال را در یک min-heap نگه می‌دارد؛ هر tick فقط
+سر heap را نگاه می‌کند (O(1)) و برای هر قالب سررسید شده یک pop/push (O(log n)) انجام
+می‌دهد. کارهای سررسید شده دسته‌ای و در یک تراکنش ایجاد می‌شوند.
+ورودی‌های قدیمی heap (قالب غیرفعال یا زمان‌بندی تغییر کرده) هنگام pop نادیده گرفته می‌شوند.
+اجراهای از دست رفته (بات خاموش بوده) فقط یک بار ایجاد می‌شوند و زمان بعدی از حالا حساب می‌شود.
+"""
+
+import heapq
+import logging
+from calendar import monthrange
+from datetime import datetime, timedelta
+from database.models.task_template import TaskTemplateModel
+from config import TEMPLATE_BATCH_SIZE
+from typing import Optional, List, Dict, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def parse_recurrence(recurrence: str, time_of_day: str) -> Tuple[str, int, int, int]:
+    """
+    اعتبارسنجی قاعده تکرار و ساعت
+
+    Raises:
+        ValueError: قاعده یا ساعت نامعتبر
+
+    Returns:
+        (نوع, آرگومان, ساعت, دقیقه)
+    """
+    hour, minute = (int(part) for part in time_of_day.split(':'))
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        raise ValueError("ساعت باید به شکل HH:MM باشد")
+
+    kind, _, argument = recurrence.partition(':')
+    if kind == 'daily' and not argument:
+        return kind, 0, hour, minute
+
+    value = int(argument)
+    if kind == 'weekly' and 0 <= value <= 6:
+        return kind, value, hour, minute
+    if kind == 'monthly' and 1 <= value <= 28:
+        return kind, value, hour, minute
+    if kind == 'interval' and value >= 1:
+        return kind, value, hour, minute
+
+    raise ValueError(f"قاعده تکرار نامعتبر: {recurrence}")
+
+
+def next_occurrence(recurrence: str, time_of_day: str, after: datetime) -> datetime:
+    """
+    اولین زمان اجرای قاعده بعد از after
+
+    Raises:
+        ValueError: قاعده نامعتبر
+    """
+    kind, value, hour, minute = parse_recurrence(recurrence, time_of_day)
+    candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    if kind == 'daily':
+        return candidate if candidate > after else candidate + timedelta(days=1)
+
+    if kind == 'weekly':
+        candidate += timedelta(days=(value - after.weekday()) % 7)
+        return candidate if candidate > after else candidate + timedelta(days=7)
+
+    if kind == 'monthly':
+        candidate = candidate.replace(day=value)
+        if candidate > after:
+            return candidate
+        year, month = (after.year + 1, 1) if after.month == 12 else (after.year, after.month + 1)
+        return candidate.replace(year=year, month=month, day=min(value, monthrange(year, month)[1]))
+
+    # interval: N روز بعد از after در همان ساعت
+    return candidate + timedelta(days=value)
+
+
+class _TemplateScheduler:
+    """min-heap زمان اجرای بعدی قالب‌ها"""
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int]] = []
+        self._next_run: Dict[int, datetime] = {}
+        self._rules: Dict[int, Tuple[str, str]] = {}
+        self.loaded = False
+
+    def load(self, schedule: List[Dict[str, Any]]):
+        """ساخت heap از زمان‌بندی قالب‌های فعال (heapify، O(n))"""
+        self._heap = []
+        self._next_run = {}
+        self._rules = {}
+        for item in schedule:
+            run_at = datetime.strptime(item['next_run'], DATETIME_FORMAT)
+            self._next_run[item['id']] = run_at
+            self._rules[item['id']] = (item['recurrence'], item['time_of_day'])
+            self._heap.append((run_at, item['id']))
+        heapq.heapify(self._heap)
+        self.loaded = True
+
+    def schedule(self, template_id: int, recurrence: str, time_of_day: str, run_at: datetime):
+        """افزودن یا جابه‌جا کردن یک قالب (ورودی قبلی در heap باطل می‌شود)"""
+        self._next_run[template_id] = run_at
+        self._rules[template_id] = (recurrence, time_of_day)
+        heapq.heappush(self._heap, (run_at, template_id))
+
+    def reschedule(self, template_id: int, run_at: datetime):
+        """تعیین زمان اجرای بعدی یک قالب موجود"""
+        recurrence, time_of_day = self._rules[template_id]
+        self.schedule(template_id, recurrence, time_of_day, run_at)
+
+    def restore(self, template_id: int, run_at: datetime, popped_at: Optional[datetime] = None):
+        """
+        برگرداندن قالب pop شده به heap بعد از await
+
+        اگر در این فاصله قالب حذف شده یا با زمان جدیدی زمان‌بندی شده باشد کاری انجام نمی‌شود.
+
+        Args:
+            popped_at: زمان اجرایی که pop شده بود (پیش‌فرض run_at)
+        """
+        if template_id not in self._rules or self._next_run.get(template_id) != (popped_at or run_at):
+            return
+        self.reschedule(template_id, run_at)
+
+    def discard(self, template_id: int, popped_at: datetime):
+        """حذف قالب pop شده، مگر اینکه در این فاصله دوباره زمان‌بندی شده باشد"""
+        if self._next_run.get(template_id) == popped_at:
+            self.remove(template_id)
+
+    def remove(self, template_id: int):
+        """حذف قالب (ورودی heap هنگام pop نادیده گرفته می‌شود)"""
+        self._next_run.pop(template_id, None)
+        self._rules.pop(template_id, None)
+        if len(self._heap) > 2 * len(self._next_run) + 64:
+            self._heap = [(run_at, tid) for run_at, tid in self._heap if self._next_run.get(tid) == run_at]
+            heapq.heapify(self._heap)
+
+    def pop_due(self, now: datetime, limit: int) -> List[Dict[str, Any]]:
+        """برداشتن حداکثر limit قالب سررسید شده به همراه زمان اجرای بعدی آنها"""
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < limit:
+            run_at, template_id = heapq.heappop(self._heap)
+            if self._next_run.get(template_id) != run_at:
+                continue
+
+            recurrence, time_of_day = self._rules[template_id]
+            next_run = next_occurrence(recurrence, time_of_day, max(run_at, now))
+            due.append({
+                'id': template_id,
+                'run_at': run_at.strftime(DATETIME_FORMAT),
+                'next_run': next_run.strftime(DATETIME_FORMAT)
+            })
+        return due
+
+    def has_due(self, now: datetime) -> bool:
+        return bool(self._heap) and self._heap[0][0] <= now
+
+    def __len__(self):
+        return len(self._next_run)
+
+
+_scheduler = _TemplateScheduler()
+
+
+class TemplateService:
+    """
+    سرویس قالب‌های کار تکرارشونده - Business Logic
+
+    متدها async هستند: کار دیتابیس روی thread دیتابیس و تغییر heap روی event loop انجام می‌شود.
+    """
+
+    @staticmethod
+    async def create_from_task(task_id: int, recurrence: str, time_of_day: str) -> Optional[Dict[str, Any]]:
+        """
+        ساخت قالب از روی یک کار موجود و افزودن آن به زمان‌بند
+
+        Raises:
+            ValueError: قاعده یا ساعت نامعتبر
+
+        Returns:
+            dict با کلیدهای id و next_run یا None
+        """
+        next_run = next_occurrence(recurrence, time_of_day, datetime.now())
+        template_id = await TaskTemplateModel.acreate_from_task(
+            task_id, recurrence, time_of_day, next_run.strftime(DATETIME_FORMAT)
+        )
+        if template_id is None:
+            return None
+
+        if _scheduler.loaded:
+            _scheduler.schedule(template_id, recurrence, time_of_day, next_run)
+        return {'id': template_id, 'next_run': next_run.strftime(DATETIME_FORMAT)}
+
+    @staticmethod
+    async def get_templates() -> List[Dict[str, Any]]:
+        """لیست قالب‌های فعال"""
+        return await TaskTemplateModel.aget_all()
+
+    @staticmethod
+    async def deactivate(template_id: int) -> bool:
+        """غیرفعال کردن قالب و حذف آن از زمان‌بند"""
+        if not await TaskTemplateModel.adeactivate(template_id):
+            return False
+        _scheduler.remove(template_id)
+        return True
+
+    @staticmethod
+    async def run_due(now: Optional[datetime] = None) -> List[Tuple[int, int]]:
+        """
+        ایجاد کارهای قالب‌های سررسید شده (برای job زمان‌بند)
+
+        Returns:
+            لیست (template_id, task_id) کارهای ایجاد شده
+        """
+        if not _scheduler.loaded:
+            _scheduler.load(await TaskTemplateModel.aget_active_schedule())
+            logger.info(f"زمان‌بند قالب‌ها با {len(_scheduler)} قالب فعال بارگذاری شد")
+
+        now = now or datetime.now()
+        created = []
+        while _scheduler.has_due(now):
+            due = _scheduler.pop_due(now, TEMPLATE_BATCH_SIZE)
+            if not due:
+                continue
+
+            result = await TaskTemplateModel.amaterialize(due)
+            if result is None:
+                # خطای دیتابیس: قالب‌ها با همان زمان برمی‌گردند تا tick بعدی دوباره امتحان شود
+                for item in due:
+                    _scheduler.restore(item['id'], datetime.strptime(item['run_at'], DATETIME_FORMAT))
+                break
+
+            fired = {template_id for template_id, _ in result}
+            for item in due:
+                run_at = datetime.strptime(item['run_at'], DATETIME_FORMAT)
+                if item['id'] in fired:
+                    _scheduler.restore(item['id'], datetime.strptime(item['next_run'], DATETIME_FORMAT), run_at)
+                else:
+                    # در دیتابیس غیرفعال یا تغییر کرده است
+                    _scheduler.discard(item['id'], run_at)
+            created.extend(result)
+
+        return created
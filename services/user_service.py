@@ -1,9 +1,79 @@
 # services/user_service.py
 
+import threading
+import time
+from collections import OrderedDict
 from database.models.user import UserModel
+from database.executor import async_methods, run_in_db_thread
+from config import USER_CACHE_SIZE, USER_CACHE_TTL
 from typing import Optional, List, Dict, Any
 
 
+class UserCache:
+    """کش LRU با TTL برای رکورد کاربران بر اساس telegram_id"""
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        Args:
+            max_size: حداکثر تعداد رکوردهای کش
+            ttl: عمر هر رکورد (ثانیه)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        """دریافت کپی رکورد از کش (None در صورت نبود یا انقضا)"""
+        with self._lock:
+            entry = self._entries.get(telegram_id)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[telegram_id]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(telegram_id)
+            self.hits += 1
+            return dict(entry[0])
+
+    def set(self, telegram_id: int, user: Dict[str, Any]):
+        """ذخیره رکورد در کش و حذف قدیمی‌ترین رکورد در صورت پر بودن"""
+        with self._lock:
+            self._entries[telegram_id] = (dict(user), time.monotonic() + self.ttl)
+            self._entries.move_to_end(telegram_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, telegram_id: int):
+        """حذف رکورد یک کاربر از کش"""
+        with self._lock:
+            self._entries.pop(telegram_id, None)
+
+    def clear(self):
+        """خالی کردن کامل کش"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """آمار hit/miss کش"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0
+            }
+
+
+_user_cache = UserCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+
+@async_methods(exclude=('invalidate_user', 'get_cache_stats'))
 class UserService:
     """سرویس مدیریت کاربران - Business Logic"""
 
@@ -22,7 +92,9 @@ class UserService:
         Returns:
             bool: موفق بودن عملیات
         """
-        return UserModel.create(telegram_id, first_name, last_name, phone_number)
+        result = UserModel.create(telegram_id, first_name, last_name, phone_number)
+        _user_cache.invalidate(telegram_id)
+        return result
 
     @staticmethod
     def get_user_info(telegram_id: int) -> Optional[Dict[str, Any]]:
@@ -35,7 +107,34 @@ class UserService:
         Returns:
             dict با اطلاعات کاربر یا None
         """
-        return UserModel.get_by_telegram_id(telegram_id)
+        user = _user_cache.get(telegram_id)
+        if user is not None:
+            return user
+        return UserService._load_user_info(telegram_id)
+
+    @staticmethod
+    def _load_user_info(telegram_id: int) -> Optional[Dict[str, Any]]:
+        """خواندن کاربر از دیتابیس و قرار دادن در کش (پس از miss، بدون بررسی دوباره کش)"""
+        user = UserModel.get_by_telegram_id(telegram_id)
+        if user:
+            _user_cache.set(telegram_id, user)
+        return user
+
+    @staticmethod
+    async def aget_user_info(telegram_id: int) -> Optional[Dict[str, Any]]:
+        """
+        نسخه async دریافت اطلاعات کاربر؛ در صورت hit بدون رفتن به thread دیتابیس
+
+        Args:
+            telegram_id: آیدی تلگرام
+
+        Returns:
+            dict با اطلاعات کاربر یا None
+        """
+        user = _user_cache.get(telegram_id)
+        if user is not None:
+            return user
+        return await run_in_db_thread(UserService._load_user_info, telegram_id)
 
     @staticmethod
     def get_user_by_id(user_id: int) -> Optional[Dict[str, Any]]:
@@ -91,7 +190,29 @@ class UserService:
         Returns:
             bool: موفق بودن عملیات
         """
-        return UserModel.approve_as_employee(telegram_id)
+        result = UserModel.approve_as_employee(telegram_id)
+        _user_cache.invalidate(telegram_id)
+        return result
+
+    @staticmethod
+    def invalidate_user(telegram_id: int):
+        """
+        حذف کاربر از کش (بعد از هر تغییر نقش یا اطلاعات کاربر)
+
+        Args:
+            telegram_id: آیدی تلگرام
+        """
+        _user_cache.invalidate(telegram_id)
+
+    @staticmethod
+    def get_cache_stats() -> Dict[str, Any]:
+        """
+        آمار کش کاربران
+
+        Returns:
+            dict با کلیدهای size, max_size, hits, misses, hit_rate
+        """
+        return _user_cache.stats()
 
     @staticmethod
     def is_admin(telegram_id: int) -> bool:
@@ -104,7 +225,8 @@ class UserService:
         Returns:
             bool: ادمین است یا نه
         """
-        return UserModel.is_admin(telegram_id)
+        user = UserService.get_user_info(telegram_id)
+        return bool(user) and user.get('role') == 'admin'
 
     @staticmethod
     def is_employee(telegram_id: int) -> bool:
@@ -117,7 +239,8 @@ class UserService:
         Returns:
             bool: کارمند است یا نه
         """
-        return UserModel.is_employee(telegram_id)
+        user = UserService.get_user_info(telegram_id)
+        return bool(user) and user.get('role') == 'employee' and user.get('is_employee') == 1
 
     @staticmethod
     def get_user_role(telegram_id: int) -> Optional[str]:
@@ -130,7 +253,7 @@ class UserService:
         Returns:
             'admin', 'employee', 'pending' یا None
         """
-        user = UserModel.get_by_telegram_id(telegram_id)
+        user = UserService.get_user_info(telegram_id)
         if user:
             return user.get('role')
         return None
@@ -0,0 +1,93 @@
+# services/watchdog_service.py
+
+"""
+watchdog تایمرهای کار
+
+در هر اجرا:
+- تایمرهایی که بیش از WATCHDOG_MAX_SESSION_MINUTES باز مانده‌اند بسته می‌شوند
+  (پایان = شروع + WATCHDOG_MAX_SESSION_MINUTES تا زمان فراموش شده شمرده نشود)
+- به کارمندانی که تایمرشان از مدت زمان کار عبور کرده یک بار اطلاع داده می‌شود
+
+هر دو کوئری روی ایندکس‌های جزئی تایمرهای باز اجرا می‌شوند و هر کدام حداکثر
+WATCHDOG_BATCH_SIZE ردیف برمی‌دارند؛ باقی‌مانده به اجرای بعدی می‌رسد. پیام‌ها برای هر
+کارمند در یک پیام جمع و با اولویت BULK در صف ارسال قرار می‌گیرند؛ ادمین یک خلاصه می‌گیرد.
+"""
+
+import logging
+from datetime import datetime
+from telegram import Bot
+from services.work_service import WorkService
+from services.delivery_service import DeliveryService, BULK
+from utils.formatters import format_time
+from config import ADMIN_ID, WATCHDOG_MAX_SESSION_MINUTES, WATCHDOG_BATCH_SIZE
+from typing import Optional, List, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+MAX_DIGEST_LINES = 20
+
+
+class WatchdogService:
+    """سرویس بررسی دوره‌ای تایمرهای باز"""
+
+    @staticmethod
+    def _build_digest(expired: List[Dict[str, Any]], overdue: List[Dict[str, Any]]) -> str:
+        """متن خلاصه برای ادمین"""
+        lines = [
+            f"⏹ {activity['employee_name'] or activity['user_id']}: {activity['task_title'] or activity['task_id']} (بسته شد)"
+            for activity in expired
+        ] + [
+            f"⏰ {activity['employee_name'] or activity['user_id']}: {activity['task_title'] or activity['task_id']} (عبور از زمان)"
+            for activity in overdue
+        ]
+
+        text = (
+            "🐕 گزارش تایمرها\n\n"
+            f"تایمرهای بسته شده خودکار: {len(expired)}\n"
+            f"کارهای عبور کرده از زمان: {len(overdue)}\n\n"
+        )
+        text += "\n".join(lines[:MAX_DIGEST_LINES])
+        if len(lines) > MAX_DIGEST_LINES:
+            text += f"\n... و {len(lines) - MAX_DIGEST_LINES} مورد دیگر"
+        return text
+
+    @staticmethod
+    async def run(bot: Bot, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        یک دور بررسی تایمرهای باز (برای job زمان‌بند)
+
+        Returns:
+            dict با کلیدهای closed و overdue (تعداد)
+        """
+        now_text = (now or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+
+        # اول بستن تایمرهای فراموش شده تا برای همان تایمرها اطلاع عبور از زمان ارسال نشود
+        expired = await WorkService.aclose_expired_timers(now_text, WATCHDOG_MAX_SESSION_MINUTES, WATCHDOG_BATCH_SIZE)
+        overdue = await WorkService.aclaim_overdue_timers(now_text, WATCHDOG_BATCH_SIZE)
+        expired = expired or []
+        overdue = overdue or []
+
+        if not expired and not overdue:
+            return {'closed': 0, 'overdue': 0}
+
+        notices: Dict[int, List[str]] = {}
+        for activity in expired:
+            if activity['telegram_id']:
+                notices.setdefault(activity['telegram_id'], []).append(
+                    f"⏹ تایمر کار «{activity['task_title']}» بعد از "
+                    f"{format_time(WATCHDOG_MAX_SESSION_MINUTES)} به صورت خودکار بسته شد."
+                )
+        for activity in overdue:
+            if activity['telegram_id']:
+                duration = int(activity['task_duration']) if activity['task_duration'] else 0
+                notices.setdefault(activity['telegram_id'], []).append(
+                    f"⏰ زمان تخصیصی کار «{activity['task_title']}» ({format_time(duration)}) "
+                    f"تمام شده و تایمر هنوز باز است."
+                )
+
+        for telegram_id, lines in notices.items():
+            DeliveryService.enqueue_message(bot, telegram_id, "\n\n".join(lines), BULK)
+        DeliveryService.enqueue_message(bot, ADMIN_ID, WatchdogService._build_digest(expired, overdue), BULK)
+
+        logger.info(f"watchdog: {len(expired)} تایمر بسته شد، {len(overdue)} کار از زمان عبور کرد")
+        return {'closed': len(expired), 'overdue': len(overdue)}
@@ -0,0 +1,168 @@
+# services/work_data_buffer.py
+
+"""
+بافر نوشتن دانش/پیشنهاد/نتایج کارمند در مکالمه‌های ثبت
+
+به جای یک INSERT و commit برای هر پیام، ورودی‌های هر مکالمه (کاربر، کار، نوع داده)
+جمع و در یک تراکنش executemany نوشته می‌شوند. نوشتن در این زمان‌ها انجام می‌شود:
+- با /done یا /cancel (قبل از پاسخ به کاربر؛ خطا به کاربر گزارش می‌شود)
+- با رسیدن تعداد ورودی‌ها به WORK_BUFFER_MAX_ENTRIES
+- قبل از بررسی تکراری بودن (find_duplicate) برای بافرهای همان نوع داده
+- WORK_BUFFER_FLUSH_SECONDS ثانیه بعد از اولین ورودی نوشته نشده
+- هنگام خاموش شدن بات (post_stop)
+
+ضمانت ماندگاری: ورودی‌ای که کاربر تأیید «ثبت شد» آن را گرفته تا نوشتن بعدی فقط در
+حافظه است؛ در صورت crash ناگهانی پروسه حداکثر WORK_BUFFER_MAX_ENTRIES ورودی
+یا ورودی‌های WORK_BUFFER_FLUSH_SECONDS ثانیه آخر هر مکالمه از دست می‌رود.
+خاموش شدن عادی و /done هیچ ورودی‌ای را از دست نمی‌دهند. زمان ثبت هر ورودی هنگام
+دریافت پیام گرفته می‌شود، پس ترتیب نمایش با نوشتن دسته‌ای تغییر نمی‌کند.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple, Any
+from services.work_service import WorkService
+from config import WORK_BUFFER_MAX_ENTRIES, WORK_BUFFER_FLUSH_SECONDS
+
+BufferKey = Tuple[int, int, str]
+
+
+class _Buffer:
+    """ورودی‌های نوشته نشده یک مکالمه"""
+
+    __slots__ = ('entries', 'timer', 'lock')
+
+    def __init__(self):
+        self.entries: List[Dict[str, Any]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.lock = asyncio.Lock()
+
+
+_buffers: Dict[BufferKey, _Buffer] = {}
+_flush_tasks = set()
+
+
+def _schedule_flush(key: BufferKey, buffer: _Buffer):
+    """زمان‌بندی نوشتن بافر بعد از WORK_BUFFER_FLUSH_SECONDS"""
+    def start():
+        buffer.timer = None
+        task = asyncio.create_task(WorkDataBuffer._flush_key(key))
+        _flush_tasks.add(task)
+        task.add_done_callback(_flush_tasks.discard)
+
+    buffer.timer = asyncio.get_running_loop().call_later(WORK_BUFFER_FLUSH_SECONDS, start)
+
+
+class WorkDataBuffer:
+    """نوشتن دسته‌ای داده‌های کاری (کلید: کاربر، کار، نوع داده)"""
+
+    @staticmethod
+    async def add(task_id: int, user_id: int, data_type: str, text_content: Optional[str] = None,
+                  file_id: Optional[str] = None, file_type: Optional[str] = None,
+                  file_unique_id: Optional[str] = None, duplicate_of: Optional[int] = None) -> int:
+        """
+        افزودن یک ورودی به بافر مکالمه
+
+        Args:
+            task_id: آیدی کار
+            user_id: آیدی کارمند
+            data_type: 'knowledge' | 'suggestion' | 'results'
+            text_content: متن
+            file_id: آیدی فایل
+            file_type: نوع فایل
+            file_unique_id: شناسه یکتای فایل تلگرام
+            duplicate_of: آیدی ورودی قبلی یکسان/مشابه (WorkService.find_duplicate)
+
+        Returns:
+            تعداد ورودی‌های نوشته نشده بعد از افزودن
+        """
+        key = (user_id, task_id, data_type)
+        buffer = _buffers.get(key)
+        if buffer is None:
+            buffer = _buffers[key] = _Buffer()
+
+        buffer.entries.append({
+            'task_id': task_id,
+            'user_id': user_id,
+            'data_type': data_type,
+            'text_content': text_content,
+            'file_id': file_id,
+            'file_type': file_type,
+            'file_unique_id': file_unique_id,
+            'duplicate_of': duplicate_of,
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+
+        if len(buffer.entries) >= WORK_BUFFER_MAX_ENTRIES:
+            await WorkDataBuffer._flush_key(key)
+        elif buffer.timer is None:
+            _schedule_flush(key, buffer)
+
+        return len(buffer.entries)
+
+    @staticmethod
+    async def _flush_key(key: BufferKey) -> Optional[int]:
+        """نوشتن ورودی‌های یک بافر؛ در صورت خطا ورودی‌ها برای تلاش بعدی می‌مانند"""
+        buffer = _buffers.get(key)
+        if buffer is None:
+            return 0
+
+        async with buffer.lock:
+            if buffer.timer:
+                buffer.timer.cancel()
+                buffer.timer = None
+            if not buffer.entries:
+                return 0
+
+            entries = buffer.entries
+            buffer.entries = []
+            saved = await WorkService.aadd_work_data_batch(entries)
+
+            if saved is None:
+                # ورودی‌های جدیدتر بعد از ورودی‌های ناموفق قرار می‌گیرند
+                buffer.entries = entries + buffer.entries
+                if buffer.timer is None:
+                    _schedule_flush(key, buffer)
+                return None
+
+            if not buffer.entries and _buffers.get(key) is buffer:
+                del _buffers[key]
+            return saved
+
+    @staticmethod
+    async def flush(task_id: int, user_id: int, data_type: str) -> Optional[int]:
+        """
+        نوشتن ورودی‌های باقی‌مانده یک مکالمه (برای /done و /cancel)
+
+        Returns:
+            تعداد ورودی‌های نوشته شده یا None در صورت خطا
+        """
+        return await WorkDataBuffer._flush_key((user_id, task_id, data_type))
+
+    @staticmethod
+    async def find_duplicate(data_type: str, text_content: Optional[str] = None,
+                             file_unique_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        بررسی تکراری بودن با در نظر گرفتن ورودی‌های نوشته نشده
+
+        جستجو روی همه کارها و کارمندان انجام می‌شود، پس بافرهای همان نوع داده اول نوشته
+        می‌شوند تا ارسال دوباره در فاصله دو نوشتن هم تکراری شناخته شود.
+
+        Returns:
+            خروجی WorkService.find_duplicate
+        """
+        keys = [key for key, buffer in _buffers.items() if key[2] == data_type and buffer.entries]
+        if keys:
+            await asyncio.gather(*(WorkDataBuffer._flush_key(key) for key in keys))
+        return await WorkService.afind_duplicate(data_type, text_content, file_unique_id)
+
+    @staticmethod
+    async def flush_all() -> bool:
+        """نوشتن همه بافرها (هنگام خاموش شدن)"""
+        results = await asyncio.gather(*(WorkDataBuffer._flush_key(key) for key in list(_buffers)))
+        return all(result is not None for result in results)
+
+    @staticmethod
+    def pending_count() -> int:
+        """تعداد کل ورودی‌های نوشته نشده"""
+        return sum(len(buffer.entries) for buffer in _buffers.values())
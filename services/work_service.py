@@ -2,9 +2,14 @@
 
 from database.models.task_work_data import TaskWorkDataModel
 from database.models.task_scores import TaskScoresModel
+from database.models.task_activity import TaskActivityModel
+from database.models.daily_stats import DailyStatsModel, iter_day_segments, DATE_FORMAT, DATETIME_FORMAT
+from database.executor import async_methods
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
 
+@async_methods
 class WorkService:
     """سرویس مدیریت کارهای ثبت شده توسط کارمندان - Business Logic"""
 
@@ -62,6 +67,59 @@ class WorkService:
         """
         return TaskWorkDataModel.create(task_id, user_id, 'results', text_content, file_id, file_type)
 
+    @staticmethod
+    def add_work_data_batch(entries: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        ثبت دسته‌ای دانش/پیشنهاد/نتایج در یک تراکنش
+
+        Args:
+            entries: لیست dict با کلیدهای task_id, user_id, data_type, text_content,
+                     file_id, file_type, timestamp و اختیاری file_unique_id, duplicate_of
+
+        Returns:
+            تعداد رکوردهای ثبت شده یا None در صورت خطا
+        """
+        return TaskWorkDataModel.create_many(entries)
+
+    @staticmethod
+    def find_duplicate(data_type: str, text_content: Optional[str] = None,
+                       file_unique_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        بررسی تکراری بودن دانش/پیشنهاد قبل از ثبت
+
+        Args:
+            data_type: 'knowledge' | 'suggestion' (بقیه انواع بررسی نمی‌شوند)
+            text_content: متن
+            file_unique_id: شناسه یکتای فایل تلگرام
+
+        Returns:
+            dict با کلیدهای id, task_id, task_title, similarity یا None
+        """
+        return TaskWorkDataModel.find_duplicate(data_type, text_content, file_unique_id)
+
+    @staticmethod
+    def deduplicate_work_data(purge: bool = False) -> Optional[Dict[str, int]]:
+        """
+        حذف تکرار دسته‌ای روی داده‌های موجود
+
+        Args:
+            purge: حذف تکرارهای دقیق همان کارمند در همان کار
+
+        Returns:
+            dict با کلیدهای fingerprinted, exact, near, purged یا None در صورت خطا
+        """
+        return TaskWorkDataModel.deduplicate(purge)
+
+    @staticmethod
+    def format_duplicate_notice(duplicate: Optional[Dict[str, Any]]) -> str:
+        """متن هشدار تکراری بودن برای پیام تأیید ثبت (خالی اگر تکراری نباشد)"""
+        if not duplicate:
+            return ""
+        title = duplicate.get('task_title') or f"#{duplicate['task_id']}"
+        if duplicate['similarity'] >= 1.0:
+            return f"\n\n⚠️ این مورد قبلاً در کار «{title}» ثبت شده است."
+        return f"\n\n⚠️ بسیار شبیه موردی است که قبلاً در کار «{title}» ثبت شده ({duplicate['similarity']:.0%} شباهت)."
+
     @staticmethod
     def set_self_score(task_id: int, user_id: int, score: int) -> Optional[int]:
         """
@@ -91,6 +149,210 @@ class WorkService:
         """
         return TaskScoresModel.get_by_task_and_user(task_id, user_id)
 
+    @staticmethod
+    def start_timer(task_id: int, user_id: int) -> bool:
+        """
+        شروع تایمر کار
+
+        Args:
+            task_id: آیدی کار
+            user_id: آیدی کارمند
+
+        Returns:
+            bool: False اگر کارمند کار فعال دیگری داشته باشد
+        """
+        return TaskActivityModel.start(user_id, task_id)
+
+    @staticmethod
+    def stop_timer(user_id: int) -> bool:
+        """
+        توقف تایمر فعال کارمند
+
+        Args:
+            user_id: آیدی کارمند
+
+        Returns:
+            bool: موفق بودن عملیات
+        """
+        return TaskActivityModel.stop(user_id)
+
+    @staticmethod
+    def close_expired_timers(now: str, max_minutes: int, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        بستن خودکار تایمرهایی که بیش از max_minutes باز مانده‌اند
+
+        Returns:
+            لیست تایمرهای بسته شده یا None در صورت خطا
+        """
+        return TaskActivityModel.close_expired(now, max_minutes, limit)
+
+    @staticmethod
+    def claim_overdue_timers(now: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        دریافت تایمرهای بازی که تازه از مدت زمان کار عبور کرده‌اند (هر تایمر یک بار)
+
+        Returns:
+            لیست تایمرها یا None در صورت خطا
+        """
+        return TaskActivityModel.claim_overdue(now, limit)
+
+    @staticmethod
+    def get_active_task_id(user_id: int) -> Optional[int]:
+        """
+        دریافت کار فعال (تایمر باز) کارمند
+
+        Args:
+            user_id: آیدی کارمند
+
+        Returns:
+            task_id یا None
+        """
+        return TaskActivityModel.get_active_task_id(user_id)
+
+    @staticmethod
+    def get_spent_minutes(task_id: int, user_id: int) -> int:
+        """
+        دریافت زمان سپری شده کارمند روی یک کار
+
+        Args:
+            task_id: آیدی کار
+            user_id: آیدی کارمند
+
+        Returns:
+            int: زمان به دقیقه
+        """
+        return TaskActivityModel.get_spent_minutes(task_id, user_id)
+
+    @staticmethod
+    def get_panel_summary(task_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        دریافت خلاصه پنل کار با یک کوئری
+
+        Args:
+            task_id: آیدی کار
+            user_id: آیدی کارمند
+
+        Returns:
+            dict با کلیدهای title, duration, knowledge_count, suggestion_count,
+            results_count, spent_minutes, has_self_score یا None
+        """
+        return TaskWorkDataModel.get_panel_summary(task_id, user_id)
+
+    @staticmethod
+    def get_user_activity_segments(user_id: int, from_date: str, to_date: str) -> List[Dict[str, Any]]:
+        """
+        دریافت فعالیت‌های کارمند در یک بازه روزها، برش خورده در نیمه‌شب
+
+        Args:
+            user_id: آیدی کارمند
+            from_date: تاریخ شروع "YYYY-MM-DD"
+            to_date: تاریخ پایان "YYYY-MM-DD" (شامل)
+
+        Returns:
+            لیست بخش‌ها به ترتیب زمان، هر کدام dict با کلیدهای date, task_id,
+            task_title, task_duration, start_time, end_time (None برای تایمر باز)،
+            segment_start, segment_end, minutes, is_open
+        """
+        range_start = datetime.strptime(from_date, DATE_FORMAT)
+        range_end = datetime.strptime(to_date, DATE_FORMAT) + timedelta(days=1)
+        now = datetime.now()
+
+        activities = TaskActivityModel.get_user_activities_between(
+            user_id, range_start.strftime(DATETIME_FORMAT), range_end.strftime(DATETIME_FORMAT)
+        )
+
+        segments = []
+        for activity in activities:
+            start_dt = datetime.strptime(activity['start_time'], DATETIME_FORMAT)
+            is_open = activity['end_time'] is None
+            end_dt = now if is_open else datetime.strptime(activity['end_time'], DATETIME_FORMAT)
+
+            clipped_start = max(start_dt, range_start)
+            clipped_end = min(end_dt, range_end)
+            for day, segment_start, segment_end in iter_day_segments(clipped_start, clipped_end):
+                segments.append({
+                    'date': day,
+                    'task_id': activity['task_id'],
+                    'task_title': activity['task_title'],
+                    'task_duration': activity['task_duration'],
+                    'start_time': activity['start_time'],
+                    'end_time': activity['end_time'],
+                    'segment_start': segment_start,
+                    'segment_end': segment_end,
+                    'minutes': int((segment_end - segment_start).total_seconds() // 60),
+                    'is_open': is_open
+                })
+
+        segments.sort(key=lambda segment: segment['segment_start'])
+        return segments
+
+    @staticmethod
+    def get_user_daily_activities(user_id: int, date: str) -> List[Dict[str, Any]]:
+        """
+        دریافت فعالیت‌های کارمند در یک روز (بخش داخل همان روز)
+
+        Args:
+            user_id: آیدی کارمند
+            date: تاریخ به فرمت "YYYY-MM-DD"
+
+        Returns:
+            لیست بخش‌ها (ساختار get_user_activity_segments)
+        """
+        return WorkService.get_user_activity_segments(user_id, date, date)
+
+    @staticmethod
+    def get_current_in_progress_tasks() -> List[Dict[str, Any]]:
+        """
+        دریافت کارهایی که در حال حاضر تایمر باز دارند
+
+        Returns:
+            لیست dict با کلیدهای user_id, employee_name, task_id, task_title,
+            start_time, task_duration
+        """
+        return TaskActivityModel.get_open_activities()
+
+    @staticmethod
+    def get_daily_stats(user_id: int, date: str) -> Dict[str, int]:
+        """
+        دریافت آمار روزانه کارمند از جدول تجمیعی
+
+        Args:
+            user_id: آیدی کارمند
+            date: تاریخ به فرمت "YYYY-MM-DD"
+
+        Returns:
+            dict با کلیدهای completed_count, worked_minutes, activity_count
+            (فقط فعالیت‌های بسته شده؛ تایمر باز شامل نمی‌شود)
+        """
+        return DailyStatsModel.get_for_user(user_id, date)
+
+    @staticmethod
+    def get_daily_overview(date: str) -> List[Dict[str, Any]]:
+        """
+        دریافت آمار روزانه همه کارمندان با یک کوئری
+
+        Args:
+            date: تاریخ به فرمت "YYYY-MM-DD"
+
+        Returns:
+            لیست کارمندان با کلیدهای id, telegram_id, name, completed_count,
+            worked_minutes, activity_count
+        """
+        return DailyStatsModel.get_employees_overview(date)
+
+    @staticmethod
+    def rebuild_daily_stats(from_date: Optional[str] = None) -> Optional[int]:
+        """
+        بازسازی جدول تجمیعی آمار روزانه از روی داده‌های خام
+
+        Args:
+            from_date: تاریخ شروع "YYYY-MM-DD" (None = همه)
+
+        Returns:
+            تعداد فعالیت‌های پردازش شده یا None در صورت خطا
+        """
+        return DailyStatsModel.rebuild(from_date)
+
     @staticmethod
     def get_task_knowledge(task_id: int, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
@@ -261,13 +523,15 @@ class WorkService:
         Returns:
             bool: آیا داده‌ای ثبت شده؟
         """
-        data = WorkService.get_employee_work_data(task_id, user_id)
+        summary = WorkService.get_panel_summary(task_id, user_id)
+        if not summary:
+            return False
 
         # بررسی دانش، پیشنهاد، نتایج
-        has_work = any(len(data.get(key, [])) > 0 for key in ['knowledge', 'suggestion', 'results'])
+        has_work = any(summary[key] > 0 for key in ['knowledge_count', 'suggestion_count', 'results_count'])
 
         # بررسی امتیاز
-        has_score = data.get('self_score') is not None
+        has_score = bool(summary['has_self_score'])
 
         return has_work or has_score
 
@@ -8,10 +8,22 @@ from . import constants
 from . import formatters
 from . import validators
 from . import keyboards
+from . import callback_codec
+from . import callback_router
+from . import update_processor
+from . import webhook_server
+from . import sqlite_persistence
+from . import text_fingerprint
 
 __all__ = [
     'constants',
     'formatters',
     'validators',
     'keyboards',
+    'callback_codec',
+    'callback_router',
+    'update_processor',
+    'webhook_server',
+    'sqlite_persistence',
+    'text_fingerprint',
 ]
\ No newline at end of file
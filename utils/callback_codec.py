@@ -0,0 +1,176 @@
+# utils/callback_codec.py
+
+"""
+کدگذاری فشرده callback_data (حداکثر 64 بایت در تلگرام)
+
+قالب: <opcode>~<payload>
+payload مقادیر بسته‌بندی شده با varint (اعداد)، طول+UTF-8 (رشته‌ها) و ثانیه از مبدأ
+(رشته‌های تاریخ "YYYY-MM-DD HH:MM:SS") است که با base64 امن برای URL کد می‌شود.
+هر مقدار یک بایت نوع دارد، پس decode به schema نیاز ندارد.
+
+Usage:
+    data = encode_callback("ts", "in_progress", 42)     # "ts~Agtpbl9wcm9ncmVzcwFU"
+    opcode, values = decode_callback(data)              # ("ts", ("in_progress", 42))
+"""
+
+import base64
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple, Any
+
+CALLBACK_DATA_LIMIT = 64
+OPCODE_SEPARATOR = "~"
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+_EPOCH = datetime(2000, 1, 1)
+
+_TAG_NONE = 0
+_TAG_INT = 1
+_TAG_STR = 2
+_TAG_DATETIME = 3
+
+
+# ==================== Varint ====================
+
+def _write_varint(buffer: bytearray, value: int):
+    """نوشتن عدد نامنفی به صورت varint"""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """خواندن varint؛ خروجی (مقدار, موقعیت بعدی)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def _as_datetime(value: str) -> Optional[datetime]:
+    """تشخیص رشته تاریخ کامل (فقط همان قالب ذخیره در دیتابیس)"""
+    if len(value) != 19 or value[4] != '-' or value[10] != ' ':
+        return None
+    try:
+        return datetime.strptime(value, DATETIME_FORMAT)
+    except ValueError:
+        return None
+
+
+# ==================== Pack / Unpack ====================
+
+def pack_values(*values: Any) -> str:
+    """
+    بسته‌بندی مقادیر (int, str, None) در یک رشته base64 امن برای URL
+
+    Returns:
+        str بدون padding
+    """
+    buffer = bytearray()
+    for value in values:
+        if value is None:
+            buffer.append(_TAG_NONE)
+        elif isinstance(value, bool) or isinstance(value, int):
+            buffer.append(_TAG_INT)
+            _write_varint(buffer, _zigzag(int(value)))
+        elif isinstance(value, str):
+            parsed = _as_datetime(value)
+            if parsed and parsed >= _EPOCH:
+                buffer.append(_TAG_DATETIME)
+                _write_varint(buffer, int((parsed - _EPOCH).total_seconds()))
+            else:
+                encoded = value.encode('utf-8')
+                buffer.append(_TAG_STR)
+                _write_varint(buffer, len(encoded))
+                buffer.extend(encoded)
+        else:
+            raise TypeError(f"نوع پشتیبانی نشده در callback_data: {type(value).__name__}")
+
+    return base64.urlsafe_b64encode(bytes(buffer)).decode('ascii').rstrip('=')
+
+
+@lru_cache(maxsize=2048)
+def unpack_values(payload: str) -> Optional[Tuple[Any, ...]]:
+    """
+    باز کردن خروجی pack_values (نتیجه کش می‌شود؛ هر دکمه یک بار decode می‌شود)
+
+    Returns:
+        tuple مقادیر یا None اگر payload نامعتبر باشد
+    """
+    try:
+        data = base64.b64decode(payload + '=' * (-len(payload) % 4), altchars=b'-_', validate=True)
+        values = []
+        position = 0
+        while position < len(data):
+            tag = data[position]
+            position += 1
+            if tag == _TAG_NONE:
+                values.append(None)
+            elif tag == _TAG_INT:
+                raw, position = _read_varint(data, position)
+                values.append(_unzigzag(raw))
+            elif tag == _TAG_STR:
+                length, position = _read_varint(data, position)
+                if position + length > len(data):
+                    return None
+                values.append(data[position:position + length].decode('utf-8'))
+                position += length
+            elif tag == _TAG_DATETIME:
+                seconds, position = _read_varint(data, position)
+                values.append((_EPOCH + timedelta(seconds=seconds)).strftime(DATETIME_FORMAT))
+            else:
+                return None
+        return tuple(values)
+
+    except (ValueError, IndexError, UnicodeDecodeError):
+        return None
+
+
+# ==================== Callback Data ====================
+
+def encode_callback(opcode: str, *values: Any) -> str:
+    """
+    ساخت callback_data فشرده
+
+    Args:
+        opcode: کد کوتاه عملیات (بدون "~")
+        *values: آرگومان‌ها
+
+    Raises:
+        ValueError: اگر طول نتیجه از محدودیت تلگرام بیشتر شود
+    """
+    data = f"{opcode}{OPCODE_SEPARATOR}{pack_values(*values)}"
+    if len(data.encode('utf-8')) > CALLBACK_DATA_LIMIT:
+        raise ValueError(f"callback_data بیش از {CALLBACK_DATA_LIMIT} بایت: {data}")
+    return data
+
+
+def decode_callback(data: str) -> Optional[Tuple[str, Tuple[Any, ...]]]:
+    """
+    باز کردن callback_data ساخته شده با encode_callback
+
+    Returns:
+        (opcode, values) یا None اگر data در این قالب نباشد
+    """
+    opcode, separator, payload = data.partition(OPCODE_SEPARATOR)
+    if not separator or not opcode:
+        return None
+
+    values = unpack_values(payload)
+    if values is None:
+        return None
+    return opcode, values
@@ -0,0 +1,346 @@
+# utils/callback_router.py
+
+"""
+مسیریاب callback_data دکمه‌های inline
+
+به جای ده‌ها CallbackQueryHandler با regex (که برای هر کلیک به ترتیب امتحان می‌شوند)
+یک CallbackQueryHandler ثبت می‌شود:
+مسیرهای ثابت با یک dict و مسیرهای پیشوندی با یک trie (طولانی‌ترین پیشوند) پیدا می‌شوند
+و آرگومان‌ها یک بار تجزیه و در context.route_args قرار می‌گیرند.
+
+Usage:
+    router = CallbackRouter()
+    router.add("show_menu", show_main_menu)
+    router.add("view_task_{task_id:int}", view_task_details_admin)
+    router.add_packed("ts", change_task_status, "status", "task_id")   # encode_callback("ts", status, task_id)
+    application.add_handler(router.build_handler())
+
+    # entry_point/state های ConversationHandler با همان قالب‌ها
+    route_handler("knowledge_{task_id:int}", start_knowledge_entry)
+
+    # داخل هندلر
+    task_id = context.route_args['task_id']
+"""
+
+import logging
+import re
+import time
+from functools import lru_cache, wraps
+from typing import Optional, List, Dict, Any, Tuple, Callable
+from telegram.ext import CallbackQueryHandler, ConversationHandler
+from utils.callback_codec import OPCODE_SEPARATOR, decode_callback
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"\{(\w+)(?::(int|str))?\}")
+_ARG_PATTERNS = {'int': r"-?\d+", 'str': r".+?"}
+_ARG_TYPES = {'int': int, 'str': str}
+_ARG_SAMPLES = {'int': "1", 'str': "x"}
+
+
+class Route:
+    """یک مسیر ثبت شده در CallbackRouter"""
+
+    def __init__(self, template: str, callback: Callable):
+        self.template = template
+        self.callback = callback
+        self.name = callback.__name__
+
+        first = _PLACEHOLDER.search(template)
+        self.prefix = template[:first.start()] if first else template
+        self.is_exact = first is None
+
+        # regex فقط برای بخش بعد از پیشوند؛ برای هر کلیک حداکثر یک بار اجرا می‌شود
+        self.arg_types = {}
+        pattern = ""
+        position = len(self.prefix)
+        sample = self.prefix
+        for match in _PLACEHOLDER.finditer(template, position):
+            literal = template[position:match.start()]
+            arg_name, arg_type = match.group(1), match.group(2) or 'str'
+            pattern += re.escape(literal) + f"(?P<{arg_name}>{_ARG_PATTERNS[arg_type]})"
+            sample += literal + _ARG_SAMPLES[arg_type]
+            self.arg_types[arg_name] = _ARG_TYPES[arg_type]
+            position = match.end()
+        pattern += re.escape(template[position:])
+        sample += template[position:]
+
+        self.args_pattern = re.compile(pattern) if not self.is_exact else None
+        self.pattern = re.compile(f"^{re.escape(self.prefix)}{pattern}$")
+        self.sample = sample
+
+    def parse(self, data: str) -> Optional[Dict[str, Any]]:
+        """تجزیه آرگومان‌ها از callback_data (None اگر با قالب مطابقت نداشته باشد)"""
+        if self.is_exact:
+            return {}
+
+        match = self.args_pattern.fullmatch(data, len(self.prefix))
+        if not match:
+            return None
+        return {name: self.arg_types[name](value) for name, value in match.groupdict().items()}
+
+
+def route_handler(template: str, callback: Callable) -> CallbackQueryHandler:
+    """
+    CallbackQueryHandler تکی (برای ConversationHandler ها که از router عبور نمی‌کنند) با قالب مسیر؛
+    آرگومان‌ها مثل router یک بار تجزیه و در context.route_args قرار می‌گیرند
+
+    Args:
+        template: قالب مسیر مثل "knowledge_{task_id:int}"
+        callback: هندلر async با امضای (update, context)
+    """
+    route = Route(template, callback)
+
+    @wraps(callback)
+    async def handle(update, context):
+        context.route_args = route.parse(update.callback_query.data)
+        return await callback(update, context)
+
+    return CallbackQueryHandler(handle, pattern=route.pattern)
+
+
+class PackedRoute:
+    """مسیر callback_data فشرده (callback_codec) با opcode ثابت و فیلدهای مرتب"""
+
+    def __init__(self, opcode: str, callback: Callable, fields: Tuple[str, ...]):
+        self.opcode = opcode
+        self.fields = fields
+        self.callback = callback
+        self.name = callback.__name__
+        self.template = f"{opcode}{OPCODE_SEPARATOR}({', '.join(fields)})"
+        self.sample = f"{opcode}{OPCODE_SEPARATOR}"
+
+    def parse(self, values: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+        """نگاشت مقادیر decode شده به نام فیلدها (None اگر تعداد نخواند)"""
+        if len(values) != len(self.fields):
+            return None
+        return dict(zip(self.fields, values))
+
+
+class RouteStats:
+    """آمار زمان dispatch یک مسیر"""
+
+    __slots__ = ('count', 'total_ms', 'max_ms', 'errors')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+
+    def record(self, elapsed_ms: float, failed: bool = False):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if failed:
+            self.errors += 1
+
+
+class CallbackRouter:
+    """مسیریاب callback_data با dict (مسیرهای ثابت) و trie (مسیرهای پیشوندی)"""
+
+    def __init__(self):
+        self._exact: Dict[str, Route] = {}
+        self._trie: Dict[str, Any] = {}
+        self._packed: Dict[str, PackedRoute] = {}
+        self._routes: List[Any] = []
+        self._stats: Dict[str, RouteStats] = {}
+        # match (در check_update) و dispatch هر دو resolve می‌کنند؛ هر callback_data یک بار تجزیه می‌شود
+        self.resolve = lru_cache(maxsize=1024)(self._resolve)
+
+    def add(self, template: str, callback: Callable) -> Route:
+        """
+        ثبت یک مسیر
+
+        Args:
+            template: "show_menu" (ثابت) یا "emp_cat_{employee_id:int}_{category_id:int}" (پیشوندی)
+            callback: هندلر async با امضای (update, context)
+
+        Raises:
+            ValueError: اگر مسیری با همین کلید قبلاً ثبت شده باشد
+        """
+        route = Route(template, callback)
+
+        if route.is_exact:
+            if route.prefix in self._exact:
+                raise ValueError(
+                    f"مسیر تکراری '{template}': قبلاً برای {self._exact[route.prefix].name} ثبت شده"
+                )
+            self._exact[route.prefix] = route
+        else:
+            node = self._trie
+            for char in route.prefix:
+                node = node.setdefault(char, {})
+            routes = node.setdefault(None, [])
+            for existing in routes:
+                if existing.template == template:
+                    raise ValueError(f"مسیر تکراری '{template}': قبلاً برای {existing.name} ثبت شده")
+            routes.append(route)
+
+        self._routes.append(route)
+        self._stats[template] = RouteStats()
+        self.resolve.cache_clear()
+        return route
+
+    def add_packed(self, opcode: str, callback: Callable, *fields: str) -> PackedRoute:
+        """
+        ثبت مسیر برای callback_data ساخته شده با encode_callback(opcode, ...)
+
+        Args:
+            opcode: کد کوتاه عملیات
+            callback: هندلر async
+            *fields: نام آرگومان‌ها به ترتیب مقادیر encode شده
+
+        Raises:
+            ValueError: اگر opcode تکراری باشد یا "~" داشته باشد
+        """
+        if OPCODE_SEPARATOR in opcode:
+            raise ValueError(f"opcode نباید '{OPCODE_SEPARATOR}' داشته باشد: {opcode}")
+        if opcode in self._packed:
+            raise ValueError(f"opcode تکراری '{opcode}': قبلاً برای {self._packed[opcode].name} ثبت شده")
+
+        route = PackedRoute(opcode, callback, fields)
+        self._packed[opcode] = route
+        self._routes.append(route)
+        self._stats[route.template] = RouteStats()
+        self.resolve.cache_clear()
+        return route
+
+    def _resolve(self, data: str) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """
+        پیدا کردن مسیر و آرگومان‌های یک callback_data
+
+        Returns:
+            (route, args) یا None
+        """
+        route = self._exact.get(data)
+        if route:
+            return route, {}
+
+        if OPCODE_SEPARATOR in data:
+            decoded = decode_callback(data)
+            if decoded:
+                opcode, values = decoded
+                packed_route = self._packed.get(opcode)
+                args = packed_route.parse(values) if packed_route else None
+                if args is not None:
+                    return packed_route, args
+
+        # جمع‌آوری مسیرهای پیشوندی روی مسیر trie؛ طولانی‌ترین پیشوند اول امتحان می‌شود
+        candidates = []
+        node = self._trie
+        for char in data:
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                candidates.append(node[None])
+
+        for routes in reversed(candidates):
+            for route in routes:
+                args = route.parse(data)
+                if args is not None:
+                    return route, args
+
+        return None
+
+    def match(self, data: Any) -> bool:
+        """pattern برای CallbackQueryHandler"""
+        return isinstance(data, str) and self.resolve(data) is not None
+
+    async def dispatch(self, update, context):
+        """callback واحد CallbackQueryHandler: اجرای هندلر مسیر و ثبت زمان"""
+        route, args = self.resolve(update.callback_query.data)
+        context.route_args = dict(args)
+
+        started = time.perf_counter()
+        failed = False
+        try:
+            return await route.callback(update, context)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._stats[route.template].record((time.perf_counter() - started) * 1000, failed)
+
+    def build_handler(self) -> CallbackQueryHandler:
+        """ساخت CallbackQueryHandler واحد برای ثبت در Application"""
+        return CallbackQueryHandler(self.dispatch, pattern=self.match)
+
+    def check_shadowing(self, handlers: List[Any]) -> List[str]:
+        """
+        بررسی مسیرهایی که یک CallbackQueryHandler ثبت شده قبل از router آنها را می‌گیرد
+        (مثلاً entry_point یک ConversationHandler)؛ نتیجه لاگ هم می‌شود
+
+        Args:
+            handlers: هندلرهای ثبت شده قبل از router در همان group
+
+        Returns:
+            لیست پیام‌ها
+        """
+        patterns = []
+        for handler in handlers:
+            if isinstance(handler, ConversationHandler):
+                for entry in handler.entry_points:
+                    patterns.append((type(handler).__name__, entry))
+            else:
+                patterns.append((type(handler).__name__, handler))
+
+        warnings = []
+        for route in self._routes:
+            for owner, handler in patterns:
+                if not isinstance(handler, CallbackQueryHandler):
+                    continue
+                pattern = handler.pattern
+                if not isinstance(pattern, re.Pattern) or not pattern.match(route.sample):
+                    continue
+                message = (f"مسیر '{route.template}' ({route.name}) توسط "
+                           f"{owner} با pattern '{pattern.pattern}' گرفته می‌شود")
+                warnings.append(message)
+                logger.warning(message)
+
+        return warnings
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """
+        آمار dispatch مسیرها به ترتیب مجموع زمان
+
+        Returns:
+            لیست dict با کلیدهای template, handler, count, avg_ms, max_ms, total_ms, errors
+        """
+        stats = []
+        for route in self._routes:
+            route_stats = self._stats[route.template]
+            if not route_stats.count:
+                continue
+            stats.append({
+                'template': route.template,
+                'handler': route.name,
+                'count': route_stats.count,
+                'avg_ms': route_stats.total_ms / route_stats.count,
+                'max_ms': route_stats.max_ms,
+                'total_ms': route_stats.total_ms,
+                'errors': route_stats.errors
+            })
+
+        stats.sort(key=lambda item: item['total_ms'], reverse=True)
+        return stats
+
+    def format_stats(self, limit: int = 20) -> str:
+        """متن گزارش آمار برای دستور /route_stats"""
+        stats = self.get_stats()
+        if not stats:
+            return "📊 هنوز هیچ callback ای پردازش نشده است."
+
+        text = f"📊 آمار مسیرها ({len(self._routes)} مسیر ثبت شده)\n\n"
+        for item in stats[:limit]:
+            text += (
+                f"• {item['template']}\n"
+                f"  تعداد: {item['count']} | میانگین: {item['avg_ms']:.1f}ms | "
+                f"بیشینه: {item['max_ms']:.1f}ms"
+            )
+            if item['errors']:
+                text += f" | خطا: {item['errors']}"
+            text += "\n"
+
+        return text
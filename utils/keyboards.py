@@ -5,6 +5,7 @@
 """
 
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
+from utils.callback_codec import pack_values, unpack_values
 
 
 # ==================== Reply Keyboards (ثابت) ====================
@@ -41,6 +42,9 @@ def get_main_menu_keyboard():
         [
             InlineKeyboardButton("👥 مدیریت کاربران", callback_data="user_management"),
             InlineKeyboardButton("📊 گزارش روزانه", callback_data="daily_report")
+        ],
+        [
+            InlineKeyboardButton("📈 تحلیل عملکرد", callback_data="performance_report")
         ]
     ]
     return InlineKeyboardMarkup(keyboard)
@@ -94,7 +98,10 @@ def get_task_work_keyboard(task_id, allocated_time, spent_time):
     allocated_formatted = format_time(allocated_time) if allocated_time > 0 else "تعیین نشده"
     
     keyboard = [
-        [InlineKeyboardButton("🚀 شروع کار", callback_data=f"start_work_{task_id}")],
+        [
+            InlineKeyboardButton("🚀 شروع کار", callback_data=f"start_work_{task_id}"),
+            InlineKeyboardButton("⏹ توقف کار", callback_data=f"end_work_{task_id}")
+        ],
         [
             InlineKeyboardButton(f"⏱️ زمان کل: {allocated_formatted}", callback_data=f"work_panel_{task_id}"),
             InlineKeyboardButton(f"⌚ زمان سپری شده: {spent_formatted}", callback_data=f"work_panel_{task_id}")
@@ -109,6 +116,86 @@ def get_task_work_keyboard(task_id, allocated_time, spent_time):
     return InlineKeyboardMarkup(keyboard)
 
 
+# ==================== Pagination ====================
+
+PAGE_CALLBACK_SEPARATOR = "_pg_"
+
+
+def get_page_callback(prefix, direction, item):
+    """
+    ساخت callback_data دکمه صفحه‌بندی با cursor keyset
+
+    Args:
+        prefix: callback_data پایه لیست (مثلاً 'list_tasks')
+        direction: 'n' (صفحه بعد) یا 'p' (صفحه قبل)
+        item: آیتم مرزی صفحه فعلی (باید کلیدهای sort_key و id داشته باشد)
+
+    Returns:
+        str: prefix + "_pg_" + (direction, sort_key, id) بسته‌بندی شده با callback_codec
+    """
+    return f"{prefix}{PAGE_CALLBACK_SEPARATOR}{pack_values(direction, item['sort_key'], item['id'])}"
+
+
+def parse_page_callback(callback_data):
+    """
+    استخراج جهت و cursor از callback_data صفحه‌بندی
+
+    Args:
+        callback_data: callback_data دکمه
+
+    Returns:
+        tuple (direction, cursor) که cursor به صورت (sort_key, id) یا None برای صفحه اول است
+    """
+    if not callback_data or PAGE_CALLBACK_SEPARATOR not in callback_data:
+        return 'n', None
+    return parse_page_cursor(callback_data.split(PAGE_CALLBACK_SEPARATOR, 1)[1])
+
+
+def parse_page_cursor(packed_cursor):
+    """
+    استخراج جهت و cursor از بخش بعد از "_pg_" (مثلاً route_args['cursor'])
+
+    Args:
+        packed_cursor: cursor بسته‌بندی شده یا None برای صفحه اول
+
+    Returns:
+        tuple (direction, cursor) مانند parse_page_callback
+    """
+    if not packed_cursor:
+        return 'n', None
+
+    values = unpack_values(packed_cursor)
+    if not values or len(values) != 3:
+        return 'n', None
+
+    direction, sort_key, item_id = values
+    if direction not in ('n', 'p') or not isinstance(item_id, int):
+        return 'n', None
+    return direction, (sort_key if sort_key is not None else '', item_id)
+
+
+def get_pagination_row(prefix, page):
+    """
+    ردیف دکمه‌های قبلی/بعدی برای یک صفحه
+
+    Args:
+        prefix: callback_data پایه لیست
+        page: dict خروجی متدهای *_page در TaskModel
+
+    Returns:
+        list دکمه‌ها (ممکن است خالی باشد)
+    """
+    row = []
+    items = page.get('items', [])
+    if not items:
+        return row
+    if page.get('has_prev'):
+        row.append(InlineKeyboardButton("◀️ قبلی", callback_data=get_page_callback(prefix, 'p', items[0])))
+    if page.get('has_next'):
+        row.append(InlineKeyboardButton("بعدی ▶️", callback_data=get_page_callback(prefix, 'n', items[-1])))
+    return row
+
+
 # ==================== Phone Request Keyboard ====================
 
 def get_phone_request_keyboard():
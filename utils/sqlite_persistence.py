@@ -0,0 +1,198 @@
+# utils/sqlite_persistence.py
+
+"""
+Persistence بات روی همان task_bot.db (وضعیت ConversationHandler ها، user_data و chat_data)
+
+- Application تغییرات را هر update_interval ثانیه در پس‌زمینه تحویل می‌دهد (نه در مسیر هر update)
+- هر کلید فقط اگر نسخه pickle شده‌اش با آخرین نسخه نوشته شده فرق کند کثیف می‌شود
+- تغییرات بافر و هر PERSISTENCE_FLUSH_MS میلی‌ثانیه یا با رسیدن به PERSISTENCE_FLUSH_CHANGES
+  تغییر، در یک تراکنش (executemany) روی thread دیتابیس نوشته می‌شوند
+
+bot_data ذخیره نمی‌شود (شامل اشیای زمان اجرا مثل callback_router است).
+"""
+
+import asyncio
+import json
+import logging
+import pickle
+from typing import Optional, Dict, Tuple, Any
+from telegram.ext import BasePersistence, PersistenceInput
+from database.models.bot_persistence import BotPersistenceModel
+
+logger = logging.getLogger(__name__)
+
+_USER = 'user'
+_CHAT = 'chat'
+
+
+class SQLitePersistence(BasePersistence):
+    """پیاده‌سازی BasePersistence با نوشتن دسته‌ای (write-behind) در SQLite"""
+
+    def __init__(self, update_interval: float = 1.0, flush_ms: int = 500, flush_changes: int = 50):
+        super().__init__(
+            store_data=PersistenceInput(bot_data=False, chat_data=True, user_data=True, callback_data=False),
+            update_interval=update_interval
+        )
+        self.flush_delay = flush_ms / 1000
+        self.flush_changes = flush_changes
+
+        # آخرین نسخه نوشته شده هر کلید؛ برای تشخیص تغییر واقعی
+        self._written: Dict[Tuple[str, str, str], bytes] = {}
+        # تغییرات در انتظار: کلید -> BLOB (None یعنی حذف)
+        self._pending: Dict[Tuple[str, str, str], Optional[bytes]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    # ==================== بارگذاری ====================
+
+    async def _load_data(self, kind: str) -> Dict[int, Any]:
+        rows = await BotPersistenceModel.aload_data(kind)
+        result = {}
+        for key, blob in rows.items():
+            try:
+                result[int(key)] = pickle.loads(blob)
+                self._written[('data', kind, key)] = blob
+            except Exception as e:
+                print(f"❌ خطا در بازیابی داده {kind}:{key}: {e}")
+        return result
+
+    async def get_user_data(self) -> Dict[int, Dict[Any, Any]]:
+        return await self._load_data(_USER)
+
+    async def get_chat_data(self) -> Dict[int, Dict[Any, Any]]:
+        return await self._load_data(_CHAT)
+
+    async def get_bot_data(self) -> Dict[Any, Any]:
+        return {}
+
+    async def get_callback_data(self):
+        return None
+
+    async def get_conversations(self, name: str) -> Dict[Tuple, object]:
+        rows = await BotPersistenceModel.aload_conversations(name)
+        conversations = {}
+        for key, blob in rows.items():
+            try:
+                conversations[tuple(json.loads(key))] = pickle.loads(blob)
+                self._written[('conversation', name, key)] = blob
+            except Exception as e:
+                print(f"❌ خطا در بازیابی وضعیت مکالمه {name}:{key}: {e}")
+        return conversations
+
+    # ==================== ثبت تغییرات ====================
+
+    def _mark(self, table: str, group: str, key: str, value: Any = None, delete: bool = False):
+        """ثبت تغییر یک کلید در بافر (فقط اگر با نسخه نوشته شده فرق داشته باشد)"""
+        slot = (table, group, key)
+        if delete:
+            if slot not in self._written and slot not in self._pending:
+                return
+            self._pending[slot] = None
+        else:
+            try:
+                blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                print(f"❌ خطا در سریال کردن داده {group}:{key}: {e}")
+                return
+            if self._written.get(slot) == blob:
+                self._pending.pop(slot, None)
+                return
+            self._pending[slot] = blob
+
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """زمان‌بندی نوشتن: فوری با رسیدن به flush_changes، وگرنه بعد از flush_delay"""
+        if len(self._pending) >= self.flush_changes:
+            if self._flush_handle:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            self._start_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.flush_delay, self._start_flush)
+
+    def _start_flush(self):
+        self._flush_handle = None
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._write_pending())
+
+    async def _write_pending(self):
+        """نوشتن بافر در یک تراکنش؛ در صورت خطا تغییرات به بافر برمی‌گردند"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+
+            data_upserts, data_deletes, conversation_upserts, conversation_deletes = [], [], [], []
+            for (table, group, key), blob in batch.items():
+                if table == 'data':
+                    if blob is None:
+                        data_deletes.append((group, key))
+                    else:
+                        data_upserts.append((group, key, blob))
+                else:
+                    if blob is None:
+                        conversation_deletes.append((group, key))
+                    else:
+                        conversation_upserts.append((group, key, blob))
+
+            saved = await BotPersistenceModel.asave_batch(
+                data_upserts, data_deletes, conversation_upserts, conversation_deletes
+            )
+            if not saved:
+                for slot, blob in batch.items():
+                    self._pending.setdefault(slot, blob)
+                return
+
+            for slot, blob in batch.items():
+                if blob is None:
+                    self._written.pop(slot, None)
+                else:
+                    self._written[slot] = blob
+
+        # تغییراتی که در حین نوشتن رسیده‌اند
+        if self._pending and self._flush_handle is None:
+            self._schedule_flush()
+
+    async def update_user_data(self, user_id: int, data: Dict[Any, Any]) -> None:
+        self._mark('data', _USER, str(user_id), data)
+
+    async def update_chat_data(self, chat_id: int, data: Dict[Any, Any]) -> None:
+        self._mark('data', _CHAT, str(chat_id), data)
+
+    async def update_bot_data(self, data: Dict[Any, Any]) -> None:
+        pass
+
+    async def update_callback_data(self, data) -> None:
+        pass
+
+    async def update_conversation(self, name: str, key: Tuple, new_state: Optional[object]) -> None:
+        # new_state برابر None یعنی مکالمه تمام شده
+        self._mark('conversation', name, json.dumps(list(key)), new_state, delete=new_state is None)
+
+    async def drop_user_data(self, user_id: int) -> None:
+        self._mark('data', _USER, str(user_id), delete=True)
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        self._mark('data', _CHAT, str(chat_id), delete=True)
+
+    async def refresh_user_data(self, user_id: int, user_data: Dict[Any, Any]) -> None:
+        pass
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: Dict[Any, Any]) -> None:
+        pass
+
+    async def refresh_bot_data(self, bot_data: Dict[Any, Any]) -> None:
+        pass
+
+    async def flush(self) -> None:
+        """نوشتن همه تغییرات باقی‌مانده (هنگام shutdown)"""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task:
+            await self._flush_task
+        await self._write_pending()
+        if self._pending:
+            logger.warning(f"{len(self._pending)} تغییر persistence هنگام خاموش شدن ذخیره نشد")
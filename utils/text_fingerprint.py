@@ -0,0 +1,102 @@
+# utils/text_fingerprint.py
+
+"""
+اثر انگشت متن برای تشخیص ورودی‌های تکراری و تقریباً تکراری
+
+- content_hash: هش متن نرمال‌شده (تکرار دقیق، بدون توجه به فاصله‌ها، علائم و ی/ک عربی)
+- MinHash روی shingleهای کاراکتری و LSH با BANDS باند از ROWS_PER_BAND سطر:
+  دو متن با شباهت Jaccard بالای حدود 0.5 با احتمال زیاد حداقل یک باند مشترک دارند،
+  پس پیدا کردن نامزدها فقط چند جستجوی ایندکس است (بدون پیمایش همه متن‌ها).
+  نامزدها در نهایت با Jaccard دقیق shingleها بررسی می‌شوند.
+"""
+
+import hashlib
+import random
+import re
+from typing import Optional, List, Set
+
+SHINGLE_SIZE = 5
+BANDS = 16
+ROWS_PER_BAND = 4
+NUM_PERMUTATIONS = BANDS * ROWS_PER_BAND
+MIN_FINGERPRINT_CHARS = 30
+MAX_FINGERPRINT_CHARS = 4000
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_random = random.Random(1403)
+# ضرایب ثابت (seed ثابت) تا امضاها بین اجراها قابل مقایسه بمانند
+_PERMUTATIONS = [
+    (_random.randrange(1, _MERSENNE_PRIME), _random.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_CHAR_MAP = str.maketrans({
+    'ي': 'ی', 'ى': 'ی', 'ك': 'ک', 'ة': 'ه', 'ۀ': 'ه', 'أ': 'ا', 'إ': 'ا', 'آ': 'ا',
+    '\u200c': ' ', '\u200e': ' ', '\u200f': ' ',
+    '۰': '0', '۱': '1', '۲': '2', '۳': '3', '۴': '4', '۵': '5', '۶': '6', '۷': '7', '۸': '8', '۹': '9',
+})
+_DIACRITICS = re.compile("[\u064b-\u065f\u0670\u0640]")
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_text(text: str) -> str:
+    """یکسان‌سازی حروف عربی/فارسی و ارقام، حذف اعراب و علائم، فاصله‌های تکی"""
+    text = _DIACRITICS.sub('', text.translate(_CHAR_MAP).lower())
+    return ' '.join(_NON_WORD.sub(' ', text).split())
+
+
+def content_hash(text: Optional[str]) -> Optional[str]:
+    """هش متن نرمال‌شده (None برای متن خالی)"""
+    if not text:
+        return None
+    normalized = normalize_text(text)
+    if not normalized:
+        return None
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def shingles(text: str) -> Set[int]:
+    """مجموعه هش shingleهای کاراکتری متن نرمال‌شده"""
+    normalized = normalize_text(text)[:MAX_FINGERPRINT_CHARS]
+    if len(normalized) < MIN_FINGERPRINT_CHARS:
+        return set()
+    return {
+        int.from_bytes(hashlib.blake2b(normalized[i:i + SHINGLE_SIZE].encode('utf-8'), digest_size=8).digest(), 'big')
+        for i in range(len(normalized) - SHINGLE_SIZE + 1)
+    }
+
+
+def jaccard(first: Set[int], second: Set[int]) -> float:
+    """شباهت Jaccard دو مجموعه shingle"""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def lsh_band_keys(shingle_set: Set[int], namespace: str) -> List[int]:
+    """
+    کلیدهای باند LSH از امضای MinHash
+
+    Args:
+        shingle_set: خروجی shingles
+        namespace: پیشوند کلید (مثلاً نوع داده) تا انواع مختلف با هم مقایسه نشوند
+
+    Returns:
+        لیست BANDS عدد صحیح 64 بیتی علامت‌دار (برای ستون INTEGER) یا لیست خالی
+    """
+    if not shingle_set:
+        return []
+
+    signature = [
+        min((a * value + b) % _MERSENNE_PRIME for value in shingle_set)
+        for a, b in _PERMUTATIONS
+    ]
+
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(
+            f"{namespace}:{band}:{':'.join(map(str, rows))}".encode('ascii'), digest_size=8
+        ).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
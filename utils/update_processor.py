@@ -0,0 +1,84 @@
+# utils/update_processor.py
+
+"""
+پردازش هم‌زمان updateها با حفظ ترتیب برای هر کاربر
+
+updateهای کاربران مختلف موازی اجرا می‌شوند، اما updateهای یک کاربر پشت یک قفل
+اختصاصی (FIFO) به ترتیب رسیدن اجرا می‌شوند؛ بنابراین state ConversationHandler ها
+(کلید chat/user) و context.user_data هرگز هم‌زمان توسط دو update یک کاربر تغییر نمی‌کنند.
+
+Usage:
+    Application.builder().token(BOT_TOKEN).concurrent_updates(PerUserUpdateProcessor(16)).build()
+"""
+
+import asyncio
+from typing import Optional, Dict, Any, Awaitable
+from telegram.ext import BaseUpdateProcessor
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """UpdateProcessor با ترتیب per-user و سقف اجرای هم‌زمان"""
+
+    __slots__ = ('_max_in_flight', '_in_flight', '_user_locks', '_user_waiters')
+
+    def __init__(self, max_in_flight: int, max_pending: Optional[int] = None):
+        """
+        Args:
+            max_in_flight: حداکثر updateهای در حال اجرا
+            max_pending: حداکثر updateهای پذیرفته شده (اجرا + انتظار)؛
+                         updateهای منتظر نوبت کاربر جای اجرای دیگران را اشغال نمی‌کنند
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight باید حداقل 1 باشد")
+        super().__init__(max(max_pending or max_in_flight, max_in_flight))
+        self._max_in_flight = max_in_flight
+        self._in_flight = asyncio.BoundedSemaphore(max_in_flight)
+        self._user_locks: Dict[int, asyncio.Lock] = {}
+        self._user_waiters: Dict[int, int] = {}
+
+    @property
+    def max_in_flight(self) -> int:
+        """حداکثر updateهای در حال اجرا"""
+        return self._max_in_flight
+
+    @staticmethod
+    def _get_key(update: Any) -> Optional[int]:
+        """کلید ترتیب: کاربر و در نبود آن chat (updateهای بدون هر دو بدون ترتیب اجرا می‌شوند)"""
+        user = getattr(update, 'effective_user', None)
+        if user:
+            return user.id
+        chat = getattr(update, 'effective_chat', None)
+        if chat:
+            return chat.id
+        return None
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """اجرای update پس از رسیدن نوبت کاربر و گرفتن جای اجرا"""
+        key = self._get_key(update)
+        if key is None:
+            async with self._in_flight:
+                await coroutine
+            return
+
+        lock = self._user_locks.get(key)
+        if lock is None:
+            lock = self._user_locks[key] = asyncio.Lock()
+        self._user_waiters[key] = self._user_waiters.get(key, 0) + 1
+
+        try:
+            # ترتیب: قفل کاربر اول، سپس جای اجرا (منتظرهای یک کاربر جای دیگران را نمی‌گیرند)
+            async with lock:
+                async with self._in_flight:
+                    await coroutine
+        finally:
+            self._user_waiters[key] -= 1
+            if not self._user_waiters[key]:
+                # آزادسازی قفل کاربران غیرفعال تا dict بی‌رویه بزرگ نشود
+                del self._user_waiters[key]
+                del self._user_locks[key]
+
+    async def initialize(self) -> None:
+        """نیازی به آماده‌سازی ندارد"""
+
+    async def shutdown(self) -> None:
+        """نیازی به آزادسازی ندارد"""
@@ -0,0 +1,253 @@
+# utils/webhook_server.py
+
+"""
+سرور HTTP داخلی برای دریافت updateها با webhook (جایگزین long polling)
+
+- فقط POST روی مسیر webhook پذیرفته می‌شود
+- هدر X-Telegram-Bot-Api-Secret-Token با secret تنظیم شده مقایسه می‌شود
+- تعداد اتصال‌های هم‌زمان محدود است (همان max_connections در setWebhook)
+- در خاموش شدن: پذیرش اتصال متوقف، درخواست‌های در حال اجرا تمام و سپس Application متوقف می‌شود
+
+اگر WEBHOOK_URL خالی باشد webhook در تلگرام ثبت نمی‌شود؛ برای تست محلی کافی است
+JSON یک Update ضبط شده را POST کنید:
+
+    curl -X POST http://127.0.0.1:8443/telegram \\
+         -H "X-Telegram-Bot-Api-Secret-Token: $WEBHOOK_SECRET_TOKEN" \\
+         -H "Content-Type: application/json" -d @update.json
+"""
+
+import asyncio
+import hmac
+import json
+import logging
+import signal
+from typing import Optional, Dict, Tuple
+from telegram import Update
+from telegram.ext import Application
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = 'x-telegram-bot-api-secret-token'
+MAX_BODY_SIZE = 1024 * 1024
+MAX_HEADER_LINES = 100
+KEEP_ALIVE_TIMEOUT = 60
+
+_REASONS = {
+    200: 'OK', 400: 'Bad Request', 403: 'Forbidden', 404: 'Not Found', 405: 'Method Not Allowed',
+    413: 'Payload Too Large', 503: 'Service Unavailable'
+}
+
+
+class WebhookServer:
+    """سرور HTTP سبک (asyncio) که updateها را در update_queue برنامه قرار می‌دهد"""
+
+    def __init__(self, application: Application, listen: str, port: int, path: str,
+                 secret_token: str, max_connections: int = 40):
+        self.application = application
+        self.listen = listen
+        self.port = port
+        self.path = path if path.startswith('/') else f"/{path}"
+        self.secret_token = secret_token
+        self.max_connections = max_connections
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers = set()
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closing = False
+        self.received = 0
+        self.rejected = 0
+
+    async def start(self):
+        """شروع گوش دادن روی listen:port"""
+        self._server = await asyncio.start_server(self._handle_connection, self.listen, self.port)
+        logger.info(f"webhook روی http://{self.listen}:{self.port}{self.path} در حال گوش دادن است")
+
+    async def stop(self, drain_timeout: float = 10.0):
+        """توقف پذیرش اتصال و انتظار برای پایان درخواست‌های در حال اجرا"""
+        self._closing = True
+        if self._server:
+            self._server.close()
+        try:
+            await asyncio.wait_for(self._idle.wait(), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("درخواست‌های webhook در زمان خاموش شدن کامل تمام نشدند")
+
+        # اتصال‌های keep-alive بیکار بسته می‌شوند
+        for writer in list(self._writers):
+            writer.close()
+        if self._server:
+            await self._server.wait_closed()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """سرویس یک اتصال (keep-alive؛ تلگرام اتصال‌ها را باز نگه می‌دارد)"""
+        if len(self._writers) >= self.max_connections:
+            await self._respond(writer, 503, keep_alive=False)
+            writer.close()
+            return
+
+        self._writers.add(writer)
+        try:
+            while not self._closing:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+
+                status, keep_alive = request
+                keep_alive = keep_alive and not self._closing
+                await self._respond(writer, status, keep_alive)
+                if not keep_alive:
+                    break
+
+        except Exception as e:
+            print(f"❌ خطا در اتصال webhook: {e}")
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[int, bool]]:
+        """
+        خواندن و پردازش یک درخواست HTTP
+
+        Returns:
+            (کد وضعیت, keep_alive) یا None اگر اتصال بسته شده باشد
+        """
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+
+        parts = request_line.decode('latin-1').split()
+        if len(parts) != 3:
+            return 400, False
+        method, target, version = parts
+
+        headers: Dict[str, str] = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            return 400, False
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            return 400, False
+        if length < 0 or length > MAX_BODY_SIZE:
+            return 413, False
+
+        # بدنه همیشه خوانده می‌شود تا درخواست بعدی روی همین اتصال خراب نشود
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            body = await reader.readexactly(length) if length else b''
+            return self._process(method, target.split('?', 1)[0], headers, body), keep_alive
+        finally:
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._idle.set()
+
+    def _process(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> int:
+        """بررسی درخواست و قرار دادن Update در صف؛ خروجی کد وضعیت HTTP"""
+        if path != self.path:
+            return 404
+        if method != 'POST':
+            return 405
+
+        if not hmac.compare_digest(headers.get(SECRET_HEADER, '').encode(), self.secret_token.encode()):
+            self.rejected += 1
+            logger.warning("درخواست webhook با secret token نامعتبر رد شد")
+            return 403
+
+        try:
+            update = Update.de_json(json.loads(body), self.application.bot)
+        except (ValueError, TypeError, KeyError) as e:
+            print(f"❌ خطا در تجزیه update دریافتی: {e}")
+            return 400
+
+        if update is None:
+            return 400
+
+        self.application.update_queue.put_nowait(update)
+        self.received += 1
+        return 200
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, keep_alive: bool):
+        """ارسال پاسخ HTTP بدون بدنه"""
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Length: 0\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def serve_webhook(application: Application, listen: str, port: int, path: str,
+                        secret_token: str, webhook_url: str = '', max_connections: int = 40,
+                        drain_timeout: float = 10.0):
+    """
+    اجرای کامل بات در حالت webhook (معادل run_polling؛ post_init/post_stop/post_shutdown هم اجرا می‌شوند)
+
+    Args:
+        application: برنامه ساخته شده
+        listen: آدرس گوش دادن
+        port: پورت
+        path: مسیر webhook
+        secret_token: مقدار مورد انتظار هدر X-Telegram-Bot-Api-Secret-Token
+        webhook_url: آدرس عمومی https (خالی = ثبت نکردن در تلگرام، برای تست محلی)
+        max_connections: حداکثر اتصال هم‌زمان
+        drain_timeout: حداکثر انتظار برای درخواست‌های در حال اجرا هنگام خاموش شدن
+    """
+    server = WebhookServer(application, listen, port, path, secret_token, max_connections)
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    await application.initialize()
+    try:
+        if application.post_init:
+            await application.post_init(application)
+
+        await application.start()
+        try:
+            await server.start()
+            if webhook_url:
+                await application.bot.set_webhook(
+                    url=f"{webhook_url.rstrip('/')}{server.path}",
+                    allowed_updates=Update.ALL_TYPES,
+                    max_connections=max_connections,
+                    secret_token=secret_token
+                )
+                logger.info(f"webhook در تلگرام ثبت شد: {webhook_url}")
+
+            await stop_event.wait()
+
+        finally:
+            # webhook حذف نمی‌شود تا تلگرام updateهای زمان restart را نگه دارد
+            await server.stop(drain_timeout)
+            await application.stop()
+            if application.post_stop:
+                await application.post_stop(application)
+
+    finally:
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)